@@ -1,12 +1,15 @@
 # KR: data/marine_*.csv → SQLite raw 저장 → 임베딩 생성 저장
 # EN: CSVs into SQLite then build sentence-transformer embeddings
 
-import os, json, time, sqlite3
+import os, sys, json, time, sqlite3, argparse
 import numpy as np
 import pandas as pd
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
 
+sys.path.insert(0, str(Path(__file__).parent))
+from src.marine_ops.core.quantization import FLOAT32, QUANTIZATIONS, encode_embedding, quantize_table
+
 DB = "marine.db"
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(exist_ok=True)
@@ -54,7 +57,7 @@ def add_csv_to_db(csv_path, source_url="manual"):
     con.commit(); con.close()
 
 
-def build_embeddings(batch=500):
+def build_embeddings(batch=500, quantization=FLOAT32):
     con = sqlite3.connect(DB)
     cur = con.cursor()
     rows = cur.execute(
@@ -73,16 +76,33 @@ def build_embeddings(batch=500):
         for (raw_id, _), emb, text in zip(chunk, embs, texts):
             cur.execute(
                 "INSERT OR REPLACE INTO marine_vec(raw_id, text, dim, embedding) VALUES (?, ?, ?, ?)",
-                (raw_id, text, len(emb), np.asarray(emb, dtype=np.float32).tobytes()),
+                (raw_id, text, len(emb), encode_embedding(emb, quantization)),
             )
         con.commit()
     con.close()
 
 
+def quantize_existing():
+    """기존 float32 임베딩을 int8 (벡터별 스케일) 로 변환 후 VACUUM"""
+    con = sqlite3.connect(DB)
+    dims = [row[0] for row in con.execute("SELECT DISTINCT dim FROM marine_vec")]
+    converted = sum(quantize_table(con, "marine_vec", dim, key="raw_id") for dim in dims)
+    con.commit()
+    con.execute("VACUUM")
+    con.close()
+    return converted
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CSV ingest + embedding build")
+    parser.add_argument("--quantize", choices=QUANTIZATIONS, default=FLOAT32, help="embedding storage (int8: ~4x smaller)")
+    parser.add_argument("--requantize", action="store_true", help="convert existing float32 rows to int8")
+    args = parser.parse_args()
     ensure_db()
     # Load all CSVs that match pattern
     for p in list(DATA_DIR.glob("marine_*.csv")) + list(DATA_DIR.glob("marine_manual.csv")):
         add_csv_to_db(str(p))
-    build_embeddings()
+    build_embeddings(quantization=args.quantize)
+    if args.requantize:
+        print(f"int8 converted: {quantize_existing()} rows")
     print("OK - embeddings built")
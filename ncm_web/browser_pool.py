@@ -0,0 +1,214 @@
+# KR: NCM 스크래핑용 재사용 헤드리스 브라우저 풀
+# EN: Reusable headless-browser pool for NCM scraping
+
+import atexit
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+DRIVER_PATH_CACHE = Path("cache/webdriver/chromedriver_path.json")
+DEFAULT_SNAPSHOT_TTL_S = 15 * 60  # 한 수집 주기 동안 같은 DOM 재사용
+
+CONTAINER_SELECTOR = (
+    "div[class*='data'], div[class*='observation'], div[class*='marine'], "
+    "span[class*='data'], span[class*='observation'], "
+    ".weather-data, .marine-data, .observation-data"
+)
+
+# 한 번의 스크립트 호출로 표 HTML과 데이터 컨테이너 텍스트를 모두 수집
+_SNAPSHOT_SCRIPT = """
+const tables = Array.from(document.querySelectorAll('table')).map(t => t.outerHTML);
+const texts = Array.from(document.querySelectorAll(arguments[0])).map(e => (e.innerText || '').trim());
+return {tables: tables, texts: texts};
+"""
+
+
+def cached_driver_path(install: Optional[Callable[[], str]] = None, cache_file: Path = DRIVER_PATH_CACHE) -> str:
+    """ChromeDriver 경로 캐시 (ChromeDriverManager 네트워크 확인은 파일이 없을 때만)"""
+    if cache_file.exists():
+        try:
+            cached = json.loads(cache_file.read_text(encoding="utf-8")).get("path")
+        except (OSError, ValueError):
+            cached = None
+        if cached and Path(cached).exists():
+            return cached
+
+    if install is None:
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        install = ChromeDriverManager().install
+    path = install()
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    cache_file.write_text(json.dumps({"path": path, "installed_at": time.time()}), encoding="utf-8")
+    return path
+
+
+def _chrome_driver(headless: bool):
+    """Chrome 드라이버 생성 (드라이버 경로는 캐시 사용)"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+
+    chrome_options = Options()
+    if headless:
+        chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument(
+        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
+
+    driver = webdriver.Chrome(service=Service(cached_driver_path()), options=chrome_options)
+    driver.implicitly_wait(10)
+    return driver
+
+
+def _wait_for_page(driver) -> None:
+    """페이지 및 해양 데이터 패널 로딩 대기"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+    try:
+        WebDriverWait(driver, 8).until(
+            EC.presence_of_element_located(
+                (
+                    By.XPATH,
+                    "//*[contains(text(), 'Forecast') or contains(text(), 'Marine') or contains(text(), 'Sea state')]",
+                )
+            )
+        )
+    except Exception:
+        print("[SELENIUM] 해양 데이터 패널 대기 시간 초과, 계속 진행")
+
+
+@dataclass
+class PageSnapshot:
+    """한 번 로드한 페이지의 표/컨테이너 스냅샷 (모든 지점이 공유)"""
+
+    url: str
+    fetched_at: float
+    table_html: List[str]
+    container_texts: List[str]
+    _frames: Optional[List[pd.DataFrame]] = field(default=None, repr=False)
+
+    def frames(self) -> List[pd.DataFrame]:
+        """표 HTML을 한 번만 DataFrame으로 파싱 (컬럼명 정규화 포함)"""
+        if self._frames is None:
+            from io import StringIO
+
+            parsed: List[pd.DataFrame] = []
+            for html in self.table_html:
+                try:
+                    frame_list = pd.read_html(StringIO(html))
+                except ValueError:
+                    continue
+                if not frame_list:
+                    continue
+                frame = frame_list[0]
+                frame.columns = [str(c).strip().lower().replace(" ", "_").replace("-", "_") for c in frame.columns]
+                parsed.append(frame)
+            self._frames = parsed
+        return self._frames
+
+
+class BrowserPool:
+    """프로세스당 하나의 웜 브라우저를 유지하고 URL별 스냅샷을 주기 동안 재사용"""
+
+    _shared: Dict[bool, "BrowserPool"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        headless: bool = True,
+        snapshot_ttl_s: float = DEFAULT_SNAPSHOT_TTL_S,
+        driver_factory: Optional[Callable[[bool], Any]] = None,
+        wait_for_page: Optional[Callable[[Any], None]] = None,
+    ):
+        self.headless = headless
+        self.snapshot_ttl_s = snapshot_ttl_s
+        self._driver_factory = driver_factory or _chrome_driver
+        self._wait_for_page = wait_for_page or _wait_for_page
+        self._driver = None
+        self._snapshots: Dict[str, PageSnapshot] = {}
+        self._lock = threading.RLock()
+        self.page_loads = 0
+
+    @classmethod
+    def shared(cls, headless: bool = True) -> "BrowserPool":
+        """프로세스 공용 풀 (종료 시 자동 정리)"""
+        with cls._shared_lock:
+            pool = cls._shared.get(headless)
+            if pool is None:
+                pool = cls._shared[headless] = cls(headless=headless)
+                atexit.register(pool.close)
+            return pool
+
+    def driver(self):
+        """웜 드라이버 반환 (없거나 죽었으면 새로 생성)"""
+        with self._lock:
+            if self._driver is not None:
+                try:
+                    self._driver.current_url  # 세션 생존 확인
+                    return self._driver
+                except Exception:
+                    self._discard_driver()
+            self._driver = self._driver_factory(self.headless)
+            return self._driver
+
+    def snapshot(self, url: str, max_age_s: Optional[float] = None) -> PageSnapshot:
+        """URL 스냅샷 반환 (주기 내에는 페이지를 다시 로드하지 않음)"""
+        max_age = self.snapshot_ttl_s if max_age_s is None else max_age_s
+        with self._lock:
+            cached = self._snapshots.get(url)
+            if cached is not None and time.time() - cached.fetched_at < max_age:
+                return cached
+
+            driver = self.driver()
+            print(f"[SELENIUM] 접근 중: {url}")
+            try:
+                driver.get(url)
+                self._wait_for_page(driver)
+                payload = driver.execute_script(_SNAPSHOT_SCRIPT, CONTAINER_SELECTOR) or {}
+            except Exception:
+                # 세션 오류 시 다음 호출에서 새 드라이버 생성
+                self._discard_driver()
+                raise
+            self.page_loads += 1
+            snapshot = PageSnapshot(
+                url=url,
+                fetched_at=time.time(),
+                table_html=list(payload.get("tables", [])),
+                container_texts=[text for text in payload.get("texts", []) if text],
+            )
+            self._snapshots[url] = snapshot
+            print(f"[SELENIUM] 페이지 로드 완료 (표 {len(snapshot.table_html)}개)")
+            return snapshot
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        with self._lock:
+            if url is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(url, None)
+
+    def _discard_driver(self) -> None:
+        driver, self._driver = self._driver, None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        with self._lock:
+            self._discard_driver()
+            self._snapshots.clear()
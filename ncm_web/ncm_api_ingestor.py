@@ -0,0 +1,424 @@
+# KR: 브라우저 없이 NCM JSON(XHR) 엔드포인트/서버 HTML에서 직접 수집
+# EN: Browserless NCM ingestion through the site's JSON (XHR) endpoints or server HTML
+
+import json
+import math
+import re
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import requests
+
+from src.marine_ops.connectors.endpoints import record_response, resolve_url
+from src.marine_ops.core.schema import MarineDataPoint, MarineTimeseries
+from src.marine_ops.core.units import calculate_sea_state
+
+BASE_URL = "https://albahar.ncm.gov.ae"
+ENDPOINT_CONFIG = Path("config/ncm_endpoints.json")
+ENDPOINT_INDEX = "_endpoints.jsonl"  # playwright_presets 응답 로거가 기록하는 URL 색인
+DEFAULT_TIMEOUT = 10
+
+# config/locations.yaml 과 동일한 좌표
+SITE_COORDS: Dict[str, Tuple[float, float]] = {
+    "AGI": (25.2111, 54.1578),
+    "DAS": (24.8667, 53.7333),
+}
+
+# NCM AWS 관측 풍속은 km/h 로 제공됨 (m/s 로 변환)
+WIND_SPEED_KMH_TO_MS = 1 / 3.6
+
+# 서버 HTML 표의 관측소 열 별칭 (html_table_frames 가 소문자/밑줄로 정규화)
+HTML_STATION_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "id": ("station_id", "station", "station_name", "name"),
+    "type": ("type", "station_type"),
+    "lat": ("lat", "latitude"),
+    "lon": ("lon", "lng", "longitude"),
+}
+
+# 관측 필드 별칭 → MarineDataPoint 필드
+OBSERVATION_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "wind_speed": ("wind_speed", "windspeed", "ws"),
+    "wind_direction": ("wind_dir", "wind_direction", "wd"),
+    "wind_gust": ("wind_gust", "gust"),
+    "wave_height": ("wave_height", "significant_wave_height", "hs", "wave_hs"),
+    "wave_period": ("wave_period", "peak_period", "tp"),
+    "wave_direction": ("wave_dir", "wave_direction"),
+    "temperature": ("air_temp", "temperature"),
+    "humidity": ("relative_humidity", "humidity"),
+    "sea_surface_temperature": ("water_temp", "sea_temp"),
+    "sea_level": ("sea_level", "radar_sea_level"),
+}
+
+
+@dataclass(frozen=True)
+class NCMEndpoints:
+    """NCM JSON 엔드포인트 (station 은 '{id}' 자리표시자를 포함하는 URL 템플릿)"""
+
+    stations: Optional[str] = None
+    station: Optional[str] = None
+
+    @property
+    def available(self) -> bool:
+        return bool(self.stations and self.station)
+
+    @classmethod
+    def load(cls, config_file: Path = ENDPOINT_CONFIG, raw_dir: Path = Path("raw")) -> "NCMEndpoints":
+        """설정 파일 우선, 없으면 raw/ 응답 색인에서 발견한 URL 사용"""
+        if config_file.exists():
+            data = json.loads(config_file.read_text(encoding="utf-8"))
+            return cls(stations=data.get("stations"), station=data.get("station"))
+        return cls.discover(raw_dir)
+
+    @classmethod
+    def discover(cls, raw_dir: Path) -> "NCMEndpoints":
+        """저장된 XHR 응답 형태로 엔드포인트 분류"""
+        stations = station = None
+        for file_name, url in _index_entries(raw_dir):
+            kind, payload = classify_payload(_load_json(raw_dir / file_name))
+            if kind == "stations" and stations is None:
+                stations = url
+            elif kind == "station" and station is None:
+                station_id = str(payload.get("id", ""))
+                if station_id and re.search(rf"(?<!\d){station_id}(?!\d)", url):
+                    station = re.sub(rf"(?<!\d){station_id}(?!\d)", "{id}", url, count=1)
+        return cls(stations=stations, station=station)
+
+
+def _index_entries(raw_dir: Path) -> Iterable[Tuple[str, str]]:
+    index_path = raw_dir / ENDPOINT_INDEX
+    if not index_path.exists():
+        return []
+    entries = []
+    for line in index_path.read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            record = json.loads(line)
+            entries.append((record["file"], record["url"]))
+    return entries
+
+
+def _load_json(path: Path) -> Any:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def classify_payload(payload: Any) -> Tuple[Optional[str], Dict[str, Any]]:
+    """XHR 응답 분류: ('stations' | 'station' | None, result)"""
+    if not isinstance(payload, dict):
+        return None, {}
+    result = payload.get("result")
+    if not isinstance(result, dict):
+        return None, {}
+    if isinstance(result.get("aStations"), list):
+        return "stations", result
+    if isinstance(result.get("observations"), list):
+        return "station", result
+    return None, {}
+
+
+def station_table(result: Mapping[str, Any]) -> pd.DataFrame:
+    """관측소 목록 → DataFrame (id, name, type, lat, lon)"""
+    frame = pd.DataFrame(result.get("aStations", []))
+    if frame.empty:
+        return pd.DataFrame(columns=["id", "name", "type", "lat", "lon"])
+    return pd.DataFrame(
+        {
+            "id": frame["ID"].astype(str),
+            "name": frame.get("NAME_EN", ""),
+            "type": frame.get("TYPE", "").astype(str).str.upper(),
+            "lat": pd.to_numeric(frame["LATITUDE"], errors="coerce"),
+            "lon": pd.to_numeric(frame["LONGITUDE"], errors="coerce"),
+        }
+    )
+
+
+def nearest_stations(
+    stations: pd.DataFrame, lat: float, lon: float, types: Iterable[str] = ("BUOY", "AWS")
+) -> Dict[str, Dict[str, Any]]:
+    """유형별 최근접 관측소 (하버사인 거리, 벡터 연산)"""
+    chosen: Dict[str, Dict[str, Any]] = {}
+    if stations.empty:
+        return chosen
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(stations["lat"].to_numpy()), np.radians(stations["lon"].to_numpy())
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    distance_km = 2 * 6371.0 * np.arcsin(np.sqrt(a))
+    frame = stations.assign(distance_km=distance_km).dropna(subset=["distance_km"])
+    for station_type in types:
+        candidates = frame[frame["type"] == station_type.upper()]
+        if not candidates.empty:
+            chosen[station_type.upper()] = candidates.nsmallest(1, "distance_km").iloc[0].to_dict()
+    return chosen
+
+
+def observation_frame(result: Mapping[str, Any]) -> pd.DataFrame:
+    """관측 목록 → 시간 인덱스 DataFrame (빈 문자열은 NaN, 단위는 SI)"""
+    raw = pd.DataFrame(result.get("observations", []))
+    if raw.empty or "measure_time" not in raw:
+        return pd.DataFrame()
+    index = pd.to_datetime(raw["measure_time"], utc=True, errors="coerce")
+    columns: Dict[str, np.ndarray] = {}
+    for target, aliases in OBSERVATION_FIELDS.items():
+        source = next((alias for alias in aliases if alias in raw), None)
+        if source is not None:
+            columns[target] = pd.to_numeric(raw[source].replace("", np.nan), errors="coerce").to_numpy(dtype=float)
+    frame = pd.DataFrame(columns, index=index)
+    frame = frame[frame.index.notna()].sort_index()
+    frame = frame[~frame.index.duplicated(keep="last")]
+    for column in ("wind_speed", "wind_gust"):
+        if column in frame:
+            frame[column] = frame[column] * WIND_SPEED_KMH_TO_MS
+    if "humidity" in frame:
+        frame["humidity"] = frame["humidity"] / 100.0
+    return frame
+
+
+def frame_to_points(frame: pd.DataFrame, confidence: float) -> List[MarineDataPoint]:
+    """관측 DataFrame → MarineDataPoint 목록"""
+    if frame.empty:
+        return []
+    timestamps = frame.index.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    columns = {name: frame[name].to_numpy(dtype=float) for name in frame.columns}
+    points: List[MarineDataPoint] = []
+    for i, timestamp in enumerate(timestamps):
+        values = {name: (None if np.isnan(array[i]) else float(array[i])) for name, array in columns.items()}
+        wave_height = values.pop("wave_height", None)
+        wind_speed = values.pop("wind_speed", None)
+        wind_direction = values.pop("wind_direction", None)
+        if wind_speed is None and wave_height is None:
+            continue
+        # 관측되지 않은 값은 0 (잔잔한 바다/무풍) 이 아니라 NaN 으로 둠
+        points.append(
+            MarineDataPoint(
+                timestamp=timestamp,
+                wind_speed=wind_speed if wind_speed is not None else math.nan,
+                wind_direction=wind_direction if wind_direction is not None else math.nan,
+                wave_height=wave_height if wave_height is not None else math.nan,
+                sea_state=calculate_sea_state(wave_height) if wave_height is not None else "Unknown",
+                confidence=confidence,
+                **values,
+            )
+        )
+    return points
+
+
+def html_table_frames(html: str) -> List[pd.DataFrame]:
+    """서버 HTML 의 표를 lxml 로 파싱 (브라우저 없이)"""
+    try:
+        frames = pd.read_html(StringIO(html), flavor="lxml")
+    except (ValueError, ImportError):
+        return []
+    for frame in frames:
+        frame.columns = [str(c).strip().lower().replace(" ", "_").replace("-", "_") for c in frame.columns]
+    return frames
+
+
+class NCMApiIngestor:
+    """브라우저 없는 NCM 수집기
+
+    1) JSON 엔드포인트 (관측소 목록 → 최근접 BUOY/AWS 관측) 를 풀링된 HTTP 세션으로 호출
+    2) 실패 시 서버 HTML 표를 lxml 로 파싱
+    3) 그래도 없으면 브라우저 풀(NCMSeleniumIngestor)로 폴백
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        endpoints: Optional[NCMEndpoints] = None,
+        session: Optional[requests.Session] = None,
+        browser_fallback: Optional[Callable[[str, int], MarineTimeseries]] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        site_coords: Optional[Mapping[str, Tuple[float, float]]] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.endpoints = endpoints if endpoints is not None else NCMEndpoints.load()
+        self.session = session or requests.Session()
+        self.session.headers.setdefault("User-Agent", "Mozilla/5.0 (compatible; HVDC-Marine/1.0)")
+        self.timeout = timeout
+        self.site_coords = dict(site_coords or SITE_COORDS)
+        self._browser_fallback = browser_fallback
+        self._stations: Optional[pd.DataFrame] = None
+        self._station_frames: Dict[str, pd.DataFrame] = {}
+        self.last_path: Optional[str] = None
+
+    def _get_json(self, url: str) -> Any:
+        response = self.session.get(resolve_url("ncm", url), timeout=self.timeout)
+        record_response("ncm", response)
+        response.raise_for_status()
+        return response.json()
+
+    def stations(self) -> pd.DataFrame:
+        """관측소 목록 (프로세스 내 1회 조회)"""
+        if self._stations is None:
+            kind, result = classify_payload(self._get_json(self.endpoints.stations))
+            if kind != "stations":
+                raise ValueError("NCM 관측소 목록 응답 형식이 아님")
+            self._stations = station_table(result)
+        return self._stations
+
+    def station_observations(self, station_id: str) -> pd.DataFrame:
+        """관측소 관측값 (같은 주기 내 여러 지점이 공유)"""
+        if station_id not in self._station_frames:
+            kind, result = classify_payload(self._get_json(self.endpoints.station.format(id=station_id)))
+            if kind != "station":
+                raise ValueError(f"NCM 관측소 {station_id} 응답 형식이 아님")
+            self._station_frames[station_id] = observation_frame(result)
+        return self._station_frames[station_id]
+
+    def reset_cycle(self) -> None:
+        """다음 주기를 위해 관측값 캐시 비움 (관측소 목록은 유지)"""
+        self._station_frames.clear()
+
+    def _json_points(self, location: str) -> List[MarineDataPoint]:
+        lat, lon = self.site_coords[location]
+        chosen = nearest_stations(self.stations(), lat, lon)
+        frames = [self.station_observations(str(station["id"])) for station in chosen.values()]
+        frames = [frame for frame in frames if not frame.empty]
+        if not frames:
+            return []
+        # BUOY(파고) 우선, 빈 값은 AWS(바람/기온)로 보충
+        merged = frames[0]
+        for frame in frames[1:]:
+            merged = merged.combine_first(frame)
+        return frame_to_points(merged, confidence=0.75)
+
+    def _html_station_ids(self, frame: pd.DataFrame, lat: float, lon: float) -> List[str]:
+        """HTML 표에서 지점 최근접 관측소 (유형별) ID, 좌표 열이 없으면 관측소 목록과 이름/ID 로 대조"""
+        columns = {key: next((alias for alias in aliases if alias in frame), None) for key, aliases in HTML_STATION_COLUMNS.items()}
+        if columns["id"] is None:
+            return []
+        ids = frame[columns["id"]].astype(str).str.strip()
+        if columns["lat"] is not None and columns["lon"] is not None:
+            stations = pd.DataFrame(
+                {
+                    "id": ids,
+                    "type": frame[columns["type"]].astype(str).str.upper() if columns["type"] else "AWS",
+                    "lat": pd.to_numeric(frame[columns["lat"]], errors="coerce"),
+                    "lon": pd.to_numeric(frame[columns["lon"]], errors="coerce"),
+                }
+            ).drop_duplicates("id")
+        elif self.endpoints.stations:
+            stations = self.stations()
+        else:
+            return []
+        chosen = nearest_stations(stations, lat, lon)
+        names = {str(station["id"]): {str(station["id"]), str(station.get("name", ""))} for station in chosen.values()}
+        present = set(ids)
+        # BUOY(파고) 우선 순서 유지, 표에 실제로 있는 관측소만
+        return [next(label for label in labels if label in present) for labels in names.values() if labels & present]
+
+    def _html_points(self, location: str) -> List[MarineDataPoint]:
+        if location not in self.site_coords:
+            return []
+        lat, lon = self.site_coords[location]
+        url = resolve_url("ncm", f"{self.base_url}/marine-observations?lang=en")
+        response = self.session.get(url, timeout=self.timeout)
+        record_response("ncm", response)
+        response.raise_for_status()
+        frames: List[pd.DataFrame] = []
+        for frame in html_table_frames(response.text):
+            if "time" not in frame and "measure_time" not in frame:
+                continue
+            frame = frame.rename(columns={"time": "measure_time"})
+            station_column = next((alias for alias in HTML_STATION_COLUMNS["id"] if alias in frame), None)
+            for station_id in self._html_station_ids(frame, lat, lon):
+                rows = frame[frame[station_column].astype(str).str.strip() == station_id]
+                observed = observation_frame({"observations": rows.to_dict(orient="records")})
+                if not observed.empty:
+                    frames.append(observed)
+        if not frames:
+            return []
+        # JSON 경로와 동일하게 BUOY 값 우선, 빈 값은 AWS 로 보충
+        merged = frames[0]
+        for frame in frames[1:]:
+            merged = merged.combine_first(frame)
+        return frame_to_points(merged, confidence=0.7)
+
+    def create_marine_timeseries(self, location: str = "AGI", forecast_hours: int = 72) -> MarineTimeseries:
+        """NCM 관측 시계열 생성 (JSON → HTML → 브라우저 순서)"""
+        data_points: List[MarineDataPoint] = []
+        self.last_path = None
+        if self.endpoints.available and location in self.site_coords:
+            try:
+                data_points = self._json_points(location)
+                if data_points:
+                    self.last_path = "json"
+            except Exception as e:
+                print(f"[NCM-API] JSON 엔드포인트 실패: {e}")
+        if not data_points:
+            try:
+                data_points = self._html_points(location)
+                if data_points:
+                    self.last_path = "html"
+            except Exception as e:
+                print(f"[NCM-API] HTML 파싱 실패: {e}")
+        if data_points:
+            print(f"[NCM-API] {location}: {len(data_points)}개 관측 ({self.last_path})")
+            return MarineTimeseries(
+                source="ncm_api",
+                location=location,
+                data_points=data_points,
+                ingested_at=datetime.now().isoformat(),
+                confidence=0.75,
+            )
+
+        fallback = self._browser_fallback or _selenium_fallback()
+        if fallback is None:
+            raise RuntimeError("NCM 빠른 경로 실패, 브라우저 폴백 사용 불가")
+        self.last_path = "browser"
+        print("[NCM-API] 빠른 경로 실패, 브라우저 풀로 폴백")
+        return fallback(location, forecast_hours)
+
+
+def _selenium_fallback() -> Optional[Callable[[str, int], MarineTimeseries]]:
+    try:
+        from ncm_web.ncm_selenium_ingestor import NCMSeleniumIngestor
+    except ImportError:
+        return None
+    ingestor = NCMSeleniumIngestor(headless=True)
+    return ingestor.create_marine_timeseries
+
+
+def replay_payloads(raw_dir: Path = Path("raw")) -> Dict[str, Any]:
+    """raw/ 에 저장된 XHR 응답을 재생하여 파서 검증 (네트워크 없음)
+
+    Returns:
+        {'stations': 관측소 수, 'station_files': {파일명: 관측 포인트 수}, 'skipped': 기타 응답 수}
+    """
+    summary: Dict[str, Any] = {"stations": 0, "station_files": {}, "skipped": 0}
+    for path in sorted(raw_dir.glob("*.json")):
+        # 지도 스타일/타일 메타데이터 등 대용량 비관측 응답은 내용 확인 전에 건너뜀
+        with path.open("r", encoding="utf-8") as handle:
+            head = handle.read(256)
+        if '"result"' not in head:
+            summary["skipped"] += 1
+            continue
+        kind, result = classify_payload(_load_json(path))
+        if kind == "stations":
+            summary["stations"] = max(summary["stations"], len(station_table(result)))
+        elif kind == "station":
+            summary["station_files"][path.name] = len(frame_to_points(observation_frame(result), confidence=0.75))
+        else:
+            summary["skipped"] += 1
+    return summary
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NCM 브라우저 없는 수집기")
+    parser.add_argument("--replay", metavar="RAW_DIR", help="저장된 XHR 응답 재생 (네트워크 없음)")
+    parser.add_argument("--location", default="AGI")
+    args = parser.parse_args()
+    if args.replay:
+        print(json.dumps(replay_payloads(Path(args.replay)), ensure_ascii=False, indent=2))
+        sys.exit(0)
+    timeseries = NCMApiIngestor().create_marine_timeseries(args.location)
+    print(f"{timeseries.source}: {len(timeseries.data_points)} points")
@@ -8,45 +8,33 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium import webdriver  # noqa: F401  # 미설치 시 ImportError로 가용성 판단
 
 from src.marine_ops.core.schema import MarineDataPoint, MarineTimeseries
 from src.marine_ops.core.units import calculate_sea_state, normalize_to_si
 
+try:
+    from .browser_pool import BrowserPool, PageSnapshot
+except ImportError:  # 스크립트로 직접 실행 시
+    from browser_pool import BrowserPool, PageSnapshot
+
 
 class NCMSeleniumIngestor:
-    """Selenium을 사용한 NCM 해양 관측 데이터 수집기"""
+    """Selenium을 사용한 NCM 해양 관측 데이터 수집기
+    
+    브라우저는 프로세스 공용 풀에서 재사용하고, 한 주기 동안 NCM 페이지를
+    한 번만 로드하여 모든 지점을 같은 DOM 스냅샷에서 파싱합니다.
+    """
 
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, pool: Optional[BrowserPool] = None):
         self.headless = headless
-        self.driver = None
+        self.pool = pool or BrowserPool.shared(headless)
         self.base_url = "https://albahar.ncm.gov.ae"
+        self.snapshot: Optional[PageSnapshot] = None
 
-    def _setup_driver(self):
-        """Chrome 드라이버 설정"""
-        chrome_options = Options()
-
-        if self.headless:
-            chrome_options.add_argument("--headless")
-
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument(
-            "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        )
-
-        # ChromeDriver 자동 설치 및 설정
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
-        self.driver.implicitly_wait(10)
+    @property
+    def marine_url(self) -> str:
+        return f"{self.base_url}/marine-observations?lang=en"
 
     def create_marine_timeseries(
         self, location: str = "AGI", forecast_hours: int = 72
@@ -54,37 +42,8 @@ class NCMSeleniumIngestor:
         """NCM에서 해양 시계열 데이터 생성"""
 
         try:
-            self._setup_driver()
-
-            # NCM Al Bahar 해양 관측 페이지 접근
-            marine_url = f"{self.base_url}/marine-observations?lang=en"
-            print(f"[SELENIUM] 접근 중: {marine_url}")
-
-            self.driver.get(marine_url)
-
-            # 페이지 로딩 대기 (DOMContentLoaded)
-            WebDriverWait(self.driver, 30).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-
-            print(f"[SELENIUM] 페이지 로드 완료")
-
-            # JavaScript 실행 완료 대기 (load state)
-            self.driver.execute_script("return document.readyState") == "complete"
-
-            # 해양 관측 데이터 패널 대기
-            try:
-                WebDriverWait(self.driver, 8).until(
-                    EC.presence_of_element_located(
-                        (
-                            By.XPATH,
-                            "//*[contains(text(), 'Forecast') or contains(text(), 'Marine') or contains(text(), 'Sea state')]",
-                        )
-                    )
-                )
-            except Exception:
-                print("[SELENIUM] 해양 데이터 패널 대기 시간 초과, 계속 진행")
-                pass
+            # 주기 내 첫 호출만 페이지 로드, 이후 지점은 스냅샷 재사용
+            self.snapshot = self.pool.snapshot(self.marine_url)
 
             # 테이블이나 데이터 컨테이너 찾기
             data_points = self._extract_data_with_selenium(location)
@@ -114,44 +73,23 @@ class NCMSeleniumIngestor:
                 confidence=0.3,
             )
 
-        finally:
-            if self.driver:
-                self.driver.quit()
+    def close(self) -> None:
+        """브라우저 종료 (프로세스 종료 시 자동 호출되므로 보통 불필요)"""
+        self.pool.close()
 
     def _extract_data_with_selenium(self, location: str) -> List[MarineDataPoint]:
-        """Selenium으로 데이터 추출"""
+        """스냅샷의 표에서 데이터 추출"""
         data_points = []
 
         try:
-            # 테이블 요소들 찾기
-            tables = self.driver.find_elements(By.TAG_NAME, "table")
-            print(f"[SELENIUM] 발견된 테이블 수: {len(tables)}")
+            frames = self.snapshot.frames() if self.snapshot else []
+            print(f"[SELENIUM] 발견된 테이블 수: {len(frames)}")
 
-            for i, table in enumerate(tables):
+            for i, df in enumerate(frames):
                 try:
-                    print(f"[SELENIUM] 테이블 {i+1} 파싱 중...")
-
-                    # 테이블 HTML을 BeautifulSoup으로 파싱
-                    from bs4 import BeautifulSoup
-
-                    table_html = table.get_attribute("outerHTML")
-                    soup = BeautifulSoup(table_html, "html.parser")
-
-                    # pandas로 테이블 파싱
-                    df_list = pd.read_html(str(soup))
-                    if not df_list:
-                        continue
-
-                    df = df_list[0]
                     print(f"[SELENIUM] 테이블 {i+1} 컬럼: {list(df.columns)}")
                     print(f"[SELENIUM] 테이블 {i+1} 행 수: {len(df)}")
 
-                    # 컬럼명 정규화
-                    df.columns = [
-                        str(c).strip().lower().replace(" ", "_").replace("-", "_")
-                        for c in df.columns
-                    ]
-
                     # 해양 관측 데이터 파싱
                     for _, row in df.iterrows():
                         data_point = self._parse_observation_row(row, location)
@@ -174,42 +112,22 @@ class NCMSeleniumIngestor:
             return []
 
     def _extract_from_other_containers(self, location: str) -> List[MarineDataPoint]:
-        """다른 컨테이너에서 데이터 추출"""
+        """스냅샷의 다른 컨테이너 텍스트에서 데이터 추출"""
         data_points = []
 
-        try:
-            # div나 span 요소에서 데이터 찾기
-            data_elements = self.driver.find_elements(
-                By.CSS_SELECTOR,
-                "div[class*='data'], div[class*='observation'], div[class*='marine'], "
-                "span[class*='data'], span[class*='observation'], "
-                ".weather-data, .marine-data, .observation-data",
-            )
-
-            print(f"[SELENIUM] 데이터 컨테이너 수: {len(data_elements)}")
-
-            for element in data_elements:
-                try:
-                    text = element.text.strip()
-                    if text and any(
-                        keyword in text.lower()
-                        for keyword in ["wind", "wave", "temp", "visibility"]
-                    ):
-                        print(f"[SELENIUM] 발견된 데이터: {text[:100]}...")
-
-                        # 간단한 데이터 파싱 시도
-                        data_point = self._parse_text_data(text, location)
-                        if data_point:
-                            data_points.append(data_point)
+        texts = self.snapshot.container_texts if self.snapshot else []
+        print(f"[SELENIUM] 데이터 컨테이너 수: {len(texts)}")
 
-                except Exception as e:
-                    continue
+        for text in texts:
+            if any(keyword in text.lower() for keyword in ["wind", "wave", "temp", "visibility"]):
+                print(f"[SELENIUM] 발견된 데이터: {text[:100]}...")
 
-            return data_points
+                # 간단한 데이터 파싱 시도
+                data_point = self._parse_text_data(text, location)
+                if data_point:
+                    data_points.append(data_point)
 
-        except Exception as e:
-            print(f"[SELENIUM] 컨테이너 추출 오류: {e}")
-            return []
+        return data_points
 
     def _parse_text_data(self, text: str, location: str) -> Optional[MarineDataPoint]:
         """텍스트에서 해양 데이터 파싱"""
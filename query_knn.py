@@ -1,28 +1,37 @@
-# KR: 코사인 유사도 기반 Top‑K 검색
-# EN: Cosine similarity KNN over normalized embeddings
+# KR: 코사인 유사도 기반 Top‑K 검색 (float32 / int8 양자화 임베딩, 선택적 float 재정렬)
+# EN: Cosine similarity KNN over normalized embeddings (float32 or int8 codes, optional float re-rank)
 
-import sqlite3, json
+import sqlite3, sys, argparse
+from pathlib import Path
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
+sys.path.insert(0, str(Path(__file__).parent))
+from src.marine_ops.core.quantization import rerank_exact
+from src.marine_ops.core.vector_search import rank_embeddings
+
 DB = "marine.db"
 model = SentenceTransformer("all-MiniLM-L6-v2")
 
 
-def knn(query: str, topk: int = 5):
+def knn(query: str, topk: int = 5, rerank: int = 0):
     qv = model.encode([query], normalize_embeddings=True)[0].astype(np.float32)
     con = sqlite3.connect(DB); cur = con.cursor()
-    rows = cur.execute("SELECT raw_id, text, dim, embedding FROM marine_vec").fetchall()
-    scored = []
-    for raw_id, text, dim, blob in rows:
-        vec = np.frombuffer(blob, dtype=np.float32)
-        sim = float(np.dot(qv, vec))  # cosine (normalized)
-        scored.append((sim, raw_id, text))
-    scored.sort(reverse=True, key=lambda x: x[0])
+    rows = cur.execute("SELECT raw_id, text, embedding FROM marine_vec").fetchall()
     con.close()
-    return scored[:topk]
+    # int8 행은 코드 위에서 바로 점수 계산, rerank > 0 이면 상위 topk*rerank 후보를 텍스트 재임베딩으로 재정렬
+    order, sims = rank_embeddings(qv, [r[2] for r in rows], topk * rerank if rerank else topk)
+    if rerank and len(order):
+        vectors = model.encode([rows[i][1] for i in order], normalize_embeddings=True)
+        order, sims = rerank_exact(qv, order, vectors, topk)
+    return [(float(sim), rows[i][0], rows[i][1]) for i, sim in zip(order.tolist(), sims.tolist())]
 
 
 if __name__ == "__main__":
-    for sim, rid, text in knn("AGI high tide RORO window", topk=5):
+    parser = argparse.ArgumentParser(description="marine.db KNN")
+    parser.add_argument("query", nargs="?", default="AGI high tide RORO window")
+    parser.add_argument("--topk", type=int, default=5)
+    parser.add_argument("--rerank", type=int, default=0, help="float re-rank of topk*N code candidates")
+    args = parser.parse_args()
+    for sim, rid, text in knn(args.query, topk=args.topk, rerank=args.rerank):
         print(f"{sim:.4f} | {rid} | {text[:160]}...")
@@ -11,15 +11,42 @@ from datetime import datetime, timedelta
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from src.marine_ops.core.vector_db import MarineVectorDB
+from src.marine_ops.core.observation_store import ObservationStore
+from src.marine_ops.core.vector_search import SearchFilter, parse_condition
 from src.marine_ops.core.schema import MarineDataPoint
+from src.marine_ops.pipeline.analogs import AnalogSearch, summarize_outcomes
+
+BACKENDS = ("vector", "analog")
 
 class MarineQueryEngine:
     """해양 데이터 질의 엔진"""
     
-    def __init__(self, db_path: str = "marine_vec.db"):
-        self.vector_db = MarineVectorDB(db_path)
+    def __init__(self, db_path: str = "marine_vec.db", vector_db=None, backend: str = "vector"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        # 이미 열린 벡터 DB가 있으면 재사용 (모델/연결 중복 방지), 없으면 텍스트 검색 시점에 로드
+        self.db_path = db_path
+        self.backend = backend
+        self._vector_db = vector_db
+        self._analogs: Optional[AnalogSearch] = None
         self.query_templates = self._load_query_templates()
+
+    @property
+    def vector_db(self):
+        """임베딩 모델을 쓰는 벡터 DB (첫 사용 시 로드)"""
+        if self._vector_db is None:
+            from src.marine_ops.core.vector_db import MarineVectorDB
+
+            self._vector_db = MarineVectorDB(self.db_path)
+        return self._vector_db
+
+    @property
+    def analogs(self) -> AnalogSearch:
+        """수치 상태 벡터 유사 사례 색인 (모델 로드 없음, 지점별로 첫 질의 시 구축)"""
+        if self._analogs is None:
+            store = self._vector_db.observations if self._vector_db is not None else ObservationStore(self.db_path)
+            self._analogs = AnalogSearch(store)
+        return self._analogs
     
     def _load_query_templates(self) -> Dict[str, str]:
         """질의 템플릿 로드"""
@@ -34,14 +61,19 @@ class MarineQueryEngine:
             "pilotage": "pilotage berthing docking vessel operations"
         }
     
-    def query_marine_conditions(self, query: str, location: str = None, top_k: int = 10) -> Dict[str, Any]:
-        """해양 조건 질의"""
+    def query_marine_conditions(
+        self, query: str, location: str = None, top_k: int = 10, search: Optional[SearchFilter] = None
+    ) -> Dict[str, Any]:
+        """해양 조건 질의 (search 의 시간/소스/숫자 조건은 유사도 계산 전에 적용)"""
         print(f"[QUERY] 질의: {query}")
         if location:
             print(f"[QUERY] 지역 필터: {location}")
+        if self.backend == "analog":
+            # 수치 백엔드: 텍스트 대신 지역의 최신 상태와 닮은 과거 시점을 검색
+            return self.query_analogs(location, top_k=top_k)
         
         # 벡터 검색 수행
-        search_results = self.vector_db.vector_search(query, top_k, location)
+        search_results = self.vector_db.vector_search(query, top_k, location, search=search)
         
         if not search_results:
             return {
@@ -63,6 +95,46 @@ class MarineQueryEngine:
             "raw_results": search_results[:5]  # 상위 5개만 반환
         }
     
+    def query_analogs(
+        self,
+        location: str,
+        at: Any = None,
+        conditions: Optional[Dict[str, float]] = None,
+        top_k: int = 10,
+        horizon_hours: int = 24,
+        resolution: str = "h",
+    ) -> Dict[str, Any]:
+        """유사 과거 시점(시간/일) N개와 이후 horizon_hours 동안의 전개
+
+        기준은 conditions(원시 값, 방향은 도) → at 시각의 관측 상태 → 최신 관측 상태 순이다.
+        """
+        if not location:
+            return {"status": "error", "message": "유사 사례 검색에는 지역이 필요합니다"}
+        print(f"[QUERY] 유사 사례: {location} (기준: {conditions or at or '최신 상태'}, {horizon_hours}시간 전개)")
+        matches = self.analogs.similar(
+            location, at=at, conditions=conditions, k=top_k, resolution=resolution, horizon_hours=horizon_hours
+        )
+        if not matches:
+            return {
+                "status": "no_results",
+                "message": "유사 사례가 없습니다",
+                "location": location
+            }
+        results = [
+            {"source": "analog", "location": location, "timestamp": match.timestamp.isoformat(),
+             "distance": round(match.distance, 4), "data": match.state, "next": match.outcome}
+            for match in matches
+        ]
+        return {
+            "status": "success",
+            "backend": "analog",
+            "location": location,
+            "total_results": len(results),
+            "analysis": self._analyze_search_results(results, "analog"),
+            "outcome_summary": summarize_outcomes(matches),
+            "raw_results": results
+        }
+    
     def _analyze_search_results(self, results: List[Dict[str, Any]], query: str) -> Dict[str, Any]:
         """검색 결과 분석"""
         if not results:
@@ -165,16 +237,14 @@ class MarineQueryEngine:
         """운항 윈도우 질의"""
         print(f"[QUERY] 운항 윈도우: {location} {start_time} ~ {end_time}")
         
-        # 시간 범위 질의
+        # 시간 범위/지역을 후보 선택 단계에 적용하고 범위 안의 전체 시점을 반환 (상위 k개로 잘리지 않음)
         time_query = f"operational window {location} {start_time} {end_time}"
-        results = self.vector_db.vector_search(time_query, location_filter=location)
-        
-        # 시간 필터링
-        filtered_results = []
-        for result in results:
-            timestamp = result.get('timestamp', '')
-            if start_time <= timestamp <= end_time:
-                filtered_results.append(result)
+        results = self.vector_db.vector_search(
+            time_query,
+            top_k=None,
+            search=SearchFilter(location=location, start=start_time, end=end_time),
+        )
+        filtered_results = sorted(results, key=lambda result: result.get('ts') or 0)
         
         if not filtered_results:
             return {
@@ -246,24 +316,63 @@ class MarineQueryEngine:
         """최근 데이터 요약"""
         print(f"[QUERY] 최근 {hours}시간 요약 (지역: {location or '전체'})")
         
-        recent_data = self.vector_db.get_recent_data(hours, location)
+        # 열 저장소에서 필요한 열만 스캔 (JSON 파싱 없음)
+        frame = self.vector_db.get_recent_frame(hours, location, columns=["wind_speed", "wave_height"])
         
-        if not recent_data:
+        if frame.empty:
             return {
                 "status": "no_data",
                 "message": f"최근 {hours}시간 데이터가 없습니다"
             }
         
         # 요약 분석
-        summary = self._analyze_search_results(recent_data, "recent_summary")
+        summary = self._summarize_frame(frame)
         
         return {
             "status": "success",
             "time_range": f"최근 {hours}시간",
             "location": location or "전체",
-            "total_records": len(recent_data),
+            "total_records": len(frame),
             "summary": summary
         }
+    
+    def _summarize_frame(self, frame) -> Dict[str, Any]:
+        """열 단위 요약 (_analyze_search_results 와 동일한 구조)"""
+        timestamps = frame["timestamp"].dt.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+        analysis = {
+            "locations": frame["location"].value_counts().to_dict(),
+            "sources": frame["source"].value_counts().to_dict(),
+            "time_span": {
+                "earliest": timestamps.min(),
+                "latest": timestamps.max(),
+                "total_periods": int(len(frame))
+            }
+        }
+        
+        for column, key in (("wind_speed", "wind_summary"), ("wave_height", "wave_summary")):
+            values = frame[column].dropna()
+            if not values.empty:
+                analysis[key] = {
+                    "min": float(values.min()),
+                    "max": float(values.max()),
+                    "avg": float(values.mean()),
+                    "count": int(len(values))
+                }
+        
+        # 조건별 분류 (_classify_conditions 와 동일한 임계값)
+        wind = frame["wind_speed"].fillna(0).to_numpy()
+        wave = frame["wave_height"].fillna(0).to_numpy()
+        good = (wind <= 15) & (wave <= 1.5)
+        moderate = ~good & (wind <= 20) & (wave <= 2.0)
+        poor = ~good & ~moderate & (wind <= 25) & (wave <= 2.5)
+        analysis["conditions"] = {
+            "good_count": int(good.sum()),
+            "moderate_count": int(moderate.sum()),
+            "poor_count": int(poor.sum()),
+            "extreme_count": int((~good & ~moderate & ~poor).sum())
+        }
+        
+        return analysis
 
 def main():
     """메인 실행 함수"""
@@ -273,13 +382,30 @@ def main():
     parser.add_argument('--query', default='AGI high tide RORO window', help='검색 쿼리')
     parser.add_argument('--location', help='지역 필터 (AGI, DAS)')
     parser.add_argument('--top-k', type=int, default=10, help='검색 결과 수')
+    parser.add_argument('--source', help='소스 필터 (open_meteo, stormglass, ...)')
+    parser.add_argument('--start', help='시작 시각 (ISO8601, naive 는 UTC)')
+    parser.add_argument('--end', help='종료 시각 (ISO8601, 포함)')
+    parser.add_argument('--where', action='append', default=[], help='숫자 조건 예: "wave_height>1.5" (반복 가능)')
     parser.add_argument('--operational', action='store_true', help='운항 윈도우 분석')
     parser.add_argument('--recent', type=int, help='최근 N시간 요약')
+    parser.add_argument('--backend', choices=BACKENDS, default='vector', help='검색 백엔드 (analog: 수치 상태 유사 사례)')
+    parser.add_argument('--at', help='유사 사례 기준 시각 (analog, 기본은 최신 상태)')
+    parser.add_argument('--horizon', type=int, default=24, help='유사 사례 이후 전개 시간 (analog)')
+    parser.add_argument('--daily', action='store_true', help='일 단위 유사 사례 (analog)')
     
     args = parser.parse_args()
     
     # 질의 엔진 초기화
-    engine = MarineQueryEngine()
+    engine = MarineQueryEngine(backend=args.backend)
+    
+    if args.backend == 'analog':
+        # 수치 상태 유사 사례 (임베딩 모델 로드 없음)
+        result = engine.query_analogs(
+            args.location, at=args.at, top_k=args.top_k, horizon_hours=args.horizon, resolution='D' if args.daily else 'h'
+        )
+        print(f"\n=== 유사 사례 ===")
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return
     
     if args.operational and args.location:
         # 운항 윈도우 분석
@@ -297,8 +423,14 @@ def main():
         print(json.dumps(result, ensure_ascii=False, indent=2))
     
     else:
-        # 일반 검색
-        result = engine.query_marine_conditions(args.query, args.location, args.top_k)
+        # 일반 검색 (구조적 조건은 후보 선택 단계에서 적용)
+        search = SearchFilter(
+            source=args.source,
+            start=args.start,
+            end=args.end,
+            conditions=tuple(parse_condition(item) for item in args.where),
+        )
+        result = engine.query_marine_conditions(args.query, args.location, args.top_k, search=search)
         print(f"\n=== 검색 결과 ===")
         print(json.dumps(result, ensure_ascii=False, indent=2))
     
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""KR: 장기 예측 모델 백테스트 유틸리티입니다. / EN: CLI utility for rolling-origin model backtests."""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.marine_ops.pipeline.backtest import BACKENDS, DEFAULT_LEAD_HOURS, compare_backends, write_metrics_table
+from src.marine_ops.pipeline.history import DEFAULT_TABLE_NAME, HistoryQuery, load_history
+
+
+def _parse_args() -> argparse.Namespace:
+    """KR: 명령행 인자를 파싱합니다. / EN: Parse command-line arguments."""
+
+    parser = argparse.ArgumentParser(description="Rolling-origin backtest of the long-range forecaster")
+    parser.add_argument(
+        "--sources",
+        nargs="*",
+        default=[
+            "data/historical_marine_metrics.csv",
+            "data/historical_marine_metrics.sqlite",
+        ],
+        help="Historical dataset sources (CSV, SQLite, Parquet or Feather)",
+    )
+    parser.add_argument("--table", default=DEFAULT_TABLE_NAME, help="SQLite table name for database sources")
+    parser.add_argument("--target", default="wave_height", help="Target column to forecast")
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=["random_forest"],
+        choices=sorted(BACKENDS),
+        help="Model backends to compare on identical folds",
+    )
+    parser.add_argument("--folds", type=int, default=5, help="Number of rolling-origin folds")
+    parser.add_argument("--test-hours", type=int, default=24 * 7, help="Length of each test window in hours")
+    parser.add_argument("--leads", nargs="+", type=int, default=list(DEFAULT_LEAD_HOURS), help="Lead times in hours")
+    parser.add_argument("--go-threshold", type=float, default=1.0, help="GO gate applied to the target")
+    parser.add_argument("--window-hours", type=int, default=None, help="Only replay the most recent N hours")
+    parser.add_argument("--workers", type=int, default=None, help="Parallel fold workers (default: bounded pool)")
+    parser.add_argument("--cache-dir", default="cache/ml_forecast/backtest", help="Fold feature cache directory")
+    parser.add_argument("--output", default="cache/ml_forecast/backtest", help="Directory for the metrics table")
+    return parser.parse_args()
+
+
+def main() -> int:
+    """KR: 백테스트를 실행하고 지표를 저장합니다. / EN: Run the backtest and store the metrics table."""
+
+    args = _parse_args()
+    query = HistoryQuery.recent(args.window_hours) if args.window_hours else HistoryQuery()
+    history = load_history([Path(item) for item in args.sources], query, sqlite_table=args.table)
+    if history.empty:
+        print("[ML][BACKTEST] No history available")
+        return 1
+    summary, reports = compare_backends(
+        history,
+        args.backends,
+        target_column=args.target,
+        lead_hours=args.leads,
+        n_folds=args.folds,
+        test_hours=args.test_hours,
+        go_threshold=args.go_threshold,
+        cache_dir=args.cache_dir,
+        max_workers=args.workers,
+    )
+    best = summary.sort_values("rmse").iloc[0]["backend"]
+    outputs = write_metrics_table(reports[best], args.output)
+    print(summary.to_string(index=False, float_format=lambda value: f"{value:.3f}"))
+    print(f"[ML][BACKTEST] Best backend={best} metrics={outputs['csv']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
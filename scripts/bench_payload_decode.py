@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""KR: 커넥터 응답 디코딩 마이크로 벤치마크입니다. / EN: Micro-benchmark for connector payload decoding.
+
+Compares the legacy ``response.json()`` + list/DataFrame path with the array decoder in
+``connectors/payloads.py`` over recorded payloads (or a synthetic 16-day payload when none are given).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.marine_ops.connectors import payloads
+from src.marine_ops.connectors.stormglass import STORMGLASS_FIELDS
+
+OPEN_METEO_VARS = [
+    "wave_height",
+    "wind_wave_height",
+    "swell_wave_height",
+    "wave_period",
+    "wind_wave_period",
+    "swell_wave_period",
+    "wave_direction",
+    "wind_wave_direction",
+    "swell_wave_direction",
+    "ocean_current_velocity",
+    "sea_surface_temperature",
+    "wind_speed_10m",
+    "wind_gusts_10m",
+    "wind_direction_10m",
+    "visibility",
+]
+
+
+def synthetic_open_meteo(hours: int = 16 * 24, variables: List[str] = OPEN_METEO_VARS) -> bytes:
+    """KR: 합성 Open-Meteo 응답입니다. / EN: Synthetic Open-Meteo payload shaped like the live API."""
+
+    rng = np.random.default_rng(7)
+    times = pd.date_range("2025-10-07T00:00", periods=hours, freq="h").strftime("%Y-%m-%dT%H:%M").tolist()
+    hourly: Dict[str, object] = {"time": times}
+    for name in variables:
+        hourly[name] = np.round(rng.gamma(2.0, 1.0, hours), 2).tolist()
+    return json.dumps({"hourly_units": {name: "" for name in variables}, "hourly": hourly}).encode("utf-8")
+
+
+def synthetic_stormglass(hours: int = 10 * 24) -> bytes:
+    """KR: 합성 Stormglass 응답입니다. / EN: Synthetic Stormglass payload with ``{"noaa": x}`` nesting."""
+
+    rng = np.random.default_rng(11)
+    times = pd.date_range("2025-10-07T00:00:00+00:00", periods=hours, freq="h").strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    rows = [
+        {"time": stamp, **{param: {"noaa": round(float(rng.gamma(2.0, 1.0)), 2)} for param in STORMGLASS_FIELDS.values()}}
+        for stamp in times
+    ]
+    return json.dumps({"hours": rows}).encode("utf-8")
+
+
+def legacy_open_meteo(raw: bytes) -> pd.DataFrame:
+    payload = json.loads(raw.decode("utf-8"))
+    hourly = payload["hourly"]
+    variables = [name for name in hourly if name != "time"]
+    return pd.DataFrame({var: hourly.get(var, []) for var in variables}, index=pd.to_datetime(hourly["time"]))
+
+
+def fast_open_meteo(raw: bytes) -> pd.DataFrame:
+    payload = payloads.loads(raw)
+    variables = [name for name in payload["hourly"] if name != "time"]
+    return payloads.open_meteo_frame(payload, variables, dtype=np.float32)
+
+
+def legacy_stormglass(raw: bytes) -> Dict[str, list]:
+    data = json.loads(raw.decode("utf-8"))
+    columns: Dict[str, list] = {name: [] for name in STORMGLASS_FIELDS.values()}
+    for hour in data.get("hours", []):
+        for name in columns:
+            columns[name].append(hour.get(name, {}).get("noaa"))
+    return columns
+
+
+def fast_stormglass(raw: bytes) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    return payloads.stormglass_columns(payloads.loads(raw).get("hours", []), STORMGLASS_FIELDS.values(), dtype=np.float32)
+
+
+def _time_it(func: Callable[[bytes], object], raw: bytes, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(raw)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _recorded(paths: List[str]) -> List[Tuple[str, str, bytes]]:
+    found: List[Tuple[str, str, bytes]] = []
+    for pattern in paths:
+        for path in sorted(Path().glob(pattern)):
+            raw = path.read_bytes()
+            head = raw[:4096]
+            if b'"hourly"' in head:
+                found.append(("open_meteo", path.name, raw))
+            elif b'"hours"' in head:
+                found.append(("stormglass", path.name, raw))
+    return found
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark connector payload decoding")
+    parser.add_argument("--payloads", nargs="*", default=[], help="Glob patterns of recorded Open-Meteo/Stormglass JSON")
+    parser.add_argument("--repeat", type=int, default=20, help="Repetitions per case (best time is reported)")
+    args = parser.parse_args()
+
+    cases = _recorded(args.payloads) or [
+        ("open_meteo", "synthetic 16d x 15 vars", synthetic_open_meteo()),
+        ("stormglass", "synthetic 10d", synthetic_stormglass()),
+    ]
+    decoders = {
+        "open_meteo": (legacy_open_meteo, fast_open_meteo),
+        "stormglass": (legacy_stormglass, fast_stormglass),
+    }
+    print(f"JSON backend: {'orjson' if payloads.orjson is not None else 'json'}")
+    for kind, name, raw in cases:
+        legacy, fast = decoders[kind]
+        legacy_s = _time_it(legacy, raw, args.repeat)
+        fast_s = _time_it(fast, raw, args.repeat)
+        print(
+            f"{kind:<11} {name:<28} {len(raw) / 1024:8.1f} KiB  "
+            f"legacy {legacy_s * 1e3:7.2f} ms  fast {fast_s * 1e3:7.2f} ms  x{legacy_s / max(fast_s, 1e-9):.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
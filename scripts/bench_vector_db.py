@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""KR: 벡터 DB 연결 재사용 벤치마크입니다. / EN: Benchmark per-call connects against the connection manager.
+
+Builds (or reuses) a ``marine_raw`` table with ``--rows`` synthetic rows shaped like the vector DB, then
+times the access patterns of ``MarineVectorDB``: single-row lookups, the top-k ``data_json`` fetch
+(N point queries versus one ``WHERE id IN (...)``) and the ``get_stats`` aggregates.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.marine_ops.core.connection import ConnectionManager
+
+SOURCES = ("open_meteo", "stormglass", "worldtides", "ncm")
+LOCATIONS = ("AGI", "DAS")
+
+
+def build_database(path: Path, rows: int, batch: int = 50_000) -> None:
+    """KR: 합성 marine_raw 테이블을 만듭니다. / EN: Create the synthetic ``marine_raw`` table once."""
+
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS marine_raw (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                location TEXT NOT NULL,
+                timestamp TEXT NOT NULL,
+                data_json TEXT NOT NULL,
+                ingested_at TEXT NOT NULL,
+                UNIQUE(source, location, timestamp)
+            )
+            """
+        )
+        existing = conn.execute("SELECT COUNT(*) FROM marine_raw").fetchone()[0]
+        if existing >= rows:
+            return
+        rng = np.random.default_rng(3)
+        for start in range(existing, rows, batch):
+            ids = np.arange(start, min(rows, start + batch))
+            waves = np.round(rng.gamma(2.0, 0.5, len(ids)), 2)
+            winds = np.round(rng.gamma(3.0, 2.0, len(ids)), 1)
+            records = []
+            for i, wave, wind in zip(ids.tolist(), waves.tolist(), winds.tolist()):
+                source, location = SOURCES[i % len(SOURCES)], LOCATIONS[(i // len(SOURCES)) % len(LOCATIONS)]
+                stamp = f"{np.datetime64('2020-01-01T00:00') + np.timedelta64(i // 8, 'h')}:00+00:00"
+                payload = {"timestamp": stamp, "wind_speed": wind, "wind_direction": 270.0, "wave_height": wave}
+                records.append((source, location, stamp, json.dumps(payload), stamp))
+            conn.executemany(
+                "INSERT OR IGNORE INTO marine_raw (source, location, timestamp, data_json, ingested_at) VALUES (?, ?, ?, ?, ?)",
+                records,
+            )
+            conn.commit()
+
+
+def _time_it(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _stats(conn: sqlite3.Connection) -> None:
+    conn.execute("SELECT COUNT(*) FROM marine_raw").fetchone()
+    conn.execute("SELECT source, COUNT(*) FROM marine_raw GROUP BY source").fetchall()
+    conn.execute("SELECT MAX(timestamp) FROM marine_raw").fetchone()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark MarineVectorDB connection handling")
+    parser.add_argument("--db", default="cache/bench/marine_vec_bench.db", help="Benchmark database path")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in marine_raw")
+    parser.add_argument("--lookups", type=int, default=2000, help="Single-row lookups per case")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--searches", type=int, default=500, help="Top-k payload fetches per case")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per case (best time is reported)")
+    args = parser.parse_args()
+
+    path = Path(args.db)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    build_database(path, args.rows)
+    print(f"DB {path} ({args.rows:,} rows) ready in {time.perf_counter() - started:.1f}s")
+
+    rng = np.random.default_rng(5)
+    lookup_ids = rng.integers(1, args.rows + 1, args.lookups).tolist()
+    topk_ids: List[List[int]] = rng.integers(1, args.rows + 1, (args.searches, args.top_k)).tolist()
+    manager = ConnectionManager(path)
+
+    def per_call_lookups() -> None:
+        for raw_id in lookup_ids:
+            with sqlite3.connect(path) as conn:
+                conn.execute("SELECT data_json FROM marine_raw WHERE id = ?", (raw_id,)).fetchone()
+
+    def managed_lookups() -> None:
+        conn = manager.connection()
+        for raw_id in lookup_ids:
+            conn.execute("SELECT data_json FROM marine_raw WHERE id = ?", (raw_id,)).fetchone()
+
+    def per_row_payloads() -> None:
+        for ids in topk_ids:
+            with sqlite3.connect(path) as conn:
+                for raw_id in ids:
+                    conn.execute("SELECT data_json FROM marine_raw WHERE id = ?", (raw_id,)).fetchone()
+
+    def in_join_payloads() -> None:
+        conn = manager.connection()
+        for ids in topk_ids:
+            placeholders = ", ".join("?" for _ in ids)
+            conn.execute(f"SELECT id, data_json FROM marine_raw WHERE id IN ({placeholders})", ids).fetchall()
+
+    def per_call_stats() -> None:
+        with sqlite3.connect(path) as conn:
+            _stats(conn)
+
+    def managed_stats() -> None:
+        _stats(manager.connection())
+
+    cases = [
+        (f"{args.lookups} point lookups", per_call_lookups, managed_lookups),
+        (f"{args.searches} top-{args.top_k} payload fetches", per_row_payloads, in_join_payloads),
+        ("get_stats aggregates", per_call_stats, managed_stats),
+    ]
+    managed_stats()  # 연결을 열고 PRAGMA 적용 (첫 연결 비용은 제외)
+    print(
+        f"PRAGMA journal_mode={manager.pragma('journal_mode')} synchronous={manager.pragma('synchronous')} "
+        f"mmap_size={manager.pragma('mmap_size')} cache_size={manager.pragma('cache_size')}"
+    )
+    for name, legacy, managed in cases:
+        legacy_s = _time_it(legacy, args.repeat)
+        managed_s = _time_it(managed, args.repeat)
+        print(
+            f"{name:<32} per-call {legacy_s * 1e3:9.1f} ms  managed {managed_s * 1e3:9.1f} ms  "
+            f"x{legacy_s / max(managed_s, 1e-9):.1f}"
+        )
+    manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
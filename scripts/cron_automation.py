@@ -15,6 +15,8 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.marine_ops.core.vector_db import MarineVectorDB
+from src.marine_ops.pipeline.notify import Notification, NotificationDispatcher, SmtpSender, TelegramSender
+from src.marine_ops.pipeline.scheduler import JobGraph
 from scripts.generate_weather_report import MarineWeatherOrchestrator
 from query_vec import MarineQueryEngine
 
@@ -24,14 +26,18 @@ class MarineAutomation:
     def __init__(self, config_file: str = "config/automation.json"):
         self.config_file = Path(config_file)
         self.config = self._load_config()
+        # 벡터 DB/임베딩 모델은 한 인스턴스를 질의 엔진과 공유
         self.vector_db = MarineVectorDB()
-        self.query_engine = MarineQueryEngine()
+        self.query_engine = MarineQueryEngine(vector_db=self.vector_db)
         self.orchestrator = MarineWeatherOrchestrator()
+        self.jobs = self._build_job_graph()
+        self._alerted_report_id = None
         
         # 알림 시스템 초기화
         self.notification_enabled = self.config.get('notifications', {}).get('enabled', False)
         self.telegram_enabled = self.config.get('notifications', {}).get('telegram', {}).get('enabled', False)
         self.email_enabled = self.config.get('notifications', {}).get('email', {}).get('enabled', False)
+        self.dispatcher = self._build_dispatcher()
     
     def _load_config(self) -> Dict[str, Any]:
         """자동화 설정 로드"""
@@ -47,6 +53,9 @@ class MarineAutomation:
                     "health_check": "*/30 * * * *"     # 30분마다
                 },
                 "locations": ["AGI", "DAS"],
+                "daemon": {
+                    "collection_max_age_minutes": 170  # 이 기간 내 수집 결과는 보고서가 재사용
+                },
                 "notifications": {
                     "enabled": False,
                     "telegram": {
@@ -77,16 +86,40 @@ class MarineAutomation:
             
             return default_config
     
+    def _build_job_graph(self) -> JobGraph:
+        """작업 의존성 그래프 구성
+        
+        collect: 커넥터 수집 + 융합 (신선도 기간 동안 결과 재사용)
+        report_summary: 최근 collect 결과로 요약 생성 (재수집 없음)
+        """
+        daemon_config = self.config.get('daemon', {})
+        collection_max_age = float(daemon_config.get('collection_max_age_minutes', 170)) * 60
+        
+        graph = JobGraph()
+        graph.add(
+            'collect',
+            lambda _: self.orchestrator.generate_report(self.config['locations']),
+            max_age_s=collection_max_age,
+        )
+        graph.add(
+            'report_summary',
+            lambda deps: self._generate_report_summary(deps['collect']),
+            depends_on=('collect',),
+        )
+        return graph
+    
     def data_collection_job(self):
         """데이터 수집 작업"""
         print(f"\n=== 데이터 수집 작업 시작 ({datetime.now()}) ===")
         
         try:
-            # 통합 보고서 생성
-            report = self.orchestrator.generate_report(self.config['locations'])
+            # 통합 보고서 생성 (같은 주기에 이미 수집했으면 재사용)
+            report = self.jobs.run('collect')
             
-            # 알림 조건 확인
-            self._check_alert_conditions(report)
+            # 알림 조건 확인 (보고서당 1회)
+            if report.report_id != self._alerted_report_id:
+                self._check_alert_conditions(report)
+                self._alerted_report_id = report.report_id
             
             print(f"데이터 수집 완료: {report.report_id}")
             
@@ -99,17 +132,14 @@ class MarineAutomation:
         print(f"\n=== 날씨 보고서 생성 작업 시작 ({datetime.now()}) ===")
         
         try:
-            # 상세 보고서 생성
-            report = self.orchestrator.generate_report(self.config['locations'])
-            
-            # 보고서 요약 생성
-            summary = self._generate_report_summary(report)
+            # 최근 수집 결과로 요약 생성 (수집이 오래됐을 때만 재수집)
+            summary = self.jobs.run('report_summary')
             
             # 알림 전송
             if self.notification_enabled:
                 self._send_daily_report(summary)
             
-            print(f"날씨 보고서 생성 완료: {report.report_id}")
+            print(f"날씨 보고서 생성 완료: {summary['report_id']}")
             
         except Exception as e:
             print(f"날씨 보고서 생성 실패: {e}")
@@ -134,7 +164,8 @@ class MarineAutomation:
                 "timestamp": datetime.now().isoformat(),
                 "db_records": stats['total_records'],
                 "recent_data_count": len(recent_data),
-                "status": "healthy" if len(recent_data) > 0 else "warning"
+                "status": "healthy" if len(recent_data) > 0 else "warning",
+                "job_latency": self.jobs.metrics()
             }
             
             # 헬스 상태 저장
@@ -207,9 +238,40 @@ class MarineAutomation:
             "warnings": report.warnings
         }
     
-    def _send_alert(self, message: str, alert_type: str = "info"):
-        """알림 전송"""
+    def _build_dispatcher(self):
+        """알림 디스패처 구성 (큐 + 채널 동시 전송 + 요약 병합 + 보관함)"""
         if not self.notification_enabled:
+            return None
+        notifications = self.config.get('notifications', {})
+        senders = []
+        if self.telegram_enabled:
+            telegram_config = notifications['telegram']
+            senders.append(TelegramSender(telegram_config['bot_token'], telegram_config['chat_id']))
+        if self.email_enabled:
+            email_config = notifications['email']
+            senders.append(SmtpSender(
+                email_config['smtp_server'],
+                email_config['smtp_port'],
+                email_config['username'],
+                email_config['recipients'],
+                username=email_config['username'],
+                password=email_config['password'],
+                subject_prefix="해양 날씨 알림 - ",
+            ))
+        dispatch_config = notifications.get('dispatch', {})
+        dispatcher = NotificationDispatcher(
+            senders,
+            outbox_path=dispatch_config.get('outbox', 'logs/notification_outbox.jsonl'),
+            coalesce_window_s=dispatch_config.get('coalesce_seconds', 30),
+            max_attempts=dispatch_config.get('max_attempts', 4),
+        )
+        # 이전 실행에서 못 보낸 알림 재시도
+        dispatcher.retry_outbox()
+        return dispatcher.start()
+    
+    def _send_alert(self, message: str, alert_type: str = "info"):
+        """알림 전송 (큐에 넣고 즉시 반환)"""
+        if not self.notification_enabled or self.dispatcher is None:
             return
         
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -217,67 +279,10 @@ class MarineAutomation:
         
         print(f"알림 전송: {full_message}")
         
-        # Telegram 알림
-        if self.telegram_enabled:
-            self._send_telegram_alert(full_message)
-        
-        # 이메일 알림
-        if self.email_enabled:
-            self._send_email_alert(full_message, alert_type)
-    
-    def _send_telegram_alert(self, message: str):
-        """Telegram 알림 전송"""
-        try:
-            import requests
-            
-            telegram_config = self.config['notifications']['telegram']
-            bot_token = telegram_config['bot_token']
-            chat_id = telegram_config['chat_id']
-            
-            url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-            data = {
-                'chat_id': chat_id,
-                'text': message,
-                'parse_mode': 'HTML'
-            }
-            
-            response = requests.post(url, data=data)
-            if response.status_code == 200:
-                print("Telegram 알림 전송 성공")
-            else:
-                print(f"Telegram 알림 전송 실패: {response.status_code}")
-        
-        except Exception as e:
-            print(f"Telegram 알림 전송 오류: {e}")
-    
-    def _send_email_alert(self, message: str, alert_type: str):
-        """이메일 알림 전송"""
-        try:
-            import smtplib
-            from email.mime.text import MIMEText
-            from email.mime.multipart import MIMEMultipart
-            
-            email_config = self.config['notifications']['email']
-            
-            msg = MIMEMultipart()
-            msg['From'] = email_config['username']
-            msg['Subject'] = f"해양 날씨 알림 - {alert_type.upper()}"
-            
-            msg.attach(MIMEText(message, 'plain', 'utf-8'))
-            
-            server = smtplib.SMTP(email_config['smtp_server'], email_config['smtp_port'])
-            server.starttls()
-            server.login(email_config['username'], email_config['password'])
-            
-            for recipient in email_config['recipients']:
-                msg['To'] = recipient
-                server.send_message(msg)
-            
-            server.quit()
-            print("이메일 알림 전송 성공")
-        
-        except Exception as e:
-            print(f"이메일 알림 전송 오류: {e}")
+        channels = tuple(
+            name for name, enabled in (("telegram", self.telegram_enabled), ("email", self.email_enabled)) if enabled
+        )
+        self.dispatcher.submit(Notification(alert_type.upper(), full_message, alert_type, channels))
     
     def _send_daily_report(self, summary: Dict[str, Any]):
         """일일 보고서 전송"""
@@ -302,8 +307,20 @@ class MarineAutomation:
         
         self._send_alert(report_text, "report")
     
-    def start_scheduler(self):
-        """스케줄러 시작"""
+    def write_metrics(self, path: str = "logs/scheduler_metrics.json"):
+        """작업별 지연 시간 히스토그램 저장"""
+        metrics_file = Path(path)
+        metrics_file.parent.mkdir(exist_ok=True)
+        payload = {"timestamp": datetime.now().isoformat(), "jobs": self.jobs.metrics()}
+        with open(metrics_file, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+    
+    def start_scheduler(self, daemon: bool = False):
+        """스케줄러 시작
+        
+        daemon=True: 시작 시 1회 수집으로 커넥터/모델/융합 결과를 메모리에 올려두고,
+        다음 작업 시각까지 대기하며 매 주기 지연 시간 지표를 기록
+        """
         print("=== 해양 데이터 자동화 스케줄러 시작 ===")
         print(f"설정 파일: {self.config_file}")
         
@@ -318,12 +335,28 @@ class MarineAutomation:
         print("- 날씨 보고서: 06:00, 18:00")
         print("- 헬스 체크: 30분마다")
         
+        if daemon:
+            print("- 데몬 모드: 워밍업 수집 실행")
+            self.data_collection_job()
+            self.write_metrics()
+        
         # 스케줄러 실행
         try:
             while True:
+                idle = schedule.idle_seconds()
                 schedule.run_pending()
-                time.sleep(60)  # 1분마다 체크
+                if daemon:
+                    if idle is not None and idle <= 0:
+                        self.write_metrics()
+                    idle = schedule.idle_seconds()
+                    time.sleep(min(60, max(1, idle)) if idle is not None else 60)
+                else:
+                    time.sleep(60)  # 1분마다 체크
         except KeyboardInterrupt:
+            if daemon:
+                self.write_metrics()
+            if self.dispatcher is not None:
+                self.dispatcher.close()
             print("\n스케줄러 종료")
     
     def run_once(self):
@@ -332,6 +365,8 @@ class MarineAutomation:
         
         self.data_collection_job()
         self.health_check_job()
+        if self.dispatcher is not None:
+            self.dispatcher.close()
 
 def main():
     """메인 실행 함수"""
@@ -339,6 +374,7 @@ def main():
     
     parser = argparse.ArgumentParser(description='해양 데이터 자동화')
     parser.add_argument('--once', action='store_true', help='한 번만 실행')
+    parser.add_argument('--daemon', action='store_true', help='상주 데몬 모드 (메모리 상태 유지)')
     parser.add_argument('--config', default='config/automation.json', help='설정 파일 경로')
     
     args = parser.parse_args()
@@ -349,7 +385,7 @@ def main():
     if args.once:
         automation.run_once()
     else:
-        automation.start_scheduler()
+        automation.start_scheduler(daemon=args.daemon)
 
 if __name__ == "__main__":
     main()
@@ -22,6 +22,7 @@ ALIASES = {
 }
 DEFAULT_TIMEOUT_MS = 25_000
 JSON_MAX_BYTES = 8 * 1024 * 1024  # guardrail for oversized responses
+ENDPOINT_INDEX = "_endpoints.jsonl"
 
 
 @dataclass
@@ -31,6 +32,11 @@ class RunOptions:
     headless: bool
     timeout: int
     network_idle: bool
+    extra_sites: tuple[str, ...] = ()
+
+    @property
+    def sites(self) -> tuple[str, ...]:
+        return (self.site, *(site for site in self.extra_sites if site != self.site))
 
 
 def _orthogonal_regex(patterns: Iterable[str]) -> re.Pattern[str]:
@@ -72,12 +78,16 @@ def _parse_tables_from_html(html: str) -> Optional[pd.DataFrame]:
     return pd.concat(frames, ignore_index=True)
 
 
-def _dump_json_payload(site: str, ts: int, payload: object) -> None:
+def _dump_json_payload(site: str, ts: int, payload: object, url: Optional[str] = None) -> None:
     RAW_ROOT.mkdir(exist_ok=True)
     millis = int(time.time() * 1000)
     out_path = RAW_ROOT / f"{site}_{ts}_{millis}.json"
     with out_path.open("w", encoding="utf-8") as fh:
         json.dump(payload, fh, ensure_ascii=False, indent=2)
+    if url:
+        # URL index lets the browserless NCM connector discover the XHR endpoints.
+        with (RAW_ROOT / ENDPOINT_INDEX).open("a", encoding="utf-8") as fh:
+            fh.write(json.dumps({"file": out_path.name, "url": url}) + "\n")
 
 
 def _install_response_logger(page: Page, site: str, ts: int) -> None:
@@ -99,21 +109,37 @@ def _install_response_logger(page: Page, site: str, ts: int) -> None:
             return
         if len(data.encode("utf-8")) > JSON_MAX_BYTES:
             return
-        _dump_json_payload(site, ts, payload)
+        _dump_json_payload(site, ts, payload, getattr(response, "url", None))
 
     page.on("response", _on_response)
 
 
-def run_scrape(opts: RunOptions) -> int:
+def _extract_site_frame(page: Page, site: str) -> Optional[pd.DataFrame]:
+    for locator in _candidate_locators(page, site):
+        try:
+            locator.wait_for(timeout=3_000)
+            html = locator.inner_html()
+        except PlaywrightTimeoutError:
+            continue
+        except Exception:
+            continue
+        dataframe = _parse_tables_from_html(html)
+        if dataframe is not None and not dataframe.empty:
+            return dataframe
+    return None
+
+
+def scrape_sites(opts: RunOptions) -> dict[str, Optional[pd.DataFrame]]:
+    """Load the page once and extract every requested site panel from the same DOM."""
     timestamp = int(time.time())
-    DATA_ROOT.mkdir(exist_ok=True)
     RAW_ROOT.mkdir(exist_ok=True)
+    frames: dict[str, Optional[pd.DataFrame]] = {}
 
     with sync_playwright() as playwright:
         browser = playwright.chromium.launch(headless=opts.headless)
         context = browser.new_context()
         page = context.new_page()
-        _install_response_logger(page, opts.site, timestamp)
+        _install_response_logger(page, "_".join(opts.sites), timestamp)
 
         goto_kwargs = {"timeout": opts.timeout}
         if opts.network_idle:
@@ -124,38 +150,46 @@ def run_scrape(opts: RunOptions) -> int:
         # Small grace settle
         page.wait_for_timeout(750)
 
-        dataframe: Optional[pd.DataFrame] = None
-        for locator in _candidate_locators(page, opts.site):
-            try:
-                locator.wait_for(timeout=3_000)
-                html = locator.inner_html()
-            except PlaywrightTimeoutError:
-                continue
-            except Exception:
-                continue
-            dataframe = _parse_tables_from_html(html)
-            if dataframe is not None and not dataframe.empty:
-                break
-
-        if dataframe is None or dataframe.empty:
-            dataframe = _parse_tables_from_html(page.content())
+        page_fallback: Optional[pd.DataFrame] = None
+        for site in opts.sites:
+            dataframe = _extract_site_frame(page, site)
+            if dataframe is None or dataframe.empty:
+                if page_fallback is None:
+                    page_fallback = _parse_tables_from_html(page.content())
+                dataframe = page_fallback
+            frames[site] = dataframe
 
         browser.close()
+    return frames
 
-    if dataframe is None or dataframe.empty:
-        print("[ZERO] No table extracted; JSON payloads saved under raw/", file=sys.stderr)
-        return 2
 
-    out_path = DATA_ROOT / f"marine_playwright_{opts.site}_{timestamp}.csv"
-    dataframe.to_csv(out_path, index=False)
-    print(f"[OK] Saved {len(dataframe)} rows to {out_path}")
-    return 0
+def run_scrape(opts: RunOptions) -> int:
+    timestamp = int(time.time())
+    DATA_ROOT.mkdir(exist_ok=True)
+
+    status = 0
+    for site, dataframe in scrape_sites(opts).items():
+        if dataframe is None or dataframe.empty:
+            print(f"[ZERO] No table extracted for {site}; JSON payloads saved under raw/", file=sys.stderr)
+            status = 2
+            continue
+        out_path = DATA_ROOT / f"marine_playwright_{site}_{timestamp}.csv"
+        dataframe.to_csv(out_path, index=False)
+        print(f"[OK] Saved {len(dataframe)} rows to {out_path}")
+    return status
 
 
 def _parse_args(argv: Optional[Iterable[str]] = None) -> RunOptions:
     parser = argparse.ArgumentParser(description="Capture AGI/DAS panels using Playwright.")
     parser.add_argument("--url", required=True, help="Target URL")
     parser.add_argument("--site", choices=sorted(ALIASES), required=True, help="Site alias")
+    parser.add_argument(
+        "--also",
+        choices=sorted(ALIASES),
+        action="append",
+        default=[],
+        help="Additional site parsed from the same page load (repeatable)",
+    )
     parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT_MS, help="Navigation timeout in ms")
     parser.add_argument("--no-headless", action="store_true", help="Disable headless mode")
     parser.add_argument(
@@ -170,6 +204,7 @@ def _parse_args(argv: Optional[Iterable[str]] = None) -> RunOptions:
         headless=not args.no_headless,
         timeout=args.timeout,
         network_idle=not args.no_network_idle,
+        extra_sites=tuple(args.also),
     )
 
 
@@ -28,9 +28,11 @@ def extract_marine_data_to_csv(summary_json_path: str, output_csv: str):
     
     rows = []
     
-    # 분석 결과에서 평균값 추출
-    analysis = data.get('analysis', {})
-    averages = analysis.get('averages', {})
+    # 평균값 추출 (인덱스 파일은 headline 에, 전체 JSON 은 analysis 에 있음)
+    if 'headline' in data:
+        averages = data['headline'].get('averages', {})
+    else:
+        averages = data.get('analysis', {}).get('averages', {})
     
     # 현재 시간
     now = datetime.now().isoformat(timespec="seconds") + "Z"
@@ -123,7 +125,10 @@ def main():
     # 2. 최신 summary.json 찾기
     print("\n🔍 2단계: 최신 데이터 파일 검색 중...")
     out_dir = Path("out")
-    summary_files = list(out_dir.glob("summary_*.json"))
+    # 작은 인덱스 파일 우선, 없으면 weather_job.py 전체 요약 JSON
+    summary_files = list(out_dir.glob("summary_[0-9]*_index.json")) or [
+        path for path in out_dir.glob("summary_[0-9]*.json") if not path.name.endswith("_index.json")
+    ]
     
     if not summary_files:
         print("❌ summary JSON 파일을 찾을 수 없습니다")
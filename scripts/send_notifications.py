@@ -3,112 +3,61 @@
 
 from __future__ import annotations
 
-import json
-import os
-import smtplib
 import sys
 from datetime import datetime
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
 from pathlib import Path
 
-import requests
 from dotenv import load_dotenv
 
 # .env 파일 로드
 load_dotenv()
 
 sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
 from secret_helpers import load_secret, mask_secret
+from src.marine_ops.pipeline.compact_outputs import headline_digest, latest_index
+from src.marine_ops.pipeline.notify import Notification, NotificationDispatcher, SmtpSender, TelegramSender
 
 
-def send_telegram_notification(summary_file: Path) -> bool:
-    """KR: Telegram 알림 전송 / EN: Send Telegram notification."""
+def telegram_sender() -> TelegramSender | None:
+    """KR: Telegram 전송기 구성 / EN: Build the Telegram sender from secrets."""
     
-    try:
-        bot_token = load_secret("TELEGRAM_BOT_TOKEN", allow_empty=True)
-        chat_id = load_secret("TELEGRAM_CHAT_ID", allow_empty=True)
-        
-        if not bot_token or not chat_id:
-            print("⚠️ Telegram 시크릿 없음 - 건너뜀")
-            return False
-        
-        print(f"\n📱 Telegram 알림 전송 중...")
-        print(f"  Bot Token: {mask_secret(bot_token)}")
-        print(f"  Chat ID: {mask_secret(chat_id)}")
-        
-        # 요약 파일 읽기
-        with open(summary_file, 'r', encoding='utf-8') as f:
-            message = f.read()
-        
-        # Telegram API 호출
-        url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-        data = {
-            "chat_id": chat_id,
-            "text": message,
-            "parse_mode": "HTML",
-            "disable_web_page_preview": True
-        }
-        
-        response = requests.post(url, json=data, timeout=10)
-        response.raise_for_status()
-        
-        result = response.json()
-        if result.get("ok"):
-            print("  ✅ Telegram 알림 전송 성공!")
-            return True
-        else:
-            print(f"  ❌ Telegram 전송 실패: {result}")
-            return False
-            
-    except Exception as e:
-        print(f"  ❌ Telegram 오류: {e}")
-        return False
+    bot_token = load_secret("TELEGRAM_BOT_TOKEN", allow_empty=True)
+    chat_id = load_secret("TELEGRAM_CHAT_ID", allow_empty=True)
+    
+    if not bot_token or not chat_id:
+        print("⚠️ Telegram 시크릿 없음 - 건너뜀")
+        return None
+    
+    print(f"\n📱 Telegram 알림 준비")
+    print(f"  Bot Token: {mask_secret(bot_token)}")
+    print(f"  Chat ID: {mask_secret(chat_id)}")
+    return TelegramSender(bot_token, chat_id)
 
 
-def send_email_notification(summary_file: Path) -> bool:
-    """KR: 이메일 알림 전송 / EN: Send email notification."""
+def email_sender() -> SmtpSender | None:
+    """KR: 이메일 전송기 구성 (배치당 SMTP 로그인 1회) / EN: Build the SMTP sender from secrets."""
     
-    try:
-        username = load_secret("MAIL_USERNAME", allow_empty=True)
-        password = load_secret("MAIL_PASSWORD", allow_empty=True)
-        to_email = load_secret("MAIL_TO", allow_empty=True)
-        
-        if not username or not password or not to_email:
-            print("⚠️ Email 시크릿 없음 - 건너뜀")
-            return False
-        
-        print(f"\n📧 Email 알림 전송 중...")
-        print(f"  From: {username}")
-        print(f"  To: {to_email}")
-        print(f"  Password: {mask_secret(password)}")
-        
-        # 요약 파일 읽기
-        with open(summary_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # 이메일 작성
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = f"🌊 HVDC Marine Weather Report - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
-        msg["From"] = f"HVDC Weather Bot <{username}>"
-        msg["To"] = to_email
-        
-        text_part = MIMEText(content, "plain", "utf-8")
-        msg.attach(text_part)
-        
-        # SMTP 전송
-        server = smtplib.SMTP("smtp.gmail.com", 587)
-        server.starttls()
-        server.login(username, password)
-        server.sendmail(username, to_email, msg.as_string())
-        server.quit()
-        
-        print("  ✅ Email 알림 전송 성공!")
-        return True
-        
-    except Exception as e:
-        print(f"  ❌ Email 오류: {e}")
-        return False
+    username = load_secret("MAIL_USERNAME", allow_empty=True)
+    password = load_secret("MAIL_PASSWORD", allow_empty=True)
+    to_email = load_secret("MAIL_TO", allow_empty=True)
+    
+    if not username or not password or not to_email:
+        print("⚠️ Email 시크릿 없음 - 건너뜀")
+        return None
+    
+    print(f"\n📧 Email 알림 준비")
+    print(f"  From: {username}")
+    print(f"  To: {to_email}")
+    print(f"  Password: {mask_secret(password)}")
+    return SmtpSender(
+        "smtp.gmail.com",
+        587,
+        f"HVDC Weather Bot <{username}>",
+        [address.strip() for address in to_email.split(",")],
+        username=username,
+        password=password,
+    )
 
 
 def main():
@@ -128,10 +77,30 @@ def main():
     
     print(f"✅ 요약 파일: {summary_file}")
     print(f"  크기: {summary_file.stat().st_size} bytes")
+    body = summary_file.read_text(encoding="utf-8")
+    
+    # 72시간 결과는 전체 JSON 대신 compact 인덱스와 결정 열만 읽어 덧붙임
+    index_file = latest_index(summary_file.parent)
+    if index_file is not None:
+        print(f"✅ 72H 인덱스: {index_file}")
+        body = f"{body.rstrip()}\n\n{headline_digest(index_file)}\n"
     
-    # 알림 전송
-    tg_success = send_telegram_notification(summary_file)
-    email_success = send_email_notification(summary_file)
+    # 알림 전송 (채널 동시 전송, 실패 시 재시도 후 보관함 저장)
+    senders = [sender for sender in (telegram_sender(), email_sender()) if sender is not None]
+    dispatcher = NotificationDispatcher(senders, max_attempts=3)
+    dispatcher.retry_outbox()
+    dispatcher.submit(
+        Notification(
+            subject=f"🌊 HVDC Marine Weather Report - {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+            body=body,
+            severity="report",
+            channels=tuple(sender.name for sender in senders),
+        )
+    )
+    results = dispatcher.flush()
+    dispatcher.close()
+    tg_success = results.get("telegram", False)
+    email_success = results.get("email", False)
     
     # 결과 요약
     print("\n" + "=" * 60)
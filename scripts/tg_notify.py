@@ -12,6 +12,9 @@ import requests
 API_BASE = "https://api.telegram.org/bot{token}/{method}"
 DEFAULT_TIMEOUT = 20
 
+# Reuse one keep-alive connection for message + document uploads in the same run.
+_SESSION = requests.Session()
+
 
 class TelegramError(RuntimeError):
     """Raised when Telegram API responses indicate failure."""
@@ -35,7 +38,7 @@ def send_message(text: str, html: bool = False, disable_preview: bool = True) ->
     }
     if html:
         payload["parse_mode"] = "HTML"
-    response = requests.post(
+    response = _SESSION.post(
         API_BASE.format(token=token, method="sendMessage"),
         json=payload,
         timeout=DEFAULT_TIMEOUT,
@@ -52,7 +55,7 @@ def send_document(path: Path, caption: Optional[str] = None) -> dict:
     if caption:
         data["caption"] = caption
     try:
-        response = requests.post(
+        response = _SESSION.post(
             API_BASE.format(token=token, method="sendDocument"),
             data=data,
             files=files,
@@ -5,8 +5,20 @@ Telegram 및 Email용 Impact-Based Forecast 포맷
 """
 
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import json
+import sys
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.marine_ops.pipeline.windows import GateSeries, WindowRuns, classify_gates, find_windows, to_epoch_seconds
+
+GST_OFFSET_SECONDS = 4 * 3600
+KT_PER_MS = 1.94384
 
 
 class ThreeDayFormatter:
@@ -44,6 +56,36 @@ class ThreeDayFormatter:
         else:
             return 'NO_GO'
     
+    @staticmethod
+    def _gst_day_number() -> int:
+        """오늘(GST)의 epoch 일수"""
+        return (int(datetime.now(timezone.utc).timestamp()) + GST_OFFSET_SECONDS) // 86400
+    
+    def _window_runs(self, timeseries: List[Dict]) -> WindowRuns:
+        """전체 시계열을 한 번만 파싱/분류하여 윈도우 탐지 (여러 날은 detect_all_windows 로 한 번에)"""
+        epoch_s = to_epoch_seconds([point['timestamp'] for point in timeseries])
+        hs_m = np.array([point.get('wave_height_m', 0) for point in timeseries], dtype=np.float64)
+        wind_kt = np.array([point.get('wind_speed_ms', 0) for point in timeseries], dtype=np.float64) * KT_PER_MS
+        # 결측(NaN)은 두 게이트 모두 실패 → NO_GO (기존 루프와 동일)
+        status = classify_gates(hs_m, wind_kt, self.THRESHOLDS['GO'], self.THRESHOLDS['CONDITIONAL'])
+        return find_windows(
+            GateSeries.build(epoch_s, status), GST_OFFSET_SECONDS, min_points=self.MIN_WINDOW_HOURS
+        )
+    
+    def detect_all_windows(self, timeseries: List[Dict], days: int = 3) -> Dict[int, List[Dict]]:
+        """
+        D0..D+(days-1) 윈도우를 한 번에 탐지
+        
+        Returns:
+            {day_offset: 윈도우 목록}
+        """
+        runs = self._window_runs(timeseries)
+        today = self._gst_day_number()
+        return {
+            offset: runs.for_day(today + offset).records(GST_OFFSET_SECONDS)
+            for offset in range(days)
+        }
+    
     def detect_windows(self, timeseries: List[Dict], day_offset: int = 0) -> List[Dict]:
         """
         연속된 GO/CONDITIONAL 윈도우 탐지
@@ -55,77 +97,9 @@ class ThreeDayFormatter:
         Returns:
             윈도우 목록 [{'start': datetime, 'end': datetime, 'status': str, 'duration_hours': float}]
         """
-        windows = []
-        current_window = None
-        
-        for point in timeseries:
-            # UTC+4 변환 (GST)
-            point_time = datetime.fromisoformat(point['timestamp'].replace('Z', '+00:00'))
-            point_time_gst = point_time.astimezone(timezone(timedelta(hours=4)))
-            
-            # 날짜 필터링
-            if point_time_gst.date() != (datetime.now(timezone(timedelta(hours=4))).date() + timedelta(days=day_offset)):
-                continue
-            
-            hs_m = point.get('wave_height_m', 0)
-            wind_ms = point.get('wind_speed_ms', 0)
-            wind_kt = wind_ms * 1.94384  # m/s to knots
-            
-            status = self.classify_point(hs_m, wind_kt)
-            
-            if status in ['GO', 'CONDITIONAL']:
-                if current_window is None:
-                    # 새 윈도우 시작
-                    current_window = {
-                        'start': point_time_gst,
-                        'end': point_time_gst,
-                        'status': status,
-                        'count': 1
-                    }
-                elif current_window['status'] == status:
-                    # 같은 상태 계속
-                    current_window['end'] = point_time_gst
-                    current_window['count'] += 1
-                else:
-                    # 상태 변경 - 이전 윈도우 저장
-                    if current_window['count'] >= self.MIN_WINDOW_HOURS:
-                        duration = (current_window['end'] - current_window['start']).total_seconds() / 3600
-                        windows.append({
-                            'start': current_window['start'],
-                            'end': current_window['end'],
-                            'status': current_window['status'],
-                            'duration_hours': duration
-                        })
-                    # 새 윈도우 시작
-                    current_window = {
-                        'start': point_time_gst,
-                        'end': point_time_gst,
-                        'status': status,
-                        'count': 1
-                    }
-            else:
-                # NO_GO - 윈도우 종료
-                if current_window and current_window['count'] >= self.MIN_WINDOW_HOURS:
-                    duration = (current_window['end'] - current_window['start']).total_seconds() / 3600
-                    windows.append({
-                        'start': current_window['start'],
-                        'end': current_window['end'],
-                        'status': current_window['status'],
-                        'duration_hours': duration
-                    })
-                current_window = None
-        
-        # 마지막 윈도우 처리
-        if current_window and current_window['count'] >= self.MIN_WINDOW_HOURS:
-            duration = (current_window['end'] - current_window['start']).total_seconds() / 3600
-            windows.append({
-                'start': current_window['start'],
-                'end': current_window['end'],
-                'status': current_window['status'],
-                'duration_hours': duration
-            })
-        
-        return windows
+        runs = self._window_runs(timeseries)
+        today = self._gst_day_number()
+        return runs.for_day(today + day_offset).records(GST_OFFSET_SECONDS)
     
     def generate_day_headline(self, windows: List[Dict], day_offset: int) -> Tuple[str, str]:
         """
@@ -202,10 +176,9 @@ class ThreeDayFormatter:
         build_utc = datetime.now(timezone.utc)
         build_gst = build_utc.astimezone(timezone(timedelta(hours=4)))
         
-        # 각 날짜별 윈도우 탐지
-        d0_windows = self.detect_windows(timeseries, 0)
-        d1_windows = self.detect_windows(timeseries, 1)
-        d2_windows = self.detect_windows(timeseries, 2)
+        # 각 날짜별 윈도우 탐지 (전체 기간 1회 파싱)
+        day_windows = self.detect_all_windows(timeseries, 3)
+        d0_windows, d1_windows, d2_windows = day_windows[0], day_windows[1], day_windows[2]
         
         # 헤드라인 생성
         d0_icon, d0_headline = self.generate_day_headline(d0_windows, 0)
@@ -221,7 +194,7 @@ class ThreeDayFormatter:
         analysis = summary_data.get('analysis', {})
         avg_hs = analysis.get('averages', {}).get('wave_height_m', 0)
         avg_wind_ms = analysis.get('averages', {}).get('wind_speed_ms', 0)
-        avg_wind_kt = avg_wind_ms * 1.94384
+        avg_wind_kt = avg_wind_ms * KT_PER_MS
         eri = analysis.get('averages', {}).get('eri', 0)
         
         # 판정 편향
@@ -32,6 +32,12 @@ def _parse_args() -> argparse.Namespace:
         default="marine_ml_history",
         help="SQLite table name to read when a database source is provided",
     )
+    parser.add_argument(
+        "--window-hours",
+        type=int,
+        default=None,
+        help="Only stream the most recent N hours of history into training",
+    )
     parser.add_argument(
         "--output",
         default="cache/ml_forecast",
@@ -53,7 +59,12 @@ def main() -> int:
     artifact_dir.mkdir(parents=True, exist_ok=True)
     sources = [Path(item) for item in args.sources]
 
-    artifacts = train_model(sources, artifact_dir, sqlite_table=args.table)
+    artifacts = train_model(
+        sources,
+        artifact_dir,
+        sqlite_table=args.table,
+        history_window_hours=args.window_hours,
+    )
     metadata = {
         "artifact": str(artifacts.artifact_path),
         "rows_trained": artifacts.metrics.get("rows_trained"),
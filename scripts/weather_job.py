@@ -36,6 +36,8 @@ from src.marine_ops.eri.compute import ERICalculator
 from scripts.offline_support import decide_execution_mode, generate_offline_dataset
 from scripts.three_day_formatter import ThreeDayFormatter
 
+from ncm_web.ncm_api_ingestor import NCMApiIngestor
+
 try:
     from ncm_web.ncm_selenium_ingestor import NCMSeleniumIngestor
 
@@ -238,41 +240,41 @@ def collect_weather_data(location_name: str = "AGI", forecast_hours: int = 24, m
         api_status["OPEN_METEO_FALLBACK"] = status_payload
         resilience_notes.append("Open-Meteo 응답 실패로 모의 데이터를 합성했습니다.")
 
-    # 3. NCM Selenium 데이터 수집
-    if NCMSeleniumIngestor is None:
-        api_status['NCM_SELENIUM'] = {'status': '❌ 모듈 누락', 'confidence': 0.0}
-        if NCM_IMPORT_ERROR is not None:
-            print(f"❌ NCM Selenium 로드 실패: {NCM_IMPORT_ERROR}")
-    else:
-        try:
-            ncm_ingestor = NCMSeleniumIngestor(headless=True)
-            ncm_timeseries = ncm_ingestor.create_marine_timeseries(
-                location=location_name, forecast_hours=forecast_hours
-            )
-            all_timeseries.append(ncm_timeseries)
-            api_status["NCM_SELENIUM"] = {
-                "status": (
-                    "✅ 실제 데이터"
-                    if "fallback" not in ncm_timeseries.source
-                    else "⚠️ 폴백 데이터"
-                ),
-                "confidence": getattr(ncm_timeseries, "confidence", 0.5),
-            }
-            print(f"✅ NCM Selenium: {len(ncm_timeseries.data_points)}개 데이터 포인트")
-        except Exception as e:
-            print(f"❌ NCM Selenium 수집 실패: {e}")
-            api_status["NCM_SELENIUM"] = {"status": "❌ 실패", "confidence": 0.0}
-            mock_ts, status_payload = create_mock_timeseries(
-                "ncm",
-                location_name,
-                forecast_hours,
-                now,
-                "셀레늄 실패",
-                confidence=0.3,
-            )
-            all_timeseries.append(mock_ts)
-            api_status["NCM_SELENIUM_FALLBACK"] = status_payload
-            resilience_notes.append("NCM Selenium 대신 모의 운항 데이터를 주입했습니다.")
+    # 3. NCM 데이터 수집 (JSON/HTML 빠른 경로 → 브라우저 폴백)
+    browser_fallback = None
+    if NCMSeleniumIngestor is not None:
+        browser_fallback = NCMSeleniumIngestor(headless=True).create_marine_timeseries
+    elif NCM_IMPORT_ERROR is not None:
+        print(f"⚠️ NCM Selenium 로드 실패 (브라우저 폴백 없음): {NCM_IMPORT_ERROR}")
+    try:
+        ncm_ingestor = NCMApiIngestor(browser_fallback=browser_fallback)
+        ncm_timeseries = ncm_ingestor.create_marine_timeseries(
+            location=location_name, forecast_hours=forecast_hours
+        )
+        all_timeseries.append(ncm_timeseries)
+        api_status["NCM_SELENIUM"] = {
+            "status": (
+                "✅ 실제 데이터"
+                if "fallback" not in ncm_timeseries.source
+                else "⚠️ 폴백 데이터"
+            ),
+            "confidence": getattr(ncm_timeseries, "confidence", 0.5),
+        }
+        print(f"✅ NCM ({ncm_ingestor.last_path}): {len(ncm_timeseries.data_points)}개 데이터 포인트")
+    except Exception as e:
+        print(f"❌ NCM Selenium 수집 실패: {e}")
+        api_status["NCM_SELENIUM"] = {"status": "❌ 실패", "confidence": 0.0}
+        mock_ts, status_payload = create_mock_timeseries(
+            "ncm",
+            location_name,
+            forecast_hours,
+            now,
+            "셀레늄 실패",
+            confidence=0.3,
+        )
+        all_timeseries.append(mock_ts)
+        api_status["NCM_SELENIUM_FALLBACK"] = status_payload
+        resilience_notes.append("NCM Selenium 대신 모의 운항 데이터를 주입했습니다.")
 
     # 4. WorldTides 데이터 수집 (선택사항)
     if worldtides_key:
@@ -461,6 +463,20 @@ def generate_summary_report(data: dict, analysis: dict, output_dir: str, use_3da
     with open(json_path, "w", encoding="utf-8") as f:
         json.dump(summary_json, f, ensure_ascii=False, indent=2)
 
+    # 헤드라인 인덱스 (다운스트림은 전체 JSON 대신 이 파일만 읽음)
+    index_json = {
+        "headline": {
+            "generated_at": summary_json["metadata"]["generated_at"],
+            "location": data["location"],
+            "execution_mode": execution_mode,
+            "data_collection_rate": collection_rate,
+            "averages": analysis.get("averages", {}),
+        },
+        "summary": json_path.name,
+    }
+    with open(output_path / f"summary_{timestamp}_index.json", "w", encoding="utf-8") as f:
+        json.dump(index_json, f, ensure_ascii=False, separators=(",", ":"))
+
     # CSV 요약
     csv_data = []
     for api_name, status in data["api_status"].items():
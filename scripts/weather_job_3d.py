@@ -13,10 +13,18 @@ import pandas as pd
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.marine_ops.pipeline.compact_outputs import write_compact_outputs
 from src.marine_ops.pipeline.config import PipelineConfig, load_pipeline_config
+from src.marine_ops.pipeline.credits import RequestPlanner
+from src.marine_ops.pipeline.delta import DEFAULT_STATE_DIR, DeltaIngestor
 from src.marine_ops.pipeline.daypart import decide_dayparts, route_window, summarize_dayparts
 from src.marine_ops.pipeline.eri import compute_eri_3d
+from src.marine_ops.pipeline.anomaly import AnomalyModelStore, StreamingAnomalyDetector
+from src.marine_ops.pipeline.archive import DEFAULT_ARCHIVE_PATH, RunArchive
+from src.marine_ops.pipeline.backtest import METRICS_HTML
+from src.marine_ops.pipeline.features import COLUMN_ALIASES
 from src.marine_ops.pipeline.fusion import fuse_timeseries_3d
+from src.marine_ops.pipeline.history import HistoryQuery, load_history
 from src.marine_ops.pipeline.ingest import collect_weather_data_3d
 from src.marine_ops.pipeline.ml_forecast import (
     MODEL_FILENAME,
@@ -28,7 +36,15 @@ from src.marine_ops.pipeline.ml_forecast import (
     train_dynamic_model,
     train_model,
 )
-from src.marine_ops.pipeline.reporting import render_html_3d, write_side_outputs
+from src.marine_ops.pipeline.report_model import build_report_model
+from src.marine_ops.pipeline.reporting import write_report
+from src.marine_ops.pipeline.tides import TideSeries, find_extrema, site_tide_windows
+from src.marine_ops.pipeline.windows import hourly_gate_series
+
+
+ANOMALY_HISTORY_COLUMNS = tuple(
+    column for feature in ("hs_value", "wind_value", "eri_value") for column, _ in COLUMN_ALIASES[feature]
+)
 
 
 def _ensure_location(cfg: PipelineConfig, location_id: str) -> None:
@@ -42,6 +58,17 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument("--out", default="out", help="Output directory")
     parser.add_argument("--mode", choices=["auto", "online", "offline"], default="auto", help="Execution mode hint")
     parser.add_argument("--locations", nargs="*", default=["AGI", "DAS"], help="Location identifiers to process")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Request only new model cycles / newly-entered horizon hours and merge into the cached window",
+    )
+    parser.add_argument(
+        "--no-credit-plan",
+        action="store_true",
+        help="Call Stormglass/WorldTides every run instead of planning within the daily credit ledger",
+    )
+    parser.add_argument("--delta-state", default=str(DEFAULT_STATE_DIR), help="Cache directory for incremental ingestion")
     return parser.parse_args()
 
 
@@ -54,9 +81,25 @@ def main() -> int:
     run_ts = datetime.now(timezone.utc)
     print(f"[72H] Starting run at {run_ts.isoformat()} (mode={args.mode})")
 
-    raw = collect_weather_data_3d(cfg, mode=args.mode)
+    delta = DeltaIngestor(state_dir=Path(args.delta_state)) if args.incremental else None
+    planner = None if args.no_credit_plan else RequestPlanner(site_priority=args.locations)
+    raw = collect_weather_data_3d(cfg, mode=args.mode, delta=delta, planner=planner)
+    if raw.get("delta"):
+        delta_summary = raw["delta"]
+        print(
+            f"[72H][DELTA] requested {delta_summary['requested_hours']}/{delta_summary['full_hours']}h, "
+            f"{delta_summary['skipped_requests']} request(s) skipped, {delta_summary['replaced_rows']} row(s) replaced"
+        )
+    for provider, summary in (raw.get("credits") or {}).items():
+        print(f"[72H][CREDITS] {provider}: {summary}")
     fused = fuse_timeseries_3d(raw["sources"])
-    compute_eri_3d(fused["timeseries"])  # ERI computed for downstream analyses
+    max_workers = getattr(cfg, "ml_max_workers", None)
+    location_timings: dict[str, dict[str, float]] = {"eri": {}}
+    eri_points = compute_eri_3d(
+        fused["timeseries"],
+        max_workers=max_workers,
+        timings=location_timings["eri"],
+    )
 
     long_range: dict[str, pd.DataFrame] = {}
     anomalies: dict[str, list[dict[str, object]]] = {}
@@ -74,6 +117,8 @@ def main() -> int:
                 cache_path=getattr(cfg, "ml_model_cache", None),
                 sqlite_table=getattr(cfg, "ml_sqlite_table", None),
                 force_retrain=bool(getattr(cfg, "ml_force_retrain", False)),
+                history_window_hours=getattr(cfg, "ml_history_window_hours", None),
+                history_cache_dir=getattr(cfg, "ml_history_cache_dir", None),
             )
             horizon_setting = getattr(cfg, "ml_forecast_horizon_hours", None)
             horizon_hours = int(horizon_setting) if horizon_setting else 24 * 7
@@ -82,6 +127,8 @@ def main() -> int:
                 recent_frames=fused["frames"],
                 horizon_hours=horizon_hours,
                 tz=cfg.tz,
+                max_workers=max_workers,
+                timings=location_timings.setdefault("long_range", {}),
             )
             converted_long_range: dict[str, pd.DataFrame] = {}
             for location, df in dynamic_long_range.items():
@@ -153,7 +200,11 @@ def main() -> int:
                 print(f"[72H][ML] Failed to load cached model: {exc}. Retraining...")
         if model is None:
             try:
-                artifacts = train_model(history_sources, model_dir)
+                artifacts = train_model(
+                    history_sources,
+                    model_dir,
+                    history_window_hours=getattr(cfg, "ml_history_window_hours", None),
+                )
                 model = artifacts.model
                 training_metrics = artifacts.metrics
                 artifact_path = artifacts.artifact_path
@@ -169,12 +220,36 @@ def main() -> int:
         anomalies = {}
         if model is not None:
             try:
-                long_range = predict_long_range(model, fused["frames"])
+                long_range = predict_long_range(
+                    model,
+                    fused["frames"],
+                    max_workers=max_workers,
+                    timings=location_timings.setdefault("long_range", {}),
+                )
             except Exception as exc:  # noqa: BLE001
                 print(f"[72H][ML] Long-range prediction failed: {exc}")
                 long_range = {}
             try:
-                anomalies = detect_anomalies(fused["frames"])
+                anomaly_store = AnomalyModelStore(model_dir / "anomaly")
+                streaming_detector = StreamingAnomalyDetector(model_dir / "anomaly_state.json")
+                stale_locations = anomaly_store.stale_locations(list(fused["frames"].keys()))
+                anomaly_history: dict[str, pd.DataFrame] = {}
+                if stale_locations:
+                    history = load_history(
+                        [path for path in history_sources if path.exists()],
+                        HistoryQuery(locations=tuple(stale_locations), columns=ANOMALY_HISTORY_COLUMNS),
+                    )
+                    if not history.empty:
+                        anomaly_history = {str(loc): group for loc, group in history.groupby("location")}
+                anomalies = detect_anomalies(
+                    fused["frames"],
+                    store=anomaly_store,
+                    history=anomaly_history,
+                    streaming=streaming_detector,
+                    max_workers=max_workers,
+                    timings=location_timings.setdefault("anomalies", {}),
+                )
+                streaming_detector.save()
             except Exception as exc:  # noqa: BLE001
                 print(f"[72H][ML] Anomaly detection failed: {exc}")
                 anomalies = {}
@@ -190,6 +265,8 @@ def main() -> int:
                 "artifact": str(artifact_path),
             }
 
+    ml_metadata["location_timings"] = location_timings
+
     decisions = {}
     for loc in args.locations:
         frame = fused["frames"].get(loc, pd.DataFrame())
@@ -198,36 +275,55 @@ def main() -> int:
         point_count = sum(metrics.count for day_metrics in summary.values() for metrics in day_metrics.values())
         print(f"[72H] Processed {loc}: {point_count} hourly points across dayparts")
 
+    try:
+        archive = RunArchive(getattr(cfg, "ml_archive_path", None) or DEFAULT_ARCHIVE_PATH)
+        archived = archive.write_run(run_ts, fused["frames"], eri=eri_points, decisions=decisions)
+        compaction = archive.compact()
+        print(f"[72H] Archived {archived} hourly rows to {archive.path} ({compaction})")
+    except Exception as exc:  # noqa: BLE001
+        print(f"[72H] Archive write failed: {exc}")
+
     agi_decisions = decisions.get("AGI", {})
     das_decisions = decisions.get("DAS", {})
-    windows = route_window(agi_decisions, das_decisions)
-
-    html_path = render_html_3d(
-        run_ts=run_ts,
-        cfg=cfg,
-        agi=agi_decisions,
-        das=das_decisions,
-        route_windows=windows,
-        ncm_alerts=raw.get("ncm_alerts", []),
-        long_range=long_range,
-        anomalies=anomalies,
-        ml_metadata=ml_metadata,
-        out_dir=args.out,
+    hourly_gates = hourly_gate_series(fused["frames"], cfg.gate_thresholds)
+    tides = {
+        loc: TideSeries.from_timeseries(series["worldtides"])
+        for loc, series in raw.get("timeseries", {}).items()
+        if "worldtides" in series and series["worldtides"].source == "worldtides"
+    }
+    for loc, tide in tides.items():
+        events = find_extrema(tide).records(cfg.tz)[:6]
+        if events:
+            listing = ", ".join(f"{event['kind']} {event['time']:%d %H:%M} {event['height_m']:.2f}m" for event in events)
+            print(f"[72H][TIDE] {loc}: {listing}")
+    windows = route_window(
+        agi_decisions,
+        das_decisions,
+        hourly=hourly_gates,
+        tides=site_tide_windows(tides, cfg.gate_thresholds),
+        tz=cfg.tz,
     )
 
-    side_outputs = write_side_outputs(
-        run_ts=run_ts,
-        cfg=cfg,
-        agi=agi_decisions,
-        das=das_decisions,
-        route_windows=windows,
-        ncm_alerts=raw.get("ncm_alerts", []),
+    backtest_fragment = Path("cache/ml_forecast/backtest") / METRICS_HTML
+    backtest_html = backtest_fragment.read_text(encoding="utf-8") if backtest_fragment.exists() else None
+
+    report_model = build_report_model(
+        run_ts,
+        cfg,
+        agi_decisions,
+        das_decisions,
+        windows,
+        raw.get("ncm_alerts", []),
         api_status=raw.get("api_status", {}),
         long_range=long_range,
         anomalies=anomalies,
         ml_metadata=ml_metadata,
-        out_dir=args.out,
+        backtest_html=backtest_html,
     )
+    side_outputs = write_report(report_model, args.out)
+    html_path = side_outputs.pop("html")
+    compact_outputs = write_compact_outputs(report_model, args.out)
+    side_outputs.update({f"compact_{name}": path for name, path in compact_outputs.items()})
 
     print(f"[72H] HTML report: {html_path}")
     for label, path in side_outputs.items():
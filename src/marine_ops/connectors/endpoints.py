@@ -0,0 +1,109 @@
+# KR: 커넥터 기본 URL 재정의 및 응답 녹화
+# EN: Base-URL overrides and response recording shared by all connectors
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+STANDIN_ENV = "MARINE_STANDIN_URL"  # 예: http://127.0.0.1:8765 → 모든 서비스가 스탠드인 서버로
+OVERRIDE_ENV_PREFIX = "MARINE_BASE_URL_"  # 예: MARINE_BASE_URL_STORMGLASS=http://host:port
+RECORD_ENV = "MARINE_RECORD_DIR"  # 설정 시 실제 응답을 카세트로 저장
+
+# 녹화/매칭 시 제외하는 비밀 쿼리 파라미터
+SECRET_PARAMS = frozenset({"key", "apikey", "api_key", "token", "access_token"})
+
+
+def service_root(service: str) -> Optional[str]:
+    """서비스별 재정의 루트 URL (없으면 None)
+
+    ``MARINE_BASE_URL_<SERVICE>`` 가 우선이고, 없으면 ``MARINE_STANDIN_URL/<service>`` 를 사용합니다.
+    """
+    explicit = os.getenv(OVERRIDE_ENV_PREFIX + service.upper())
+    if explicit:
+        return explicit.rstrip("/")
+    standin = os.getenv(STANDIN_ENV)
+    if standin:
+        return f"{standin.rstrip('/')}/{service}"
+    return None
+
+
+def resolve_url(service: str, url: str) -> str:
+    """실제 URL 의 scheme/host 를 재정의 루트로 교체 (경로/쿼리는 유지)"""
+    root = service_root(service)
+    if root is None:
+        return url
+    parts = urlsplit(url)
+    return f"{root}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+def public_query(query: str | Mapping[str, Any]) -> Dict[str, str]:
+    """비밀 파라미터를 제외한 쿼리 dict"""
+    items = parse_qsl(query, keep_blank_values=True) if isinstance(query, str) else query.items()
+    return {str(k): str(v) for k, v in items if str(k).lower() not in SECRET_PARAMS}
+
+
+def cassette_key(method: str, path: str, query: Mapping[str, str]) -> str:
+    canonical = json.dumps([method.upper(), path, sorted(query.items())], ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def save_exchange(
+    cassette_dir: Path,
+    service: str,
+    method: str,
+    path: str,
+    query: str | Mapping[str, Any],
+    status: int,
+    body: str,
+    content_type: str = "application/json",
+) -> Path:
+    """요청/응답 한 건을 ``<cassette_dir>/<service>/<key>.json`` 으로 저장 (경로는 실제 서비스 기준)"""
+    query = public_query(query)
+    record = {
+        "service": service,
+        "method": method.upper(),
+        "path": path,
+        "query": query,
+        "status": int(status),
+        "content_type": content_type,
+        "body": body,
+        "recorded_at": time.time(),
+    }
+    target = Path(cassette_dir) / service / f"{cassette_key(method, path, query)}.json"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(record, ensure_ascii=False), encoding="utf-8")
+    return target
+
+
+def record_response(service: str, response: Any) -> None:
+    """``MARINE_RECORD_DIR`` 가 설정된 경우 requests/httpx 응답을 카세트로 저장"""
+    record_dir = os.getenv(RECORD_ENV)
+    if not record_dir:
+        return
+    request = getattr(response, "request", None)
+    method = getattr(request, "method", None) or "GET"
+    parts = urlsplit(str(response.url))
+    path = parts.path
+    root = service_root(service)
+    root_path = urlsplit(root).path if root else ""
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):] or "/"  # 재정의 루트 아래 경로를 실제 서비스 경로로 환원
+    try:
+        save_exchange(
+            Path(record_dir),
+            service,
+            method,
+            path,
+            parts.query,
+            response.status_code,
+            response.text,
+            response.headers.get("content-type", "application/json"),
+        )
+    except OSError as e:
+        print(f"[RECORD] {service} 응답 저장 실패: {e}")
@@ -5,18 +5,31 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 import requests
 
+from src.marine_ops.connectors.endpoints import record_response, resolve_url
+from src.marine_ops.connectors.payloads import decode_response, open_meteo_frame
 from src.marine_ops.core.schema import MarineDataPoint, MarineTimeseries
-from src.marine_ops.core.units import normalize_to_si
+from src.marine_ops.core.units import normalize_columns, optional_values
 
 MARINE_BASE_URL = "https://marine-api.open-meteo.com/v1/marine"
 FORECAST_BASE_URL = "https://api.open-meteo.com/v1/forecast"
 
+# MarineDataPoint field -> Open-Meteo hourly variable for the legacy helper
+LEGACY_HOURLY_FIELDS = {
+    "wind_speed": "wind_speed_10m",
+    "wind_direction": "wind_direction_10m",
+    "wind_gust": "wind_gusts_10m",
+    "visibility": "visibility",
+}
+# Open-Meteo defaults used when a response omits ``hourly_units``
+LEGACY_DEFAULT_UNITS = {"wind_speed": "km/h", "wind_gust": "km/h", "visibility": "m"}
+
 
 @dataclass(frozen=True)
 class OpenMeteoResult:
@@ -52,37 +65,42 @@ class OpenMeteoConnector:
             "timezone": "Asia/Dubai",
         }
 
-        response = self.session.get(f"{self.base_url}/forecast", params=params, timeout=30)
+        url = resolve_url("open_meteo", f"{self.base_url}/forecast")
+        response = self.session.get(url, params=params, timeout=30)
+        record_response("open_meteo", response)
         response.raise_for_status()
-        data = response.json()
+        data = decode_response(response)
 
-        data_points: List[MarineDataPoint] = []
         hourly = data.get("hourly", {})
         times = hourly.get("time", [])
-
-        for i, time_str in enumerate(times):
-            raw_data = {
-                "wind_speed": hourly.get("wind_speed_10m", [0])[i],
-                "wind_direction": hourly.get("wind_direction_10m", [0])[i],
-                "wind_gust": hourly.get("wind_gusts_10m", [None])[i],
-                "wave_height": 0.0,  # Placeholder: general forecast API lacks wave height
-                "visibility": hourly.get("visibility", [None])[i],
-                "wind_unit": "ms",  # Open-Meteo returns m/s
-            }
-
-            normalized = normalize_to_si(raw_data, "open_meteo")
-
-            data_points.append(
-                MarineDataPoint(
-                    timestamp=time_str,
-                    wind_speed=normalized["wind_speed"],
-                    wind_direction=normalized["wind_direction"],
-                    wind_gust=normalized.get("wind_gust"),
-                    wave_height=normalized["wave_height"],
-                    visibility=normalized.get("visibility"),
-                    confidence=0.75,
-                )
+        hourly_units = data.get("hourly_units", {})
+        # 응답의 hourly_units 기준으로 열 단위 변환 (기본 풍속 단위는 km/h)
+        units = {
+            field: hourly_units.get(name, LEGACY_DEFAULT_UNITS.get(field, ""))
+            for field, name in LEGACY_HOURLY_FIELDS.items()
+        }
+        columns = normalize_columns(
+            {field: hourly.get(name) for field, name in LEGACY_HOURLY_FIELDS.items()},
+            units,
+            length=len(times),
+        )
+        wind_speed = np.nan_to_num(columns["wind_speed"], nan=0.0).tolist()
+        wind_direction = np.nan_to_num(columns["wind_direction"], nan=0.0).tolist()
+        wind_gust = optional_values(columns["wind_gust"])
+        visibility = optional_values(columns["visibility"])
+
+        data_points: List[MarineDataPoint] = [
+            MarineDataPoint(
+                timestamp=time_str,
+                wind_speed=wind_speed[i],
+                wind_direction=wind_direction[i],
+                wind_gust=wind_gust[i],
+                wave_height=0.0,  # Placeholder: general forecast API lacks wave height
+                visibility=visibility[i],
+                confidence=0.75,
             )
+            for i, time_str in enumerate(times)
+        ]
 
         return MarineTimeseries(
             source="open_meteo",
@@ -101,6 +119,7 @@ def _fetch_open_meteo_dataframe(
     hourly_vars: List[str],
     tz: str,
     extra_params: Dict[str, Any] | None = None,
+    window: Tuple[pd.Timestamp, pd.Timestamp] | None = None,
 ) -> OpenMeteoResult:
     if hours <= 0:
         raise ValueError("forecast hours must be positive")
@@ -111,7 +130,12 @@ def _fetch_open_meteo_dataframe(
         "hourly": ",".join(hourly_vars),
         "timezone": tz,
     }
-    if hours <= 168:
+    if window is not None:
+        # Only the requested valid-time range (interpreted in ``tz``), for incremental ingestion.
+        start, end = (pd.Timestamp(stamp).tz_convert(tz) for stamp in window)
+        params["start_hour"] = start.strftime("%Y-%m-%dT%H:%M")
+        params["end_hour"] = end.strftime("%Y-%m-%dT%H:%M")
+    elif hours <= 168:
         params["forecast_hours"] = hours
     else:
         params["forecast_days"] = min(16, int((hours + 23) / 24))
@@ -119,19 +143,19 @@ def _fetch_open_meteo_dataframe(
     if extra_params:
         params.update(extra_params)
 
-    response = requests.get(base_url, params=params, timeout=30)
+    service = "open_meteo_marine" if base_url == MARINE_BASE_URL else "open_meteo"
+    response = requests.get(resolve_url(service, base_url), params=params, timeout=30)
+    record_response(service, response)
     response.raise_for_status()
-    payload = response.json()
+    payload = decode_response(response)
 
     if "hourly" not in payload:
         raise RuntimeError(f"Open-Meteo response missing 'hourly': {payload}")
 
-    hourly = payload["hourly"]
-    times = hourly.get("time", [])
-    if not times:
+    if not payload["hourly"].get("time"):
         raise RuntimeError("Open-Meteo hourly response contains no timestamps")
 
-    df = pd.DataFrame({var: hourly.get(var, []) for var in hourly_vars}, index=pd.to_datetime(times))
+    df = open_meteo_frame(payload, hourly_vars)
     if df.empty:
         raise RuntimeError("Open-Meteo returned empty dataframe")
 
@@ -158,6 +182,7 @@ def fetch_open_meteo_marine(
     hourly: List[str],
     tz: str = "Asia/Dubai",
     cell_selection: str | None = None,
+    window: Tuple[pd.Timestamp, pd.Timestamp] | None = None,
 ) -> OpenMeteoResult:
     extra: Dict[str, Any] = {}
     if cell_selection:
@@ -170,6 +195,7 @@ def fetch_open_meteo_marine(
         hourly_vars=hourly,
         tz=tz,
         extra_params=extra,
+        window=window,
     )
 
 
@@ -179,6 +205,7 @@ def fetch_open_meteo_weather(
     hours: int,
     hourly: List[str],
     tz: str = "Asia/Dubai",
+    window: Tuple[pd.Timestamp, pd.Timestamp] | None = None,
 ) -> OpenMeteoResult:
     extra = {"forecast_model": "ecmwf_ifs04"}
     return _fetch_open_meteo_dataframe(
@@ -189,6 +216,7 @@ def fetch_open_meteo_weather(
         hourly_vars=hourly,
         tz=tz,
         extra_params=extra,
+        window=window,
     )
 
 
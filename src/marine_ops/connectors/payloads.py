@@ -0,0 +1,116 @@
+# KR: Open-Meteo / Stormglass 응답을 NumPy 배열로 바로 디코딩
+# EN: Fast decoding of Open-Meteo and Stormglass payloads straight into NumPy arrays
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:  # orjson 이 있으면 사용 (선택 의존성)
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+_EMPTY: Mapping[str, Any] = {}
+
+
+def loads(raw: bytes | str) -> Any:
+    """JSON 디코딩 (orjson 우선, 없으면 표준 json)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def decode_response(response: Any) -> Any:
+    """requests 응답 본문을 바이트에서 바로 디코딩 (response.json() 의 문자열 디코딩 단계 생략)"""
+    return loads(response.content)
+
+
+def regular_time_index(times: Sequence[Any], step: pd.Timedelta | None = None) -> pd.DatetimeIndex:
+    """시간 문자열 → DatetimeIndex
+
+    전체를 한 번에 벡터 파싱한 뒤 정수 epoch 차분이 모두 같으면 (``step`` 지정 시 그 간격과 같으면)
+    freq 가 붙은 등간격 인덱스로 반환합니다. 중간의 결측/중복 시각도 검출되며, 불규칙하면 파싱 결과를 그대로 씁니다.
+    """
+    index = pd.DatetimeIndex(pd.to_datetime(list(times)))
+    if len(index) < 3:
+        return index
+    diffs = np.diff(index.asi8)
+    spacing = pd.Timedelta(step) if step is not None else pd.Timedelta(int(diffs[0]), unit=index.unit)
+    expected = spacing // pd.Timedelta(1, unit=index.unit)
+    if expected > 0 and np.all(diffs == expected):
+        return pd.date_range(index[0], periods=len(index), freq=spacing, unit=index.unit)
+    return index
+
+
+def hourly_arrays(
+    hourly: Mapping[str, Any],
+    variables: Iterable[str],
+    length: int,
+    dtype: Any = np.float64,
+) -> Dict[str, np.ndarray]:
+    """Open-Meteo hourly 블록 → 변수별 배열 (None 은 NaN, 누락 변수는 NaN 열)"""
+    arrays: Dict[str, np.ndarray] = {}
+    for name in variables:
+        values = hourly.get(name)
+        if values is None:
+            arrays[name] = np.full(length, np.nan, dtype=dtype)
+            continue
+        try:
+            array = np.asarray(values, dtype=dtype)
+        except (TypeError, ValueError):
+            array = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce").to_numpy(dtype=dtype)
+        if len(array) != length:
+            padded = np.full(length, np.nan, dtype=dtype)
+            padded[: min(length, len(array))] = array[:length]
+            array = padded
+        arrays[name] = array
+    return arrays
+
+
+def open_meteo_frame(payload: Mapping[str, Any], variables: Sequence[str], dtype: Any = np.float64) -> pd.DataFrame:
+    """Open-Meteo 응답 → 시간 인덱스 DataFrame (열은 요청 변수 순서)"""
+    hourly = payload.get("hourly", _EMPTY)
+    times = hourly.get("time", [])
+    index = regular_time_index(times)
+    arrays = hourly_arrays(hourly, variables, len(index), dtype=dtype)
+    return pd.DataFrame(arrays, index=index, columns=list(variables), copy=False)
+
+
+def stormglass_columns(
+    hours: Sequence[Mapping[str, Any]],
+    params: Iterable[str],
+    source: str = "noaa",
+    dtype: Any = np.float64,
+) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """Stormglass hours 목록 → (시간 문자열, 파라미터별 배열)
+
+    각 값은 ``{"noaa": x}`` 로 중첩되어 있어 파라미터마다 한 번의 리스트 컴프리헨션으로 꺼냅니다.
+    """
+    times = [hour["time"] for hour in hours]
+    columns: Dict[str, np.ndarray] = {}
+    for param in params:
+        values = [(hour.get(param) or _EMPTY).get(source) for hour in hours]
+        columns[param] = np.asarray(values, dtype=dtype) if values else np.empty(0, dtype=dtype)
+    return times, columns
+
+
+def worldtides_heights(payload: Mapping[str, Any], dtype: Any = np.float64) -> Tuple[np.ndarray, np.ndarray]:
+    """WorldTides heights 목록 → (epoch 초 int64 배열, 높이 m 배열)
+
+    ``dt`` 가 없는 항목은 ``date`` 문자열을 파싱합니다. 높이가 없으면 NaN.
+    """
+    heights = payload.get("heights") or []
+    if not heights:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=dtype)
+    stamps = [item.get("dt") for item in heights]
+    if any(stamp is None for stamp in stamps):
+        parsed = pd.to_datetime([item.get("date") for item in heights], utc=True, format="ISO8601")
+        epoch_s = parsed.as_unit("s").asi8.astype(np.int64)
+    else:
+        epoch_s = np.asarray(stamps, dtype=np.int64)
+    values = [item.get("height") for item in heights]
+    return epoch_s, np.asarray([np.nan if value is None else value for value in values], dtype=dtype)
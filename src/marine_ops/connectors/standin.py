@@ -0,0 +1,267 @@
+# KR: 녹화된 응답을 재생하는 로컬 스탠드인 HTTP 서버
+# EN: Local stand-in HTTP server replaying recorded connector responses
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.marine_ops.connectors.endpoints import (
+    RECORD_ENV,
+    STANDIN_ENV,
+    cassette_key,
+    public_query,
+    save_exchange,
+)
+
+DEFAULT_CASSETTE_DIR = Path("cache/cassettes")
+NCM_ENDPOINT_INDEX = "_endpoints.jsonl"
+
+
+@dataclass
+class Cassette:
+    """서비스별 녹화 응답 모음 (정확 매칭 → 같은 경로 중 쿼리가 가장 비슷한 응답 순서)"""
+
+    exact: Dict[Tuple[str, str], Dict[str, Any]] = field(default_factory=dict)
+    by_path: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, cassette_dir: Path) -> "Cassette":
+        cassette = cls()
+        for path in sorted(Path(cassette_dir).glob("*/*.json")):
+            try:
+                record = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            cassette.add(record)
+        return cassette
+
+    def add(self, record: Dict[str, Any]) -> None:
+        service, method, path = record["service"], record.get("method", "GET"), record["path"]
+        self.exact[(service, cassette_key(method, path, record.get("query", {})))] = record
+        self.by_path.setdefault((service, method, path), []).append(record)
+
+    def __len__(self) -> int:
+        return len(self.exact)
+
+    def match(self, service: str, method: str, path: str, query: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        record = self.exact.get((service, cassette_key(method, path, query)))
+        if record is not None:
+            return record
+        candidates = self.by_path.get((service, method.upper(), path))
+        if not candidates:
+            return None
+        # 날짜 등 시간 의존 쿼리가 달라도 같은 경로라면 가장 많이 겹치는 응답 사용
+        return max(candidates, key=lambda item: len(set(item.get("query", {}).items()) & set(query.items())))
+
+
+class TokenBucket:
+    """초당 요청 한도 (rate_limit <= 0 이면 무제한)"""
+
+    def __init__(self, rate_per_s: float, burst: Optional[float] = None):
+        self.rate = float(rate_per_s)
+        self.capacity = float(burst if burst is not None else max(1.0, rate_per_s))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            return False
+
+
+class StandInServer:
+    """녹화된 응답을 지연/지터/오류율/속도 제한과 함께 재생
+
+    경로 ``/<service>/<실제 경로>`` 로 요청을 받습니다. 커넥터는 ``MARINE_STANDIN_URL`` 로 이 서버를 가리킵니다.
+    ``/__stats`` 는 요청/오류/제한 횟수를 JSON 으로 반환합니다.
+    """
+
+    def __init__(
+        self,
+        cassette_dir: Path = DEFAULT_CASSETTE_DIR,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.cassette = Cassette.load(cassette_dir)
+        self.latency_s = latency_ms / 1000.0
+        self.jitter_s = jitter_ms / 1000.0
+        self.error_rate = error_rate
+        self.bucket = TokenBucket(rate_limit)
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"requests": 0, "served": 0, "errors": 0, "throttled": 0, "missing": 0}
+        self._stats_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _draw(self) -> Tuple[float, float]:
+        with self._random_lock:
+            return self._random.random(), self._random.uniform(-self.jitter_s, self.jitter_s)
+
+    def respond(self, method: str, raw_path: str) -> Tuple[int, str, bytes, Dict[str, str]]:
+        """(상태 코드, content-type, 본문, 추가 헤더)"""
+        parts = urlsplit(raw_path)
+        if parts.path == "/__stats":
+            with self._stats_lock:
+                return 200, "application/json", json.dumps(self.stats).encode("utf-8"), {}
+        self._count("requests")
+        if not self.bucket.take():
+            self._count("throttled")
+            return 429, "application/json", b'{"error": "rate limited"}', {"Retry-After": "1"}
+        roll, jitter = self._draw()
+        delay = max(0.0, self.latency_s + jitter)
+        if delay:
+            time.sleep(delay)
+        if roll < self.error_rate:
+            self._count("errors")
+            return 503, "application/json", b'{"error": "injected failure"}', {}
+
+        service, _, upstream = parts.path.lstrip("/").partition("/")
+        record = self.cassette.match(service, method, "/" + upstream, public_query(parts.query))
+        if record is None:
+            self._count("missing")
+            return 404, "application/json", json.dumps({"error": f"no cassette for {parts.path}"}).encode("utf-8"), {}
+        self._count("served")
+        body = record.get("body", "")
+        payload = body.encode("utf-8") if isinstance(body, str) else json.dumps(body).encode("utf-8")
+        return int(record.get("status", 200)), record.get("content_type", "application/json"), payload, {}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                self._reply("GET")
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                self._reply("POST")
+
+            def _reply(self, method: str) -> None:
+                status, content_type, payload, headers = server.respond(method, self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:  # 요청 로그는 stats 로 대체
+                return
+
+        return Handler
+
+    def start(self) -> "StandInServer":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="standin", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def import_ncm_dumps(raw_dir: Path = Path("raw"), cassette_dir: Path = DEFAULT_CASSETTE_DIR) -> int:
+    """playwright 가 저장한 NCM XHR 응답(raw/ + URL 색인)을 카세트로 변환"""
+    index_path = Path(raw_dir) / NCM_ENDPOINT_INDEX
+    if not index_path.exists():
+        return 0
+    count = 0
+    for line in index_path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        source = Path(raw_dir) / entry["file"]
+        if not source.exists():
+            continue
+        parts = urlsplit(entry["url"])
+        save_exchange(cassette_dir, "ncm", "GET", parts.path, parts.query, 200, source.read_text(encoding="utf-8"))
+        count += 1
+    return count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded marine API responses on a local server")
+    parser.add_argument("--cassettes", default=str(DEFAULT_CASSETTE_DIR), help="Cassette directory")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform latency jitter (+/-)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second before 429 (0 = off)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--import-ncm", metavar="RAW_DIR", help="Convert saved NCM XHR dumps into cassettes first")
+    args = parser.parse_args()
+
+    if args.import_ncm:
+        print(f"NCM 응답 {import_ncm_dumps(Path(args.import_ncm), Path(args.cassettes))}건 변환")
+    server = StandInServer(
+        Path(args.cassettes),
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        seed=args.seed,
+    )
+    print(f"카세트 {len(server.cassette)}건 로드, 재생 서버: {server.url}")
+    print(f"커넥터 연결: export {STANDIN_ENV}={server.url}  (녹화: {RECORD_ENV}=<dir>)")
+    try:
+        server.start()
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
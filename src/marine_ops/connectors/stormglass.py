@@ -3,12 +3,26 @@
 
 import requests
 import os
+import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from zoneinfo import ZoneInfo
 
+from src.marine_ops.connectors.endpoints import record_response, resolve_url
+from src.marine_ops.connectors.payloads import decode_response, stormglass_columns
 from src.marine_ops.core.schema import MarineTimeseries, MarineDataPoint
-from src.marine_ops.core.units import normalize_to_si
+from src.marine_ops.core.units import normalize_columns, optional_values
+
+# MarineDataPoint 필드 → Stormglass 파라미터
+STORMGLASS_FIELDS = {
+    'wind_speed': 'windSpeed',
+    'wind_direction': 'windDirection',
+    'wave_height': 'waveHeight',
+    'wave_period': 'wavePeriod',
+    'visibility': 'visibility',
+}
+# Stormglass NOAA 소스 단위 (풍속 m/s, 파고 m, 가시거리 km)
+STORMGLASS_UNITS = {'wind_speed': 'm/s', 'wave_height': 'm', 'visibility': 'km'}
 
 class StormglassConnector:
     """Stormglass API 커넥터"""
@@ -39,35 +53,37 @@ class StormglassConnector:
         }
         
         try:
-            response = self.session.get(f"{self.base_url}/weather/point", params=params)
+            url = resolve_url('stormglass', f"{self.base_url}/weather/point")
+            response = self.session.get(url, params=params)
+            record_response('stormglass', response)
             response.raise_for_status()
-            data = response.json()
+            data = decode_response(response)
             
-            data_points = []
-            for hour_data in data.get('hours', []):
-                raw_data = {
-                    'wind_speed': hour_data.get('windSpeed', {}).get('noaa', 0),
-                    'wind_direction': hour_data.get('windDirection', {}).get('noaa', 0),
-                    'wave_height': hour_data.get('waveHeight', {}).get('noaa', 0),
-                    'wave_period': hour_data.get('wavePeriod', {}).get('noaa'),
-                    'visibility': hour_data.get('visibility', {}).get('noaa'),
-                    'wind_unit': 'ms',  # Stormglass NOAA source returns m/s
-                    'wave_unit': 'm'    # Stormglass returns meters
-                }
-                
-                # SI 단위로 정규화
-                normalized = normalize_to_si(raw_data, 'stormglass')
-                
-                data_point = MarineDataPoint(
-                    timestamp=hour_data['time'],
-                    wind_speed=normalized['wind_speed'],
-                    wind_direction=normalized['wind_direction'],
-                    wave_height=normalized['wave_height'],
-                    wave_period=normalized.get('wave_period'),
-                    visibility=normalized.get('visibility'),
+            # 시간별 dict 목록을 열로 한 번 모은 뒤 열 단위로 변환
+            times, raw_columns = stormglass_columns(data.get('hours', []), STORMGLASS_FIELDS.values())
+            columns = normalize_columns(
+                {field: raw_columns[name] for field, name in STORMGLASS_FIELDS.items()},
+                STORMGLASS_UNITS,
+                length=len(times),
+            )
+            wind_speed = np.nan_to_num(columns['wind_speed'], nan=0.0).tolist()
+            wind_direction = np.nan_to_num(columns['wind_direction'], nan=0.0).tolist()
+            wave_height = np.nan_to_num(columns['wave_height'], nan=0.0).tolist()
+            wave_period = optional_values(columns['wave_period'])
+            visibility = optional_values(columns['visibility'])
+
+            data_points = [
+                MarineDataPoint(
+                    timestamp=timestamp,
+                    wind_speed=wind_speed[i],
+                    wind_direction=wind_direction[i],
+                    wave_height=wave_height[i],
+                    wave_period=wave_period[i],
+                    visibility=visibility[i],
                     confidence=0.85  # Stormglass NOAA 데이터 신뢰도
                 )
-                data_points.append(data_point)
+                for i, timestamp in enumerate(times)
+            ]
             
             return MarineTimeseries(
                 source="stormglass",
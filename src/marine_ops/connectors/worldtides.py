@@ -1,7 +1,10 @@
 # src/marine_ops/connectors/worldtides.py
+import math
 import httpx
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional
+from datetime import datetime, timedelta, timezone
 import sys
 from pathlib import Path
 
@@ -9,15 +12,22 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.marine_ops.connectors.endpoints import record_response, resolve_url
+from src.marine_ops.connectors.payloads import worldtides_heights
 from src.marine_ops.core.schema import MarineTimeseries, MarineDataPoint
 from src.marine_ops.core.units import normalize_to_si
 
 WT = "https://www.worldtides.info/api/v3"
 
-def fetch_worldtides_heights(lat: float, lon: float, key: str, hours: int = 72) -> Dict[str, Any]:
+def fetch_worldtides_heights(
+    lat: float, lon: float, key: str, hours: int = 72, start: Optional[datetime] = None
+) -> Dict[str, Any]:
     """Return tide heights (30-min resolution where available)."""
     params = {"heights": "", "lat": lat, "lon": lon, "key": key, "duration": hours}
-    r = httpx.get(WT, params=params, timeout=20)
+    if start is not None:
+        params["start"] = int(start.timestamp())  # 증분 수집: 새로 들어온 구간만 요청
+    r = httpx.get(resolve_url("worldtides", WT), params=params, timeout=20)
+    record_response("worldtides", r)
     
     # API 응답 상태 확인
     if r.status_code == 400:
@@ -37,44 +47,41 @@ def create_marine_timeseries_from_worldtides(
     lon: float, 
     api_key: str, 
     location: str = "AGI",
-    forecast_hours: int = 72
+    forecast_hours: int = 72,
+    start: Optional[datetime] = None,
+    fallback: bool = True
 ) -> MarineTimeseries:
-    """WorldTides API에서 해양 시계열 데이터 생성"""
+    """WorldTides API에서 해양 시계열 데이터 생성 (start 지정 시 해당 시각부터 forecast_hours 구간)
+
+    fallback=False 이면 실패 시 합성 데이터 대신 예외를 그대로 올림 (크레딧 계획기가 캐시로 대체)
+    """
     
     try:
         print(f"[WorldTides] 조석 데이터 수집 중: lat={lat}, lon={lon}")
         
         # WorldTides API 호출
-        data = fetch_worldtides_heights(lat, lon, api_key, forecast_hours)
-        
-        data_points = []
+        data = fetch_worldtides_heights(lat, lon, api_key, forecast_hours, start=start)
         
-        # 조석 높이 데이터 처리
-        if 'heights' in data:
-            for height_data in data['heights']:
-                timestamp = height_data['dt']
-                tide_height = height_data['height']  # 미터 단위
-                
-                # ISO8601 형식으로 변환
-                if isinstance(timestamp, (int, float)):
-                    dt = datetime.fromtimestamp(timestamp)
-                    timestamp = dt.isoformat()
-                
-                # MarineDataPoint 생성 (조석 높이만)
-                data_point = MarineDataPoint(
-                    timestamp=timestamp,
-                    wind_speed=0.0,  # WorldTides는 조석 데이터만 제공
-                    wind_direction=0.0,
-                    wave_height=0.0,
-                    sea_state="Unknown",  # 조석 데이터로는 파도 상태 추정 불가
-                    confidence=0.8  # WorldTides 조석 데이터 신뢰도
-                )
-                data_points.append(data_point)
+        # 조석 높이 처리: 30분 간격 높이를 배열로 디코딩해 sea_level 에 저장 (UTC 기준)
+        epoch_s, heights = worldtides_heights(data)
+        stamps = pd.to_datetime(epoch_s, unit="s", utc=True).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+        data_points = [
+            MarineDataPoint(
+                timestamp=stamp,
+                wind_speed=0.0,  # WorldTides는 조석 데이터만 제공
+                wind_direction=0.0,
+                wave_height=0.0,
+                sea_state="Unknown",  # 조석 데이터로는 파도 상태 추정 불가
+                sea_level=float(height),  # 미터 단위
+                confidence=0.8  # WorldTides 조석 데이터 신뢰도
+            )
+            for stamp, height in zip(stamps, heights)
+            if not np.isnan(height)
+        ]
         
-        # 조석 데이터가 없는 경우 기본 구조 반환
+        # 유효한 높이가 없으면 실패로 처리 (아래에서 폴백 시계열 반환 또는 예외 전파)
         if not data_points:
-            print("[WorldTides] 조석 데이터 없음, 폴백 데이터 생성")
-            data_points = _create_fallback_tide_data(location, forecast_hours)
+            raise ValueError("WorldTides 응답에 유효한 조석 높이 없음")
         
         return MarineTimeseries(
             source="worldtides",
@@ -86,21 +93,22 @@ def create_marine_timeseries_from_worldtides(
         
     except Exception as e:
         print(f"WorldTides 데이터 수집 실패: {e}")
+        if not fallback:
+            raise
         # 실패 시 기본 데이터 반환
         return _create_fallback_tide_data(location, forecast_hours)
 
 def _create_fallback_tide_data(location: str, forecast_hours: int) -> MarineTimeseries:
     """폴백 조석 데이터 생성"""
     data_points = []
-    now = datetime.now()
+    now = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
     
-    # 간단한 조석 시뮬레이션 (12.4시간 주기)
+    # 간단한 조석 시뮬레이션 (12.42시간 M2 반일주조)
     for i in range(min(forecast_hours, 72)):
         timestamp = (now + timedelta(hours=i)).isoformat()
         
         # 조석 높이 시뮬레이션 (0.5m ~ 2.5m)
-        tide_cycle = (i / 12.4) * 2 * 3.14159  # 12.4시간 주기
-        tide_height = 1.5 + 1.0 * (tide_cycle % (2 * 3.14159))
+        tide_height = 1.5 + 1.0 * math.sin(2 * math.pi * i / 12.42)
         
         data_point = MarineDataPoint(
             timestamp=timestamp,
@@ -108,6 +116,7 @@ def _create_fallback_tide_data(location: str, forecast_hours: int) -> MarineTime
             wind_direction=0.0,
             wave_height=0.0,
             sea_state="Unknown",
+            sea_level=round(tide_height, 3),
             confidence=0.3  # 폴백 데이터 신뢰도
         )
         data_points.append(data_point)
@@ -143,6 +152,7 @@ def save_worldtides_forecast(location: str, timeseries: MarineTimeseries) -> Non
                     'wind_speed': dp.wind_speed,
                     'wind_direction': dp.wind_direction,
                     'wave_height': dp.wave_height,
+                    'sea_level': dp.sea_level,
                     'sea_state': dp.sea_state
                 }
                 for dp in timeseries.data_points
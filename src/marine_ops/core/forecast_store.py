@@ -0,0 +1,315 @@
+# KR: 발표 시각별 예보 실행 저장소 (리드타임 인덱스)
+# EN: Run-versioned forecast store indexed by lead time
+
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .connection import ConnectionManager
+from .schema import MarineTimeseries
+
+FORECAST_TABLE = "forecast_values"
+SERIES_TABLE = "forecast_series"
+# 변수 -> 정수 인코딩 배율 (값 * scale 을 반올림해 INTEGER 로 저장, 1~2바이트 정수로 압축됨)
+VALUE_SCALES: Dict[str, int] = {
+    "wind_speed": 10,
+    "wind_direction": 1,
+    "wave_height": 100,
+    "wind_gust": 10,
+    "wave_period": 10,
+    "wave_direction": 1,
+    "visibility": 10,
+    "fog_probability": 1000,
+    "temperature": 10,
+    "humidity": 1000,
+    "swell_wave_height": 100,
+    "swell_wave_period": 10,
+    "swell_wave_direction": 1,
+    "wind_wave_height": 100,
+    "wind_wave_period": 10,
+    "wind_wave_direction": 1,
+    "ocean_current_speed": 100,
+    "ocean_current_direction": 1,
+    "sea_surface_temperature": 10,
+    "sea_level": 1000,
+    "confidence": 1000,
+}
+VALUE_FIELDS: Tuple[str, ...] = tuple(VALUE_SCALES)
+INT16_MAX = np.iinfo(np.int16).max
+
+
+def _epoch_hours(values) -> np.ndarray:
+    """시각(들)을 UTC epoch 시(hour) 정수로 변환 (naive 는 UTC, 시 단위 내림)"""
+    parsed = pd.to_datetime(pd.Series(np.atleast_1d(values), dtype=object), utc=True, errors="coerce", format="ISO8601")
+    hours = (parsed - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(hours=1)
+    return hours.fillna(-1).astype("int64").to_numpy()
+
+
+def _hours_to_timestamps(hours: np.ndarray) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(np.asarray(hours, dtype="int64").astype("datetime64[h]")).tz_localize("UTC")
+
+
+class ForecastStore:
+    """예보 실행 버전 저장소
+
+    (issue_time, valid_time, location, source) 마다 한 행을 저장한다. 시각은 epoch 시 정수, 변수는
+    ``VALUE_SCALES`` 배율의 정수로 인코딩하고 (location, source) 는 ``forecast_series`` 의 정수 ID 로
+    치환해 1년치 3시간 간격 실행도 노트북에 보관할 수 있게 한다. 기본키 (series_id, valid_h, issue_h)
+    로 "발표 시각별 최신" 조회가, valid_h 인덱스로 "T 시점 유효 예보 전체" 조회가 인덱스 스캔이 된다.
+    """
+
+    def __init__(self, db_path: str = "marine_vec.db", connections: Optional[ConnectionManager] = None):
+        self.db_path = Path(db_path)
+        # 같은 DB 를 쓰는 MarineVectorDB 와 연결 관리자를 공유
+        self.connections = connections or ConnectionManager(self.db_path)
+        self._series_cache: Dict[Tuple[str, str], int] = {}
+        self._create_tables()
+
+    def _connect(self) -> sqlite3.Connection:
+        return self.connections.connection()
+
+    def _create_tables(self):
+        """테이블 생성"""
+        value_columns = ",\n".join(f"                    {name} INTEGER" for name in VALUE_FIELDS)
+        with self._connect() as conn:
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {SERIES_TABLE} (
+                    series_id INTEGER PRIMARY KEY,
+                    location TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    UNIQUE(location, source)
+                )
+            """)
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {FORECAST_TABLE} (
+                    series_id INTEGER NOT NULL,
+                    valid_h INTEGER NOT NULL,
+                    issue_h INTEGER NOT NULL,
+                    lead_h INTEGER NOT NULL,
+{value_columns},
+                    PRIMARY KEY (series_id, valid_h, issue_h)
+                ) WITHOUT ROWID
+            """)
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{FORECAST_TABLE}_valid ON {FORECAST_TABLE}(valid_h)")
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{FORECAST_TABLE}_issue ON {FORECAST_TABLE}(issue_h)")
+            # 리드타임 필터 (f.lead_h <= ?) 와 리드별 검증 집계용, 시계열 조인 후 valid_h 범위까지 커버
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{FORECAST_TABLE}_series_lead ON {FORECAST_TABLE}(series_id, lead_h, valid_h)"
+            )
+            conn.commit()
+
+    def _series_id(self, conn: sqlite3.Connection, location: str, source: str) -> int:
+        key = (location, source)
+        if key not in self._series_cache:
+            conn.execute(
+                f"INSERT INTO {SERIES_TABLE} (location, source) VALUES (?, ?) ON CONFLICT(location, source) DO NOTHING",
+                key,
+            )
+            row = conn.execute(
+                f"SELECT series_id FROM {SERIES_TABLE} WHERE location = ? AND source = ?", key
+            ).fetchone()
+            self._series_cache[key] = int(row[0])
+        return self._series_cache[key]
+
+    def write_timeseries(
+        self,
+        timeseries: MarineTimeseries,
+        issue_time=None,
+        conn: Optional[sqlite3.Connection] = None,
+    ) -> int:
+        """시계열 한 건을 발표 시각 기준으로 upsert (기본 발표 시각: ingested_at)"""
+        points = timeseries.data_points
+        if not points:
+            return 0
+        issue_h = int(_epoch_hours(issue_time or timeseries.ingested_at)[0])
+        if issue_h < 0:
+            raise ValueError(f"Invalid issue time for {timeseries.source}/{timeseries.location}")
+        valid_h = _epoch_hours([point.timestamp for point in points])
+        encoded = np.full((len(points), len(VALUE_FIELDS)), np.nan)
+        for column, name in enumerate(VALUE_FIELDS):
+            encoded[:, column] = [
+                getattr(point, name) if isinstance(getattr(point, name), (int, float)) else np.nan for point in points
+            ]
+        scales = np.array([VALUE_SCALES[name] for name in VALUE_FIELDS], dtype=float)
+        scaled = np.rint(encoded * scales)
+        keep = valid_h >= 0
+        lead = np.clip(valid_h - issue_h, -INT16_MAX, INT16_MAX)
+
+        def _store(target: sqlite3.Connection) -> int:
+            series_id = self._series_id(target, timeseries.location, timeseries.source)
+            rows = [
+                (series_id, int(v), issue_h, int(l), *(None if np.isnan(x) else int(x) for x in values))
+                for v, l, values, ok in zip(valid_h, lead, scaled, keep)
+                if ok
+            ]
+            columns = ("series_id", "valid_h", "issue_h", "lead_h", *VALUE_FIELDS)
+            updates = ", ".join(f"{name} = excluded.{name}" for name in columns[3:])
+            target.executemany(
+                f"INSERT INTO {FORECAST_TABLE} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+                f"ON CONFLICT(series_id, valid_h, issue_h) DO UPDATE SET {updates}",
+                rows,
+            )
+            return len(rows)
+
+        if conn is not None:
+            return _store(conn)
+        with self._connect() as own:
+            stored = _store(own)
+            own.commit()
+        return stored
+
+    def _fetch(self, where: str, params: list, variables: Optional[Iterable[str]], group_latest: bool = False) -> pd.DataFrame:
+        selected = list(variables) if variables is not None else list(VALUE_FIELDS)
+        unknown = [name for name in selected if name not in VALUE_SCALES]
+        if unknown:
+            raise ValueError(f"Unknown forecast variables: {unknown}")
+        value_sql = "".join(f", f.{name}" for name in selected)
+        if group_latest:
+            # SQLite 의 bare-column MAX() 규칙: 같은 그룹의 나머지 열은 최신 issue_h 행에서 온다
+            sql = (
+                f"SELECT s.location, s.source, f.valid_h, MAX(f.issue_h) AS issue_h, f.lead_h{value_sql} "
+                f"FROM {FORECAST_TABLE} f JOIN {SERIES_TABLE} s USING (series_id){where} "
+                f"GROUP BY f.series_id, f.valid_h ORDER BY s.location, s.source, f.valid_h"
+            )
+        else:
+            sql = (
+                f"SELECT s.location, s.source, f.valid_h, f.issue_h, f.lead_h{value_sql} "
+                f"FROM {FORECAST_TABLE} f JOIN {SERIES_TABLE} s USING (series_id){where} "
+                f"ORDER BY s.location, s.source, f.valid_h, f.issue_h"
+            )
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        frame = pd.DataFrame(
+            {
+                "location": [row[0] for row in rows],
+                "source": [row[1] for row in rows],
+                "valid_time": _hours_to_timestamps([row[2] for row in rows]),
+                "issue_time": _hours_to_timestamps([row[3] for row in rows]),
+                "lead_hours": np.array([row[4] for row in rows], dtype=np.int16),
+            }
+        )
+        if selected:
+            raw = np.array([row[5:] for row in rows], dtype=float).reshape(len(rows), len(selected))
+            scales = np.array([VALUE_SCALES[name] for name in selected], dtype=float)
+            decoded = (raw / scales).astype(np.float32)
+            for column, name in enumerate(selected):
+                frame[name] = decoded[:, column]
+        return frame
+
+    @staticmethod
+    def _filters(
+        location: Optional[str] = None,
+        source: Optional[str] = None,
+        start=None,
+        end=None,
+        max_lead: Optional[int] = None,
+    ) -> Tuple[str, list]:
+        clauses: List[str] = []
+        params: list = []
+        if location:
+            clauses.append("s.location = ?")
+            params.append(location)
+        if source:
+            clauses.append("s.source = ?")
+            params.append(source)
+        if start is not None:
+            clauses.append("f.valid_h >= ?")
+            params.append(int(_epoch_hours(start)[0]))
+        if end is not None:
+            clauses.append("f.valid_h < ?")
+            params.append(int(_epoch_hours(end)[0]))
+        if max_lead is not None:
+            clauses.append("f.lead_h <= ?")
+            params.append(int(max_lead))
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def valid_at(self, valid_time, location: Optional[str] = None, variables: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """T 시점에 유효한 모든 발표 예보"""
+        hour = int(_epoch_hours(valid_time)[0])
+        where, params = self._filters(location=location)
+        where = (where + " AND " if where else " WHERE ") + "f.valid_h = ?"
+        return self._fetch(where, params + [hour], variables)
+
+    def latest_issue(
+        self,
+        location: Optional[str] = None,
+        source: Optional[str] = None,
+        start=None,
+        end=None,
+        variables: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
+        """유효 시각별 가장 최근 발표 예보"""
+        where, params = self._filters(location, source, start, end)
+        return self._fetch(where, params, variables, group_latest=True)
+
+    def forecasts(
+        self,
+        location: Optional[str] = None,
+        source: Optional[str] = None,
+        start=None,
+        end=None,
+        max_lead: Optional[int] = None,
+        variables: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
+        """기간 내 모든 발표/유효 조합"""
+        where, params = self._filters(location, source, start, end, max_lead)
+        return self._fetch(where, params, variables)
+
+    def error_by_lead(
+        self,
+        observed: pd.DataFrame,
+        variable: str = "wave_height",
+        observed_column: Optional[str] = None,
+        location: Optional[str] = None,
+        source: Optional[str] = None,
+        max_lead: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """관측 대비 리드타임별 오차 (bias/MAE/RMSE)
+
+        ``observed`` 는 ``location``, ``timestamp`` 열과 변수 열을 가진 프레임 (예: ObservationStore.scan
+        또는 RunArchive.latest 결과).
+        """
+        observed_column = observed_column or variable
+        if observed.empty:
+            return pd.DataFrame(columns=["source", "lead_hours", "bias", "mae", "rmse", "n"])
+        times = pd.to_datetime(observed["timestamp"], utc=True)
+        truth = pd.DataFrame(
+            {
+                "location": observed["location"].astype(str).to_numpy(),
+                "valid_time": times.dt.floor("h").to_numpy(),
+                "observed": pd.to_numeric(observed[observed_column], errors="coerce").to_numpy(dtype=float),
+            }
+        ).dropna()
+        truth = truth.groupby(["location", "valid_time"], as_index=False)["observed"].mean()
+        forecasts = self.forecasts(
+            location=location,
+            source=source,
+            start=times.min(),
+            end=times.max() + pd.Timedelta(hours=1),
+            max_lead=max_lead,
+            variables=[variable],
+        )
+        forecasts["valid_time"] = forecasts["valid_time"].dt.tz_convert("UTC")
+        truth["valid_time"] = pd.to_datetime(truth["valid_time"], utc=True)
+        paired = forecasts.merge(truth, on=["location", "valid_time"], how="inner").dropna(subset=[variable])
+        error = paired[variable].astype(float) - paired["observed"]
+        return (
+            paired.assign(err=error, abs_err=error.abs(), sq_err=error**2)
+            .groupby(["source", "lead_hours"])
+            .agg(bias=("err", "mean"), mae=("abs_err", "mean"), rmse=("sq_err", "mean"), n=("err", "size"))
+            .assign(rmse=lambda table: np.sqrt(table["rmse"]))
+            .reset_index()
+        )
+
+    def prune(self, older_than_days: int = 400, now: Optional[datetime] = None) -> int:
+        """보존 기간을 넘긴 발표 실행 삭제"""
+        reference = now or datetime.now(timezone.utc)
+        cutoff = int(_epoch_hours(pd.Timestamp(reference) - pd.Timedelta(days=older_than_days))[0])
+        with self._connect() as conn:
+            removed = conn.execute(f"DELETE FROM {FORECAST_TABLE} WHERE issue_h < ?", (cutoff,)).rowcount
+            conn.commit()
+        return int(removed)
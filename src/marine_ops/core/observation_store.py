@@ -0,0 +1,254 @@
+# KR: 해양 관측 시계열의 열 기반 저장소
+# EN: Typed columnar store for marine observations
+
+import json
+import sqlite3
+from dataclasses import fields
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .connection import ConnectionManager
+from .schema import MarineDataPoint, MarineTimeseries
+
+OBS_TABLE = "marine_obs"
+# MarineDataPoint 숫자 필드 -> REAL 열 (timestamp, sea_state 제외)
+NUMERIC_FIELDS: Tuple[str, ...] = tuple(
+    f.name for f in fields(MarineDataPoint) if f.name not in ("timestamp", "sea_state")
+)
+TEXT_FIELDS: Tuple[str, ...] = ("sea_state",)
+# scan 으로 읽을 수 있는 텍스트 열 (적재 시각 포함)
+TEXT_COLUMNS: Tuple[str, ...] = (*TEXT_FIELDS, "ingested_at")
+
+
+def _to_epoch_seconds(values: Sequence[str]) -> np.ndarray:
+    """ISO8601 문자열을 UTC epoch 초로 변환 (naive 값은 UTC로 간주)"""
+    parsed = pd.to_datetime(pd.Series(list(values), dtype=object), utc=True, errors="coerce", format="ISO8601")
+    seconds = (parsed - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+    return seconds.fillna(-1).astype("int64").to_numpy()
+
+
+def _epoch(value) -> Optional[int]:
+    if value is None:
+        return None
+    stamp = pd.Timestamp(value)
+    stamp = stamp.tz_localize("UTC") if stamp.tzinfo is None else stamp.tz_convert("UTC")
+    return int((stamp - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1))
+
+
+def _as_float(value) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ObservationStore:
+    """해양 관측 열 저장소
+
+    ``MarineDataPoint`` 숫자 필드마다 REAL 열을 두고 (location, ts, source) 복합 키로 저장한다.
+    ts 는 UTC epoch 초(INTEGER)이므로 범위 조회가 인덱스 범위 스캔이 되고, 결과는 JSON 파싱 없이
+    NumPy 배열/판다스 열로 바로 반환된다.
+    """
+
+    def __init__(self, db_path: str = "marine_vec.db", connections: Optional[ConnectionManager] = None):
+        self.db_path = Path(db_path)
+        # 같은 DB 를 쓰는 MarineVectorDB 와 연결 관리자를 공유
+        self.connections = connections or ConnectionManager(self.db_path)
+        self._create_tables()
+
+    def _connect(self) -> sqlite3.Connection:
+        return self.connections.connection()
+
+    def _create_tables(self):
+        """테이블 생성"""
+        numeric_columns = ",\n".join(f"    {name} REAL" for name in NUMERIC_FIELDS)
+        with self._connect() as conn:
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {OBS_TABLE} (
+                    location TEXT NOT NULL,
+                    ts INTEGER NOT NULL,
+                    source TEXT NOT NULL,
+                {numeric_columns},
+                    sea_state TEXT,
+                    ingested_at TEXT,
+                    PRIMARY KEY (location, ts, source)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{OBS_TABLE}_ts ON {OBS_TABLE}(ts)")
+            conn.commit()
+
+    def _rows(self, timeseries: MarineTimeseries) -> List[tuple]:
+        points = timeseries.data_points
+        if not points:
+            return []
+        epochs = _to_epoch_seconds([point.timestamp for point in points])
+        rows = []
+        for point, ts in zip(points, epochs):
+            if ts == -1:  # 파싱 실패
+                continue
+            rows.append(
+                (
+                    timeseries.location,
+                    int(ts),
+                    timeseries.source,
+                    *(_as_float(getattr(point, name)) for name in NUMERIC_FIELDS),
+                    point.sea_state,
+                    timeseries.ingested_at,
+                )
+            )
+        return rows
+
+    def upsert_timeseries(self, timeseries: MarineTimeseries, conn: Optional[sqlite3.Connection] = None) -> int:
+        """시계열을 (location, ts, source) 기준으로 upsert"""
+        rows = self._rows(timeseries)
+        if not rows:
+            return 0
+        columns = ("location", "ts", "source", *NUMERIC_FIELDS, *TEXT_FIELDS, "ingested_at")
+        updates = ", ".join(f"{name} = excluded.{name}" for name in columns[3:])
+        sql = (
+            f"INSERT INTO {OBS_TABLE} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT(location, ts, source) DO UPDATE SET {updates}"
+        )
+        if conn is not None:
+            conn.executemany(sql, rows)
+            return len(rows)
+        with self._connect() as own:
+            own.executemany(sql, rows)
+            own.commit()
+        return len(rows)
+
+    def _where(
+        self,
+        location: Optional[str],
+        start,
+        end,
+        source: Optional[str],
+    ) -> Tuple[str, list]:
+        clauses: List[str] = []
+        params: list = []
+        if location:
+            clauses.append("location = ?")
+            params.append(location)
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(_epoch(start))
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(_epoch(end))
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def scan_arrays(
+        self,
+        location: Optional[str] = None,
+        start=None,
+        end=None,
+        columns: Optional[Iterable[str]] = None,
+        source: Optional[str] = None,
+    ) -> Dict[str, np.ndarray]:
+        """범위 조회 결과를 열별 NumPy 배열로 반환 (ts 는 datetime64[s], UTC)
+
+        숫자 열은 float 배열, 텍스트 열(sea_state, ingested_at)은 object 배열이다.
+        """
+        selected = list(columns) if columns is not None else list(NUMERIC_FIELDS)
+        unknown = [name for name in selected if name not in NUMERIC_FIELDS + TEXT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown observation columns: {unknown}")
+        where, params = self._where(location, start, end, source)
+        sql = (
+            f"SELECT location, ts, source{''.join(', ' + name for name in selected)} "
+            f"FROM {OBS_TABLE}{where} ORDER BY location, ts, source"
+        )
+        with self._connect() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        if not rows:
+            result = {
+                "location": np.array([], dtype=object),
+                "timestamp": np.array([], dtype="datetime64[s]"),
+                "source": np.array([], dtype=object),
+            }
+            result.update({name: np.array([], dtype=float if name in NUMERIC_FIELDS else object) for name in selected})
+            return result
+        numeric = [name for name in selected if name in NUMERIC_FIELDS]
+        if len(numeric) == len(selected):
+            matrix = np.array([row[3:] for row in rows], dtype=float) if selected else np.empty((len(rows), 0))
+        result = {
+            "location": np.array([row[0] for row in rows], dtype=object),
+            "timestamp": np.array([row[1] for row in rows], dtype="int64").astype("datetime64[s]"),
+            "source": np.array([row[2] for row in rows], dtype=object),
+        }
+        for position, name in enumerate(selected):
+            if len(numeric) == len(selected):
+                result[name] = matrix[:, position]
+            elif name in NUMERIC_FIELDS:
+                result[name] = np.array([row[3 + position] for row in rows], dtype=float)
+            else:
+                result[name] = np.array([row[3 + position] for row in rows], dtype=object)
+        return result
+
+    def scan(
+        self,
+        location: Optional[str] = None,
+        start=None,
+        end=None,
+        columns: Optional[Iterable[str]] = None,
+        source: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """범위 조회 결과를 DataFrame 으로 반환 (timestamp 는 tz-aware UTC)"""
+        arrays = self.scan_arrays(location, start, end, columns, source)
+        frame = pd.DataFrame(arrays)
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"]).dt.tz_localize("UTC")
+        return frame
+
+    def recent(self, hours: int = 24, location: Optional[str] = None, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """최근 N시간 관측 조회"""
+        start = datetime.now(timezone.utc) - timedelta(hours=hours)
+        return self.scan(location=location, start=start, columns=columns)
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return int(conn.execute(f"SELECT COUNT(*) FROM {OBS_TABLE}").fetchone()[0])
+
+    def backfill_from_raw(self, raw_table: str = "marine_raw", batch_size: int = 5000) -> int:
+        """기존 JSON 블롭 테이블에서 1회 이관 (이미 채워져 있으면 건너뜀)"""
+        with self._connect() as conn:
+            if conn.execute(f"SELECT 1 FROM {OBS_TABLE} LIMIT 1").fetchone():
+                return 0
+        migrated = 0
+        with self._connect() as conn:
+            exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (raw_table,)
+            ).fetchone()
+            if not exists:
+                return 0
+            cursor = conn.execute(f"SELECT source, location, data_json, ingested_at FROM {raw_table}")
+            known = {f.name for f in fields(MarineDataPoint)}
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                grouped: Dict[Tuple[str, str, str], List[MarineDataPoint]] = {}
+                for source, location, data_json, ingested_at in batch:
+                    try:
+                        payload = json.loads(data_json)
+                        point = MarineDataPoint(**{k: v for k, v in payload.items() if k in known})
+                    except (json.JSONDecodeError, TypeError):
+                        continue
+                    grouped.setdefault((source, location, ingested_at), []).append(point)
+                for (source, location, ingested_at), points in grouped.items():
+                    migrated += self.upsert_timeseries(
+                        MarineTimeseries(source=source, location=location, data_points=points, ingested_at=ingested_at),
+                        conn=conn,
+                    )
+            conn.commit()
+        return migrated
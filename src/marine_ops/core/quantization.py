@@ -0,0 +1,122 @@
+# KR: 임베딩 int8 스칼라 양자화 (벡터별 스케일) 저장 형식, 코드 상 점수 계산, recall@k
+# EN: Int8 scalar-quantized embedding storage (per-vector scale), scoring on codes, recall@k
+
+import sqlite3
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+FLOAT32, INT8 = "float32", "int8"
+QUANTIZATIONS = (FLOAT32, INT8)
+# int8 BLOB = float32 스케일 4바이트 + 차원 수만큼의 int8 코드 (384차원: 1536 → 388 바이트)
+SCALE_BYTES = 4
+# 코드 → float32 변환 시 임시 행렬 크기 제한
+SCORE_CHUNK = 65536
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(n, d) float 행렬 → (int8 코드, 벡터별 스케일), x ≈ codes * scale"""
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float32))
+    peak = np.abs(matrix).max(axis=1)
+    scales = np.where(peak > 0, peak / 127.0, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales
+
+
+def encode_embedding(vector: np.ndarray, quantization: str = FLOAT32) -> bytes:
+    """저장용 BLOB (float32 원본 또는 스케일 헤더 + int8 코드)"""
+    if quantization == FLOAT32:
+        return np.asarray(vector, dtype=np.float32).tobytes()
+    if quantization != INT8:
+        raise ValueError(f"Unknown quantization: {quantization}")
+    codes, scales = quantize_int8(vector)
+    return scales.tobytes() + codes.tobytes()
+
+
+def decode_int8(blobs: Sequence[bytes], dim: int) -> Tuple[np.ndarray, np.ndarray]:
+    """int8 BLOB 목록 → (코드 (n, dim) int8, 스케일 (n,) float32), 복사 없이 뷰로 분리"""
+    raw = np.frombuffer(b"".join(blobs), dtype=np.uint8).reshape(len(blobs), dim + SCALE_BYTES)
+    scales = np.ascontiguousarray(raw[:, :SCALE_BYTES]).view(np.float32).ravel()
+    return raw[:, SCALE_BYTES:].view(np.int8), scales
+
+
+def score_codes(query: np.ndarray, codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """코드 위에서 직접 내적 (비대칭: 질의는 float 유지), score_i = scale_i * (codes_i · q)"""
+    query = np.asarray(query, dtype=np.float32)
+    scores = np.empty(len(codes), dtype=np.float32)
+    for offset in range(0, len(codes), SCORE_CHUNK):
+        block = codes[offset:offset + SCORE_CHUNK]
+        scores[offset:offset + len(block)] = block.astype(np.float32) @ query
+    return scores * scales
+
+
+def score_embeddings(query: np.ndarray, blobs: Sequence[bytes]) -> np.ndarray:
+    """float32 / int8 BLOB 이 섞여 있어도 (이관 중인 테이블) 행별 형식에 맞춰 내적 계산"""
+    query = np.asarray(query, dtype=np.float32)
+    dim = len(query)
+    if not blobs:
+        return np.array([], dtype=np.float32)
+    lengths = np.fromiter((len(blob) for blob in blobs), dtype=np.int64, count=len(blobs))
+    scores = np.empty(len(blobs), dtype=np.float32)
+    quantized = lengths == dim + SCALE_BYTES
+    dense = lengths == 4 * dim
+    if not np.all(quantized | dense):
+        bad = int(lengths[~(quantized | dense)][0])
+        raise ValueError(f"Embedding blob of {bad} bytes does not match dim {dim}")
+    for mask, is_int8 in ((dense, False), (quantized, True)):
+        if not mask.any():
+            continue
+        subset = blobs if mask.all() else [blobs[i] for i in np.flatnonzero(mask)]
+        if is_int8:
+            scores[mask] = score_codes(query, *decode_int8(subset, dim))
+        else:
+            scores[mask] = np.frombuffer(b"".join(subset), dtype=np.float32).reshape(len(subset), dim) @ query
+    return scores
+
+
+def quantize_table(
+    conn: sqlite3.Connection, table: str, dim: int, key: str = "id", column: str = "embedding", batch_size: int = 5000
+) -> int:
+    """기존 float32 BLOB 행을 int8 로 1회 변환 (이미 변환된 행은 건너뜀), 변환 행 수 반환
+
+    디스크 공간 회수는 이후 VACUUM 으로 한다.
+    """
+    converted = 0
+    last = None
+    while True:
+        where, params = (f"WHERE {key} > ?", [last]) if last is not None else ("", [])
+        rows = conn.execute(
+            f"SELECT {key}, {column} FROM {table} {where} ORDER BY {key} LIMIT ?", params + [batch_size]
+        ).fetchall()
+        if not rows:
+            break
+        last = rows[-1][0]
+        dense = [(row[0], row[1]) for row in rows if row[1] is not None and len(row[1]) == 4 * dim]
+        if dense:
+            matrix = np.frombuffer(b"".join(blob for _, blob in dense), dtype=np.float32).reshape(len(dense), dim)
+            codes, scales = quantize_int8(matrix)
+            conn.executemany(
+                f"UPDATE {table} SET {column} = ? WHERE {key} = ?",
+                [(scale.tobytes() + code.tobytes(), row_key) for (row_key, _), code, scale in zip(dense, codes, scales)],
+            )
+            converted += len(dense)
+    return converted
+
+
+def recall_at_k(exact: Iterable[Sequence[int]], approx: Iterable[Sequence[int]], k: int) -> float:
+    """질의별 |정확 상위 k ∩ 근사 상위 k| / k 의 평균"""
+    ratios: List[float] = []
+    for truth, found in zip(exact, approx):
+        truth_k = list(truth)[:k]
+        if truth_k:
+            ratios.append(len(set(truth_k) & set(list(found)[:k])) / len(truth_k))
+    return float(np.mean(ratios)) if ratios else 0.0
+
+
+def rerank_exact(
+    query: np.ndarray, order: np.ndarray, vectors: np.ndarray, top_k: Optional[int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """코드로 고른 후보(order)를 float 벡터로 다시 점수 매겨 상위 top_k 재정렬"""
+    scores = np.asarray(vectors, dtype=np.float32) @ np.asarray(query, dtype=np.float32)
+    resorted = np.argsort(-scores, kind="stable")[:top_k]
+    return np.asarray(order)[resorted], scores[resorted]
@@ -1,27 +1,152 @@
 # KR: 단위 변환 유틸리티
 # EN: Unit conversion utilities
 
-from typing import Dict, Any
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+KT_TO_MS = 0.514444
+KMH_TO_MS = 1 / 3.6
+MPH_TO_MS = 0.44704
+FT_TO_M = 0.3048
+
+# 단위 문자열(API hourly_units 표기 포함) → (물리량, 기준 단위 배율)
+# 기준 단위: 속도 m/s, 길이 m, 온도 °C, 비율 0-1
+UNIT_SCALES: Dict[str, Tuple[str, float]] = {
+    "m/s": ("speed", 1.0),
+    "ms": ("speed", 1.0),
+    "m s-1": ("speed", 1.0),
+    "kt": ("speed", KT_TO_MS),
+    "kn": ("speed", KT_TO_MS),
+    "kts": ("speed", KT_TO_MS),
+    "knots": ("speed", KT_TO_MS),
+    "km/h": ("speed", KMH_TO_MS),
+    "kmh": ("speed", KMH_TO_MS),
+    "mph": ("speed", MPH_TO_MS),
+    "m": ("length", 1.0),
+    "km": ("length", 1000.0),
+    "ft": ("length", FT_TO_M),
+    "nmi": ("length", 1852.0),
+    "°c": ("temperature", 1.0),
+    "c": ("temperature", 1.0),
+    "°f": ("temperature", 1.0),
+    "f": ("temperature", 1.0),
+    "%": ("fraction", 0.01),
+    "fraction": ("fraction", 1.0),
+}
+
+# MarineDataPoint 필드별 목표 단위 (스키마 주석과 동일, 가시거리는 km)
+FIELD_UNITS: Dict[str, str] = {
+    "wind_speed": "m/s",
+    "wind_gust": "m/s",
+    "ocean_current_speed": "m/s",
+    "wave_height": "m",
+    "swell_wave_height": "m",
+    "wind_wave_height": "m",
+    "sea_level": "m",
+    "visibility": "km",
+    "temperature": "°c",
+    "sea_surface_temperature": "°c",
+    "humidity": "fraction",
+    "fog_probability": "fraction",
+}
+
+
+def unit_conversion(unit: str, target: str) -> Tuple[float, float]:
+    """단위 변환 계수 (scale, offset): 목표값 = 값 * scale + offset"""
+    source_key, target_key = unit.strip().lower(), target.strip().lower()
+    if source_key == target_key:
+        return 1.0, 0.0
+    if source_key not in UNIT_SCALES or target_key not in UNIT_SCALES:
+        raise ValueError(f"지원하지 않는 단위: {unit!r} -> {target!r}")
+    (source_kind, source_scale), (target_kind, target_scale) = UNIT_SCALES[source_key], UNIT_SCALES[target_key]
+    if source_kind != target_kind:
+        raise ValueError(f"호환되지 않는 단위: {unit!r} -> {target!r}")
+    if source_kind == "temperature":
+        to_c = (5 / 9, -32 * 5 / 9) if source_key.endswith("f") else (1.0, 0.0)
+        from_c = (9 / 5, 32.0) if target_key.endswith("f") else (1.0, 0.0)
+        return to_c[0] * from_c[0], to_c[1] * from_c[0] + from_c[1]
+    return source_scale / target_scale, 0.0
+
+
+def as_float_array(values: Optional[Sequence[Any]], length: Optional[int] = None) -> np.ndarray:
+    """값 목록 → float64 배열 (None/빈 문자열/숫자 아님은 NaN, 누락 열은 NaN으로 채움)"""
+    if values is None:
+        return np.full(length or 0, np.nan)
+    try:
+        result = np.asarray(values, dtype=np.float64)  # None → NaN
+    except (TypeError, ValueError):
+        import pandas as pd
+
+        result = pd.to_numeric(pd.Series(list(values), dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+    if length is not None and len(result) != length:
+        padded = np.full(length, np.nan)
+        padded[: min(length, len(result))] = result[:length]
+        return padded
+    return result
+
+
+def convert_array(values: Any, unit: str, target: str) -> np.ndarray:
+    """열 전체를 한 번에 단위 변환"""
+    scale, offset = unit_conversion(unit, target)
+    array = values if isinstance(values, np.ndarray) and values.dtype == np.float64 else as_float_array(values)
+    if scale == 1.0 and offset == 0.0:
+        return array
+    return array * scale + offset
+
+
+def normalize_columns(
+    columns: Mapping[str, Any],
+    units: Mapping[str, str],
+    length: Optional[int] = None,
+    targets: Mapping[str, str] = FIELD_UNITS,
+) -> Dict[str, np.ndarray]:
+    """커넥터 시간별 배열을 열 단위로 SI(스키마 단위) 변환
+
+    Args:
+        columns: 스키마 필드명 → 시간별 값 배열
+        units: 스키마 필드명 → 원본 단위 (API hourly_units 등). 없으면 목표 단위로 간주
+        length: 시간 축 길이 (누락/짧은 열은 NaN으로 채움)
+        targets: 필드별 목표 단위
+
+    Returns:
+        필드명 → float64 배열 (결측은 NaN)
+    """
+    normalized: Dict[str, np.ndarray] = {}
+    for name, values in columns.items():
+        array = as_float_array(values, length)
+        target = targets.get(name)
+        unit = units.get(name)
+        if target is not None and unit:
+            array = convert_array(array, unit, target)
+        normalized[name] = array
+    return normalized
+
+
+def optional_values(array: np.ndarray) -> list:
+    """NaN → None 인 파이썬 float 목록 (데이터클래스 생성용)"""
+    return [None if value != value else value for value in array.tolist()]
+
 
 def kt_to_ms(knots: float) -> float:
     """노트를 m/s로 변환"""
-    return knots * 0.514444
+    return knots * KT_TO_MS
 
 def ms_to_kt(ms: float) -> float:
     """m/s를 노트로 변환"""
-    return ms / 0.514444
+    return ms / KT_TO_MS
 
 def ft_to_m(feet: float) -> float:
     """피트를 미터로 변환"""
-    return feet * 0.3048
+    return feet * FT_TO_M
 
 def m_to_ft(meters: float) -> float:
     """미터를 피트로 변환"""
-    return meters / 0.3048
+    return meters / FT_TO_M
 
 def mph_to_ms(mph: float) -> float:
     """마일/시를 m/s로 변환"""
-    return mph * 0.44704
+    return mph * MPH_TO_MS
 
 def celsius_to_fahrenheit(c: float) -> float:
     """섭씨를 화씨로 변환"""
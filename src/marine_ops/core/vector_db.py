@@ -4,24 +4,59 @@
 import sqlite3
 import json
 import numpy as np
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from sentence_transformers import SentenceTransformer
 
+from .connection import ConnectionManager
 from .schema import MarineTimeseries, MarineDataPoint
+from .observation_store import NUMERIC_FIELDS, ObservationStore, _to_epoch_seconds
+from .quantization import FLOAT32, INT8, QUANTIZATIONS, encode_embedding, quantize_table, rerank_exact
+from .vector_search import SearchFilter, candidate_embeddings, ensure_meta_ts, fetch_hits, rank_embeddings
+from .forecast_store import ForecastStore
+
+# 모델명별로 한 번만 로드하여 같은 프로세스의 모든 인스턴스가 공유
+_MODEL_CACHE: Dict[str, SentenceTransformer] = {}
+
+
+def shared_model(model_name: str) -> SentenceTransformer:
+    """SentenceTransformer 모델을 프로세스 내에서 공유"""
+    model = _MODEL_CACHE.get(model_name)
+    if model is None:
+        model = _MODEL_CACHE[model_name] = SentenceTransformer(model_name)
+    return model
 
 class MarineVectorDB:
     """해양 데이터 벡터 데이터베이스 관리자"""
     
-    def __init__(self, db_path: str = "marine_vec.db", model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, db_path: str = "marine_vec.db", model_name: str = "all-MiniLM-L6-v2", quantization: str = FLOAT32):
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization: {quantization}")
         self.db_path = Path(db_path)
-        self.model = SentenceTransformer(model_name)
+        self.model = shared_model(model_name)
         self.embedding_dim = 384  # all-MiniLM-L6-v2 dimension
+        # 새 임베딩 저장 형식 (int8: 벡터별 스케일 + int8 코드, 행당 약 1/4 크기)
+        self.quantization = quantization
+        # 호출마다 connect 하지 않고 스레드별 장수명 연결 재사용 (WAL/mmap PRAGMA 적용)
+        self.connections = ConnectionManager(self.db_path)
         
         # 벡터 확장 초기화
         self._init_vector_extension()
         self._create_tables()
+        # 숫자 조회용 열 저장소 (JSON 블롭 파싱 없이 범위 스캔)
+        self.observations = ObservationStore(str(self.db_path), connections=self.connections)
+        self.observations.backfill_from_raw()
+        # 발표 시각별 예보 버전 (리드타임별 이력 보존)
+        self.forecasts = ForecastStore(str(self.db_path), connections=self.connections)
+    
+    def _connect(self) -> sqlite3.Connection:
+        return self.connections.connection()
+    
+    def close(self) -> None:
+        """장수명 연결 닫기"""
+        self.connections.close()
     
     def _init_vector_extension(self):
         """SQLite 벡터 확장 초기화"""
@@ -31,7 +66,7 @@ class MarineVectorDB:
     
     def _create_tables(self):
         """테이블 생성"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # 해양 데이터 원본 테이블
@@ -74,6 +109,7 @@ class MarineVectorDB:
                     timestamp TEXT NOT NULL,
                     embedding_id INTEGER,
                     created_at TEXT NOT NULL,
+                    ts INTEGER,
                     FOREIGN KEY(raw_id) REFERENCES marine_raw(id)
                 )
             """)
@@ -82,6 +118,9 @@ class MarineVectorDB:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_marine_raw_source_loc ON marine_raw(source, location)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_marine_raw_timestamp ON marine_raw(timestamp)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_vec_meta_source ON marine_vec_meta(source)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_vec_meta_raw ON marine_vec_meta(raw_id)")
+            # 시간 범위 푸시다운용 epoch 초 열 (기존 DB 는 열 추가 후 1회 채움)
+            ensure_meta_ts(conn)
             
             conn.commit()
     
@@ -89,18 +128,25 @@ class MarineVectorDB:
         """시계열 데이터를 벡터 DB에 저장"""
         stored_count = 0
         
-        with sqlite3.connect(self.db_path) as conn:
+        epochs = _to_epoch_seconds([point.timestamp for point in timeseries.data_points])
+        
+        with self._connect() as conn:
             cursor = conn.cursor()
             
-            for data_point in timeseries.data_points:
+            for data_point, ts in zip(timeseries.data_points, epochs.tolist()):
                 try:
                     # 원본 데이터 저장
                     data_json = json.dumps(data_point.__dict__, ensure_ascii=False)
                     
+                    # UPSERT: 기존 행 id 유지 (INSERT OR REPLACE 는 행을 지우고 새 id 를 만들어
+                    # marine_vec_meta.raw_id 가 사라진 행을 가리키게 됨)
                     cursor.execute("""
-                        INSERT OR REPLACE INTO marine_raw 
+                        INSERT INTO marine_raw 
                         (source, location, timestamp, data_json, ingested_at)
                         VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT(source, location, timestamp) DO UPDATE SET
+                            data_json = excluded.data_json,
+                            ingested_at = excluded.ingested_at
                     """, (
                         timeseries.source,
                         timeseries.location,
@@ -109,7 +155,19 @@ class MarineVectorDB:
                         timeseries.ingested_at
                     ))
                     
-                    raw_id = cursor.lastrowid
+                    # lastrowid 는 UPDATE 경로에서 신뢰할 수 없으므로 키로 조회
+                    cursor.execute("""
+                        SELECT id FROM marine_raw WHERE source = ? AND location = ? AND timestamp = ?
+                    """, (timeseries.source, timeseries.location, data_point.timestamp))
+                    raw_id = cursor.fetchone()[0]
+                    
+                    # 같은 원본 행의 이전 임베딩 제거 (재수집 시 중복 방지)
+                    cursor.execute("""
+                        DELETE FROM marine_vec WHERE id IN (
+                            SELECT embedding_id FROM marine_vec_meta WHERE raw_id = ?
+                        )
+                    """, (raw_id,))
+                    cursor.execute("DELETE FROM marine_vec_meta WHERE raw_id = ?", (raw_id,))
                     
                     # 텍스트 콘텐츠 생성 (임베딩용)
                     text_content = self._create_text_content(data_point, timeseries)
@@ -125,15 +183,15 @@ class MarineVectorDB:
                     else:
                         cursor.execute("""
                             INSERT INTO marine_vec (embedding) VALUES (?)
-                        """, (embedding.tobytes(),))
+                        """, (encode_embedding(embedding, self.quantization),))
                     
                     embedding_id = cursor.lastrowid
                     
                     # 메타데이터 저장
                     cursor.execute("""
-                        INSERT OR REPLACE INTO marine_vec_meta
-                        (raw_id, text_content, source, location, timestamp, embedding_id, created_at)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                        INSERT INTO marine_vec_meta
+                        (raw_id, text_content, source, location, timestamp, embedding_id, created_at, ts)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                     """, (
                         raw_id,
                         text_content,
@@ -141,7 +199,8 @@ class MarineVectorDB:
                         timeseries.location,
                         data_point.timestamp,
                         embedding_id,
-                        datetime.now().isoformat()
+                        datetime.now().isoformat(),
+                        ts if ts >= 0 else None
                     ))
                     
                     stored_count += 1
@@ -150,6 +209,8 @@ class MarineVectorDB:
                     print(f"데이터 포인트 저장 실패: {e}")
                     continue
             
+            self.observations.upsert_timeseries(timeseries, conn=conn)
+            self.forecasts.write_timeseries(timeseries, conn=conn)
             conn.commit()
         
         return stored_count
@@ -179,146 +240,111 @@ class MarineVectorDB:
         
         return " | ".join(content_parts)
     
-    def vector_search(self, query: str, top_k: int = 10, location_filter: str = None) -> List[Dict[str, Any]]:
-        """벡터 유사도 검색"""
+    def vector_search(
+        self,
+        query: str,
+        top_k: Optional[int] = 10,
+        location_filter: str = None,
+        search: Optional[SearchFilter] = None,
+        rerank: int = 0,
+    ) -> List[Dict[str, Any]]:
+        """벡터 유사도 검색
+
+        ``search`` 의 구조적 조건(시간 범위, 지역, 소스, 숫자 조건)은 유사도 계산 전에 SQL 후보 선택에
+        적용되어 조건을 만족하는 행만 점수를 계산한다. ``top_k=None`` 이면 조건을 만족하는 전체를
+        유사도 순으로 반환한다 (시간 창 질의가 상위 k개에서 잘리지 않도록).
+        ``rerank`` > 0 이면 코드 점수로 top_k*rerank 개 후보를 고른 뒤, 저장된 텍스트를 다시 임베딩한
+        float 벡터로 재정렬한다 (int8 저장 시 정확 순위 복원, float 벡터를 따로 저장하지 않음).
+        """
+        search = search or SearchFilter()
+        if location_filter:
+            search = replace(search, location=location_filter)
+        
         # 쿼리 임베딩 생성
         query_embedding = self.model.encode([query], normalize_embeddings=True)[0]
         
-        results = []
+        with self._connect() as conn:
+            # 후보는 (id, 임베딩)만 읽고, 텍스트/원본은 상위 결과에 대해서만 IN 조인 한 번으로 조회
+            meta_ids, blobs = candidate_embeddings(conn, search)
+            candidates = top_k * rerank if rerank and top_k is not None else top_k
+            order, scores = rank_embeddings(query_embedding, blobs, candidates)
+            top_ids = meta_ids[order].tolist()
+            hits = fetch_hits(conn, top_ids)
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            if self.use_vector_extension:
-                # 벡터 유사도 검색 (sqlite-vec 사용)
-                if location_filter:
-                    cursor.execute("""
-                        SELECT mvm.raw_id, mvm.text_content, mvm.source, mvm.location, 
-                               mvm.timestamp, mvm.created_at, v.embedding
-                        FROM marine_vec_meta mvm
-                        JOIN marine_vec v ON mvm.embedding_id = v.rowid
-                        WHERE mvm.location = ?
-                        ORDER BY v.embedding <-> ?
-                        LIMIT ?
-                    """, (location_filter, query_embedding.tolist(), top_k))
-                else:
-                    cursor.execute("""
-                        SELECT mvm.raw_id, mvm.text_content, mvm.source, mvm.location, 
-                               mvm.timestamp, mvm.created_at, v.embedding
-                        FROM marine_vec_meta mvm
-                        JOIN marine_vec v ON mvm.embedding_id = v.rowid
-                        ORDER BY v.embedding <-> ?
-                        LIMIT ?
-                    """, (query_embedding.tolist(), top_k))
-            else:
-                # 기본 SQLite 검색 (모든 결과 반환 후 Python에서 유사도 계산)
-                if location_filter:
-                    cursor.execute("""
-                        SELECT mvm.raw_id, mvm.text_content, mvm.source, mvm.location, 
-                               mvm.timestamp, mvm.created_at, v.embedding
-                        FROM marine_vec_meta mvm
-                        JOIN marine_vec v ON mvm.embedding_id = v.id
-                        WHERE mvm.location = ?
-                    """, (location_filter,))
-                else:
-                    cursor.execute("""
-                        SELECT mvm.raw_id, mvm.text_content, mvm.source, mvm.location, 
-                               mvm.timestamp, mvm.created_at, v.embedding
-                        FROM marine_vec_meta mvm
-                        JOIN marine_vec v ON mvm.embedding_id = v.id
-                    """)
-            
-            rows = cursor.fetchall()
-            
-            # 기본 SQLite 모드에서는 유사도 계산 후 정렬
-            if not self.use_vector_extension:
-                scored_rows = []
-                for row in rows:
-                    raw_id, text_content, source, location, timestamp, created_at, embedding_bytes = row
-                    
-                    # BLOB을 numpy 배열로 변환
-                    stored_embedding = np.frombuffer(embedding_bytes, dtype=np.float32)
-                    
-                    # 코사인 유사도 계산
-                    similarity = float(np.dot(query_embedding, stored_embedding))
-                    scored_rows.append((similarity, row))
-                
-                # 유사도 기준으로 정렬하고 상위 k개 선택
-                scored_rows.sort(reverse=True, key=lambda x: x[0])
-                rows = [row for _, row in scored_rows[:top_k]]
-            
-            for row in rows:
-                raw_id, text_content, source, location, timestamp, created_at, embedding = row
-                
-                # 원본 데이터 조회
-                cursor.execute("SELECT data_json FROM marine_raw WHERE id = ?", (raw_id,))
-                raw_data = cursor.fetchone()
-                
-                if raw_data:
-                    try:
-                        data_json = json.loads(raw_data[0])
-                        
-                        result = {
-                            'raw_id': raw_id,
-                            'source': source,
-                            'location': location,
-                            'timestamp': timestamp,
-                            'text_content': text_content,
-                            'data': data_json,
-                            'created_at': created_at
-                        }
-                        results.append(result)
-                        
-                    except json.JSONDecodeError:
-                        continue
+        if rerank and top_k is not None and top_ids:
+            top_ids = [meta_id for meta_id in top_ids if meta_id in hits]
+            vectors = self.model.encode([hits[meta_id][1] for meta_id in top_ids], normalize_embeddings=True)
+            positions, scores = rerank_exact(query_embedding, np.arange(len(top_ids)), vectors, top_k)
+            top_ids = [top_ids[position] for position in positions.tolist()]
+        
+        results = []
+        for meta_id, score in zip(top_ids, scores.tolist()):
+            hit = hits.get(meta_id)
+            if hit is None:
+                continue
+            raw_id, text_content, source, location, timestamp, created_at, raw_data, ts = hit
+            try:
+                data_json = json.loads(raw_data)
+            except json.JSONDecodeError:
+                continue
+            results.append({
+                'raw_id': raw_id,
+                'source': source,
+                'location': location,
+                'timestamp': timestamp,
+                'text_content': text_content,
+                'data': data_json,
+                'created_at': created_at,
+                'similarity': score,
+                'ts': ts
+            })
         
         return results
     
+    def quantize_embeddings(self) -> int:
+        """기존 float32 임베딩을 int8 로 1회 변환 (이후 저장도 int8), 변환 행 수 반환"""
+        self.quantization = INT8
+        with self._connect() as conn:
+            converted = quantize_table(conn, "marine_vec", self.embedding_dim)
+            conn.commit()
+        return converted
+    
+    def get_recent_frame(self, hours: int = 24, location: str = None, columns: Optional[List[str]] = None):
+        """최근 데이터를 열 저장소에서 DataFrame 으로 조회"""
+        return self.observations.recent(hours=hours, location=location, columns=columns)
+    
     def get_recent_data(self, hours: int = 24, location: str = None) -> List[Dict[str, Any]]:
-        """최근 데이터 조회"""
-        cutoff_time = datetime.now().timestamp() - (hours * 3600)
-        cutoff_iso = datetime.fromtimestamp(cutoff_time).isoformat()
+        """최근 데이터 조회 (열 저장소 기반, 전체 지역에 걸쳐 최신순)"""
+        frame = self.get_recent_frame(hours, location, columns=[*NUMERIC_FIELDS, "sea_state", "ingested_at"])
+        if frame.empty:
+            return []
         
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            if location:
-                cursor.execute("""
-                    SELECT data_json, source, location, timestamp, ingested_at
-                    FROM marine_raw
-                    WHERE timestamp >= ? AND location = ?
-                    ORDER BY timestamp DESC
-                """, (cutoff_iso, location))
-            else:
-                cursor.execute("""
-                    SELECT data_json, source, location, timestamp, ingested_at
-                    FROM marine_raw
-                    WHERE timestamp >= ?
-                    ORDER BY timestamp DESC
-                """, (cutoff_iso,))
-            
-            rows = cursor.fetchall()
-            results = []
-            
-            for row in rows:
-                data_json, source, location, timestamp, ingested_at = row
-                try:
-                    data = json.loads(data_json)
-                    results.append({
-                        'source': source,
-                        'location': location,
-                        'timestamp': timestamp,
-                        'data': data,
-                        'ingested_at': ingested_at
-                    })
-                except json.JSONDecodeError:
-                    continue
-            
-            return results
+        # 스캔은 (location, ts, source) 순이므로 지역 구분 없이 시각 내림차순으로 다시 정렬
+        frame = frame.sort_values("timestamp", ascending=False, kind="stable")
+        numeric = frame[list(NUMERIC_FIELDS)]
+        timestamps = frame["timestamp"].dt.strftime("%Y-%m-%dT%H:%M:%S+00:00").tolist()
+        results = []
+        for source, loc, timestamp, values, sea_state, ingested_at in zip(
+            frame["source"].tolist(), frame["location"].tolist(), timestamps, numeric.to_numpy(),
+            frame["sea_state"].tolist(), frame["ingested_at"].tolist()
+        ):
+            data = {name: float(value) for name, value in zip(numeric.columns, values) if value == value}
+            data["timestamp"] = timestamp
+            if sea_state is not None:
+                data["sea_state"] = sea_state
+            results.append({
+                'source': source,
+                'location': loc,
+                'timestamp': timestamp,
+                'data': data,
+                'ingested_at': ingested_at,
+            })
+        
+        return results
     
     def get_stats(self) -> Dict[str, Any]:
         """데이터베이스 통계"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.cursor()
             
             # 총 레코드 수
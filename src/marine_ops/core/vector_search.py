@@ -0,0 +1,136 @@
+# KR: 벡터 검색 후보 선택 (구조적 조건 푸시다운) 및 정확 유사도 순위
+# EN: Vector-search candidate selection with predicate pushdown, and exact similarity ranking
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .observation_store import NUMERIC_FIELDS, OBS_TABLE, _epoch, _to_epoch_seconds
+from .quantization import score_embeddings
+
+META_TABLE = "marine_vec_meta"
+COMPARISONS = (">=", "<=", ">", "<", "=")
+# SQLite 바인드 변수 한도(구버전 999) 이내로 IN 목록을 나눔
+IN_CHUNK = 900
+
+
+@dataclass(frozen=True)
+class SearchFilter:
+    """벡터 검색 구조적 조건 (유사도 계산 전에 SQL 후보 선택 단계에서 적용)
+
+    ``start``/``end`` 는 양끝 포함 범위이며 naive 시각은 UTC 로 간주한다. ``conditions`` 는
+    ``("wave_height", ">", 1.5)`` 형태의 숫자 조건으로, 열 저장소(marine_obs)의 (location, ts, source)
+    기본키 조인으로 평가되어 JSON 블롭을 읽지 않는다.
+    """
+
+    location: Optional[str] = None
+    source: Optional[str] = None
+    start: Any = None
+    end: Any = None
+    conditions: Tuple[Tuple[str, str, float], ...] = ()
+
+    def __post_init__(self):
+        for name, op, _ in self.conditions:
+            if name not in NUMERIC_FIELDS:
+                raise ValueError(f"Unknown numeric field: {name}")
+            if op not in COMPARISONS:
+                raise ValueError(f"Unsupported comparison: {op}")
+
+    def clauses(self) -> Tuple[str, str, list]:
+        """(조인 절, WHERE 절, 바인드 값)"""
+        where: List[str] = []
+        params: list = []
+        if self.location:
+            where.append("mvm.location = ?")
+            params.append(self.location)
+        if self.source:
+            where.append("mvm.source = ?")
+            params.append(self.source)
+        if self.start is not None:
+            where.append("mvm.ts >= ?")
+            params.append(_epoch(self.start))
+        if self.end is not None:
+            where.append("mvm.ts <= ?")
+            params.append(_epoch(self.end))
+        join = ""
+        if self.conditions:
+            join = f" JOIN {OBS_TABLE} o ON o.location = mvm.location AND o.ts = mvm.ts AND o.source = mvm.source"
+            for name, op, value in self.conditions:
+                where.append(f"o.{name} {op} ?")
+                params.append(float(value))
+        return join, (" WHERE " + " AND ".join(where)) if where else "", params
+
+
+def parse_condition(text: str) -> Tuple[str, str, float]:
+    """``"wave_height>1.5"`` → ("wave_height", ">", 1.5)"""
+    for op in COMPARISONS:  # 두 글자 연산자를 먼저 검사
+        name, found, value = text.partition(op)
+        if found:
+            return name.strip(), op, float(value)
+    raise ValueError(f"Cannot parse condition: {text!r}")
+
+
+def ensure_meta_ts(conn: sqlite3.Connection, batch_size: int = 5000) -> int:
+    """marine_vec_meta 에 epoch 초 ``ts`` 열과 (location, ts) 인덱스 보장 (기존 행은 1회 채움)"""
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({META_TABLE})")}
+    if "ts" not in columns:
+        conn.execute(f"ALTER TABLE {META_TABLE} ADD COLUMN ts INTEGER")
+    filled = 0
+    while True:
+        rows = conn.execute(f"SELECT id, timestamp FROM {META_TABLE} WHERE ts IS NULL LIMIT ?", (batch_size,)).fetchall()
+        if not rows:
+            break
+        epochs = _to_epoch_seconds([row[1] for row in rows])
+        conn.executemany(f"UPDATE {META_TABLE} SET ts = ? WHERE id = ?", [(int(ts), row[0]) for ts, row in zip(epochs, rows)])
+        filled += len(rows)
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_vec_meta_loc_ts ON {META_TABLE}(location, ts)")
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_vec_meta_ts ON {META_TABLE}(ts)")
+    return filled
+
+
+def candidate_embeddings(conn: sqlite3.Connection, search: Optional[SearchFilter] = None) -> Tuple[np.ndarray, List[bytes]]:
+    """조건을 만족하는 후보의 (메타 id 배열, 임베딩 BLOB 목록)
+
+    조건은 인덱스(location/ts)와 열 저장소 조인으로 SQL 안에서 평가되고, 텍스트/원본 열은 읽지 않는다.
+    """
+    join, where, params = (search or SearchFilter()).clauses()
+    rows = conn.execute(
+        f"SELECT mvm.id, v.embedding FROM {META_TABLE} mvm JOIN marine_vec v ON mvm.embedding_id = v.id{join}{where}",
+        params,
+    ).fetchall()
+    return np.array([row[0] for row in rows], dtype=np.int64), [row[1] for row in rows]
+
+
+def rank_embeddings(query: np.ndarray, blobs: Sequence[bytes], top_k: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """정규화 임베딩 내적(코사인) 기준 상위 위치와 점수 (top_k=None 이면 전체 순위)
+
+    int8 양자화 BLOB 은 복원 없이 코드 위에서 점수를 계산한다 (float32 행과 섞여 있어도 됨).
+    """
+    if not blobs:
+        return np.array([], dtype=np.int64), np.array([], dtype=np.float32)
+    scores = score_embeddings(query, blobs)
+    if top_k is None or top_k >= len(scores):
+        order = np.argsort(-scores, kind="stable")
+    else:
+        # 후보가 많을 때는 전체 정렬 대신 부분 선택 후 상위 k개만 정렬
+        head = np.argpartition(-scores, top_k - 1)[:top_k]
+        order = head[np.argsort(-scores[head], kind="stable")]
+    return order, scores[order]
+
+
+def fetch_hits(conn: sqlite3.Connection, meta_ids: Sequence[int]) -> Dict[int, tuple]:
+    """메타 id → (raw_id, text_content, source, location, timestamp, created_at, data_json, ts), IN 조인 한 번"""
+    hits: Dict[int, tuple] = {}
+    ids = [int(value) for value in meta_ids]
+    for offset in range(0, len(ids), IN_CHUNK):
+        chunk = ids[offset:offset + IN_CHUNK]
+        placeholders = ", ".join("?" for _ in chunk)
+        for row in conn.execute(
+            f"SELECT mvm.id, mvm.raw_id, mvm.text_content, mvm.source, mvm.location, mvm.timestamp, mvm.created_at, "
+            f"r.data_json, mvm.ts FROM {META_TABLE} mvm JOIN marine_raw r ON r.id = mvm.raw_id WHERE mvm.id IN ({placeholders})",
+            chunk,
+        ):
+            hits[row[0]] = row[1:]
+    return hits
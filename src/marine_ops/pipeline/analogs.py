@@ -0,0 +1,296 @@
+"""Numeric analog search: nearest historical met-ocean states and what followed them."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+from src.marine_ops.pipeline.windows import from_epoch_seconds, to_epoch_seconds
+
+SCALAR_FEATURES = ("wave_height", "wave_period", "wind_speed", "wind_gust", "visibility", "eri")
+DIRECTION_FEATURES = ("wind_direction", "wave_direction")
+OUTCOME_COLUMNS = ("wave_height", "wind_speed", "wind_gust")
+RESOLUTIONS = {"h": 3600, "D": 86_400}
+# Above this many points (and at low dimension) a KD-tree beats a brute-force BLAS scan.
+KDTREE_MIN_POINTS = 5000
+KDTREE_MAX_DIM = 16
+
+
+def state_frame(frame: pd.DataFrame, resolution: str = "h") -> pd.DataFrame:
+    """KR: 시간(또는 일) 단위 상태 프레임입니다. / EN: One row per hour (or day) of numeric state.
+
+    Accepts an observation scan (``timestamp`` column, possibly several sources per hour) or a frame
+    with a datetime index. Directions become sin/cos pairs *before* averaging so the mean is circular.
+    """
+
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"Unknown resolution: {resolution}")
+    stamps = frame["timestamp"] if "timestamp" in frame else frame.index.to_series(index=frame.index)
+    stamps = pd.to_datetime(stamps, utc=True)
+    data: Dict[str, np.ndarray] = {}
+    for name in SCALAR_FEATURES:
+        if name in frame:
+            data[name] = frame[name].to_numpy(dtype=np.float64)
+    if "eri" not in data and "eri_value" in frame:
+        data["eri"] = frame["eri_value"].to_numpy(dtype=np.float64)
+    for name in DIRECTION_FEATURES:
+        if name in frame:
+            radians = np.deg2rad(frame[name].to_numpy(dtype=np.float64))
+            data[f"{name}_sin"], data[f"{name}_cos"] = np.sin(radians), np.cos(radians)
+    bucket = stamps.dt.floor(pd.Timedelta(seconds=RESOLUTIONS[resolution])).to_numpy()
+    state = pd.DataFrame(data, index=pd.DatetimeIndex(bucket)).groupby(level=0).mean()
+    return state.dropna(axis=1, how="all")
+
+
+@dataclass(frozen=True)
+class AnalogMatch:
+    """KR: 유사 과거 시점과 이후 전개입니다. / EN: One analog time, its distance, state and what followed."""
+
+    timestamp: pd.Timestamp
+    distance: float
+    state: Dict[str, float]
+    outcome: Dict[str, float | int | None]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp.isoformat(),
+            "distance": round(self.distance, 4),
+            "state": self.state,
+            "next": self.outcome,
+        }
+
+
+@dataclass
+class AnalogIndex:
+    """KR: 지점별 표준화 상태 벡터 색인입니다. / EN: Per-location index of standardised state vectors.
+
+    Each column is z-scored with the location's own mean/std (missing values become 0, the mean);
+    a sin/cos pair is weighted by 1/sqrt(2) so one direction weighs as much as one scalar feature.
+    ``backend`` is ``"kdtree"``, ``"brute"`` (one BLAS matrix-vector product) or ``"auto"``.
+    """
+
+    location: str
+    epoch_s: np.ndarray
+    columns: Tuple[str, ...]
+    mean: np.ndarray
+    std: np.ndarray
+    weights: np.ndarray
+    vectors: np.ndarray
+    raw: Dict[str, np.ndarray]
+    step_s: int
+    backend: str = "auto"
+    _tree: KDTree | None = field(default=None, repr=False)
+    _norms: np.ndarray | None = field(default=None, repr=False)
+
+    @classmethod
+    def build(
+        cls,
+        location: str,
+        frame: pd.DataFrame,
+        resolution: str = "h",
+        backend: str = "auto",
+        leaf_size: int = 40,
+    ) -> "AnalogIndex":
+        state = state_frame(frame, resolution)
+        values = state.to_numpy(dtype=np.float64)
+        columns = tuple(state.columns)
+        with np.errstate(invalid="ignore"):
+            mean = np.nanmean(values, axis=0) if len(values) else np.zeros(len(columns))
+            std = np.nanstd(values, axis=0) if len(values) else np.ones(len(columns))
+        std = np.where(np.isfinite(std) & (std > 0), std, 1.0)
+        weights = np.array([np.sqrt(0.5) if name.endswith(("_sin", "_cos")) else 1.0 for name in columns])
+        vectors = np.nan_to_num((values - mean) / std * weights).astype(np.float32)
+        if backend == "auto":
+            backend = "kdtree" if len(vectors) >= KDTREE_MIN_POINTS and len(columns) <= KDTREE_MAX_DIM else "brute"
+        index = cls(
+            location=location,
+            epoch_s=to_epoch_seconds(state.index),
+            columns=columns,
+            mean=mean,
+            std=std,
+            weights=weights,
+            vectors=vectors,
+            raw={name: state[name].to_numpy(dtype=np.float64) for name in state.columns},
+            step_s=RESOLUTIONS[resolution],
+            backend=backend,
+        )
+        if backend == "kdtree" and len(vectors):
+            index._tree = KDTree(vectors, leaf_size=leaf_size)
+        elif backend == "brute":
+            index._norms = np.einsum("ij,ij->i", vectors, vectors)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.epoch_s)
+
+    def encode(self, conditions: Mapping[str, float]) -> np.ndarray:
+        """KR: 조건 dict 를 표준화 벡터로 바꿉니다. / EN: Standardised vector for raw conditions.
+
+        Directions are given in degrees under their plain name. Unspecified features are NaN and are
+        left out of the distance rather than pinned to the mean.
+        """
+
+        raw = np.full(len(self.columns), np.nan)
+        for position, name in enumerate(self.columns):
+            base, _, part = name.rpartition("_")
+            if part in ("sin", "cos") and base in conditions and conditions[base] is not None:
+                angle = np.deg2rad(float(conditions[base]))
+                raw[position] = np.sin(angle) if part == "sin" else np.cos(angle)
+            elif name in conditions and conditions[name] is not None:
+                raw[position] = float(conditions[name])
+        return ((raw - self.mean) / self.std * self.weights).astype(np.float32)
+
+    def position_at(self, when: Any) -> int | None:
+        """KR: 주어진 시각 이전 마지막 상태의 위치입니다. / EN: Position of the last state at or before ``when``."""
+
+        if not len(self):
+            return None
+        target = int(to_epoch_seconds([when])[0]) if not isinstance(when, (int, np.integer)) else int(when)
+        position = int(np.searchsorted(self.epoch_s, target, side="right")) - 1
+        return position if position >= 0 else None
+
+    def _nearest(self, vector: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        count = min(count, len(self))
+        known = ~np.isnan(vector)
+        if not known.all():
+            # Partial conditions: exact scan over the specified subspace only.
+            vectors, vector = self.vectors[:, known], vector[known]
+            norms = np.einsum("ij,ij->i", vectors, vectors)
+        elif self._tree is not None:
+            distances, positions = self._tree.query(vector[None, :], k=count)
+            return positions[0], distances[0]
+        else:
+            vectors, norms = self.vectors, self._norms
+        squared = norms - 2.0 * (vectors @ vector) + float(vector @ vector)
+        squared = np.maximum(squared, 0.0)
+        if count < len(squared):
+            head = np.argpartition(squared, count - 1)[:count]
+            positions = head[np.argsort(squared[head], kind="stable")]
+        else:
+            positions = np.argsort(squared, kind="stable")
+        return positions, np.sqrt(squared[positions])
+
+    def query(
+        self,
+        vector: np.ndarray,
+        k: int = 10,
+        *,
+        exclude_around: int | None = None,
+        exclude_hours: float = 48.0,
+        horizon_hours: int = 24,
+    ) -> List[AnalogMatch]:
+        """KR: 가장 가까운 k 개 과거 상태입니다. / EN: The ``k`` nearest states and what followed each.
+
+        ``exclude_around`` (epoch seconds) drops states within ``exclude_hours`` of the query time so a
+        query never matches its own neighbouring hours. Only states with a full ``horizon_hours`` of
+        history after them can be matched.
+        """
+
+        if not len(self) or k <= 0:
+            return []
+        eligible_until = int(self.epoch_s[-1]) - horizon_hours * 3600
+        excluded = int(np.searchsorted(self.epoch_s, eligible_until, side="right"))
+        skip = len(self) - excluded
+        lo = hi = 0
+        if exclude_around is not None:
+            margin = int(exclude_hours * 3600)
+            lo = int(np.searchsorted(self.epoch_s, exclude_around - margin, side="left"))
+            hi = int(np.searchsorted(self.epoch_s, exclude_around + margin, side="right"))
+            skip += hi - lo
+        positions, distances = self._nearest(np.asarray(vector, dtype=np.float32), k + skip)
+        keep = self.epoch_s[positions] <= eligible_until
+        if exclude_around is not None:
+            keep &= (positions < lo) | (positions >= hi)
+        positions, distances = positions[keep][:k], distances[keep][:k]
+        return [self._match(int(position), float(distance), horizon_hours) for position, distance in zip(positions, distances)]
+
+    def query_at(self, when: Any, k: int = 10, **kwargs: Any) -> List[AnalogMatch]:
+        """KR: 특정 시각의 상태와 닮은 과거 시점입니다. / EN: Analogs of the stored state at ``when``."""
+
+        position = self.position_at(when)
+        if position is None:
+            return []
+        kwargs.setdefault("exclude_around", int(self.epoch_s[position]))
+        return self.query(self.vectors[position], k, **kwargs)
+
+    def _match(self, position: int, distance: float, horizon_hours: int) -> AnalogMatch:
+        start = int(self.epoch_s[position])
+        lo = position + 1
+        hi = int(np.searchsorted(self.epoch_s, start + horizon_hours * 3600, side="right"))
+        outcome: Dict[str, float | int | None] = {"hours": horizon_hours, "points": hi - lo}
+        for name in OUTCOME_COLUMNS:
+            if name not in self.raw:
+                continue
+            window = self.raw[name][lo:hi]
+            valid = window[~np.isnan(window)]
+            outcome[f"{name}_max"] = round(float(valid.max()), 3) if len(valid) else None
+            outcome[f"{name}_mean"] = round(float(valid.mean()), 3) if len(valid) else None
+        state = {
+            name: round(float(values[position]), 3)
+            for name, values in self.raw.items()
+            if not name.endswith(("_sin", "_cos")) and not np.isnan(values[position])
+        }
+        for name in DIRECTION_FEATURES:
+            if f"{name}_sin" in self.raw:
+                angle = np.degrees(np.arctan2(self.raw[f"{name}_sin"][position], self.raw[f"{name}_cos"][position]))
+                if not np.isnan(angle):
+                    state[name] = round(float(angle % 360.0), 1)
+        return AnalogMatch(from_epoch_seconds(np.array([start]), "UTC")[0], distance, state, outcome)
+
+
+class AnalogSearch:
+    """KR: 관측 저장소 위의 지점별 색인 캐시입니다. / EN: Lazily built per-location indexes over a store.
+
+    ``store`` is anything with ``scan(location=..., columns=...)`` returning an observation frame
+    (the columnar :class:`ObservationStore`); no embedding model is involved.
+    """
+
+    def __init__(self, store: Any, backend: str = "auto"):
+        self.store = store
+        self.backend = backend
+        self._indexes: Dict[Tuple[str, str], AnalogIndex] = {}
+
+    def index(self, location: str, resolution: str = "h") -> AnalogIndex:
+        key = (location, resolution)
+        if key not in self._indexes:
+            available = [name for name in (*SCALAR_FEATURES, *DIRECTION_FEATURES) if name != "eri"]
+            frame = self.store.scan(location=location, columns=available)
+            self._indexes[key] = AnalogIndex.build(location, frame, resolution, backend=self.backend)
+        return self._indexes[key]
+
+    def invalidate(self, location: str | None = None) -> None:
+        self._indexes = {key: value for key, value in self._indexes.items() if location is not None and key[0] != location}
+
+    def similar(
+        self,
+        location: str,
+        *,
+        at: Any = None,
+        conditions: Mapping[str, float] | None = None,
+        k: int = 10,
+        resolution: str = "h",
+        horizon_hours: int = 24,
+    ) -> List[AnalogMatch]:
+        """KR: 조건(또는 시각, 기본은 최신 상태)과 닮은 과거입니다. / EN: Analogs of conditions, a time, or the latest state."""
+
+        index = self.index(location, resolution)
+        if conditions:
+            return index.query(index.encode(conditions), k, horizon_hours=horizon_hours)
+        if not len(index):
+            return []
+        return index.query_at(at if at is not None else int(index.epoch_s[-1]), k, horizon_hours=horizon_hours)
+
+
+def summarize_outcomes(matches: Sequence[AnalogMatch]) -> Dict[str, float | None]:
+    """KR: 유사 사례 이후 전개의 요약입니다. / EN: Median of each outcome over the analogs."""
+
+    summary: Dict[str, float | None] = {}
+    for name in OUTCOME_COLUMNS:
+        for stat in ("max", "mean"):
+            key = f"{name}_{stat}"
+            values = [match.outcome.get(key) for match in matches if match.outcome.get(key) is not None]
+            summary[f"{key}_median"] = round(float(np.median(values)), 3) if values else None
+    return summary
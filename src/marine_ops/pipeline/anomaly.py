@@ -0,0 +1,329 @@
+"""Persistent and streaming sea-state anomaly detection."""
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Mapping, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import IsolationForest
+
+from src.marine_ops.pipeline.features import BASE_FEATURES, build_features
+from src.marine_ops.pipeline.parallel import pin_worker_threads, run_per_location, worker_n_jobs
+
+ANOMALY_FEATURES: List[str] = list(BASE_FEATURES)
+MODEL_TEMPLATE = "anomaly_{location}.joblib"
+# Floors keep z-scores finite on flat series (m, kt, ERI units).
+MIN_FEATURE_STD = {"hs_value": 0.05, "wind_value": 0.5, "eri_value": 0.01}
+MAD_TO_STD = 1.4826
+LOGGER = logging.getLogger(__name__)
+
+
+def _feature_floor(columns: Sequence[str]) -> np.ndarray:
+    return np.array([MIN_FEATURE_STD.get(col, 1e-6) for col in columns], dtype=float)
+
+
+def _contributions(z_scores: np.ndarray, columns: Sequence[str]) -> List[Dict[str, float]]:
+    """KR: 피처별 기여도(|z| 비율)를 계산합니다. / EN: Per-feature share of the absolute z-score."""
+
+    magnitude = np.abs(z_scores)
+    totals = magnitude.sum(axis=1, keepdims=True)
+    shares = np.divide(magnitude, totals, out=np.zeros_like(magnitude), where=totals > 0)
+    return [{col: round(float(value), 4) for col, value in zip(columns, row)} for row in shares]
+
+
+def _feature_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    features = build_features(frame, keep_columns=False, lags=(), windows=())
+    return features[["timestamp", *ANOMALY_FEATURES]]
+
+
+def _result_frame(
+    features: pd.DataFrame,
+    scores: np.ndarray,
+    threshold: float,
+    z_scores: np.ndarray,
+    method: str,
+    flags: np.ndarray | None = None,
+) -> pd.DataFrame:
+    result = features.reset_index(drop=True).copy()
+    result["score"] = scores
+    result["threshold"] = threshold
+    result["is_anomaly"] = scores >= threshold if flags is None else flags
+    result["contributions"] = _contributions(z_scores, ANOMALY_FEATURES)
+    result["method"] = method
+    return result
+
+
+@dataclass(slots=True)
+class AnomalyModel:
+    """KR: 위치별로 장기 이력에 학습된 IsolationForest입니다. / EN: IsolationForest fitted once on long history."""
+
+    location: str
+    detector: IsolationForest
+    threshold: float
+    median: np.ndarray
+    scale: np.ndarray
+    fitted_at: str
+    rows: int
+
+    def score(self, features: pd.DataFrame) -> pd.DataFrame:
+        """KR: 새 행을 배치로 점수화합니다. / EN: Score new rows in one batch; higher is more anomalous."""
+
+        values = features[ANOMALY_FEATURES].to_numpy(dtype=float)
+        scores = -pin_worker_threads(self.detector).score_samples(values)
+        z_scores = (values - self.median) / self.scale
+        return _result_frame(features, scores, self.threshold, z_scores, "isolation_forest")
+
+
+class AnomalyModelStore:
+    """KR: 위치별 이상탐지 모델 캐시입니다. / EN: On-disk cache of per-location anomaly models."""
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        *,
+        contamination: float = 0.01,
+        n_estimators: int = 100,
+        max_age_hours: float = 24 * 7,
+        min_rows: int = 24 * 14,
+        random_state: int = 42,
+        n_jobs: int | None = -1,
+    ) -> None:
+        self.cache_dir = Path(cache_dir).expanduser().resolve()
+        self.contamination = contamination
+        self.n_estimators = n_estimators
+        self.max_age_hours = max_age_hours
+        self.min_rows = min_rows
+        self.random_state = random_state
+        self.n_jobs = n_jobs
+        self._models: Dict[str, AnomalyModel] = {}
+
+    def _path(self, location: str) -> Path:
+        return self.cache_dir / MODEL_TEMPLATE.format(location=location)
+
+    def load(self, location: str) -> AnomalyModel | None:
+        if location in self._models:
+            return self._models[location]
+        path = self._path(location)
+        if not path.exists():
+            return None
+        try:
+            model = joblib.load(path)
+        except Exception as exc:  # noqa: BLE001
+            LOGGER.warning("Failed to load anomaly model %s: %s", path, exc)
+            return None
+        self._models[location] = model
+        return model
+
+    def is_stale(self, model: AnomalyModel | None) -> bool:
+        if model is None:
+            return True
+        fitted_at = pd.Timestamp(model.fitted_at)
+        return pd.Timestamp.now(tz="UTC") - fitted_at > pd.Timedelta(hours=self.max_age_hours)
+
+    def fit(self, location: str, history: pd.DataFrame) -> AnomalyModel | None:
+        """KR: 장기 이력으로 모델을 학습하고 저장합니다. / EN: Fit on long history and persist the model."""
+
+        features = _feature_frame(history)
+        if len(features) < self.min_rows:
+            LOGGER.info("Not enough history to fit anomaly model for %s (%d rows)", location, len(features))
+            return None
+        values = features[ANOMALY_FEATURES].to_numpy(dtype=float)
+        detector = IsolationForest(
+            n_estimators=self.n_estimators,
+            contamination="auto",
+            random_state=self.random_state,
+            n_jobs=worker_n_jobs(self.n_jobs),
+        )
+        detector.fit(values)
+        train_scores = -detector.score_samples(values)
+        # persist the configured value; a model fitted in a pool worker is still pinned when scored there
+        detector.set_params(n_jobs=self.n_jobs)
+        median = np.median(values, axis=0)
+        mad = np.median(np.abs(values - median), axis=0) * MAD_TO_STD
+        model = AnomalyModel(
+            location=location,
+            detector=detector,
+            threshold=float(np.quantile(train_scores, 1.0 - self.contamination)),
+            median=median,
+            scale=np.maximum(mad, _feature_floor(ANOMALY_FEATURES)),
+            fitted_at=datetime.now(timezone.utc).isoformat(),
+            rows=len(values),
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        joblib.dump(model, self._path(location))
+        self._models[location] = model
+        return model
+
+    def stale_locations(self, locations: Sequence[str]) -> List[str]:
+        """KR: 재학습이 필요한 위치 목록입니다. / EN: Locations whose cached model is missing or stale."""
+
+        return [location for location in locations if self.is_stale(self.load(location))]
+
+    def ensure(self, location: str, history: pd.DataFrame | None) -> AnomalyModel | None:
+        """KR: 캐시 모델을 반환하고 필요 시 재학습합니다. / EN: Return the cached model, refitting only when stale."""
+
+        model = self.load(location)
+        if self.is_stale(model) and history is not None and not history.empty:
+            model = self.fit(location, history) or model
+        return model
+
+
+class StreamingAnomalyDetector:
+    """KR: 지수가중 평균/분산 기반 온라인 z-score 탐지기입니다. / EN: Online robust z-scores on EW mean/variance.
+
+    State per location is a handful of floats kept in a small JSON file. Each hour updates the state
+    at most once; deviations are winsorised at ``clip`` sigmas before updating so that a single spike
+    does not inflate the variance.
+    """
+
+    def __init__(
+        self,
+        state_path: str | Path | None = None,
+        *,
+        halflife_hours: float = 24.0,
+        threshold: float = 3.0,
+        warmup: int = 24,
+        clip: float = 4.0,
+    ) -> None:
+        self.state_path = Path(state_path).expanduser().resolve() if state_path else None
+        self.halflife_hours = halflife_hours
+        self.threshold = threshold
+        self.warmup = warmup
+        self.clip = clip
+        self.state: Dict[str, Dict[str, object]] = {}
+        if self.state_path and self.state_path.exists():
+            try:
+                self.state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError) as exc:
+                LOGGER.warning("Discarding unreadable anomaly state %s: %s", self.state_path, exc)
+
+    def score(self, location: str, features: pd.DataFrame) -> pd.DataFrame:
+        """KR: 행을 점수화하고 새 시점으로 상태를 갱신합니다. / EN: Score rows, updating state with unseen hours."""
+
+        values = features[ANOMALY_FEATURES].to_numpy(dtype=float)
+        times = pd.to_datetime(features["timestamp"], utc=True).to_numpy(dtype="datetime64[s]").astype(np.int64)
+        floor = _feature_floor(ANOMALY_FEATURES)
+        entry = self.state.get(location)
+        if entry:
+            mean = np.asarray(entry["mean"], dtype=float)
+            var = np.asarray(entry["var"], dtype=float)
+            count = int(entry["count"])
+            last = int(entry["last_epoch"])
+        else:
+            mean = values[0].copy() if len(values) else np.zeros(len(ANOMALY_FEATURES))
+            var = floor**2
+            count = 0
+            last = int(times[0]) - 3600 if len(times) else 0
+
+        z_scores = np.zeros_like(values)
+        flags = np.zeros(len(values), dtype=bool)
+        for i, (row, epoch) in enumerate(zip(values, times)):
+            std = np.maximum(np.sqrt(var), floor)
+            deviation = row - mean
+            z_scores[i] = deviation / std
+            flags[i] = count >= self.warmup and bool(np.nanmax(np.abs(z_scores[i])) >= self.threshold)
+            if epoch <= last or np.isnan(row).any():
+                continue
+            alpha = 1.0 - 0.5 ** (((epoch - last) / 3600.0) / self.halflife_hours)
+            clipped = np.clip(deviation, -self.clip * std, self.clip * std)
+            mean = mean + alpha * clipped
+            var = (1.0 - alpha) * (var + alpha * clipped**2)
+            count += 1
+            last = int(epoch)
+
+        self.state[location] = {
+            "mean": mean.tolist(),
+            "var": var.tolist(),
+            "count": count,
+            "last_epoch": last,
+            "features": ANOMALY_FEATURES,
+        }
+        scores = np.nanmax(np.abs(z_scores), axis=1) if len(values) else np.zeros(0)
+        return _result_frame(features, scores, self.threshold, z_scores, "ewm_zscore", flags=flags)
+
+    def save(self) -> None:
+        if not self.state_path:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(json.dumps(self.state), encoding="utf-8")
+
+
+def anomaly_records(result: pd.DataFrame) -> List[Dict[str, object]]:
+    """KR: 탐지 결과를 보고서 레코드로 변환합니다. / EN: Convert flagged rows into report records."""
+
+    flagged = result.loc[result["is_anomaly"]]
+    records: List[Dict[str, object]] = []
+    for row in flagged.itertuples(index=False):
+        contributions = row.contributions
+        driver = max(contributions, key=contributions.get) if contributions else None
+        records.append(
+            {
+                "timestamp": row.timestamp.isoformat(),
+                "eri_value": float(row.eri_value),
+                "hs_value": float(row.hs_value),
+                "wind_value": float(row.wind_value),
+                "score": round(float(row.score), 4),
+                "threshold": round(float(row.threshold), 4),
+                "contributions": contributions,
+                "message": f"{row.method} score {float(row.score):.2f} ≥ {float(row.threshold):.2f}"
+                + (f", driven by {driver}" if driver else ""),
+            }
+        )
+    return records
+
+
+def _score_location_task(location: str, frame: pd.DataFrame, context: tuple) -> tuple:
+    """KR: 단일 위치 점수화 작업입니다. / EN: Score one location (worker task); returns streaming state too."""
+
+    store, history, streaming, window_hours = context
+    features = _feature_frame(frame)
+    if features.empty:
+        return None, None
+    last_ts = features["timestamp"].max()
+    recent = features.loc[features["timestamp"] >= last_ts - pd.Timedelta(hours=window_hours)]
+    model = store.ensure(location, (history or {}).get(location)) if store is not None else None
+    if model is not None:
+        return model.score(recent), None
+    return streaming.score(location, recent), streaming.state.get(location)
+
+
+def score_locations(
+    fused_frames: Mapping[str, pd.DataFrame],
+    *,
+    store: AnomalyModelStore | None = None,
+    history: Mapping[str, pd.DataFrame] | None = None,
+    streaming: StreamingAnomalyDetector | None = None,
+    window_hours: int = 72,
+    max_workers: int | None = 1,
+    timings: Dict[str, float] | None = None,
+) -> Dict[str, pd.DataFrame]:
+    """KR: 위치별 최근 구간을 점수화합니다. / EN: Score each location's recent window.
+
+    A cached (or freshly refitted) IsolationForest is used when available; otherwise rows go through
+    the streaming EW z-score detector, whose per-location state is merged back from the workers.
+    """
+
+    streaming = streaming or StreamingAnomalyDetector()
+    items = {location: frame for location, frame in fused_frames.items() if frame is not None and not frame.empty}
+    run = run_per_location(
+        _score_location_task,
+        items,
+        context=(store, history, streaming, window_hours),
+        max_workers=max_workers,
+    )
+    if timings is not None:
+        timings.update(run.timings)
+    results: Dict[str, pd.DataFrame] = {}
+    for location, (result, state_entry) in run.results.items():
+        if result is None:
+            continue
+        if state_entry is not None:
+            streaming.state[location] = state_entry
+        results[location] = result
+    return results
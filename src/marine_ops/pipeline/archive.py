@@ -0,0 +1,278 @@
+"""Append-only archive of fused pipeline runs feeding the ML history table."""
+from __future__ import annotations
+
+import logging
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.marine_ops.core.schema import ERIPoint
+from src.marine_ops.pipeline.features import KT_PER_MS
+from src.marine_ops.pipeline.history import DEFAULT_TABLE_NAME
+
+DEFAULT_ARCHIVE_PATH = Path("data/historical_marine_metrics.sqlite")
+ARCHIVE_TABLE = "marine_run_archive"
+FALLBACK_LATEST_TABLE = "marine_ml_latest"
+# Fused-frame columns archived as REAL; names match the feature-engine aliases.
+ARCHIVE_COLUMNS = (
+    "wave_height",
+    "wave_period",
+    "wave_direction",
+    "swell_wave_height",
+    "swell_wave_period",
+    "swell_wave_direction",
+    "wind_speed_kt",
+    "wind_gusts_kt",
+    "wind_direction_10m",
+    "visibility_km",
+    "eri",
+)
+DEFAULT_SUPERSEDED_AFTER_HOURS = 72
+DEFAULT_RETENTION_DAYS = 730
+LOGGER = logging.getLogger(__name__)
+
+
+def run_identifier(run_ts: datetime) -> str:
+    """KR: 실행 시각 기반 식별자입니다. / EN: Stable run identifier (``YYYYMMDDTHHMMZ``) for a run timestamp."""
+
+    stamp = run_ts.astimezone(timezone.utc) if run_ts.tzinfo else run_ts.replace(tzinfo=timezone.utc)
+    return stamp.strftime("%Y%m%dT%H%MZ")
+
+
+def _hourly_decisions(decisions: Mapping[str, Mapping[str, Mapping[str, object]]], index: pd.DatetimeIndex) -> np.ndarray:
+    labels = np.full(len(index), None, dtype=object)
+    if not len(index):
+        return labels
+    for parts in decisions.values():
+        for entry in parts.values():
+            try:
+                start = pd.Timestamp(entry["start"]).tz_convert("UTC")
+                end = pd.Timestamp(entry["end"]).tz_convert("UTC")
+            except (KeyError, TypeError, ValueError):
+                continue
+            mask = (index >= start) & (index < end)
+            labels[mask] = entry.get("decision")
+    return labels
+
+
+def archive_frame(
+    location: str,
+    frame: pd.DataFrame,
+    *,
+    eri_points: Sequence[ERIPoint] | None = None,
+    decisions: Mapping[str, Mapping[str, Mapping[str, object]]] | None = None,
+) -> pd.DataFrame:
+    """KR: 융합 프레임을 보관용 행으로 변환합니다. / EN: Project one fused frame onto the archive columns."""
+
+    if frame is None or frame.empty or not isinstance(frame.index, pd.DatetimeIndex):
+        return pd.DataFrame()
+    index = frame.index.tz_localize("UTC") if frame.index.tz is None else frame.index.tz_convert("UTC")
+    rows = pd.DataFrame(index=index)
+    for column in ARCHIVE_COLUMNS:
+        if column in frame.columns:
+            rows[column] = pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=float)
+        else:
+            rows[column] = np.nan
+    if "wind_speed_kt" in rows and rows["wind_speed_kt"].isna().all() and "wind_speed_10m" in frame.columns:
+        rows["wind_speed_kt"] = pd.to_numeric(frame["wind_speed_10m"], errors="coerce").to_numpy(dtype=float) * KT_PER_MS
+    if eri_points:
+        eri = pd.Series(
+            [point.eri_value for point in eri_points],
+            index=pd.to_datetime([point.timestamp for point in eri_points], utc=True),
+            dtype=float,
+        )
+        eri = eri[~eri.index.duplicated(keep="last")]
+        rows["eri"] = eri.reindex(index).to_numpy()
+    rows["decision"] = _hourly_decisions(decisions or {}, index)
+    rows = rows[~rows.index.duplicated(keep="last")]
+    rows.insert(0, "location", location)
+    rows.insert(1, "timestamp", rows.index.strftime("%Y-%m-%dT%H:%M:%S+00:00"))
+    return rows.reset_index(drop=True)
+
+
+class RunArchive:
+    """KR: 실행별 시간 단위 행을 보관하는 SQLite 저장소입니다. / EN: SQLite archive of hourly rows per run.
+
+    ``marine_run_archive`` keeps every run keyed by (location, timestamp, run_id); writes are idempotent
+    upserts. A companion "latest analysis per hour" table holds, for each (location, timestamp), the row
+    of the most recently issued run and is maintained incrementally on write. It is named
+    ``marine_ml_history`` — the trainer's default table — unless a foreign table already owns that name.
+    """
+
+    def __init__(self, path: str | Path = DEFAULT_ARCHIVE_PATH) -> None:
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            self.latest_table = self._resolve_latest_table(conn)
+            self._create_tables(conn)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """KR: 트랜잭션 후 연결을 닫습니다. / EN: One transaction on a fresh connection, closed on exit.
+
+        ``sqlite3.Connection`` as a context manager only commits or rolls back; it never closes.
+        """
+
+        conn = sqlite3.connect(self.path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _resolve_latest_table(conn: sqlite3.Connection) -> str:
+        row = conn.execute(
+            "SELECT type FROM sqlite_master WHERE name = ?",
+            (DEFAULT_TABLE_NAME,),
+        ).fetchone()
+        if row is None:
+            return DEFAULT_TABLE_NAME
+        columns = {info[1] for info in conn.execute(f"PRAGMA table_info({DEFAULT_TABLE_NAME})")}
+        if row[0] == "table" and "run_id" in columns:
+            return DEFAULT_TABLE_NAME
+        LOGGER.info("Table %s exists with a foreign schema; archive latest view uses %s", DEFAULT_TABLE_NAME, FALLBACK_LATEST_TABLE)
+        return FALLBACK_LATEST_TABLE
+
+    def _create_tables(self, conn: sqlite3.Connection) -> None:
+        value_columns = ", ".join(f"{name} REAL" for name in ARCHIVE_COLUMNS)
+        for table in (ARCHIVE_TABLE, self.latest_table):
+            key = "location, timestamp, run_id" if table == ARCHIVE_TABLE else "location, timestamp"
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    location TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    run_id TEXT NOT NULL,
+                    issued_at TEXT NOT NULL,
+                    lead_hours INTEGER NOT NULL,
+                    {value_columns},
+                    decision TEXT,
+                    PRIMARY KEY ({key})
+                ) WITHOUT ROWID
+                """
+            )
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{ARCHIVE_TABLE}_run ON {ARCHIVE_TABLE}(run_id)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.latest_table}_ts ON {self.latest_table}(timestamp)")
+        conn.commit()
+
+    def write_run(
+        self,
+        run_ts: datetime,
+        frames: Mapping[str, pd.DataFrame],
+        *,
+        eri: Mapping[str, Sequence[ERIPoint]] | None = None,
+        decisions: Mapping[str, Mapping[str, Mapping[str, Mapping[str, object]]]] | None = None,
+    ) -> int:
+        """KR: 한 실행의 행을 upsert 합니다. / EN: Upsert one run's hourly rows; re-running is a no-op."""
+
+        run_id = run_identifier(run_ts)
+        issued = pd.Timestamp(run_ts)
+        issued = issued.tz_localize("UTC") if issued.tzinfo is None else issued.tz_convert("UTC")
+        parts: List[pd.DataFrame] = []
+        for location, frame in frames.items():
+            rows = archive_frame(
+                location,
+                frame,
+                eri_points=(eri or {}).get(location),
+                decisions=(decisions or {}).get(location),
+            )
+            if not rows.empty:
+                parts.append(rows)
+        if not parts:
+            return 0
+        rows = pd.concat(parts, ignore_index=True)
+        valid = pd.to_datetime(rows["timestamp"], utc=True)
+        rows.insert(2, "run_id", run_id)
+        rows.insert(3, "issued_at", issued.strftime("%Y-%m-%dT%H:%M:%S+00:00"))
+        rows.insert(4, "lead_hours", ((valid - issued) / pd.Timedelta(hours=1)).round().astype(int).to_numpy())
+        columns = list(rows.columns)
+        records = [
+            tuple(None if isinstance(value, float) and np.isnan(value) else value for value in record)
+            for record in rows.itertuples(index=False, name=None)
+        ]
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{name} = excluded.{name}" for name in columns[3:])
+        with self._connect() as conn:
+            conn.executemany(
+                f"INSERT INTO {ARCHIVE_TABLE} ({', '.join(columns)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(location, timestamp, run_id) DO UPDATE SET {updates}",
+                records,
+            )
+            conn.executemany(
+                f"INSERT INTO {self.latest_table} ({', '.join(columns)}) VALUES ({placeholders}) "
+                f"ON CONFLICT(location, timestamp) DO UPDATE SET run_id = excluded.run_id, {updates} "
+                f"WHERE excluded.issued_at >= {self.latest_table}.issued_at",
+                records,
+            )
+            conn.commit()
+        LOGGER.info("Archived run %s: %d rows into %s", run_id, len(records), self.path)
+        return len(records)
+
+    def compact(
+        self,
+        *,
+        now: datetime | None = None,
+        superseded_after_hours: int = DEFAULT_SUPERSEDED_AFTER_HOURS,
+        retention_days: int = DEFAULT_RETENTION_DAYS,
+        vacuum: bool = False,
+    ) -> Dict[str, int]:
+        """KR: 대체된 예보 실행과 만료 행을 정리합니다. / EN: Drop superseded runs and rows past retention.
+
+        For valid times older than ``superseded_after_hours`` only the latest issue is kept in the run
+        archive; anything older than ``retention_days`` is removed from both tables.
+        """
+
+        reference = pd.Timestamp(now or datetime.now(timezone.utc))
+        reference = reference.tz_localize("UTC") if reference.tzinfo is None else reference.tz_convert("UTC")
+        superseded_cutoff = (reference - pd.Timedelta(hours=superseded_after_hours)).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+        retention_cutoff = (reference - pd.Timedelta(days=retention_days)).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+        with self._connect() as conn:
+            superseded = conn.execute(
+                f"""
+                DELETE FROM {ARCHIVE_TABLE}
+                WHERE timestamp < ?
+                  AND EXISTS (
+                      SELECT 1 FROM {ARCHIVE_TABLE} AS newer
+                      WHERE newer.location = {ARCHIVE_TABLE}.location
+                        AND newer.timestamp = {ARCHIVE_TABLE}.timestamp
+                        AND newer.issued_at > {ARCHIVE_TABLE}.issued_at
+                  )
+                """,
+                (superseded_cutoff,),
+            ).rowcount
+            expired = conn.execute(f"DELETE FROM {ARCHIVE_TABLE} WHERE timestamp < ?", (retention_cutoff,)).rowcount
+            expired += conn.execute(f"DELETE FROM {self.latest_table} WHERE timestamp < ?", (retention_cutoff,)).rowcount
+            conn.commit()
+            if vacuum:
+                conn.execute("VACUUM")
+        return {"superseded": int(superseded), "expired": int(expired)}
+
+    def latest(self, locations: Iterable[str] | None = None, start: datetime | None = None) -> pd.DataFrame:
+        """KR: 시간별 최신 분석 행을 반환합니다. / EN: Latest-issue row per (location, hour)."""
+
+        clauses: List[str] = []
+        params: List[object] = []
+        selected = list(locations or [])
+        if selected:
+            clauses.append(f"location IN ({', '.join('?' for _ in selected)})")
+            params.extend(selected)
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(pd.Timestamp(start).tz_convert("UTC").strftime("%Y-%m-%dT%H:%M:%S+00:00"))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._connect() as conn:
+            frame = pd.read_sql_query(
+                f"SELECT * FROM {self.latest_table}{where} ORDER BY location, timestamp",
+                conn,
+                params=params,
+            )
+        frame["timestamp"] = pd.to_datetime(frame["timestamp"], utc=True)
+        return frame
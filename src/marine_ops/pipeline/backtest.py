@@ -0,0 +1,409 @@
+"""Rolling-origin backtest engine for the long-range ML forecaster."""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.impute import SimpleImputer
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from src.marine_ops.pipeline.features import build_features, resolve_schema
+from src.marine_ops.pipeline.parallel import run_per_location
+
+DEFAULT_LEAD_HOURS = (24, 48, 72, 96, 120, 144, 168)
+METRICS_CSV = "backtest_metrics.csv"
+METRICS_HTML = "backtest_metrics.html"
+METRICS_JSON = "backtest_summary.json"
+LOGGER = logging.getLogger(__name__)
+
+
+def _random_forest() -> Pipeline:
+    return Pipeline(
+        steps=[
+            ("imputer", SimpleImputer(strategy="median")),
+            ("model", RandomForestRegressor(n_estimators=128, min_samples_leaf=4, random_state=42, n_jobs=1)),
+        ]
+    )
+
+
+def _gradient_boosting() -> Pipeline:
+    return Pipeline(steps=[("model", HistGradientBoostingRegressor(max_iter=200, random_state=42))])
+
+
+def _ridge() -> Pipeline:
+    return Pipeline(
+        steps=[
+            ("imputer", SimpleImputer(strategy="median")),
+            ("scaler", StandardScaler()),
+            ("model", Ridge(alpha=1.0)),
+        ]
+    )
+
+
+BACKENDS = {
+    "random_forest": _random_forest,
+    "gradient_boosting": _gradient_boosting,
+    "ridge": _ridge,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Fold:
+    """KR: 롤링 원점 폴드 경계입니다. / EN: Rolling-origin fold boundaries (UTC)."""
+
+    index: int
+    train_end: pd.Timestamp
+    test_end: pd.Timestamp
+
+
+@dataclass(slots=True)
+class BacktestReport:
+    """KR: 백테스트 결과 요약입니다. / EN: Backtest outcome for one backend."""
+
+    backend: str
+    target_column: str
+    folds: List[Fold]
+    metrics: pd.DataFrame
+    reliability: pd.DataFrame
+    brier_go: float | None
+    predictions: pd.DataFrame = field(repr=False)
+    fold_timings: Dict[str, float] = field(default_factory=dict)
+
+
+def rolling_origin_folds(
+    timestamps: pd.Series,
+    *,
+    n_folds: int = 5,
+    test_hours: int = 24 * 7,
+    min_train_hours: int = 24 * 28,
+) -> List[Fold]:
+    """KR: 시간 순서를 지키는 폴드를 생성합니다. / EN: Build folds walking forward from the end of history."""
+
+    if timestamps.empty:
+        return []
+    start = timestamps.min()
+    end = timestamps.max()
+    folds: List[Fold] = []
+    for offset in range(n_folds, 0, -1):
+        train_end = end - pd.Timedelta(hours=test_hours * offset)
+        if train_end - start < pd.Timedelta(hours=min_train_hours):
+            continue
+        folds.append(Fold(index=len(folds), train_end=train_end, test_end=train_end + pd.Timedelta(hours=test_hours)))
+    return folds
+
+
+def _stack_leads(
+    features: pd.DataFrame,
+    feature_columns: Sequence[str],
+    target_column: str,
+    lead_hours: Sequence[int],
+) -> pd.DataFrame:
+    """KR: 리드타임별 타깃을 쌓은 학습 행렬을 만듭니다. / EN: Stack (origin, lead) rows with future targets."""
+
+    stacked: List[pd.DataFrame] = []
+    keyed = features.set_index(["location", "timestamp"])[target_column]
+    keyed = keyed[~keyed.index.duplicated(keep="last")]
+    for lead in lead_hours:
+        valid_time = features["timestamp"] + pd.Timedelta(hours=lead)
+        future = keyed.reindex(pd.MultiIndex.from_arrays([features["location"], valid_time])).to_numpy()
+        part = features[["location", "timestamp", *feature_columns]].copy()
+        part["lead_hours"] = float(lead)
+        part["target"] = future
+        stacked.append(part)
+    return pd.concat(stacked, ignore_index=True).dropna(subset=["target"])
+
+
+class FoldFeatureCache:
+    """KR: 폴드별 피처 행렬 캐시입니다. / EN: ``.npz`` cache of per-fold design matrices.
+
+    Keys hash the data fingerprint, feature set, leads and fold bounds, so running the same backtest
+    with another backend only repeats the fits.
+    """
+
+    def __init__(self, cache_dir: str | Path) -> None:
+        self.cache_dir = Path(cache_dir).expanduser().resolve()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, fingerprint: str, fold: Fold) -> Path:
+        return self.cache_dir / f"fold_{fingerprint}_{fold.index}.npz"
+
+    def materialise(
+        self,
+        stacked: pd.DataFrame,
+        fingerprint: str,
+        folds: Sequence[Fold],
+        max_lead: int,
+    ) -> Dict[str, str]:
+        paths: Dict[str, str] = {}
+        columns = [col for col in stacked.columns if col not in {"location", "timestamp", "target"}]
+        for fold in folds:
+            path = self.path(fingerprint, fold)
+            paths[f"fold{fold.index}"] = str(path)
+            if path.exists():
+                continue
+            # Training targets must be observed before the fold origin.
+            valid_time = stacked["timestamp"] + pd.to_timedelta(stacked["lead_hours"], unit="h")
+            train_mask = valid_time < fold.train_end
+            test_mask = (stacked["timestamp"] >= fold.train_end) & (stacked["timestamp"] < fold.test_end)
+            train = stacked.loc[train_mask]
+            test = stacked.loc[test_mask]
+            np.savez(
+                path,
+                X_train=train[columns].to_numpy(dtype=np.float32),
+                y_train=train["target"].to_numpy(dtype=np.float32),
+                X_test=test[columns].to_numpy(dtype=np.float32),
+                y_test=test["target"].to_numpy(dtype=np.float32),
+                test_location=np.asarray(test["location"].astype(str), dtype=np.str_),
+                test_timestamp=test["timestamp"].dt.tz_convert("UTC").dt.tz_localize(None).to_numpy("datetime64[ns]"),
+                test_lead=test["lead_hours"].to_numpy(dtype=np.int16),
+                max_lead=np.array([max_lead]),
+            )
+        return paths
+
+
+def _fingerprint(frame: pd.DataFrame, payload: Dict[str, object]) -> str:
+    digest = hashlib.sha1()
+    digest.update(np.asarray(pd.util.hash_pandas_object(frame, index=False)).tobytes())
+    digest.update(json.dumps(payload, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _fit_fold_task(name: str, cache_path: str, backend: str) -> Dict[str, np.ndarray]:
+    """KR: 단일 폴드를 학습/예측합니다. / EN: Fit one fold from its cached matrices (worker task)."""
+
+    data = np.load(cache_path, allow_pickle=False)
+    if len(data["y_train"]) == 0 or len(data["y_test"]) == 0:
+        return {}
+    model = BACKENDS[backend]()
+    model.fit(data["X_train"], data["y_train"])
+    return {
+        "predicted": model.predict(data["X_test"]).astype(np.float32),
+        "observed": data["y_test"],
+        "location": data["test_location"],
+        "timestamp": data["test_timestamp"],
+        "lead_hours": data["test_lead"],
+    }
+
+
+def _normal_cdf(values: np.ndarray) -> np.ndarray:
+    return 0.5 * (1.0 + _erf(values / math.sqrt(2.0)))
+
+
+def _erf(values: np.ndarray) -> np.ndarray:
+    # Abramowitz-Stegun 7.1.26, |error| < 1.5e-7; avoids a scipy dependency.
+    sign = np.sign(values)
+    x = np.abs(values)
+    t = 1.0 / (1.0 + 0.3275911 * x)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    return sign * (1.0 - poly * np.exp(-x * x))
+
+
+def _go_probabilities(predictions: pd.DataFrame, go_threshold: float) -> pd.DataFrame:
+    """KR: 이전 폴드 RMSE로 GO 확률을 추정합니다. / EN: P(target <= gate) using the previous fold's RMSE.
+
+    The spread for fold k comes from fold k-1 at the same lead, so probabilities stay out-of-sample;
+    the first fold is therefore left unscored.
+    """
+
+    errors = predictions.assign(sq=(predictions["predicted"] - predictions["observed"]) ** 2)
+    rmse = errors.groupby(["fold", "lead_hours"])["sq"].mean().pow(0.5).rename("sigma").reset_index()
+    rmse["fold"] = rmse["fold"] + 1
+    scored = predictions.merge(rmse, on=["fold", "lead_hours"], how="inner")
+    sigma = scored["sigma"].clip(lower=1e-6).to_numpy()
+    scored["p_go"] = _normal_cdf((go_threshold - scored["predicted"].to_numpy()) / sigma)
+    scored["go_observed"] = (scored["observed"] <= go_threshold).astype(float)
+    return scored
+
+
+def _reliability(scored: pd.DataFrame, bins: int = 10) -> pd.DataFrame:
+    if scored.empty:
+        return pd.DataFrame(columns=["bin", "p_mean", "observed_freq", "n"])
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    bucket = np.clip(np.digitize(scored["p_go"], edges) - 1, 0, bins - 1)
+    table = (
+        scored.assign(bin=bucket)
+        .groupby("bin")
+        .agg(p_mean=("p_go", "mean"), observed_freq=("go_observed", "mean"), n=("go_observed", "size"))
+        .reset_index()
+    )
+    return table
+
+
+def run_backtest(
+    history: pd.DataFrame,
+    *,
+    target_column: str = "wave_height",
+    backend: str = "random_forest",
+    lead_hours: Sequence[int] = DEFAULT_LEAD_HOURS,
+    n_folds: int = 5,
+    test_hours: int = 24 * 7,
+    min_train_hours: int = 24 * 28,
+    go_threshold: float = 1.0,
+    cache_dir: str | Path = "cache/ml_forecast/backtest",
+    max_workers: int | None = 1,
+) -> BacktestReport:
+    """KR: 이력을 재생하며 롤링 원점 백테스트를 수행합니다. / EN: Replay history with rolling-origin folds.
+
+    Features come from the shared feature engine and are stacked once per lead time. Folds are fitted in parallel and scored as
+    MAE/RMSE per (location, lead) plus Brier score and reliability for the GO event.
+    """
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backtest backend '{backend}'. Choose from {sorted(BACKENDS)}")
+    if "timestamp" not in history.columns:
+        raise ValueError("Backtest history requires a 'timestamp' column")
+    if target_column not in history.columns:
+        raise ValueError(f"Target column '{target_column}' is missing from history")
+    working = history if "location" in history.columns else history.assign(location="UNKNOWN")
+    features = build_features(working, schema=resolve_schema(working.columns))
+    # Every feature is observed at the origin and every target lies ``lead`` hours later, so the
+    # current target value (persistence) is a legitimate predictor here.
+    feature_columns = [
+        col
+        for col, dtype in features.dtypes.items()
+        if col not in {"location", "timestamp"} and pd.api.types.is_numeric_dtype(dtype)
+    ]
+    folds = rolling_origin_folds(
+        features["timestamp"],
+        n_folds=n_folds,
+        test_hours=test_hours,
+        min_train_hours=min_train_hours,
+    )
+    if not folds:
+        raise ValueError("History too short for the requested backtest folds")
+
+    fingerprint = _fingerprint(
+        working[["location", "timestamp", *[c for c in working.columns if c not in {"location", "timestamp"}]]],
+        {"features": feature_columns, "leads": list(lead_hours), "target": target_column, "folds": [str(f) for f in folds]},
+    )
+    cache = FoldFeatureCache(cache_dir)
+    fold_paths = {f"fold{fold.index}": cache.path(fingerprint, fold) for fold in folds}
+    if not all(path.exists() for path in fold_paths.values()):
+        stacked = _stack_leads(features, feature_columns, target_column, lead_hours)
+        cache.materialise(stacked, fingerprint, folds, max(lead_hours))
+    run = run_per_location(
+        _fit_fold_task,
+        {name: str(path) for name, path in fold_paths.items()},
+        context=backend,
+        max_workers=max_workers,
+    )
+
+    parts: List[pd.DataFrame] = []
+    for name, payload in run.results.items():
+        if not payload:
+            continue
+        part = pd.DataFrame(payload)
+        part["fold"] = int(name.removeprefix("fold"))
+        parts.append(part)
+    if not parts:
+        raise ValueError("Backtest folds produced no test rows")
+    predictions = pd.concat(parts, ignore_index=True)
+    predictions["timestamp"] = pd.to_datetime(predictions["timestamp"]).dt.tz_localize("UTC")
+    predictions["lead_hours"] = predictions["lead_hours"].astype(int)
+
+    error = predictions["predicted"].astype(float) - predictions["observed"].astype(float)
+    metrics = (
+        predictions.assign(abs_err=error.abs(), sq_err=error**2)
+        .groupby(["location", "lead_hours"])
+        .agg(mae=("abs_err", "mean"), rmse=("sq_err", "mean"), n=("abs_err", "size"))
+        .reset_index()
+    )
+    metrics["rmse"] = np.sqrt(metrics["rmse"])
+    scored = _go_probabilities(predictions, go_threshold)
+    brier = float(np.mean((scored["p_go"] - scored["go_observed"]) ** 2)) if not scored.empty else None
+    return BacktestReport(
+        backend=backend,
+        target_column=target_column,
+        folds=folds,
+        metrics=metrics,
+        reliability=_reliability(scored),
+        brier_go=brier,
+        predictions=predictions,
+        fold_timings=run.timings,
+    )
+
+
+def metrics_table_html(metrics: pd.DataFrame) -> str:
+    """KR: 보고서에 삽입할 소형 표를 만듭니다. / EN: Compact lead × location MAE/RMSE table for the report."""
+
+    if metrics is None or metrics.empty:
+        return "<p>No backtest metrics available.</p>"
+    locations = sorted(metrics["location"].astype(str).unique())
+    header = "".join(f"<th>{loc} MAE</th><th>{loc} RMSE</th>" for loc in locations)
+    indexed = metrics.set_index(["lead_hours", "location"])
+    rows: List[str] = []
+    for lead in sorted(metrics["lead_hours"].unique()):
+        cells: List[str] = []
+        for loc in locations:
+            if (lead, loc) in indexed.index:
+                record = indexed.loc[(lead, loc)]
+                cells.append(f"<td>{float(record['mae']):.3f}</td><td>{float(record['rmse']):.3f}</td>")
+            else:
+                cells.append("<td>-</td><td>-</td>")
+        rows.append(f"<tr><td>+{int(lead)}h</td>{''.join(cells)}</tr>")
+    return (
+        "<table class='table'><thead><tr><th>Lead</th>"
+        + header
+        + "</tr></thead><tbody>"
+        + "".join(rows)
+        + "</tbody></table>"
+    )
+
+
+def write_metrics_table(report: BacktestReport, out_dir: str | Path) -> Dict[str, Path]:
+    """KR: 백테스트 지표를 CSV/HTML/JSON으로 저장합니다. / EN: Persist metrics as CSV, HTML fragment and JSON."""
+
+    output_dir = Path(out_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    csv_path = output_dir / METRICS_CSV
+    html_path = output_dir / METRICS_HTML
+    json_path = output_dir / METRICS_JSON
+    report.metrics.to_csv(csv_path, index=False, float_format="%.4f")
+    html_path.write_text(metrics_table_html(report.metrics), encoding="utf-8")
+    summary = {
+        "backend": report.backend,
+        "target_column": report.target_column,
+        "folds": len(report.folds),
+        "brier_go": report.brier_go,
+        "reliability": report.reliability.to_dict(orient="records"),
+        "fold_timings": report.fold_timings,
+    }
+    json_path.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return {"csv": csv_path, "html": html_path, "json": json_path}
+
+
+def load_metrics_table(out_dir: str | Path) -> pd.DataFrame | None:
+    """KR: 저장된 백테스트 지표를 읽습니다. / EN: Load the persisted metrics table, if any."""
+
+    path = Path(out_dir) / METRICS_CSV
+    if not path.exists():
+        return None
+    return pd.read_csv(path)
+
+
+def compare_backends(history: pd.DataFrame, backends: Sequence[str], **kwargs) -> Tuple[pd.DataFrame, Dict[str, BacktestReport]]:
+    """KR: 여러 백엔드를 같은 폴드 캐시로 비교합니다. / EN: Compare backends on the same cached folds."""
+
+    reports = {name: run_backtest(history, backend=name, **kwargs) for name in backends}
+    summary = pd.DataFrame(
+        [
+            {
+                "backend": name,
+                "mae": float(report.metrics["mae"].mean()),
+                "rmse": float(report.metrics["rmse"].mean()),
+                "brier_go": report.brier_go,
+            }
+            for name, report in reports.items()
+        ]
+    )
+    return summary, reports
@@ -0,0 +1,172 @@
+"""Compact Parquet side outputs with a small headline index."""
+from __future__ import annotations
+
+import json
+import logging
+import numbers
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping
+
+import numpy as np
+import pandas as pd
+
+from src.marine_ops.pipeline.history import pyarrow_available
+from src.marine_ops.pipeline.report_model import ColumnTable, ReportModel, to_python
+
+INDEX_SUFFIX = "_index.json"
+COMPACT_TABLES = ("decisions", "long_range", "anomalies")
+LOGGER = logging.getLogger(__name__)
+
+
+def _arrow_column(values: np.ndarray):
+    import pyarrow as pa
+
+    if np.issubdtype(values.dtype, np.floating):
+        return pa.array(values.astype(np.float32), from_pandas=True)
+    if values.dtype == object:
+        if pd.api.types.infer_dtype(values, skipna=True) in ("datetime", "datetime64"):
+            return pa.array(pd.to_datetime(pd.Series(values), utc=True), from_pandas=True)
+        cleaned = [to_python(value) for value in values]
+        try:
+            return pa.array(cleaned, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return pa.array([None if value is None else str(value) for value in cleaned], type=pa.string())
+    return pa.array(values, from_pandas=True)
+
+
+def _write_parquet(table: ColumnTable, path: Path) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow = pa.table({name: _arrow_column(np.asarray(table.data[name])) for name in table.columns})
+    pq.write_table(arrow, path, compression="zstd")
+    return arrow.num_rows
+
+
+def _headline(model: ReportModel) -> Dict[str, Any]:
+    decisions: Dict[str, Dict[str, int]] = {}
+    for location, table in model.decision_tables.items():
+        labels = table.data.get("decision", np.array([], dtype=object))
+        decisions[location] = dict(Counter(str(label) for label in labels))
+    peak_eri: Dict[str, float | None] = {}
+    for location, records in model.anomalies.items():
+        values = [to_python(record.get("eri_value")) for record in records]
+        peaks = [float(value) for value in values if isinstance(value, numbers.Real) and not isinstance(value, bool)]
+        peak_eri[location] = max(peaks) if peaks else None
+    return {
+        "generated_at": model.local_ts.isoformat(),
+        "tz": model.tz,
+        "alerts": list(model.alerts),
+        "locations": list(model.location_ids),
+        "route_windows": len(model.route_windows),
+        "go_windows": [
+            window.get("label")
+            for window in model.route_windows
+            if window.get("agi_decision") == "GO" and window.get("das_decision") == "GO"
+        ],
+        "decision_counts": decisions,
+        "anomaly_counts": {location: len(records) for location, records in model.anomalies.items()},
+        "anomaly_peak_eri": peak_eri,
+        "ml_mode": model.ml_metadata.get("mode"),
+    }
+
+
+def write_compact_outputs(model: ReportModel, out_dir: str | Path = "out") -> Dict[str, Path]:
+    """KR: Parquet 표와 헤드라인 인덱스를 씁니다. / EN: Write per-table Parquet files plus an index JSON.
+
+    Tables are zstd-compressed with float32 values. The index holds headline fields and each table's
+    path, row count and columns, so consumers can decide what to open. Without pyarrow only the index
+    is written.
+    """
+
+    output_dir = Path(out_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stem = f"summary_3d_{model.timestamp_label}"
+    tables = {
+        "decisions": model.decision_table,
+        "long_range": model.long_range_table,
+        "anomalies": model.anomaly_table,
+    }
+    paths: Dict[str, Path] = {}
+    entries: Dict[str, Dict[str, Any]] = {}
+    arrow_ready = pyarrow_available()
+    if not arrow_ready:
+        LOGGER.info("pyarrow not installed; writing index without Parquet tables")
+    for name, table in tables.items():
+        entry: Dict[str, Any] = {"rows": len(table), "columns": list(table.columns), "path": None}
+        if arrow_ready and not table.empty:
+            path = output_dir / f"{stem}_{name}.parquet"
+            _write_parquet(table, path)
+            paths[name] = path
+            entry["path"] = path.name
+        entries[name] = entry
+    index = {"headline": _headline(model), "tables": entries}
+    index_path = output_dir / f"{stem}{INDEX_SUFFIX}"
+    index_path.write_text(json.dumps(index, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    paths["index"] = index_path
+    return paths
+
+
+def latest_index(out_dir: str | Path = "out", pattern: str = f"summary_3d_*{INDEX_SUFFIX}") -> Path | None:
+    """KR: 가장 최근 인덱스 파일을 찾습니다. / EN: Most recently written index file, if any."""
+
+    candidates = list(Path(out_dir).glob(pattern))
+    return max(candidates, key=lambda path: path.stat().st_mtime) if candidates else None
+
+
+def load_index(path: str | Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def read_compact_table(
+    index_path: str | Path,
+    table: str,
+    columns: Iterable[str] | None = None,
+) -> pd.DataFrame:
+    """KR: 필요한 열만 Parquet 에서 읽습니다. / EN: Read only the requested columns of one compact table."""
+
+    if table not in COMPACT_TABLES:
+        raise ValueError(f"Unknown compact table '{table}'. Choose from {COMPACT_TABLES}")
+    index_path = Path(index_path)
+    entry: Mapping[str, Any] = load_index(index_path)["tables"].get(table, {})
+    if not entry.get("path"):
+        return pd.DataFrame(columns=list(columns or entry.get("columns", [])))
+    import pyarrow.parquet as pq
+
+    available = entry.get("columns", [])
+    selected: List[str] | None = None
+    if columns is not None:
+        selected = [name for name in columns if name in available]
+    return pq.read_table(index_path.parent / entry["path"], columns=selected).to_pandas()
+
+
+def headline_digest(index_path: str | Path) -> str:
+    """KR: 알림용 짧은 요약 텍스트입니다. / EN: Short notification text from the index and decision column.
+
+    Reads the headline block and only the ``location``/``day``/``daypart``/``decision`` columns of the
+    decisions table, never the full summary JSON.
+    """
+
+    headline = load_index(index_path)["headline"]
+    lines = [f"72H outlook ({headline.get('generated_at', 'n/a')})"]
+    go_windows = headline.get("go_windows") or []
+    lines.append(f"GO windows: {', '.join(map(str, go_windows)) if go_windows else 'none'}")
+    for location, counts in (headline.get("decision_counts") or {}).items():
+        if counts:
+            lines.append(f"{location}: " + ", ".join(f"{label} {count}" for label, count in sorted(counts.items())))
+    try:
+        decisions = read_compact_table(index_path, "decisions", columns=["location", "day", "daypart", "decision"])
+    except ImportError:
+        decisions = pd.DataFrame()
+    if "decision" in decisions:
+        blocked = decisions.loc[decisions["decision"] == "NO-GO"]
+        if not blocked.empty:
+            lines.append(
+                "NO-GO: " + ", ".join(f"{row.location} {row.day} {row.daypart}" for row in blocked.itertuples(index=False))
+            )
+    for location, peak in (headline.get("anomaly_peak_eri") or {}).items():
+        if peak is not None:
+            lines.append(f"Anomaly peak ERI {location}: {peak:.1f}")
+    lines.extend(f"NCM alert: {alert}" for alert in headline.get("alerts") or [])
+    return "\n".join(lines)
@@ -40,6 +40,10 @@ class PipelineConfig:
     ml_target_column: Optional[str] = None
     ml_force_retrain: bool = False
     ml_forecast_horizon_hours: Optional[int] = None
+    ml_history_window_hours: Optional[int] = None
+    ml_history_cache_dir: Optional[str] = None
+    ml_max_workers: Optional[int] = None
+    ml_archive_path: Optional[str] = None
 
     def location_ids(self) -> List[str]:
         return [loc.id for loc in self.locations]
@@ -138,6 +142,14 @@ def load_pipeline_config(path: str | Path = "config/locations.yaml") -> Pipeline
     ml_forecast_horizon_hours = _coalesce_ml_value("ml_forecast_horizon_hours", "forecast_horizon_hours")
     if ml_forecast_horizon_hours is not None:
         ml_forecast_horizon_hours = int(ml_forecast_horizon_hours)
+    ml_history_window_hours = _coalesce_ml_value("ml_history_window_hours", "history_window_hours")
+    if ml_history_window_hours is not None:
+        ml_history_window_hours = int(ml_history_window_hours)
+    ml_history_cache_dir = _coalesce_ml_value("ml_history_cache_dir", "history_cache_dir")
+    ml_max_workers = _coalesce_ml_value("ml_max_workers", "max_workers")
+    if ml_max_workers is not None:
+        ml_max_workers = int(ml_max_workers)
+    ml_archive_path = _coalesce_ml_value("ml_archive_path", "archive_path")
 
     return PipelineConfig(
         locations=locations,
@@ -157,4 +169,8 @@ def load_pipeline_config(path: str | Path = "config/locations.yaml") -> Pipeline
         ml_target_column=str(ml_target_column) if ml_target_column else None,
         ml_force_retrain=ml_force_retrain,
         ml_forecast_horizon_hours=ml_forecast_horizon_hours,
+        ml_history_window_hours=ml_history_window_hours,
+        ml_history_cache_dir=str(ml_history_cache_dir) if ml_history_cache_dir else None,
+        ml_max_workers=ml_max_workers,
+        ml_archive_path=str(ml_archive_path) if ml_archive_path else None,
     )
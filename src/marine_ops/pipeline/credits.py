@@ -0,0 +1,241 @@
+"""Daily credit ledger and per-cycle request planner for metered marine APIs."""
+from __future__ import annotations
+
+import json
+import math
+import os
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Sequence
+
+import pandas as pd
+
+from src.marine_ops.core.schema import MarineDataPoint, MarineTimeseries
+
+DEFAULT_LEDGER_DIR = Path("cache/credits")
+DEFAULT_CYCLE_HOURS = 3  # cron_automation collection cadence
+
+
+@dataclass(frozen=True)
+class ProviderPolicy:
+    """KR: 유료 제공자의 일일 한도와 호출 비용입니다. / EN: Daily quota and call cost of a metered provider.
+
+    ``cost_per_call`` is charged per ``cost_hours`` of requested horizon (WorldTides bills per 7 days of
+    heights). Responses are reused for ``refresh_hours``; ``horizon_hours`` (when set) is what one call
+    requests so later cycles can be served from the cached response.
+    """
+
+    daily_quota: int
+    cost_per_call: int = 1
+    cost_hours: int | None = None
+    refresh_hours: int = 6
+    horizon_hours: int | None = None
+
+    def cost(self, hours: int) -> int:
+        if not self.cost_hours:
+            return self.cost_per_call
+        return self.cost_per_call * max(1, math.ceil(hours / self.cost_hours))
+
+
+def default_policies() -> Dict[str, ProviderPolicy]:
+    """KR: 환경 변수로 조정 가능한 기본 정책입니다. / EN: Default policies, quotas overridable by env."""
+
+    return {
+        "stormglass": ProviderPolicy(
+            daily_quota=int(os.getenv("STORMGLASS_DAILY_QUOTA", "10")),
+            refresh_hours=6,
+        ),
+        # One multi-day tide call per site per day; tides are astronomical so the cache stays valid.
+        "worldtides": ProviderPolicy(
+            daily_quota=int(os.getenv("WORLDTIDES_DAILY_CREDITS", "4")),
+            cost_hours=7 * 24,
+            refresh_hours=24,
+            horizon_hours=7 * 24,
+        ),
+    }
+
+
+@dataclass(frozen=True)
+class PlannedCall:
+    """KR: 한 제공자/지점의 이번 주기 계획입니다. / EN: This cycle's decision for one provider and site."""
+
+    provider: str
+    site: str
+    action: str  # "call" | "cache" | "skip"
+    horizon_hours: int
+    cost: int
+    reason: str
+
+
+class CreditLedger:
+    """KR: 제공자별 UTC 일일 사용량을 JSON 으로 기록합니다. / EN: Per-provider daily credit usage on disk.
+
+    Usage resets at UTC midnight. :meth:`mark_exhausted` records a provider-side "not enough credits"
+    answer so the rest of the day is planned from cache instead of failing call by call.
+    """
+
+    def __init__(self, path: Path | str = DEFAULT_LEDGER_DIR / "ledger.json", clock: Callable[[], datetime] | None = None):
+        self.path = Path(path)
+        self._clock = clock or (lambda: datetime.now(timezone.utc))
+        self._data: Dict[str, Dict[str, object]] = (
+            json.loads(self.path.read_text(encoding="utf-8")) if self.path.exists() else {}
+        )
+
+    def now(self) -> datetime:
+        return self._clock()
+
+    def _entry(self, provider: str) -> Dict[str, object]:
+        today = self.now().date().isoformat()
+        entry = self._data.get(provider)
+        if entry is None or entry.get("day") != today:
+            entry = self._data[provider] = {"day": today, "spent": 0, "exhausted": False, "calls": []}
+        return entry
+
+    def spent(self, provider: str) -> int:
+        return int(self._entry(provider)["spent"])
+
+    def remaining(self, provider: str, policy: ProviderPolicy) -> int:
+        entry = self._entry(provider)
+        if entry["exhausted"]:
+            return 0
+        return max(0, policy.daily_quota - int(entry["spent"]))
+
+    def charge(self, provider: str, site: str, cost: int, horizon_hours: int) -> None:
+        entry = self._entry(provider)
+        entry["spent"] = int(entry["spent"]) + int(cost)
+        entry["calls"].append(
+            {"site": site, "cost": int(cost), "horizon_hours": int(horizon_hours), "at": self.now().isoformat()}
+        )
+        self.save()
+
+    def mark_exhausted(self, provider: str, reason: str) -> None:
+        entry = self._entry(provider)
+        entry["exhausted"] = True
+        entry["exhausted_reason"] = reason
+        self.save()
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self._data, indent=2), encoding="utf-8")
+
+
+class RequestPlanner:
+    """KR: 주기마다 가장 저렴한 호출 집합을 계획합니다. / EN: Plan the cheapest set of metered calls per cycle.
+
+    Remaining credits are spread over the collection cycles left in the UTC day. Sites are served in
+    ``site_priority`` order (the sites driving decisions first); a site whose cached response is still
+    within ``refresh_hours`` is served from cache, and a site with no cached data at all is funded even
+    when the per-cycle allowance is used up, as long as the provider still has credits today.
+    """
+
+    def __init__(
+        self,
+        ledger: CreditLedger | None = None,
+        policies: Mapping[str, ProviderPolicy] | None = None,
+        *,
+        cache_dir: Path | str = DEFAULT_LEDGER_DIR / "series",
+        site_priority: Sequence[str] = (),
+        cycle_hours: int = DEFAULT_CYCLE_HOURS,
+    ) -> None:
+        self.ledger = ledger or CreditLedger()
+        self.policies = dict(policies or default_policies())
+        self.cache_dir = Path(cache_dir)
+        self.site_priority = list(site_priority)
+        self.cycle_hours = cycle_hours
+        self.plan: Dict[str, Dict[str, PlannedCall]] = {}
+
+    def _cache_path(self, provider: str, site: str) -> Path:
+        return self.cache_dir / f"{provider}__{site}.json"
+
+    def cache_age_hours(self, provider: str, site: str) -> float | None:
+        path = self._cache_path(provider, site)
+        if not path.exists():
+            return None
+        fetched = pd.Timestamp(json.loads(path.read_text(encoding="utf-8"))["fetched_at"])
+        return (pd.Timestamp(self.ledger.now()) - fetched) / pd.Timedelta(hours=1)
+
+    def cycles_left_today(self) -> int:
+        now = self.ledger.now()
+        hours_left = 24 - (now.hour + now.minute / 60)
+        return max(1, math.ceil(hours_left / self.cycle_hours))
+
+    def plan_cycle(
+        self, sites: Sequence[str], forecast_hours: int, providers: Sequence[str] | None = None
+    ) -> Dict[str, Dict[str, PlannedCall]]:
+        """KR: 제공자별·지점별 호출/캐시 계획을 세웁니다. / EN: Decide call vs cache per provider and site.
+
+        ``providers`` limits the plan to providers that can actually be called this cycle (API key set,
+        not offline); the others get no plan entry.
+        """
+
+        order = [site for site in self.site_priority if site in sites] + [site for site in sites if site not in self.site_priority]
+        self.plan = {}
+        for provider, policy in self.policies.items():
+            if providers is not None and provider not in providers:
+                continue
+            horizon = max(forecast_hours, policy.horizon_hours or 0)
+            cost = policy.cost(horizon)
+            remaining = self.ledger.remaining(provider, policy)
+            allowance = remaining // self.cycles_left_today()
+            decisions: Dict[str, PlannedCall] = {}
+            for site in order:
+                age = self.cache_age_hours(provider, site)
+                if age is not None and age < policy.refresh_hours:
+                    decisions[site] = PlannedCall(provider, site, "cache", horizon, 0, f"cached {age:.1f}h ago")
+                elif remaining >= cost and (allowance >= cost or age is None):
+                    decisions[site] = PlannedCall(provider, site, "call", horizon, cost, f"{remaining} credit(s) left today")
+                    remaining -= cost
+                    allowance = max(0, allowance - cost)
+                elif age is not None:
+                    decisions[site] = PlannedCall(provider, site, "cache", horizon, 0, "credit budget reserved for later cycles")
+                else:
+                    decisions[site] = PlannedCall(provider, site, "skip", horizon, 0, "no credits and no cached data")
+            self.plan[provider] = decisions
+        return self.plan
+
+    def decision(self, provider: str, site: str) -> PlannedCall | None:
+        return self.plan.get(provider, {}).get(site)
+
+    def record(self, call: PlannedCall, series: MarineTimeseries) -> None:
+        """KR: 호출 비용을 기록하고 응답을 캐시에 저장합니다. / EN: Charge a call and cache its response."""
+
+        self.ledger.charge(call.provider, call.site, call.cost, call.horizon_hours)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        payload = {"fetched_at": self.ledger.now().isoformat(), "series": asdict(series)}
+        self._cache_path(call.provider, call.site).write_text(json.dumps(payload), encoding="utf-8")
+
+    def cached_series(self, provider: str, site: str, hours: int) -> MarineTimeseries | None:
+        """KR: 캐시 응답 중 현재 지평 구간입니다. / EN: Cached response restricted to the current horizon."""
+
+        path = self._cache_path(provider, site)
+        if not path.exists():
+            return None
+        raw = json.loads(path.read_text(encoding="utf-8"))["series"]
+        start = pd.Timestamp(self.ledger.now()).floor("h")
+        end = start + pd.Timedelta(hours=hours)
+        points: List[MarineDataPoint] = []
+        for point in raw["data_points"]:
+            stamp = pd.Timestamp(point["timestamp"])
+            stamp = stamp.tz_localize("UTC") if stamp.tzinfo is None else stamp
+            if start <= stamp < end:
+                points.append(MarineDataPoint(**point))
+        return MarineTimeseries(
+            source=raw["source"],
+            location=raw["location"],
+            data_points=points,
+            ingested_at=raw["ingested_at"],
+            confidence=raw.get("confidence"),
+        )
+
+    def status(self) -> Dict[str, str]:
+        """KR: 제공자별 크레딧/계획 요약입니다. / EN: Per-provider credit and plan summary."""
+
+        summary: Dict[str, str] = {}
+        for provider, policy in self.policies.items():
+            decisions = self.plan.get(provider, {})
+            planned = ", ".join(f"{site}={call.action}" for site, call in decisions.items())
+            summary[provider] = (
+                f"{self.ledger.spent(provider)}/{policy.daily_quota} credits used today; plan: {planned or 'none'}"
+            )
+        return summary
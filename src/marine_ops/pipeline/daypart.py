@@ -3,13 +3,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import timedelta
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Mapping, Tuple
 
 import numpy as np
 import pandas as pd
 from zoneinfo import ZoneInfo
 
 from src.marine_ops.pipeline.config import PipelineConfig
+from src.marine_ops.pipeline.tides import TideWindows, best_joint_span
+from src.marine_ops.pipeline.windows import GateSeries, find_windows, format_span, to_epoch_seconds
 
 DAYPART_DEFINITION: List[Tuple[str, int, int]] = [
     ("dawn", 3, 6),
@@ -34,6 +36,8 @@ class DaypartMetrics:
     wind_p90_kt: float | None
     wind_dir_mean: float | None
     visibility_mean_km: float | None
+    tide_min_m: float | None = None
+    tide_max_m: float | None = None
 
 
 def _quantile(series: pd.Series, q: float) -> float | None:
@@ -102,6 +106,8 @@ def summarize_dayparts(df: pd.DataFrame, tz: str) -> Dict[str, Dict[str, Daypart
                 if "wind_gusts_kt" in slot else _quantile(slot.get("wind_speed_kt"), 0.9),
                 wind_dir_mean=_circular_mean(slot.get("wind_direction_10m")),
                 visibility_mean_km=_mean(slot.get("visibility_km")),
+                tide_min_m=_quantile(slot.get("sea_level"), 0.0),
+                tide_max_m=_quantile(slot.get("sea_level"), 1.0),
             )
     return summaries
 
@@ -156,6 +162,8 @@ def decide_dayparts(
                 "wind_p90_kt": metrics.wind_p90_kt,
                 "wind_dir_mean": metrics.wind_dir_mean,
                 "visibility_mean_km": metrics.visibility_mean_km,
+                "tide_min_m": metrics.tide_min_m,
+                "tide_max_m": metrics.tide_max_m,
             }
             sea_state = _classify_sea_state(metrics.hs_p90 or metrics.hs_mean, config.sea_state_thresholds)
             entry["sea_state"] = sea_state
@@ -191,9 +199,23 @@ def route_window(
     agi: Dict[str, Dict[str, Dict[str, object]]],
     das: Dict[str, Dict[str, Dict[str, object]]],
     allowed: Iterable[str] | None = None,
+    *,
+    hourly: Dict[str, GateSeries] | None = None,
+    tides: Mapping[str, TideWindows] | None = None,
+    tz: str = "UTC",
 ) -> List[Dict[str, object]]:
+    """Daypart slots where both AGI and DAS are sailable.
+
+    With ``hourly`` gate series for both sites, each slot also gets ``hourly_window``: the best joint
+    hourly run inside the slot, found once over the whole horizon. With per-site ``tides`` windows,
+    ``tide_window`` is the longest span inside the slot where both sites meet the tide band.
+    """
+
     allowed_set = set(allowed or {"GO", "CONDITIONAL"})
     windows: List[Dict[str, object]] = []
+    joint_runs = None
+    if hourly and "AGI" in hourly and "DAS" in hourly:
+        joint_runs = find_windows(hourly["AGI"].joint(hourly["DAS"]), tz)
     for day_label, agi_parts in agi.items():
         das_parts = das.get(day_label, {})
         for name, agi_entry in agi_parts.items():
@@ -201,17 +223,31 @@ def route_window(
             if not das_entry:
                 continue
             if agi_entry.get("decision") in allowed_set and das_entry.get("decision") in allowed_set:
-                windows.append(
-                    {
-                        "label": f"{day_label} {name}",
-                        "start": agi_entry.get("start"),
-                        "end": agi_entry.get("end"),
-                        "agi_decision": agi_entry.get("decision"),
-                        "das_decision": das_entry.get("decision"),
-                        "buffer_minutes": max(
-                            agi_entry.get("buffer_minutes", 0),
-                            das_entry.get("buffer_minutes", 0),
-                        ),
-                    }
-                )
+                window = {
+                    "label": f"{day_label} {name}",
+                    "start": agi_entry.get("start"),
+                    "end": agi_entry.get("end"),
+                    "agi_decision": agi_entry.get("decision"),
+                    "das_decision": das_entry.get("decision"),
+                    "buffer_minutes": max(
+                        agi_entry.get("buffer_minutes", 0),
+                        das_entry.get("buffer_minutes", 0),
+                    ),
+                }
+                if joint_runs is not None:
+                    window["hourly_window"] = _best_hourly_span(joint_runs, window["start"], window["end"], tz)
+                if tides:
+                    window["tide_window"] = best_joint_span(tides, ["AGI", "DAS"], window["start"], window["end"], tz)
+                windows.append(window)
     return windows
+
+
+def _best_hourly_span(runs, start: object, end: object, tz: str) -> str | None:
+    if not start or not end:
+        return None
+    bounds = to_epoch_seconds([start, end])
+    slot = runs.within(int(bounds[0]), int(bounds[1]))
+    best = slot.best()
+    if best is None:
+        return None
+    return format_span(int(slot.start_s[best]), int(slot.end_s[best]), tz)
@@ -0,0 +1,274 @@
+"""Overlap-aware incremental ingestion of rolling forecast windows."""
+from __future__ import annotations
+
+import json
+import math
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping
+
+import pandas as pd
+
+from src.marine_ops.core.schema import MarineDataPoint, MarineTimeseries
+
+DEFAULT_STATE_DIR = Path("cache/delta")
+HOUR = pd.Timedelta(hours=1)
+_POINT_FIELDS = tuple(item.name for item in fields(MarineDataPoint) if item.name != "timestamp")
+
+
+@dataclass(frozen=True)
+class SourcePolicy:
+    """KR: 소스별 모델 주기와 증분 조건입니다. / EN: Model-cycle cadence and delta rules for one source.
+
+    ``cycle_hours`` is the model run cadence (``None`` for sources whose values never change, such as
+    astronomical tides); a run becomes available ``publish_lag_hours`` after its nominal time. Within one
+    cycle only newly-entered horizon hours are fetched, and only once at least ``min_new_hours`` are missing.
+    """
+
+    cycle_hours: int | None
+    publish_lag_hours: int = 0
+    min_new_hours: int = 1
+
+
+DEFAULT_POLICIES: Dict[str, SourcePolicy] = {
+    "open_meteo_marine": SourcePolicy(cycle_hours=6, publish_lag_hours=5),
+    "open_meteo_weather": SourcePolicy(cycle_hours=6, publish_lag_hours=5),
+    # Paid per request: wait until half a day of horizon is missing.
+    "stormglass": SourcePolicy(cycle_hours=6, publish_lag_hours=5, min_new_hours=12),
+    "worldtides": SourcePolicy(cycle_hours=None, min_new_hours=24),
+}
+
+
+@dataclass(frozen=True)
+class FetchPlan:
+    """KR: 한 소스/지점의 수집 계획입니다. / EN: What to request for one source and site.
+
+    ``mode`` is ``"full"`` (no usable cache or a new model cycle), ``"tail"`` (same cycle, only
+    ``start``..``end`` is new) or ``"skip"`` (the cache already covers the horizon).
+    """
+
+    source: str
+    site: str
+    mode: str
+    start: pd.Timestamp
+    end: pd.Timestamp
+    horizon_hours: int
+    issue: pd.Timestamp | None
+    reason: str
+
+    @property
+    def hours(self) -> int:
+        if self.mode == "skip":
+            return 0
+        return int((self.end - self.start) / HOUR) + 1
+
+
+@dataclass
+class UpsertResult:
+    """KR: 유효 시각 기준 병합 결과입니다. / EN: Outcome of a valid-time upsert."""
+
+    frame: pd.DataFrame
+    replaced: pd.DatetimeIndex
+    added: pd.DatetimeIndex
+    expired: int = 0
+
+
+def model_cycle(now: pd.Timestamp, policy: SourcePolicy) -> pd.Timestamp | None:
+    """KR: 현재 사용 가능한 최신 모델 발표 시각입니다. / EN: Latest model cycle available at ``now``."""
+
+    if not policy.cycle_hours:
+        return None
+    available = now.tz_convert("UTC") - pd.Timedelta(hours=policy.publish_lag_hours)
+    return available.floor(f"{policy.cycle_hours}h")
+
+
+def upsert_frame(
+    existing: pd.DataFrame | None,
+    incoming: pd.DataFrame,
+    keep_after: pd.Timestamp | None = None,
+) -> UpsertResult:
+    """KR: 유효 시각이 겹치는 행은 새 값으로 교체합니다. / EN: Replace overlapping valid times, append the rest.
+
+    Rows are replaced whole (a newer cycle supersedes every column of an hour). Rows older than
+    ``keep_after`` are dropped from the result and counted in ``expired``.
+    """
+
+    incoming = incoming[~incoming.index.duplicated(keep="last")]
+    if existing is None or existing.empty:
+        merged = incoming.sort_index()
+        replaced = pd.DatetimeIndex([], tz=incoming.index.tz)
+        added = incoming.index
+    else:
+        if incoming.index.tz is not None and existing.index.tz is not None:
+            incoming = incoming.tz_convert(existing.index.tz)
+        overlap = existing.index.isin(incoming.index)
+        replaced = existing.index[overlap]
+        added = incoming.index[~incoming.index.isin(existing.index)]
+        merged = pd.concat([existing.loc[~overlap], incoming]).sort_index()
+    expired = 0
+    if keep_after is not None and len(merged):
+        stale = merged.index < keep_after
+        expired = int(stale.sum())
+        merged = merged.loc[~stale]
+    return UpsertResult(frame=merged, replaced=pd.DatetimeIndex(replaced), added=pd.DatetimeIndex(added), expired=expired)
+
+
+def timeseries_frame(series: MarineTimeseries) -> pd.DataFrame:
+    """KR: 시계열을 UTC 유효 시각 인덱스 프레임으로 바꿉니다. / EN: Valid-time frame of a timeseries."""
+
+    points = series.data_points
+    index = pd.to_datetime([point.timestamp for point in points], utc=True, format="ISO8601")
+    frame = pd.DataFrame({name: [getattr(point, name) for point in points] for name in _POINT_FIELDS}, index=index)
+    return frame[~frame.index.isna()]
+
+
+def frame_timeseries(frame: pd.DataFrame, source: str, location: str, confidence: float | None = None) -> MarineTimeseries:
+    """KR: 캐시 프레임을 시계열로 되돌립니다. / EN: Rebuild a timeseries from a cached frame."""
+
+    columns = {name: frame[name].tolist() for name in _POINT_FIELDS if name in frame}
+    stamps = frame.index.tz_convert("UTC").strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    points: List[MarineDataPoint] = []
+    for i, stamp in enumerate(stamps):
+        values = {name: _none_if_nan(column[i]) for name, column in columns.items()}
+        for required in ("wind_speed", "wind_direction", "wave_height"):
+            if values.get(required) is None:
+                values[required] = 0.0
+        points.append(MarineDataPoint(timestamp=stamp, **values))
+    return MarineTimeseries(
+        source=source,
+        location=location,
+        data_points=points,
+        ingested_at=datetime.now(timezone.utc).isoformat(),
+        confidence=confidence,
+    )
+
+
+def _none_if_nan(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+@dataclass
+class DeltaIngestor:
+    """KR: 소스/지점별 발표 시각과 캐시 프레임을 관리합니다. / EN: Track issue times and cached frames.
+
+    State lives in ``state_dir/state.json`` (issue time and covered-until per ``source/site``) with one
+    pickled valid-time frame per key. :meth:`plan` decides what to request, :meth:`commit` upserts the
+    response into the cached frame and appends an explicit replaced/added record to :attr:`report`.
+    """
+
+    state_dir: Path = DEFAULT_STATE_DIR
+    policies: Mapping[str, SourcePolicy] = field(default_factory=lambda: dict(DEFAULT_POLICIES))
+    clock: Callable[[], pd.Timestamp] = field(default=lambda: pd.Timestamp.now(tz="UTC"))
+    report: List[Dict[str, object]] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.state_dir = Path(self.state_dir)
+        state_path = self.state_dir / "state.json"
+        self._state: Dict[str, Dict[str, str]] = (
+            json.loads(state_path.read_text(encoding="utf-8")) if state_path.exists() else {}
+        )
+
+    @staticmethod
+    def _key(source: str, site: str) -> str:
+        return f"{source}/{site}"
+
+    def _frame_path(self, source: str, site: str) -> Path:
+        return self.state_dir / f"{source}__{site}.pkl"
+
+    def now(self) -> pd.Timestamp:
+        return pd.Timestamp(self.clock()).tz_convert("UTC")
+
+    def cached(self, source: str, site: str) -> pd.DataFrame | None:
+        path = self._frame_path(source, site)
+        if self._key(source, site) not in self._state or not path.exists():
+            return None
+        return pd.read_pickle(path)
+
+    def plan(self, source: str, site: str, horizon_hours: int) -> FetchPlan:
+        """KR: 새 모델 주기/새 예보 시간만 요청하도록 계획합니다. / EN: Plan a full, tail or skipped fetch."""
+
+        now = self.now()
+        start = now.floor("h")
+        end = start + pd.Timedelta(hours=horizon_hours - 1)
+        policy = self.policies.get(source, SourcePolicy(cycle_hours=None))
+        issue = model_cycle(now, policy)
+        entry = self._state.get(self._key(source, site))
+        if entry is None or not self._frame_path(source, site).exists():
+            return FetchPlan(source, site, "full", start, end, horizon_hours, issue, "no cached window")
+        if issue is not None and pd.Timestamp(entry["issue"]) < issue:
+            return FetchPlan(source, site, "full", start, end, horizon_hours, issue, f"new model cycle {issue:%Y-%m-%dT%HZ}")
+        covered = pd.Timestamp(entry["covered_until"])
+        if covered < start:
+            return FetchPlan(source, site, "full", start, end, horizon_hours, issue, "cache fell behind the horizon")
+        missing = int((end - covered) / HOUR)
+        if missing < max(1, policy.min_new_hours):
+            return FetchPlan(source, site, "skip", start, end, horizon_hours, issue, f"{missing}h new (< {policy.min_new_hours}h)")
+        return FetchPlan(source, site, "tail", covered + HOUR, end, horizon_hours, issue, f"{missing}h entered the horizon")
+
+    def window(self, plan: FetchPlan) -> pd.DataFrame | None:
+        """KR: 계획 지평 구간의 캐시 프레임입니다. / EN: Cached rows inside the plan's horizon."""
+
+        frame = self.cached(plan.source, plan.site)
+        if frame is None:
+            return None
+        horizon_start = plan.end - pd.Timedelta(hours=plan.horizon_hours - 1)
+        index = frame.index.tz_convert("UTC")
+        return frame.loc[(index >= horizon_start) & (index <= plan.end)]
+
+    def commit(self, plan: FetchPlan, incoming: pd.DataFrame) -> UpsertResult:
+        """KR: 응답을 캐시에 upsert 하고 교체된 행을 기록합니다. / EN: Upsert a response and record what changed."""
+
+        previous = self.cached(plan.source, plan.site)
+        horizon_start = plan.end - pd.Timedelta(hours=plan.horizon_hours - 1)
+        result = upsert_frame(previous, incoming, keep_after=horizon_start.tz_convert(incoming.index.tz or "UTC"))
+        if plan.mode == "full" and previous is not None:
+            # A new cycle refreshes the whole window: rows it did not return are dropped, not kept stale.
+            result.frame = result.frame.loc[result.frame.index.isin(incoming.index)]
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        result.frame.to_pickle(self._frame_path(plan.source, plan.site))
+        covered = result.frame.index.max().tz_convert("UTC") if len(result.frame) else plan.start - HOUR
+        self._state[self._key(plan.source, plan.site)] = {
+            "issue": (plan.issue or self.now().floor("h")).isoformat(),
+            "covered_until": covered.isoformat(),
+            "updated_at": self.now().isoformat(),
+        }
+        (self.state_dir / "state.json").write_text(json.dumps(self._state, indent=2), encoding="utf-8")
+        self._record(plan, result)
+        return result
+
+    def skipped(self, plan: FetchPlan) -> None:
+        """KR: 요청하지 않은 계획을 기록합니다. / EN: Record a plan that was served from the cache."""
+
+        self._record(plan, None)
+
+    def _record(self, plan: FetchPlan, result: UpsertResult | None) -> None:
+        self.report.append(
+            {
+                "source": plan.source,
+                "site": plan.site,
+                "mode": plan.mode,
+                "reason": plan.reason,
+                "horizon_hours": plan.horizon_hours,
+                "requested_hours": plan.hours,
+                "replaced": [stamp.isoformat() for stamp in result.replaced] if result else [],
+                "added": len(result.added) if result else 0,
+                "expired": result.expired if result else 0,
+            }
+        )
+
+    def summary(self) -> Dict[str, object]:
+        """KR: 전체 지평 대비 절약량 요약입니다. / EN: Requests and hours saved versus full-horizon fetches."""
+
+        full = sum(int(entry["horizon_hours"]) for entry in self.report)
+        requested = sum(int(entry["requested_hours"]) for entry in self.report)
+        return {
+            "entries": list(self.report),
+            "full_hours": full,
+            "requested_hours": requested,
+            "saved_hours": full - requested,
+            "skipped_requests": sum(1 for entry in self.report if entry["mode"] == "skip"),
+            "replaced_rows": sum(len(entry["replaced"]) for entry in self.report),
+        }
@@ -5,14 +5,23 @@ from typing import Dict, List
 
 from src.marine_ops.core.schema import ERIPoint, MarineTimeseries
 from src.marine_ops.eri.compute import ERICalculator
+from src.marine_ops.pipeline.parallel import run_per_location
 
 
-def compute_eri_3d(timeseries_map: Dict[str, MarineTimeseries]) -> Dict[str, List[ERIPoint]]:
-    calculator = ERICalculator()
-    results: Dict[str, List[ERIPoint]] = {}
-    for location, timeseries in timeseries_map.items():
-        try:
-            results[location] = calculator.compute_eri_timeseries(timeseries)
-        except Exception:  # pragma: no cover - robustness guard
-            results[location] = []
-    return results
+def _eri_task(location: str, timeseries: MarineTimeseries, calculator: ERICalculator) -> List[ERIPoint]:
+    try:
+        return calculator.compute_eri_timeseries(timeseries)
+    except Exception:  # pragma: no cover - robustness guard
+        return []
+
+
+def compute_eri_3d(
+    timeseries_map: Dict[str, MarineTimeseries],
+    *,
+    max_workers: int | None = 1,
+    timings: Dict[str, float] | None = None,
+) -> Dict[str, List[ERIPoint]]:
+    run = run_per_location(_eri_task, timeseries_map, context=ERICalculator(), max_workers=max_workers)
+    if timings is not None:
+        timings.update(run.timings)
+    return run.results
@@ -0,0 +1,216 @@
+"""Shared vectorised feature engineering for the ML forecast paths."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+KT_PER_MS = 1.9438444924406
+BASE_FEATURES = ("hs_value", "wind_value", "eri_value")
+# Canonical feature -> ordered (column, scale) candidates. The first present column wins.
+COLUMN_ALIASES: Dict[str, Tuple[Tuple[str, float], ...]] = {
+    "hs_value": (("hs_value", 1.0), ("hs", 1.0), ("hs_mean", 1.0), ("wave_height", 1.0), ("hs_p90", 1.0)),
+    "wind_value": (
+        ("wind_value", 1.0),
+        ("wind_speed_kt", 1.0),
+        ("wind_mean_kt", 1.0),
+        ("wind_speed", 1.0),
+        ("wind_p90_kt", 1.0),
+        ("wind_speed_10m", KT_PER_MS),
+    ),
+    "eri_value": (("eri_value", 1.0), ("eri", 1.0), ("eri_score", 1.0), ("eri_mean", 1.0)),
+    "wind_dir": (("wind_direction_10m", 1.0), ("wind_direction", 1.0), ("wind_dir_mean", 1.0)),
+    "wave_dir": (("wave_direction", 1.0), ("swell_wave_direction", 1.0), ("swell_dir_mean", 1.0)),
+}
+DEFAULT_LAGS = (1, 3, 6, 24)
+DEFAULT_WINDOWS = (6, 24)
+
+
+@dataclass(frozen=True, slots=True)
+class FeatureSchema:
+    """KR: 원본 열과 표준 피처의 매핑입니다. / EN: Resolved mapping from canonical features to source columns."""
+
+    sources: Tuple[Tuple[str, str, float], ...]
+
+    def column_for(self, feature: str) -> str | None:
+        for name, column, _ in self.sources:
+            if name == feature:
+                return column
+        return None
+
+    def leakage_columns(self, target_column: str) -> List[str]:
+        """KR: 타깃과 동시점 정보를 공유하는 피처를 반환합니다. / EN: Features that expose the target at lag zero."""
+
+        aliased = [name for name, column, _ in self.sources if column == target_column]
+        leaked: List[str] = []
+        for name in aliased:
+            leaked.append(name)
+            leaked.extend(f"{name}_{stat}_{window}h" for stat in ("mean", "max") for window in DEFAULT_WINDOWS)
+            if name == "eri_value":
+                leaked.append("eri_rolling_24h")
+        return leaked
+
+
+@lru_cache(maxsize=64)
+def _resolve_schema_cached(columns: Tuple[str, ...]) -> FeatureSchema:
+    available = set(columns)
+    sources: List[Tuple[str, str, float]] = []
+    for feature, candidates in COLUMN_ALIASES.items():
+        for column, scale in candidates:
+            if column in available:
+                sources.append((feature, column, scale))
+                break
+    return FeatureSchema(sources=tuple(sources))
+
+
+def resolve_schema(columns: Iterable[str]) -> FeatureSchema:
+    """KR: 열 별칭을 한 번만 해석합니다. / EN: Resolve column aliases once into a schema map."""
+
+    return _resolve_schema_cached(tuple(str(col) for col in columns))
+
+
+def _timestamp_series(frame: pd.DataFrame) -> pd.Series:
+    if "timestamp" in frame.columns:
+        values = pd.to_datetime(frame["timestamp"], utc=True, errors="coerce")
+    elif isinstance(frame.index, pd.DatetimeIndex):
+        index = frame.index.tz_localize("UTC") if frame.index.tz is None else frame.index.tz_convert("UTC")
+        values = pd.Series(index, index=frame.index)
+    else:
+        raise ValueError("Feature frame requires DatetimeIndex or 'timestamp' column")
+    return pd.Series(values.to_numpy(), index=frame.index, name="timestamp")
+
+
+def build_features(
+    frame: pd.DataFrame,
+    *,
+    schema: FeatureSchema | None = None,
+    group_column: str = "location",
+    lags: Sequence[int] = DEFAULT_LAGS,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+    keep_columns: bool = True,
+) -> pd.DataFrame:
+    """KR: 위치별 그룹에 대해 피처를 벡터 연산으로 계산합니다. / EN: Compute features with grouped vectorised ops.
+
+    Produces the base ``hs_value``/``wind_value``/``eri_value`` columns, ``eri_rolling_24h``, lags,
+    rolling means/maxima, sin/cos direction encodings and calendar features. The output is sorted by
+    (group, timestamp) with a ``timestamp`` column; source columns are kept when ``keep_columns``.
+    """
+
+    if frame is None or frame.empty:
+        return pd.DataFrame(columns=["timestamp", *BASE_FEATURES])
+    schema = schema or resolve_schema(frame.columns)
+    timestamps = _timestamp_series(frame)
+    base = frame.reset_index(drop=True) if keep_columns else pd.DataFrame(index=range(len(frame)))
+    if group_column in frame.columns and group_column not in base.columns:
+        base[group_column] = frame[group_column].to_numpy()
+    working: Dict[str, np.ndarray] = {"timestamp": timestamps.to_numpy()}
+
+    resolved = {name: (column, scale) for name, column, scale in schema.sources}
+    for name in BASE_FEATURES:
+        if name in resolved:
+            column, scale = resolved[name]
+            values = pd.to_numeric(frame[column], errors="coerce").to_numpy(dtype=float) * scale
+            working[name] = np.nan_to_num(values, nan=0.0)
+        else:
+            working[name] = np.zeros(len(frame), dtype=float)
+    for name, prefix in (("wind_dir", "wind_dir"), ("wave_dir", "wave_dir")):
+        if name in resolved:
+            radians = np.deg2rad(pd.to_numeric(frame[resolved[name][0]], errors="coerce").to_numpy(dtype=float))
+            working[f"{prefix}_sin"] = np.sin(radians)
+            working[f"{prefix}_cos"] = np.cos(radians)
+
+    features = pd.DataFrame(working)
+    features = pd.concat([base.drop(columns=[c for c in features.columns if c in base.columns]), features], axis=1)
+    features = features.dropna(subset=["timestamp"])
+    sort_keys = [group_column, "timestamp"] if group_column in features.columns else ["timestamp"]
+    features = features.sort_values(sort_keys, kind="stable").reset_index(drop=True)
+
+    stats: Dict[str, pd.Series] = {}
+    if group_column in features.columns:
+        grouped = features.groupby(group_column, sort=False)[list(BASE_FEATURES)]
+        for window in windows:
+            rolling = grouped.rolling(window=window, min_periods=1)
+            means = rolling.mean().reset_index(level=0, drop=True).sort_index()
+            maxima = rolling.max().reset_index(level=0, drop=True).sort_index()
+            for name in BASE_FEATURES:
+                stats[f"{name}_mean_{window}h"] = means[name]
+                stats[f"{name}_max_{window}h"] = maxima[name]
+        shifted = {lag: grouped.shift(lag) for lag in lags}
+    else:
+        for window in windows:
+            rolling = features[list(BASE_FEATURES)].rolling(window=window, min_periods=1)
+            means = rolling.mean()
+            maxima = rolling.max()
+            for name in BASE_FEATURES:
+                stats[f"{name}_mean_{window}h"] = means[name]
+                stats[f"{name}_max_{window}h"] = maxima[name]
+        shifted = {lag: features[list(BASE_FEATURES)].shift(lag) for lag in lags}
+    for lag, frame_lag in shifted.items():
+        for name in BASE_FEATURES:
+            stats[f"{name}_lag_{lag}h"] = frame_lag[name]
+    if "eri_value_mean_24h" in stats:
+        stats["eri_rolling_24h"] = stats["eri_value_mean_24h"]
+    else:
+        stats["eri_rolling_24h"] = features["eri_value"]
+
+    ts = features["timestamp"].dt
+    hour = ts.hour.to_numpy(dtype=float)
+    dayofyear = ts.dayofyear.to_numpy(dtype=float)
+    stats["hour"] = pd.Series(hour)
+    stats["dayofweek"] = pd.Series(ts.dayofweek.to_numpy(dtype=float))
+    stats["hour_sin"] = pd.Series(np.sin(2 * np.pi * hour / 24.0))
+    stats["hour_cos"] = pd.Series(np.cos(2 * np.pi * hour / 24.0))
+    stats["doy_sin"] = pd.Series(np.sin(2 * np.pi * dayofyear / 365.25))
+    stats["doy_cos"] = pd.Series(np.cos(2 * np.pi * dayofyear / 365.25))
+
+    engineered = pd.DataFrame({name: series.to_numpy() for name, series in stats.items()}, index=features.index)
+    features = features.drop(columns=[c for c in engineered.columns if c in features.columns])
+    return pd.concat([features, engineered], axis=1)
+
+
+def calendar_features(timestamps: pd.DatetimeIndex | Sequence[pd.Timestamp]) -> pd.DataFrame:
+    """KR: 미래 시점의 달력 피처를 계산합니다. / EN: Calendar features for arbitrary (future) timestamps."""
+
+    index = pd.DatetimeIndex(timestamps)
+    hour = index.hour.to_numpy(dtype=float)
+    dayofyear = index.dayofyear.to_numpy(dtype=float)
+    return pd.DataFrame(
+        {
+            "hour": hour,
+            "dayofweek": index.dayofweek.to_numpy(dtype=float),
+            "hour_sin": np.sin(2 * np.pi * hour / 24.0),
+            "hour_cos": np.cos(2 * np.pi * hour / 24.0),
+            "doy_sin": np.sin(2 * np.pi * dayofyear / 365.25),
+            "doy_cos": np.cos(2 * np.pi * dayofyear / 365.25),
+        }
+    )
+
+
+def latest_features(
+    frame: pd.DataFrame,
+    *,
+    schema: FeatureSchema | None = None,
+    lags: Sequence[int] = DEFAULT_LAGS,
+    windows: Sequence[int] = DEFAULT_WINDOWS,
+) -> Mapping[str, float]:
+    """KR: 마지막 시점의 피처 벡터를 반환합니다. / EN: Feature vector of the most recent row.
+
+    Only the tail needed by the longest lag/window is processed, so inference reuses exactly the
+    training computation without touching the whole frame.
+    """
+
+    if frame is None or frame.empty:
+        return {}
+    tail = frame.tail(max([*lags, *windows, 1]) + 1)
+    features = build_features(tail, schema=schema, lags=lags, windows=windows, keep_columns=False)
+    if features.empty:
+        return {}
+    last = features.iloc[-1]
+    return {name: float(value) for name, value in last.items() if name != "timestamp" and _is_number(value)}
+
+
+def _is_number(value: object) -> bool:
+    return isinstance(value, (int, float, np.integer, np.floating)) and not isinstance(value, bool)
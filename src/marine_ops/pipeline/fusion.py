@@ -46,6 +46,7 @@ def _dataframe_to_timeseries(location: str, df: pd.DataFrame) -> MarineTimeserie
                 ocean_current_speed=_nan_to_none(row.get("ocean_current_velocity")),
                 sea_surface_temperature=_nan_to_none(row.get("sea_surface_temperature")),
                 visibility=_nan_to_none(row.get("visibility_km")),
+                sea_level=_nan_to_none(row.get("sea_level")),
             )
         )
     return MarineTimeseries(
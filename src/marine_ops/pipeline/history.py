@@ -0,0 +1,343 @@
+"""Chunked historical dataset loader for the ML pipeline."""
+from __future__ import annotations
+
+import logging
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_TABLE_NAME = "marine_ml_history"
+COLUMNAR_SUFFIXES = {".parquet": "parquet", ".feather": "feather"}
+KEY_COLUMNS = ("timestamp", "location")
+# Text columns of the archive/history tables; every other non-timestamp column is cached as float32.
+TEXT_COLUMNS = ("location", "run_id", "issued_at", "decision", "sea_state", "source")
+CACHE_KEY_SUFFIX = ".key"
+# Stored timestamps are canonical UTC ISO text (see archive.archive_frame); one day of slack keeps
+# legacy rows with other offsets inside the SQL range.
+SQL_BOUND_MARGIN = pd.Timedelta(days=1)
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class HistoryQuery:
+    """KR: 이력 데이터 조회 조건입니다. / EN: Row and column filters applied while streaming history."""
+
+    start: pd.Timestamp | None = None
+    end: pd.Timestamp | None = None
+    locations: tuple[str, ...] | None = None
+    columns: tuple[str, ...] | None = None
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+    downcast: bool = True
+
+    @classmethod
+    def recent(
+        cls,
+        hours: int,
+        *,
+        end: pd.Timestamp | None = None,
+        locations: Iterable[str] | None = None,
+        columns: Iterable[str] | None = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ) -> "HistoryQuery":
+        """KR: 최근 N시간 창을 조회합니다. / EN: Build a query for a bounded trailing window."""
+
+        anchor = _to_utc(end) if end is not None else pd.Timestamp.now(tz="UTC")
+        return cls(
+            start=anchor - pd.Timedelta(hours=int(hours)),
+            end=_to_utc(end) if end is not None else None,
+            locations=tuple(locations) if locations else None,
+            columns=tuple(columns) if columns else None,
+            chunk_rows=chunk_rows,
+        )
+
+    def projected(self, available: Sequence[str]) -> List[str] | None:
+        """KR: 필요한 열만 선택합니다. / EN: Resolve the column projection against available columns."""
+
+        if not self.columns:
+            return None
+        wanted = list(dict.fromkeys([*KEY_COLUMNS, *self.columns]))
+        return [col for col in wanted if col in available]
+
+
+def _to_utc(value) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+def _downcast_floats(frame: pd.DataFrame) -> pd.DataFrame:
+    """KR: float64 열을 float32로 축소합니다. / EN: Downcast float64 columns to float32 in place."""
+
+    for name in frame.columns:
+        if frame[name].dtype == np.float64:
+            frame[name] = frame[name].astype(np.float32)
+    return frame
+
+
+def _finalise_chunk(chunk: pd.DataFrame, query: HistoryQuery) -> pd.DataFrame:
+    """KR: 청크에 타임스탬프/필터/다운캐스트를 적용합니다. / EN: Coerce, filter and downcast a streamed chunk."""
+
+    if "timestamp" not in chunk.columns:
+        raise ValueError("Historical dataset requires a 'timestamp' column")
+    chunk["timestamp"] = pd.to_datetime(chunk["timestamp"], utc=True, errors="coerce", format="ISO8601")
+    if query.downcast:
+        chunk = _downcast_floats(chunk)
+    mask = chunk["timestamp"].notna()
+    if query.start is not None:
+        mask &= chunk["timestamp"] >= _to_utc(query.start)
+    if query.end is not None:
+        mask &= chunk["timestamp"] <= _to_utc(query.end)
+    if query.locations and "location" in chunk.columns:
+        mask &= chunk["location"].isin(query.locations)
+    if not mask.all():
+        chunk = chunk.loc[mask]
+    return chunk
+
+
+def iter_csv_chunks(path: Path, query: HistoryQuery) -> Iterator[pd.DataFrame]:
+    """KR: CSV를 청크 단위로 스트리밍합니다. / EN: Stream a CSV source chunk by chunk."""
+
+    header = pd.read_csv(path, nrows=0).columns.tolist()
+    usecols = query.projected(header)
+    reader = pd.read_csv(path, usecols=usecols, chunksize=max(1, query.chunk_rows))
+    for chunk in reader:
+        chunk = _finalise_chunk(chunk, query)
+        if not chunk.empty:
+            yield chunk
+
+
+def _sql_day_bound(value, shift: pd.Timedelta) -> str:
+    """KR: 색인 비교용 날짜 경계입니다. / EN: ``YYYY-MM-DD`` prefix bound, which sorts before any time that day."""
+
+    return (_to_utc(value) + shift).strftime("%Y-%m-%d")
+
+
+def _sqlite_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    rows = conn.execute(f'SELECT * FROM "{table}" LIMIT 0').description or []
+    return [row[0] for row in rows]
+
+
+def sqlite_select(available: Sequence[str], table: str, query: HistoryQuery) -> tuple[str, List[object]]:
+    """KR: 필터를 SQL 로 내린 조회문입니다. / EN: SELECT with projection and index-friendly row filters."""
+
+    projection = query.projected(available)
+    select = ", ".join(f'"{col}"' for col in projection) if projection else "*"
+    clauses: List[str] = []
+    params: List[object] = []
+    # Raw text comparisons so the timestamp index is used. Bounds are widened to whole days (covering
+    # UTC offsets and " "/"T" separators in non-canonical rows); _finalise_chunk applies the exact cut.
+    if query.start is not None:
+        clauses.append("timestamp >= ?")
+        params.append(_sql_day_bound(query.start, -SQL_BOUND_MARGIN))
+    if query.end is not None:
+        clauses.append("timestamp < ?")
+        params.append(_sql_day_bound(query.end, SQL_BOUND_MARGIN + pd.Timedelta(days=1)))
+    if query.locations and "location" in available:
+        clauses.append(f"location IN ({', '.join('?' for _ in query.locations)})")
+        params.extend(query.locations)
+    sql = f'SELECT {select} FROM "{table}"'
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    return sql, params
+
+
+def iter_sqlite_chunks(path: Path, table: str, query: HistoryQuery) -> Iterator[pd.DataFrame]:
+    """KR: SQLite 테이블을 필터 푸시다운으로 스트리밍합니다. / EN: Stream a SQLite table with filters pushed into SQL."""
+
+    with sqlite3.connect(path) as conn:
+        sql, params = sqlite_select(_sqlite_columns(conn, table), table, query)
+        for chunk in pd.read_sql_query(sql, conn, params=params, chunksize=max(1, query.chunk_rows)):
+            chunk = _finalise_chunk(chunk, query)
+            if not chunk.empty:
+                yield chunk
+
+
+def iter_columnar_chunks(path: Path, query: HistoryQuery) -> Iterator[pd.DataFrame]:
+    """KR: Parquet/Feather 파일을 열 투영으로 읽습니다. / EN: Read a Parquet/Feather cache with column projection."""
+
+    fmt = COLUMNAR_SUFFIXES[path.suffix.lower()]
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        projection = query.projected(parquet.schema_arrow.names)
+        for batch in parquet.iter_batches(batch_size=max(1, query.chunk_rows), columns=projection):
+            chunk = _finalise_chunk(batch.to_pandas(), query)
+            if not chunk.empty:
+                yield chunk
+        return
+    import pyarrow.feather as feather
+
+    table = feather.read_table(path, memory_map=True)
+    projection = query.projected(table.column_names)
+    if projection:
+        table = table.select(projection)
+    for batch in table.to_batches(max_chunksize=max(1, query.chunk_rows)):
+        chunk = _finalise_chunk(batch.to_pandas(), query)
+        if not chunk.empty:
+            yield chunk
+
+
+def iter_history_chunks(
+    source: str | Path,
+    query: HistoryQuery | None = None,
+    *,
+    sqlite_table: str | None = None,
+) -> Iterator[pd.DataFrame]:
+    """KR: 소스 형식에 맞춰 이력 청크를 반환합니다. / EN: Dispatch chunked reads based on the source format."""
+
+    path = Path(source).expanduser().resolve()
+    query = query or HistoryQuery()
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        yield from iter_csv_chunks(path, query)
+    elif suffix in {".sqlite", ".db"}:
+        yield from iter_sqlite_chunks(path, sqlite_table or DEFAULT_TABLE_NAME, query)
+    elif suffix in COLUMNAR_SUFFIXES:
+        yield from iter_columnar_chunks(path, query)
+    else:
+        raise ValueError(f"Unsupported historical data format: {path.suffix}")
+
+
+def pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def columnar_cache_path(source: Path, cache_dir: str | Path, fmt: str = "parquet") -> Path:
+    """KR: 원본에 대응하는 캐시 경로를 계산합니다. / EN: Resolve the columnar cache file for a source."""
+
+    return Path(cache_dir).expanduser().resolve() / f"{source.stem}{source.suffix.replace('.', '_')}.{fmt}"
+
+
+def _columnar_schema(chunk: pd.DataFrame):
+    """KR: 캐시 스키마를 명시적으로 정합니다. / EN: Explicit cache schema, independent of the first chunk's values.
+
+    Inferring from the first chunk types an all-null column as ``null`` (and an int column that later
+    gains NaN as ``int64``), which later chunks cannot be cast to.
+    """
+
+    import pyarrow as pa
+
+    fields = []
+    for name in chunk.columns:
+        if name == "timestamp":
+            arrow_type = pa.timestamp("ns", tz="UTC")
+        elif name in TEXT_COLUMNS or (
+            chunk[name].dtype == object and pd.api.types.infer_dtype(chunk[name], skipna=True) not in ("empty", "floating", "integer", "mixed-integer-float")
+        ):
+            arrow_type = pa.string()
+        else:
+            arrow_type = pa.float32()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _source_key(path: Path) -> str:
+    stat = path.stat()
+    return f"{stat.st_mtime_ns} {stat.st_size}"
+
+
+def convert_to_columnar(
+    source: str | Path,
+    cache_dir: str | Path,
+    *,
+    fmt: str = "parquet",
+    sqlite_table: str | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Path | None:
+    """KR: CSV/SQLite 원본을 Parquet/Feather 캐시로 변환합니다. / EN: Convert a CSV/SQLite source into a columnar cache.
+
+    The cache is keyed on the source's (mtime, size) and rebuilt whenever either changes. Returns
+    ``None`` when pyarrow is unavailable.
+    """
+
+    if fmt not in COLUMNAR_SUFFIXES.values():
+        raise ValueError(f"Unsupported columnar format: {fmt}")
+    if not pyarrow_available():
+        LOGGER.info("pyarrow not installed; skipping columnar cache for %s", source)
+        return None
+    import pyarrow as pa
+
+    path = Path(source).expanduser().resolve()
+    target = columnar_cache_path(path, cache_dir, fmt)
+    key_path = target.with_suffix(target.suffix + CACHE_KEY_SUFFIX)
+    source_key = _source_key(path)
+    if target.exists() and key_path.exists() and key_path.read_text(encoding="utf-8") == source_key:
+        return target
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp_target = target.with_suffix(target.suffix + ".tmp")
+    query = HistoryQuery(chunk_rows=chunk_rows)
+
+    writer = None
+    schema = None
+    batches: List[pa.RecordBatch] = []
+    try:
+        for chunk in iter_history_chunks(path, query, sqlite_table=sqlite_table):
+            if "location" not in chunk.columns:
+                chunk = chunk.assign(location="UNKNOWN")
+            if schema is None:
+                schema = _columnar_schema(chunk)
+            table = pa.Table.from_pandas(chunk, preserve_index=False).select(schema.names).cast(schema)
+            if fmt == "parquet":
+                import pyarrow.parquet as pq
+
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_target, schema, compression="zstd")
+                writer.write_table(table)
+            else:
+                batches.extend(table.to_batches())
+    finally:
+        if writer is not None:
+            writer.close()
+    if schema is None:
+        return None
+    if fmt == "feather":
+        import pyarrow.feather as feather
+
+        feather.write_feather(pa.Table.from_batches(batches, schema=schema), tmp_target, compression="zstd")
+    tmp_target.replace(target)
+    key_path.write_text(source_key, encoding="utf-8")
+    LOGGER.info("Stored columnar history cache at %s", target)
+    return target
+
+
+def load_history(
+    sources: Iterable[str | Path],
+    query: HistoryQuery | None = None,
+    *,
+    sqlite_table: str | None = None,
+    cache_dir: str | Path | None = None,
+) -> pd.DataFrame:
+    """KR: 필터링된 청크만 모아 이력 프레임을 구성합니다. / EN: Materialise only the filtered rows of all sources.
+
+    When ``cache_dir`` is given and pyarrow is installed, CSV/SQLite sources are read through a Parquet cache.
+    """
+
+    query = query or HistoryQuery()
+    parts: List[pd.DataFrame] = []
+    for source in sources:
+        path = Path(source).expanduser().resolve()
+        if not path.exists():
+            LOGGER.warning("Historical dataset not found at %s", path)
+            continue
+        read_path = path
+        if cache_dir is not None and path.suffix.lower() not in COLUMNAR_SUFFIXES:
+            cached = convert_to_columnar(path, cache_dir, sqlite_table=sqlite_table, chunk_rows=query.chunk_rows)
+            if cached is not None:
+                read_path = cached
+        for chunk in iter_history_chunks(read_path, query, sqlite_table=sqlite_table):
+            if "location" not in chunk.columns:
+                chunk = chunk.assign(location="UNKNOWN")
+            parts.append(chunk)
+    if not parts:
+        return pd.DataFrame()
+    merged = pd.concat(parts, ignore_index=True, sort=False) if len(parts) > 1 else parts[0]
+    return merged.sort_values("timestamp", kind="stable").reset_index(drop=True)
@@ -3,12 +3,13 @@ from __future__ import annotations
 
 import os
 from datetime import datetime, timezone
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple
 
 import pandas as pd
 import requests
 from bs4 import BeautifulSoup
 
+from src.marine_ops.connectors.endpoints import record_response, resolve_url
 from src.marine_ops.connectors.open_meteo import (
     OpenMeteoResult,
     fetch_open_meteo_marine,
@@ -18,6 +19,9 @@ from src.marine_ops.connectors.stormglass import StormglassConnector
 from src.marine_ops.connectors.worldtides import create_marine_timeseries_from_worldtides
 from src.marine_ops.core.schema import MarineDataPoint, MarineTimeseries
 from src.marine_ops.pipeline.config import LocationSpec, PipelineConfig
+from src.marine_ops.pipeline.credits import RequestPlanner
+from src.marine_ops.pipeline.delta import DeltaIngestor, frame_timeseries, timeseries_frame
+from src.marine_ops.pipeline.tides import TideSeries
 
 KT_PER_MS = 1.9438444924406
 
@@ -92,35 +96,178 @@ def _dataframe_to_timeseries(location: str, df: pd.DataFrame) -> MarineTimeserie
     )
 
 
-def _try_stormglass(loc: LocationSpec, hours: int) -> Tuple[MarineTimeseries | None, str]:
+METERED_KEYS = {"stormglass": "STORMGLASS_API_KEY", "worldtides": "WORLDTIDES_API_KEY"}
+
+
+def reachable_metered_providers(mode: str) -> List[str]:
+    """Metered providers that can actually be called this run (API key set and not offline)."""
+
+    if mode == "offline":
+        return []
+    return [provider for provider, env in METERED_KEYS.items() if os.getenv(env)]
+
+
+def _offline_metered(
+    planner: RequestPlanner | None, provider: str, loc: LocationSpec, hours: int
+) -> Tuple[MarineTimeseries | None, str]:
+    if planner is None:
+        return None, "skipped (offline mode)"
+    return _planned_cache(planner, provider, loc.id, hours, "offline mode")
+
+
+def _try_stormglass(
+    loc: LocationSpec,
+    hours: int,
+    delta: DeltaIngestor | None = None,
+    planner: RequestPlanner | None = None,
+) -> Tuple[MarineTimeseries | None, str]:
     api_key = os.getenv("STORMGLASS_API_KEY")
     if not api_key:
         return None, "skipped (missing STORMGLASS_API_KEY)"
     connector = StormglassConnector(api_key=api_key)
-    try:
-        start = datetime.now(timezone.utc)
-        end = start + pd.Timedelta(hours=hours)
-        series = connector.get_marine_weather(loc.lat, loc.lon, start, end, location=loc.id)
-        return series, "ok"
-    except Exception as exc:  # pragma: no cover - network path
-        return None, f"error: {exc}"
 
+    def fetch(start: pd.Timestamp, end: pd.Timestamp) -> MarineTimeseries:
+        return connector.get_marine_weather(loc.lat, loc.lon, start, end, location=loc.id)
+
+    return _metered_series(planner, delta, "stormglass", loc, hours, fetch, confidence=0.85)
 
-def _try_worldtides(loc: LocationSpec, hours: int) -> Tuple[MarineTimeseries | None, str]:
+
+def _try_worldtides(
+    loc: LocationSpec,
+    hours: int,
+    delta: DeltaIngestor | None = None,
+    planner: RequestPlanner | None = None,
+) -> Tuple[MarineTimeseries | None, str]:
     api_key = os.getenv("WORLDTIDES_API_KEY")
     if not api_key:
         return None, "skipped (missing WORLDTIDES_API_KEY)"
-    try:
-        series = create_marine_timeseries_from_worldtides(
+
+    def fetch(start: pd.Timestamp, end: pd.Timestamp) -> MarineTimeseries:
+        return create_marine_timeseries_from_worldtides(
             lat=loc.lat,
             lon=loc.lon,
             api_key=api_key,
             location=loc.id,
-            forecast_hours=hours,
+            forecast_hours=int((end - start) / pd.Timedelta(hours=1)) + 1,
+            start=start.to_pydatetime(),
+            # With a planner, credit failures must surface so the cached real tides are used instead.
+            fallback=planner is None,
+        )
+
+    return _metered_series(planner, delta, "worldtides", loc, hours, fetch, confidence=0.8)
+
+
+def _tide_frame(series: MarineTimeseries, index: pd.DatetimeIndex) -> pd.DataFrame | None:
+    """Real tide heights interpolated onto the fused hourly grid as a ``sea_level`` column."""
+
+    if series.source != "worldtides":
+        return None
+    tide = TideSeries.from_timeseries(series)
+    if len(tide) < 2:
+        return None
+    column = tide.aligned(index) if len(index) else tide.hourly()
+    return column.to_frame()
+
+
+def _metered_series(
+    planner: RequestPlanner | None,
+    delta: DeltaIngestor | None,
+    provider: str,
+    loc: LocationSpec,
+    hours: int,
+    fetch: Callable[[pd.Timestamp, pd.Timestamp], MarineTimeseries],
+    confidence: float,
+) -> Tuple[MarineTimeseries | None, str]:
+    """Run a paid connector only when the credit plan funds it; otherwise serve its cached response."""
+
+    call = planner.decision(provider, loc.id) if planner is not None else None
+    if planner is None or call is None:
+        try:
+            return _series_with_delta(delta, provider, loc, hours, fetch, confidence)
+        except Exception as exc:  # pragma: no cover - network path
+            return None, f"error: {exc}"
+
+    if call.action != "call":
+        return _planned_cache(planner, provider, loc.id, hours, call.reason)
+    fetched: List[MarineTimeseries] = []
+
+    def charged_fetch(start: pd.Timestamp, end: pd.Timestamp) -> MarineTimeseries:
+        series = fetch(start, end)
+        fetched.append(series)
+        return series
+
+    try:
+        series, status = _series_with_delta(
+            delta, provider, loc, call.horizon_hours, charged_fetch, confidence, now=pd.Timestamp(planner.ledger.now())
         )
+    except Exception as exc:
+        if "credit" in str(exc).lower() or "크레딧" in str(exc):
+            planner.ledger.mark_exhausted(provider, str(exc))
+        return _planned_cache(planner, provider, loc.id, hours, f"call failed ({exc})")
+    if fetched:
+        planner.record(call, series)
+        status = f"{status}; charged {call.cost} credit(s)"
+    if call.horizon_hours > hours:
+        series = planner.cached_series(provider, loc.id, hours) or series
+    return series, status
+
+
+def _planned_cache(planner: RequestPlanner, provider: str, site: str, hours: int, reason: str) -> Tuple[MarineTimeseries | None, str]:
+    cached = planner.cached_series(provider, site, hours)
+    if cached is None or not cached.data_points:
+        return None, f"skipped ({reason})"
+    return cached, f"ok (cached: {reason})"
+
+
+def _series_with_delta(
+    delta: DeltaIngestor | None,
+    source: str,
+    loc: LocationSpec,
+    hours: int,
+    fetch: Callable[[pd.Timestamp, pd.Timestamp], MarineTimeseries],
+    confidence: float,
+    now: pd.Timestamp | None = None,
+) -> Tuple[MarineTimeseries, str]:
+    """Fetch a connector series, or only its new hours when incremental ingestion is enabled."""
+
+    if delta is None:
+        start = (now if now is not None else pd.Timestamp.now(tz="UTC")).floor("h")
+        return fetch(start, start + pd.Timedelta(hours=hours)), "ok"
+    plan = delta.plan(source, loc.id, hours)
+    if plan.mode == "skip":
+        delta.skipped(plan)
+        return frame_timeseries(delta.window(plan), source, loc.id, confidence), f"ok (cached: {plan.reason})"
+    series = fetch(plan.start, plan.end)
+    if series.source != source or not series.data_points:
+        # Connector fallbacks (e.g. synthetic tides) are passed through but never cached.
         return series, "ok"
-    except Exception as exc:  # pragma: no cover - network path
-        return None, f"error: {exc}"
+    incoming = timeseries_frame(series)
+    incoming = incoming.loc[(incoming.index >= plan.start) & (incoming.index <= plan.end)]
+    delta.commit(plan, incoming)
+    return frame_timeseries(delta.window(plan), source, loc.id, confidence), f"ok ({plan.mode}: {plan.reason})"
+
+
+def _open_meteo_with_delta(
+    delta: DeltaIngestor | None,
+    source: str,
+    loc: LocationSpec,
+    hours: int,
+    tz: str,
+    fetch: Callable[[Tuple[pd.Timestamp, pd.Timestamp] | None], OpenMeteoResult],
+) -> OpenMeteoResult:
+    """Fetch an Open-Meteo frame, requesting only ``start_hour``..``end_hour`` when the cache allows it."""
+
+    if delta is None:
+        return fetch(None)
+    plan = delta.plan(source, loc.id, hours)
+    if plan.mode == "skip":
+        delta.skipped(plan)
+        metadata = {"delta": {"mode": "skip", "reason": plan.reason}}
+    else:
+        result = fetch((plan.start, plan.end) if plan.mode == "tail" else None)
+        delta.commit(plan, result.dataframe)
+        metadata = {**result.metadata, "delta": {"mode": plan.mode, "reason": plan.reason}}
+    return OpenMeteoResult(dataframe=delta.window(plan).tz_convert(tz), metadata=metadata)
 
 
 NCM_URL = "https://albahar.ncm.gov.ae/marine-observations?lang=en"
@@ -128,8 +275,11 @@ _ALERT_KEYWORDS = ("rough at times", "high seas", "fog")
 
 
 def fetch_ncm_alerts(timeout: int = 20) -> Dict[str, List[str] | str]:
+    """Scan the NCM marine-observations page for alert keywords (stand-in/recording aware)."""
+
     try:
-        resp = requests.get(NCM_URL, timeout=timeout)
+        resp = requests.get(resolve_url("ncm", NCM_URL), timeout=timeout)
+        record_response("ncm", resp)
         resp.raise_for_status()
         soup = BeautifulSoup(resp.text, "html.parser")
         text = " ".join(soup.stripped_strings).lower()
@@ -142,12 +292,23 @@ def fetch_ncm_alerts(timeout: int = 20) -> Dict[str, List[str] | str]:
 def collect_weather_data_3d(
     config: PipelineConfig,
     mode: str = "auto",
+    delta: DeltaIngestor | None = None,
+    planner: RequestPlanner | None = None,
 ) -> Dict[str, object]:
-    """Collect 72-hour marine and weather timeseries for all configured locations."""
+    """Collect 72-hour marine and weather timeseries for all configured locations.
+
+    With ``delta`` each source/site requests only a new model cycle or the hours that entered the horizon
+    since the last run, merged into the cached window; the returned ``delta`` entry lists replaced rows.
+    With ``planner`` the metered sources (Stormglass, WorldTides) are called only when the daily credit
+    plan funds them; the plan and credits spent are reported under ``api_status["credits"]``.
+    """
 
     per_location: Dict[str, Dict[str, object]] = {}
     per_location_series: Dict[str, Dict[str, MarineTimeseries]] = {}
     api_status: Dict[str, Dict[str, str]] = {}
+    offline = mode == "offline"
+    if planner is not None:
+        planner.plan_cycle(config.location_ids(), config.forecast_hours, providers=reachable_metered_providers(mode))
 
     for loc in config.locations:
         sources: Dict[str, object] = {}
@@ -155,25 +316,33 @@ def collect_weather_data_3d(
         # Open-Meteo marine
         marine_result: OpenMeteoResult | None = None
         try:
-            marine_result = fetch_open_meteo_marine(
-                lat=loc.lat,
-                lon=loc.lon,
-                hours=config.forecast_hours,
-                hourly=config.marine_vars or [
-                    "wave_height",
-                    "wind_wave_height",
-                    "swell_wave_height",
-                    "wave_period",
-                    "wind_wave_period",
-                    "swell_wave_period",
-                    "wave_direction",
-                    "wind_wave_direction",
-                    "swell_wave_direction",
-                    "ocean_current_velocity",
-                    "sea_surface_temperature",
-                ],
-                tz=config.tz,
-                cell_selection="sea",
+            marine_result = _open_meteo_with_delta(
+                delta,
+                "open_meteo_marine",
+                loc,
+                config.forecast_hours,
+                config.tz,
+                lambda window: fetch_open_meteo_marine(
+                    lat=loc.lat,
+                    lon=loc.lon,
+                    hours=config.forecast_hours,
+                    hourly=config.marine_vars or [
+                        "wave_height",
+                        "wind_wave_height",
+                        "swell_wave_height",
+                        "wave_period",
+                        "wind_wave_period",
+                        "swell_wave_period",
+                        "wave_direction",
+                        "wind_wave_direction",
+                        "swell_wave_direction",
+                        "ocean_current_velocity",
+                        "sea_surface_temperature",
+                    ],
+                    tz=config.tz,
+                    cell_selection="sea",
+                    window=window,
+                ),
             )
             sources["open_meteo_marine"] = marine_result
             api_status.setdefault(loc.id, {})["open_meteo_marine"] = "ok"
@@ -183,17 +352,25 @@ def collect_weather_data_3d(
         # Open-Meteo weather (ECMWF)
         weather_result: OpenMeteoResult | None = None
         try:
-            weather_result = fetch_open_meteo_weather(
-                lat=loc.lat,
-                lon=loc.lon,
-                hours=config.forecast_hours,
-                hourly=config.weather_vars or [
-                    "wind_speed_10m",
-                    "wind_gusts_10m",
-                    "wind_direction_10m",
-                    "visibility",
-                ],
-                tz=config.tz,
+            weather_result = _open_meteo_with_delta(
+                delta,
+                "open_meteo_weather",
+                loc,
+                config.forecast_hours,
+                config.tz,
+                lambda window: fetch_open_meteo_weather(
+                    lat=loc.lat,
+                    lon=loc.lon,
+                    hours=config.forecast_hours,
+                    hourly=config.weather_vars or [
+                        "wind_speed_10m",
+                        "wind_gusts_10m",
+                        "wind_direction_10m",
+                        "visibility",
+                    ],
+                    tz=config.tz,
+                    window=window,
+                ),
             )
             sources["open_meteo_weather"] = weather_result
             api_status.setdefault(loc.id, {})["open_meteo_weather"] = "ok"
@@ -212,15 +389,24 @@ def collect_weather_data_3d(
         )
 
         # Optional sources
-        stormglass_ts, stormglass_status = _try_stormglass(loc, config.forecast_hours)
+        if offline:
+            stormglass_ts, stormglass_status = _offline_metered(planner, "stormglass", loc, config.forecast_hours)
+        else:
+            stormglass_ts, stormglass_status = _try_stormglass(loc, config.forecast_hours, delta, planner)
         api_status.setdefault(loc.id, {})["stormglass"] = stormglass_status
         if stormglass_ts is not None:
             series_bucket["stormglass"] = stormglass_ts
 
-        worldtides_ts, worldtides_status = _try_worldtides(loc, config.forecast_hours)
+        if offline:
+            worldtides_ts, worldtides_status = _offline_metered(planner, "worldtides", loc, config.forecast_hours)
+        else:
+            worldtides_ts, worldtides_status = _try_worldtides(loc, config.forecast_hours, delta, planner)
         api_status.setdefault(loc.id, {})["worldtides"] = worldtides_status
         if worldtides_ts is not None:
             series_bucket["worldtides"] = worldtides_ts
+            tide_frame = _tide_frame(worldtides_ts, fused_df.index)
+            if tide_frame is not None:
+                sources["tide"] = tide_frame
 
         per_location[loc.id] = sources
         per_location_series[loc.id] = series_bucket
@@ -232,7 +418,9 @@ def collect_weather_data_3d(
         "sources": per_location,
         "timeseries": per_location_series,
         "api_status": api_status,
+        "credits": planner.status() if planner is not None else None,
         "ncm_alerts": ncm_info.get("alerts", []),
         "ncm_raw": ncm_info,
         "mode": mode,
+        "delta": delta.summary() if delta is not None else None,
     }
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import logging
-import sqlite3
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List, Mapping, Sequence
@@ -10,13 +9,30 @@ from typing import Dict, Iterable, List, Mapping, Sequence
 import joblib
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import IsolationForest, RandomForestRegressor
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
 from sklearn.impute import SimpleImputer
-from sklearn.metrics import mean_absolute_error
-from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 
+from src.marine_ops.pipeline.anomaly import (
+    AnomalyModelStore,
+    StreamingAnomalyDetector,
+    anomaly_records,
+    score_locations,
+)
+from src.marine_ops.pipeline.features import (
+    BASE_FEATURES,
+    DEFAULT_LAGS,
+    DEFAULT_WINDOWS,
+    build_features,
+    calendar_features,
+    latest_features,
+    resolve_schema,
+)
+from src.marine_ops.pipeline.history import HistoryQuery, iter_history_chunks, load_history
+from src.marine_ops.pipeline.parallel import pin_worker_threads, run_per_location
+
 MODEL_FILENAME = "marine_ml_forecast.joblib"
 DEFAULT_TABLE_NAME = "marine_ml_history"
 FEATURE_COLUMNS = [
@@ -28,6 +44,9 @@ FEATURE_COLUMNS = [
     "dayofweek",
 ]
 TARGET_COLUMN = "eri_target_7d"
+_FEATURE_TAIL_ROWS = max([*DEFAULT_LAGS, *DEFAULT_WINDOWS]) + 1
+HOLDOUT_FRACTION = 0.2
+MIN_HOLDOUT_ROWS = 24
 LOGGER = logging.getLogger(__name__)
 
 
@@ -67,76 +86,30 @@ def _normalise_paths(sources: Iterable[str | Path]) -> List[Path]:
     return paths
 
 
-def _load_csv(path: Path) -> pd.DataFrame:
-    """KR: CSV 파일을 로드합니다. / EN: Load a dataset from CSV."""
-
-    return pd.read_csv(path, parse_dates=["timestamp"], infer_datetime_format=True)
-
-
-def _load_sqlite(path: Path, table: str) -> pd.DataFrame:
-    """KR: SQLite 테이블을 로드합니다. / EN: Load a dataset table from SQLite."""
-
-    import sqlite3
+def _load_csv(path: Path, query: HistoryQuery | None = None) -> pd.DataFrame:
+    """KR: CSV 파일을 청크 단위로 로드합니다. / EN: Load a dataset from CSV in filtered chunks."""
 
-    with sqlite3.connect(path) as conn:
-        query = f"SELECT * FROM {table}"
-        return pd.read_sql_query(query, conn, parse_dates=["timestamp"])
+    chunks = list(iter_history_chunks(path, query))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=["timestamp"])
 
 
-def _coalesce_column(frame: pd.DataFrame, candidates: Sequence[str], default: float = 0.0) -> pd.Series:
-    """KR: 우선순위에 따라 열을 선택합니다. / EN: Pick the first available column by priority."""
+def _load_sqlite(path: Path, table: str, query: HistoryQuery | None = None) -> pd.DataFrame:
+    """KR: SQLite 테이블을 청크 단위로 로드합니다. / EN: Load a dataset table from SQLite in filtered chunks."""
 
-    for name in candidates:
-        if name in frame.columns:
-            return pd.to_numeric(frame[name], errors="coerce").fillna(default)
-    return pd.Series([default] * len(frame), index=frame.index)
-
-
-def _safe_pick(row: Mapping[str, object], candidates: Sequence[str]) -> float:
-    """KR: 행에서 첫 번째 유효 값을 선택합니다. / EN: Pick the first valid value from row mapping."""
-
-    for key in candidates:
-        if key in row:
-            value = row.get(key)
-            try:
-                cast_value = float(value)  # type: ignore[arg-type]
-            except (TypeError, ValueError):
-                continue
-            if not np.isnan(cast_value):
-                return cast_value
-    return float("nan")
+    chunks = list(iter_history_chunks(path, query, sqlite_table=table))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=["timestamp"])
 
 
 def _prepare_training_frame(raw: pd.DataFrame) -> pd.DataFrame:
     """KR: 학습용 데이터프레임을 정리합니다. / EN: Prepare the training dataframe."""
 
-    frame = raw.copy()
-    if "timestamp" not in frame.columns:
+    if "timestamp" not in raw.columns:
         raise ValueError("Historical dataset requires a 'timestamp' column")
-    frame["timestamp"] = pd.to_datetime(frame["timestamp"], utc=True, errors="coerce")
-    frame = frame.dropna(subset=["timestamp"]).sort_values("timestamp")
-
-    frame["hs_value"] = _coalesce_column(frame, ["hs", "hs_mean", "wave_height", "hs_p90"], default=0.0)
-    frame["wind_value"] = _coalesce_column(
-        frame,
-        [
-            "wind_speed_kt",
-            "wind_mean_kt",
-            "wind_speed",
-            "wind_speed_10m",
-            "wind_p90_kt",
-        ],
-        default=0.0,
-    )
-    if "wind_speed_10m" in frame.columns and "wind_value" in frame.columns:
-        fallback = frame["wind_speed_10m"] * 1.9438444924406
-        frame.loc[:, "wind_value"] = frame["wind_value"].where(frame["wind_value"] > 0.0, fallback)
-
-    frame["eri_value"] = _coalesce_column(frame, ["eri", "eri_score", "eri_mean"], default=0.0)
-    frame["eri_rolling_24h"] = frame["eri_value"].rolling(window=24, min_periods=1).mean()
-    frame["hour"] = frame["timestamp"].dt.hour.astype(float)
-    frame["dayofweek"] = frame["timestamp"].dt.dayofweek.astype(float)
-    frame[TARGET_COLUMN] = frame["eri_value"].shift(-168)
+    frame = build_features(raw)
+    if "location" in frame.columns:
+        frame[TARGET_COLUMN] = frame.groupby("location", sort=False)["eri_value"].shift(-168)
+    else:
+        frame[TARGET_COLUMN] = frame["eri_value"].shift(-168)
     frame = frame.dropna(subset=[TARGET_COLUMN])
     if frame.empty:
         raise ValueError("Insufficient historical rows after preparing features")
@@ -147,11 +120,7 @@ def _generate_synthetic_history(period_hours: int = 24 * 28, seed: int = 42) ->
     """KR: 합성 학습 데이터를 생성합니다. / EN: Generate synthetic training history."""
 
     rng = np.random.default_rng(seed)
-    now = pd.Timestamp.utcnow()
-    if now.tzinfo is None:
-        now = now.tz_localize("UTC")
-    else:
-        now = now.tz_convert("UTC")
+    now = pd.Timestamp.now(tz="UTC")
     timestamps = pd.date_range(end=now, periods=period_hours, freq="h")
     hs = 1.5 + 0.4 * np.sin(np.linspace(0, 8 * np.pi, period_hours)) + rng.normal(0, 0.1, period_hours)
     wind = 12.0 + 1.5 * np.cos(np.linspace(0, 6 * np.pi, period_hours)) + rng.normal(0, 0.5, period_hours)
@@ -172,33 +141,33 @@ def train_model(
     *,
     sqlite_table: str = DEFAULT_TABLE_NAME,
     random_state: int = 42,
+    history_window_hours: int | None = None,
 ) -> MLForecastArtifacts:
-    """KR: RandomForest 모델을 학습하고 저장합니다. / EN: Train and persist the RandomForest model."""
+    """KR: RandomForest 모델을 학습하고 저장합니다. / EN: Train and persist the RandomForest model.
+
+    ``history_window_hours`` bounds the training set to the most recent window so that only
+    those rows are streamed out of the sources.
+    """
 
     paths = _normalise_paths(data_sources)
+    query = HistoryQuery.recent(history_window_hours) if history_window_hours else None
     frames: List[pd.DataFrame] = []
     for path in paths:
         if not path.exists():
             continue
         if path.suffix.lower() == ".csv":
-            frames.append(_load_csv(path))
+            frames.append(_load_csv(path, query))
         elif path.suffix.lower() in {".sqlite", ".db"}:
-            frames.append(_load_sqlite(path, sqlite_table))
+            frames.append(_load_sqlite(path, sqlite_table, query))
+    frames = [frame for frame in frames if not frame.empty]
     if not frames:
         frames.append(_generate_synthetic_history())
 
-    combined = pd.concat(frames, ignore_index=True)
+    combined = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
     prepared = _prepare_training_frame(combined)
     X = prepared[FEATURE_COLUMNS]
     y = prepared[TARGET_COLUMN]
 
-    X_train, X_test, y_train, y_test = train_test_split(
-        X,
-        y,
-        test_size=0.2,
-        shuffle=False,
-    )
-
     pipeline = Pipeline(
         steps=[
             ("scaler", StandardScaler()),
@@ -209,14 +178,19 @@ def train_model(
                     max_depth=12,
                     min_samples_leaf=4,
                     random_state=random_state,
+                    n_jobs=-1,
                 ),
             ),
         ]
     )
-    pipeline.fit(X_train, y_train)
-
-    predictions = pipeline.predict(X_test)
-    mae = float(mean_absolute_error(y_test, predictions))
+    # Hold out the latest timestamps across all locations (the frame is grouped by location, so a
+    # positional tail would mostly be the last site).
+    residuals = _chronological_holdout_residuals(pipeline, prepared, X, y)
+    holdout_rows = 0 if residuals is None else len(residuals)
+    pipeline.fit(X, y)
+    if residuals is None:
+        residuals = y.to_numpy() - pipeline.predict(X)
+    mae = float(np.mean(np.abs(residuals)))
 
     artifact_directory = Path(artifact_dir).expanduser().resolve()
     artifact_directory.mkdir(parents=True, exist_ok=True)
@@ -225,6 +199,7 @@ def train_model(
 
     metadata = {
         "rows_trained": float(len(prepared)),
+        "rows_holdout": float(holdout_rows),
         "mae": round(mae, 4),
     }
 
@@ -243,53 +218,48 @@ def load_model(artifact_path: str | Path) -> Pipeline:
 
 
 def _extract_recent_features(frame: pd.DataFrame) -> dict:
-    """KR: 최신 시점에서 피처를 산출합니다. / EN: Derive feature vector from the most recent window."""
+    """KR: 최신 시점에서 피처를 산출합니다. / EN: Derive the feature vector of the most recent observation."""
 
-    working = frame.copy()
-    working = working.sort_index()
-    if not isinstance(working.index, pd.DatetimeIndex):
-        if "timestamp" in working.columns:
-            working["timestamp"] = pd.to_datetime(working["timestamp"], utc=True, errors="coerce")
-            working = working.dropna(subset=["timestamp"]).set_index("timestamp")
-        else:
-            raise ValueError("Fused frame requires DatetimeIndex or 'timestamp' column")
+    latest = latest_features(frame)
+    return {name: float(latest.get(name, 0.0)) for name in (*BASE_FEATURES, "eri_rolling_24h")}
 
-    if working.empty:
-        recent = working
+
+def _last_timestamp(frame: pd.DataFrame) -> pd.Timestamp | None:
+    if isinstance(frame.index, pd.DatetimeIndex):
+        last_ts = frame.index.max()
+    elif "timestamp" in frame.columns:
+        last_ts = pd.to_datetime(frame["timestamp"], utc=True, errors="coerce").max()
     else:
-        last_ts = working.index.max()
-        window_start = last_ts - pd.Timedelta(hours=24)
-        recent = working.loc[window_start:last_ts]
-    if recent.empty:
-        return {
-            "hs_value": 0.0,
-            "wind_value": 0.0,
-            "eri_value": 0.0,
-            "eri_rolling_24h": 0.0,
-        }
+        return None
+    if pd.isna(last_ts):
+        return None
+    return last_ts.tz_convert("UTC") if last_ts.tzinfo else last_ts.tz_localize("UTC")
 
-    hs_series = recent.filter(regex="hs|wave_height", axis=1)
-    if "hs_value" in recent.columns:
-        hs_series = recent[["hs_value"]]
-    wind_series = recent.filter(regex="wind_speed|wind_mean", axis=1)
-    if "wind_value" in recent.columns:
-        wind_series = recent[["wind_value"]]
-    eri_series = recent.filter(regex="eri", axis=1)
-    if "eri_value" in recent.columns:
-        eri_series = recent[["eri_value"]]
-
-    hs_value = float(hs_series.mean(numeric_only=True).iloc[-1]) if not hs_series.empty else 0.0
-    wind_value = float(wind_series.mean(numeric_only=True).iloc[-1]) if not wind_series.empty else 0.0
-    eri_value = float(eri_series.mean(numeric_only=True).iloc[-1]) if not eri_series.empty else 0.0
-
-    return {
-        "hs_value": hs_value,
-        "wind_value": wind_value,
-        "eri_value": eri_value,
-        "eri_rolling_24h": float(recent.filter(like="eri", axis=1).mean(numeric_only=True).mean())
-        if not eri_series.empty
-        else eri_value,
-    }
+
+def _predict_location(location: str, frame: pd.DataFrame, context: tuple) -> pd.DataFrame | None:
+    """KR: 단일 위치의 장기 예측을 계산합니다. / EN: Long-range forecast for one location (worker task)."""
+
+    model, horizon_hours, step_hours = context
+    if frame is None or frame.empty:
+        return None
+    last_ts = _last_timestamp(frame)
+    if last_ts is None:
+        return None
+
+    recent_features = _extract_recent_features(frame)
+    future = pd.DatetimeIndex(
+        [last_ts + pd.Timedelta(hours=offset) for offset in range(step_hours, horizon_hours + step_hours, step_hours)]
+    )
+    inputs = calendar_features(future).assign(**recent_features)[FEATURE_COLUMNS]
+    predictions = pin_worker_threads(model).predict(inputs)
+    return pd.DataFrame(
+        {
+            "timestamp": future,
+            "predicted_eri": predictions.astype(float),
+            "hs_value": recent_features["hs_value"],
+            "wind_value": recent_features["wind_value"],
+        }
+    )
 
 
 def predict_long_range(
@@ -298,113 +268,53 @@ def predict_long_range(
     *,
     horizon_hours: int = 168,
     step_hours: int = 24,
+    max_workers: int | None = 1,
+    timings: Dict[str, float] | None = None,
 ) -> Dict[str, pd.DataFrame]:
-    """KR: 7일 장기 ERI 예측을 생성합니다. / EN: Produce 7-day ERI forecasts."""
+    """KR: 7일 장기 ERI 예측을 생성합니다. / EN: Produce 7-day ERI forecasts.
 
-    results: Dict[str, pd.DataFrame] = {}
-    for location, frame in fused_frames.items():
-        if frame is None or frame.empty:
-            continue
+    Locations run on a process pool when ``max_workers`` > 1; per-location seconds are written into
+    ``timings`` when a dict is supplied.
+    """
 
-        recent_features = _extract_recent_features(frame)
-        if not isinstance(frame.index, pd.DatetimeIndex):
-            if "timestamp" in frame.columns:
-                last_ts = pd.to_datetime(frame["timestamp"], utc=True, errors="coerce").dropna().max()
-            else:
-                continue
-        else:
-            last_ts = frame.index.max()
-        if pd.isna(last_ts):
-            continue
-        last_ts = last_ts.tz_convert("UTC") if last_ts.tzinfo else last_ts.tz_localize("UTC")
-
-        rows = []
-        for offset in range(step_hours, horizon_hours + step_hours, step_hours):
-            future_ts = last_ts + pd.Timedelta(hours=offset)
-            feature_vector = {
-                **recent_features,
-                "hour": float(future_ts.hour),
-                "dayofweek": float(future_ts.dayofweek),
-            }
-            input_df = pd.DataFrame([feature_vector])[FEATURE_COLUMNS]
-            prediction = float(model.predict(input_df)[0])
-            rows.append(
-                {
-                    "timestamp": future_ts,
-                    "predicted_eri": prediction,
-                    "hs_value": feature_vector["hs_value"],
-                    "wind_value": feature_vector["wind_value"],
-                }
-            )
-        results[location] = pd.DataFrame(rows)
-    return results
+    run = run_per_location(
+        _predict_location,
+        fused_frames,
+        context=(model, horizon_hours, step_hours),
+        max_workers=max_workers,
+    )
+    if timings is not None:
+        timings.update(run.timings)
+    return {location: result for location, result in run.results.items() if result is not None}
 
 
 def detect_anomalies(
     fused_frames: Mapping[str, pd.DataFrame],
     *,
-    contamination: float = 0.15,
-    random_state: int = 42,
+    store: AnomalyModelStore | None = None,
+    history: Mapping[str, pd.DataFrame] | None = None,
+    streaming: StreamingAnomalyDetector | None = None,
+    window_hours: int = 72,
+    max_workers: int | None = 1,
+    timings: Dict[str, float] | None = None,
 ) -> Dict[str, List[Dict[str, object]]]:
-    """KR: 최근 시계열의 이상 징후를 탐지합니다. / EN: Detect anomalies from the recent fused timeseries."""
-
-    anomalies: Dict[str, List[Dict[str, object]]] = {}
-    for location, frame in fused_frames.items():
-        if frame is None or frame.empty:
-            continue
-        working = frame.copy()
-        if not isinstance(working.index, pd.DatetimeIndex):
-            if "timestamp" in working.columns:
-                working["timestamp"] = pd.to_datetime(working["timestamp"], utc=True, errors="coerce")
-                working = working.dropna(subset=["timestamp"]).set_index("timestamp")
-            else:
-                continue
-        last_ts = working.index.max()
-        window_start = last_ts - pd.Timedelta(hours=72)
-        recent = working.loc[window_start:last_ts]
-        if recent.empty:
-            continue
-        feature_frame = pd.DataFrame(
-            {
-                "hs_value": _coalesce_column(recent, ["hs_value", "wave_height", "hs", "hs_mean"], default=0.0),
-                "wind_value": _coalesce_column(
-                    recent,
-                    ["wind_value", "wind_speed_kt", "wind_mean_kt", "wind_speed"],
-                    default=0.0,
-                ),
-                "eri_value": _coalesce_column(recent, ["eri_value", "eri", "eri_score"], default=0.0),
-            }
-        )
-        detector = IsolationForest(
-            n_estimators=200,
-            contamination=contamination,
-            random_state=random_state,
-        )
-        detector.fit(feature_frame)
-        predictions = detector.predict(feature_frame)
-        flagged_indices = feature_frame.index[predictions == -1]
-        if flagged_indices.empty:
-            continue
-        location_anomalies: List[Dict[str, object]] = []
-        for ts in flagged_indices:
-            row = recent.loc[ts]
-            if isinstance(row, pd.Series):
-                row_mapping = row.to_dict()
-            else:
-                row_mapping = row.iloc[0].to_dict()
-            location_anomalies.append(
-                {
-                    "timestamp": ts.isoformat(),
-                    "eri_value": _safe_pick(row_mapping, ["eri", "eri_score", "eri_value"]),
-                    "hs_value": _safe_pick(row_mapping, ["hs", "wave_height", "hs_value", "hs_mean"]),
-                    "wind_value": _safe_pick(
-                        row_mapping,
-                        ["wind_speed_kt", "wind_mean_kt", "wind_speed", "wind_value"],
-                    ),
-                }
-            )
-        anomalies[location] = location_anomalies
-    return anomalies
+    """KR: 최근 시계열의 이상 징후를 탐지합니다. / EN: Detect anomalies from the recent fused timeseries.
+
+    Scores come from a persistent per-location model (``store``) or, when none is available, from
+    the streaming EW z-score detector. Every scored location is present in the result, possibly
+    with an empty list.
+    """
+
+    scored = score_locations(
+        fused_frames,
+        store=store,
+        history=history,
+        streaming=streaming,
+        window_hours=window_hours,
+        max_workers=max_workers,
+        timings=timings,
+    )
+    return {location: anomaly_records(result) for location, result in scored.items()}
 
 
 def _normalise_history_sources(
@@ -423,9 +333,12 @@ def _normalise_history_sources(
     return paths
 
 
-def _coerce_timestamp_frame(df: pd.DataFrame) -> pd.DataFrame:
-    """Ensure that a dataframe has a proper UTC timestamp column."""
-    working = df.copy()
+def _coerce_timestamp_frame(df: pd.DataFrame, *, copy: bool = True) -> pd.DataFrame:
+    """Ensure that a dataframe has a proper UTC timestamp column.
+
+    Pass ``copy=False`` for frames the caller already owns (e.g. freshly streamed history).
+    """
+    working = df.copy() if copy else df
     if "timestamp" in working.columns:
         working["timestamp"] = pd.to_datetime(working["timestamp"], utc=True, errors="coerce")
     elif isinstance(working.index, pd.DatetimeIndex):
@@ -437,25 +350,6 @@ def _coerce_timestamp_frame(df: pd.DataFrame) -> pd.DataFrame:
     return working
 
 
-def _load_historical_dataset(source: Path, sqlite_table: str | None = None) -> pd.DataFrame:
-    """Load a historical dataset from CSV or SQLite storage."""
-    if not source.exists():
-        LOGGER.warning("Historical dataset not found at %s", source)
-        return pd.DataFrame()
-    suffix = source.suffix.lower()
-    if suffix == ".csv":
-        data = pd.read_csv(source)
-    elif suffix in {".sqlite", ".db"}:
-        table_name = sqlite_table or DEFAULT_TABLE_NAME
-        with sqlite3.connect(source) as conn:
-            data = pd.read_sql(f"SELECT * FROM {table_name}", conn)
-    else:
-        raise ValueError(f"Unsupported historical data format: {source.suffix}")
-    if "location" not in data.columns:
-        data["location"] = "UNKNOWN"
-    return _coerce_timestamp_frame(data)
-
-
 def _assemble_training_frame_dynamic(
     historical: pd.DataFrame,
     recent_frames: Mapping[str, pd.DataFrame],
@@ -463,7 +357,7 @@ def _assemble_training_frame_dynamic(
     """Merge historical data with the latest fused frames for model training."""
     parts: List[pd.DataFrame] = []
     if not historical.empty:
-        parts.append(historical.copy())
+        parts.append(historical)
     for location, frame in recent_frames.items():
         if frame is None or frame.empty:
             continue
@@ -484,18 +378,45 @@ def _derive_dynamic_feature_columns(
     df: pd.DataFrame,
     target_column: str,
     feature_columns: Sequence[str] | None,
+    excluded: Sequence[str] = (),
 ) -> List[str]:
     """Determine the feature columns to use when training the dynamic model."""
     if feature_columns:
         return [col for col in feature_columns if col in df.columns]
+    skip = {target_column, *excluded}
     numeric_cols = [
         col
         for col, dtype in df.dtypes.items()
-        if col != target_column and pd.api.types.is_numeric_dtype(dtype)
+        if col not in skip and pd.api.types.is_numeric_dtype(dtype)
     ]
     return numeric_cols
 
 
+def _chronological_holdout_residuals(
+    pipeline: Pipeline,
+    training_frame: pd.DataFrame,
+    features: pd.DataFrame,
+    target: pd.Series,
+    holdout_fraction: float = HOLDOUT_FRACTION,
+) -> np.ndarray | None:
+    """Residuals of a clone of ``pipeline`` on the most recent slice of history.
+
+    The cutoff is a timestamp quantile, so every location contributes its latest rows regardless of
+    how the frame is ordered. Returns ``None`` when the frame is too small to split; callers then
+    fall back to the in-sample residual.
+    """
+    if "timestamp" not in training_frame.columns or len(training_frame) < MIN_HOLDOUT_ROWS * 2:
+        return None
+    timestamps = pd.to_datetime(training_frame["timestamp"], utc=True)
+    cutoff = timestamps.quantile(1.0 - holdout_fraction)
+    train_mask = (timestamps < cutoff).to_numpy()
+    if train_mask.sum() < MIN_HOLDOUT_ROWS or (~train_mask).sum() < MIN_HOLDOUT_ROWS:
+        return None
+    scorer = clone(pipeline)
+    scorer.fit(features.loc[train_mask], target.loc[train_mask])
+    return target.loc[~train_mask].to_numpy() - scorer.predict(features.loc[~train_mask])
+
+
 def train_dynamic_model(
     *,
     history_source: str | Path | Iterable[str | Path] | None,
@@ -505,19 +426,33 @@ def train_dynamic_model(
     cache_path: str | Path | None = None,
     sqlite_table: str | None = None,
     force_retrain: bool = False,
+    history_window_hours: int | None = None,
+    history_cache_dir: str | Path | None = None,
 ) -> ForecastArtifacts:
-    """Train or load a dynamic RandomForest regression model for long-range forecasts."""
+    """Train or load a dynamic RandomForest regression model for long-range forecasts.
+
+    History is streamed in chunks; ``history_window_hours`` limits it to a trailing window and
+    ``history_cache_dir`` enables the Parquet conversion cache for CSV/SQLite sources.
+    """
     sources = _normalise_history_sources(history_source)
-    historical_frames: List[pd.DataFrame] = []
-    for source in sources:
-        historical_frames.append(_load_historical_dataset(source, sqlite_table))
-    historical = (
-        pd.concat(historical_frames, ignore_index=True, sort=False) if historical_frames else pd.DataFrame()
+    query = HistoryQuery.recent(history_window_hours) if history_window_hours else HistoryQuery()
+    historical = load_history(
+        sources,
+        query,
+        sqlite_table=sqlite_table or DEFAULT_TABLE_NAME,
+        cache_dir=history_cache_dir,
     )
     training_frame = _assemble_training_frame_dynamic(historical, recent_frames)
     if training_frame.empty:
         raise ValueError("No data available for training the long-range model")
-    resolved_features = _derive_dynamic_feature_columns(training_frame, target_column, feature_columns)
+    schema = resolve_schema(training_frame.columns)
+    training_frame = build_features(training_frame, schema=schema)
+    resolved_features = _derive_dynamic_feature_columns(
+        training_frame,
+        target_column,
+        feature_columns,
+        excluded=schema.leakage_columns(target_column),
+    )
     if not resolved_features:
         raise ValueError("No feature columns available for model training")
     if target_column not in training_frame.columns:
@@ -557,12 +492,15 @@ def train_dynamic_model(
             ),
         ]
     )
+    residuals = _chronological_holdout_residuals(pipeline, training_frame, features, target)
+    holdout_rows = 0 if residuals is None else len(residuals)
     pipeline.fit(features, target)
-    predictions = pipeline.predict(features)
-    residuals = target.to_numpy() - predictions
+    if residuals is None:
+        residuals = target.to_numpy() - pipeline.predict(features)
     rmse = float(np.sqrt(np.mean(residuals**2))) if len(residuals) else None
     metrics = {
         "rows_trained": float(len(training_frame)),
+        "rows_holdout": float(holdout_rows),
         "rmse": float(rmse) if rmse is not None else None,
     }
     if cache_file:
@@ -590,49 +528,67 @@ def train_dynamic_model(
     )
 
 
+def _predict_location_dynamic(location: str, frame: pd.DataFrame, context: tuple) -> pd.DataFrame | None:
+    """Dynamic long-range forecast for one location (worker task)."""
+    model, feature_columns, target_column, rmse, horizon_hours, tz = context
+    if frame is None or frame.empty:
+        return None
+    working = _coerce_timestamp_frame(frame.tail(_FEATURE_TAIL_ROWS))
+    if working.empty:
+        return None
+    working = build_features(working)
+    feature_tail = working.reindex(columns=feature_columns).tail(1)
+    if feature_tail.empty:
+        return None
+    feature_tail = feature_tail.ffill(axis=0).bfill(axis=0)
+    replicated = pd.concat([feature_tail] * horizon_hours, ignore_index=True)
+    predictions = pin_worker_threads(model).predict(replicated)
+    last_ts = working["timestamp"].iloc[-1]
+    if pd.isna(last_ts):
+        return None
+    if last_ts.tzinfo is None:
+        last_ts = last_ts.tz_localize("UTC")
+    timestamps = pd.date_range(
+        last_ts.tz_convert(tz) + pd.Timedelta(hours=1),
+        periods=horizon_hours,
+        freq="h",
+        tz=tz,
+    )
+    return pd.DataFrame(
+        {
+            "timestamp": timestamps,
+            target_column: predictions,
+            "location": location,
+            "model_rmse": rmse,
+        }
+    )
+
+
 def predict_long_range_dynamic(
     artifacts: ForecastArtifacts,
     recent_frames: Mapping[str, pd.DataFrame],
     *,
     horizon_hours: int = 168,
     tz: str = "UTC",
+    max_workers: int | None = 1,
+    timings: Dict[str, float] | None = None,
 ) -> Dict[str, pd.DataFrame]:
     """Produce dynamic long-range forecasts for each configured location."""
-    outputs: Dict[str, pd.DataFrame] = {}
     if horizon_hours <= 0:
-        return outputs
-    for location, frame in recent_frames.items():
-        if frame is None or frame.empty:
-            continue
-        working = _coerce_timestamp_frame(frame)
-        if working.empty:
-            continue
-        feature_tail = working[artifacts.feature_columns].tail(1).copy()
-        if feature_tail.empty:
-            continue
-        feature_tail = feature_tail.ffill(axis=0).bfill(axis=0)
-        replicated = pd.concat([feature_tail] * horizon_hours, ignore_index=True)
-        predictions = artifacts.model.predict(replicated)
-        last_ts = working["timestamp"].iloc[-1]
-        if pd.isna(last_ts):
-            continue
-        if last_ts.tzinfo is None:
-            last_ts = last_ts.tz_localize("UTC")
-        timestamps = pd.date_range(
-            last_ts.tz_convert(tz) + pd.Timedelta(hours=1),
-            periods=horizon_hours,
-            freq="H",
-            tz=tz,
-        )
-        outputs[location] = pd.DataFrame(
-            {
-                "timestamp": timestamps,
-                artifacts.target_column: predictions,
-                "location": location,
-                "model_rmse": artifacts.rmse,
-            }
-        )
-    return outputs
+        return {}
+    # The training frame stays in the parent; workers only receive the fitted model.
+    context = (
+        artifacts.model,
+        list(artifacts.feature_columns),
+        artifacts.target_column,
+        artifacts.rmse,
+        horizon_hours,
+        tz,
+    )
+    run = run_per_location(_predict_location_dynamic, recent_frames, context=context, max_workers=max_workers)
+    if timings is not None:
+        timings.update(run.timings)
+    return {location: result for location, result in run.results.items() if result is not None}
 
 
 def detect_dynamic_anomalies(
@@ -0,0 +1,372 @@
+"""Queued, concurrent notification fan-out with digests, retries and an on-disk outbox."""
+from __future__ import annotations
+
+import json
+import logging
+import queue
+import smtplib
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from email.mime.text import MIMEText
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Mapping, Protocol, Sequence, Tuple
+
+import requests
+
+TELEGRAM_API_BASE = "https://api.telegram.org"
+TELEGRAM_MAX_CHARS = 4096
+DEFAULT_OUTBOX = "logs/notification_outbox.jsonl"
+LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Notification:
+    """KR: 전송할 알림 한 건입니다. / EN: One outbound notification."""
+
+    subject: str
+    body: str
+    severity: str = "info"
+    channels: Tuple[str, ...] = ("telegram", "email")
+    created_at: float = field(default_factory=time.time)
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    @classmethod
+    def from_dict(cls, payload: Mapping[str, object]) -> "Notification":
+        data = dict(payload)
+        data["channels"] = tuple(data.get("channels", ()))
+        return cls(**data)  # type: ignore[arg-type]
+
+
+class Sender(Protocol):
+    name: str
+
+    def send_batch(self, items: Sequence[Notification]) -> None: ...
+
+
+class TelegramSender:
+    """KR: 세션을 재사용하는 Telegram 전송기입니다. / EN: Telegram Bot API sender on one pooled session."""
+
+    name = "telegram"
+
+    def __init__(
+        self,
+        token: str,
+        chat_id: str,
+        *,
+        api_base: str = TELEGRAM_API_BASE,
+        parse_mode: str | None = "HTML",
+        timeout: float = 20.0,
+        session: requests.Session | None = None,
+    ) -> None:
+        self.url = f"{api_base.rstrip('/')}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        self.parse_mode = parse_mode
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+    def send_batch(self, items: Sequence[Notification]) -> None:
+        for item in items:
+            for text in split_message(_telegram_text(item), TELEGRAM_MAX_CHARS):
+                payload: Dict[str, object] = {
+                    "chat_id": self.chat_id,
+                    "text": text,
+                    "disable_web_page_preview": True,
+                }
+                if self.parse_mode:
+                    payload["parse_mode"] = self.parse_mode
+                response = self.session.post(self.url, json=payload, timeout=self.timeout)
+                response.raise_for_status()
+                result = response.json()
+                if not result.get("ok", False):
+                    raise RuntimeError(f"Telegram API error: {result}")
+
+
+class SmtpSender:
+    """KR: 배치마다 SMTP 연결/로그인을 한 번만 합니다. / EN: One SMTP session and login per batch.
+
+    Each notification goes to every recipient in a single ``sendmail`` call.
+    """
+
+    name = "email"
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        sender: str,
+        recipients: Iterable[str],
+        *,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool = True,
+        timeout: float = 30.0,
+        subject_prefix: str = "",
+    ) -> None:
+        self.host = host
+        self.port = int(port)
+        self.sender = sender
+        self.recipients = [recipient for recipient in recipients if recipient]
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.subject_prefix = subject_prefix
+
+    def send_batch(self, items: Sequence[Notification]) -> None:
+        if not self.recipients:
+            raise RuntimeError("No email recipients configured")
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as server:
+            if self.starttls:
+                server.starttls()
+            if self.username and self.password:
+                server.login(self.username, self.password)
+            for item in items:
+                message = MIMEText(item.body, "plain", "utf-8")
+                message["Subject"] = f"{self.subject_prefix}{item.subject}"
+                message["From"] = self.sender
+                message["To"] = ", ".join(self.recipients)
+                server.sendmail(self.sender, self.recipients, message.as_string())
+
+
+def _telegram_text(item: Notification) -> str:
+    return f"{item.subject}\n\n{item.body}" if item.subject else item.body
+
+
+def split_message(text: str, limit: int) -> List[str]:
+    """KR: 긴 본문을 줄 단위로 나눕니다. / EN: Split text into parts of at most ``limit`` characters.
+
+    Parts break at line boundaries; a single line longer than ``limit`` is cut into fixed slices.
+    """
+
+    parts: List[str] = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        while len(line) > limit:
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(line[:limit])
+            line = line[limit:]
+        if len(current) + len(line) > limit:
+            parts.append(current)
+            current = ""
+        current += line
+    parts.append(current)
+    return [part.rstrip("\n") for part in parts if part.strip()] or [text]
+
+
+def coalesce(items: Sequence[Notification]) -> Notification:
+    """KR: 여러 알림을 하나의 요약으로 합칩니다. / EN: Merge several notifications into one digest."""
+
+    if len(items) == 1:
+        return items[0]
+    sections = [f"[{item.severity.upper()}] {item.subject}\n{item.body}".rstrip() for item in items]
+    severities = {item.severity for item in items}
+    severity = next((level for level in ("error", "warning", "report") if level in severities), "info")
+    return Notification(
+        subject=f"{len(items)} notifications",
+        body="\n\n".join(sections),
+        severity=severity,
+        channels=tuple(dict.fromkeys(channel for item in items for channel in item.channels)),
+        created_at=items[0].created_at,
+    )
+
+
+class NotificationDispatcher:
+    """KR: 알림을 큐에 넣고 채널별로 동시에 전송합니다. / EN: Queue notifications and fan out concurrently.
+
+    Items submitted within ``coalesce_window_s`` of the first queued item are merged into one digest per
+    channel. Each channel is retried with exponential backoff; items still undelivered after
+    ``max_attempts`` are appended to the JSONL outbox for :meth:`retry_outbox`. Outbox records are
+    removed only once their re-queued delivery succeeds.
+    """
+
+    def __init__(
+        self,
+        senders: Iterable[Sender],
+        *,
+        outbox_path: str | Path = DEFAULT_OUTBOX,
+        coalesce_window_s: float = 30.0,
+        max_attempts: int = 4,
+        backoff_s: float = 2.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.senders: Dict[str, Sender] = {sender.name: sender for sender in senders}
+        self.outbox_path = Path(outbox_path)
+        self.coalesce_window_s = float(coalesce_window_s)
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_s = float(backoff_s)
+        self._sleep = sleep
+        self._queue: "queue.Queue[Notification | None]" = queue.Queue()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, len(self.senders)), thread_name_prefix="notify")
+        self._worker: threading.Thread | None = None
+        self._stopping = False
+        self._outbox_lock = threading.Lock()
+        # (channel, notification id) of outbox records re-queued and not yet settled
+        self._requeued: set[Tuple[str, str]] = set()
+        self.results: Dict[str, bool] = {}
+
+    def submit(self, notification: Notification) -> None:
+        """KR: 블로킹 없이 큐에 넣습니다. / EN: Enqueue without blocking the caller."""
+
+        self._queue.put(notification)
+
+    def start(self) -> "NotificationDispatcher":
+        """KR: 백그라운드 전송 스레드를 시작합니다. / EN: Start the background delivery thread."""
+
+        if self._worker is None or not self._worker.is_alive():
+            self._stopping = False
+            self._worker = threading.Thread(target=self._run, name="notify-dispatcher", daemon=True)
+            self._worker.start()
+        return self
+
+    def flush(self) -> Dict[str, bool]:
+        """KR: 대기 중인 알림을 모두 전송하고 채널별 결과를 돌려줍니다. / EN: Deliver everything queued.
+
+        Without a running worker the queue is drained on the calling thread as one batch.
+        """
+
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.join()
+        else:
+            batch = self._drain(time.monotonic())
+            if batch:
+                self._deliver(batch)
+                for _ in batch:
+                    self._queue.task_done()
+        return dict(self.results)
+
+    def close(self, timeout: float | None = None) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join(timeout)
+        self.flush()
+        self._pool.shutdown(wait=True)
+
+    def _drain(self, deadline: float) -> List[Notification]:
+        batch: List[Notification] = []
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                return batch
+            if item is None:
+                self._queue.task_done()
+                self._stopping = True
+                return batch
+            batch.append(item)
+
+    def _run(self) -> None:
+        while not self._stopping:
+            first = self._queue.get()
+            if first is None:
+                self._queue.task_done()
+                return
+            batch = [first] + self._drain(time.monotonic() + self.coalesce_window_s)
+            try:
+                self._deliver(batch)
+            except Exception:  # noqa: BLE001
+                LOGGER.exception("Notification delivery crashed")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _deliver(self, batch: Sequence[Notification]) -> None:
+        per_channel: Dict[str, List[Notification]] = {}
+        for item in batch:
+            for channel in item.channels:
+                if channel in self.senders:
+                    per_channel.setdefault(channel, []).append(item)
+        futures = {
+            channel: self._pool.submit(self._send_with_retry, channel, items) for channel, items in per_channel.items()
+        }
+        for channel, future in futures.items():
+            self.results[channel] = future.result()
+
+    def _send_with_retry(self, channel: str, items: Sequence[Notification]) -> bool:
+        sender = self.senders[channel]
+        error: Exception | None = None
+        for attempt in range(self.max_attempts):
+            try:
+                sender.send_batch([coalesce(items)])
+            except Exception as exc:  # noqa: BLE001
+                error = exc
+                LOGGER.warning("%s delivery failed (attempt %d/%d): %s", channel, attempt + 1, self.max_attempts, exc)
+                if attempt + 1 < self.max_attempts:
+                    self._sleep(self.backoff_s * (2**attempt))
+                continue
+            self._settle_outbox(channel, items)
+            return True
+        self._persist(channel, items, error)
+        return False
+
+    def _persist(self, channel: str, items: Sequence[Notification], error: Exception | None) -> None:
+        with self._outbox_lock:
+            # Re-queued items are still in the outbox; only new failures are appended.
+            fresh = [item for item in items if (channel, item.id) not in self._requeued]
+            self._requeued.difference_update((channel, item.id) for item in items)
+            if not fresh:
+                return
+            self.outbox_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.outbox_path.open("a", encoding="utf-8") as handle:
+                for item in fresh:
+                    record = {"channel": channel, "error": str(error), "notification": asdict(item)}
+                    handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def _settle_outbox(self, channel: str, items: Sequence[Notification]) -> None:
+        """KR: 재전송에 성공한 기록만 보관함에서 지웁니다. / EN: Drop delivered re-queued records from the outbox."""
+
+        with self._outbox_lock:
+            settled = {(channel, item.id) for item in items} & self._requeued
+            if not settled:
+                return
+            self._requeued -= settled
+            if not self.outbox_path.exists():
+                return
+            kept = [
+                line
+                for line in self.outbox_path.read_text(encoding="utf-8").splitlines()
+                if line.strip() and _outbox_key(json.loads(line)) not in settled
+            ]
+            if not kept:
+                self.outbox_path.unlink()
+                return
+            staging = self.outbox_path.with_suffix(self.outbox_path.suffix + ".tmp")
+            staging.write_text("\n".join(kept) + "\n", encoding="utf-8")
+            staging.replace(self.outbox_path)
+
+    def retry_outbox(self) -> int:
+        """KR: 보관함의 미전송 알림을 다시 큐에 넣습니다. / EN: Re-queue undelivered outbox items.
+
+        The outbox file is left in place; each record is removed only after its delivery succeeds, so a
+        crash or another failed attempt never loses it.
+        """
+
+        with self._outbox_lock:
+            if not self.outbox_path.exists():
+                return 0
+            records = [json.loads(line) for line in self.outbox_path.read_text(encoding="utf-8").splitlines() if line.strip()]
+            records = [record for record in records if _outbox_key(record) not in self._requeued]
+            self._requeued.update(_outbox_key(record) for record in records)
+        for record in records:
+            notification = Notification.from_dict(record["notification"])
+            self.submit(
+                Notification(
+                    subject=notification.subject,
+                    body=notification.body,
+                    severity=notification.severity,
+                    channels=(record["channel"],),
+                    created_at=notification.created_at,
+                    id=notification.id,
+                )
+            )
+        return len(records)
+
+
+def _outbox_key(record: Mapping[str, object]) -> Tuple[str, str]:
+    notification = record["notification"]
+    return str(record["channel"]), str(notification["id"])  # type: ignore[index]
@@ -0,0 +1,206 @@
+"""Per-location process-pool executor for the ML stage."""
+from __future__ import annotations
+
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Mapping, Tuple, TypeVar
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_WORKERS = 4
+LOGGER = logging.getLogger(__name__)
+
+T = TypeVar("T")
+R = TypeVar("R")
+LocationTask = Callable[[str, Any, Any], R]
+
+_WORKER_CONTEXT: Any = None
+_IN_POOL = False
+
+
+@dataclass(frozen=True, slots=True)
+class SharedFrame:
+    """KR: 메모리 맵으로 공유되는 읽기 전용 프레임입니다. / EN: Read-only frame backed by memory-mapped arrays.
+
+    Numeric columns live in one ``.npy`` matrix per dtype (so bool/int columns come back unchanged) and
+    a DatetimeIndex in an int64 ``.npy`` file; workers map them instead of receiving a pickled copy.
+    Non-numeric and extension-dtype columns travel inline.
+    """
+
+    blocks: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    index_path: str | None
+    index_tz: str | None
+    index_name: str | None
+    index_unit: str
+    extra: Dict[str, Any]
+    column_order: Tuple[str, ...]
+    fallback_index: Any = None
+
+    def load(self) -> pd.DataFrame:
+        if self.index_path is not None:
+            index = pd.DatetimeIndex(np.load(self.index_path, mmap_mode="r").view(f"datetime64[{self.index_unit}]"), name=self.index_name)
+            index = index.tz_localize("UTC").tz_convert(self.index_tz) if self.index_tz else index
+        else:
+            index = self.fallback_index
+        parts = [
+            pd.DataFrame(np.load(path, mmap_mode="r"), columns=list(columns), index=index, copy=False)
+            for path, columns in self.blocks
+        ]
+        frame = pd.concat(parts, axis=1) if parts else pd.DataFrame(index=index)
+        for name, column in self.extra.items():
+            frame[name] = column
+        return frame[list(self.column_order)]
+
+
+@dataclass(slots=True)
+class ParallelResult(Generic[R]):
+    """KR: 위치별 결과와 소요 시간입니다. / EN: Per-location results (input order) and wall-clock timings."""
+
+    results: Dict[str, R]
+    timings: Dict[str, float]
+
+
+def resolve_workers(requested: int | None, n_items: int) -> int:
+    """KR: 작업자 수를 제한합니다. / EN: Bound the worker count by config, CPU count and item count.
+
+    ``None`` (the unconfigured default) runs serially; ``0`` asks for ``DEFAULT_MAX_WORKERS``.
+    """
+
+    cpu_bound = os.cpu_count() or 1
+    if requested is None:
+        return 1
+    limit = DEFAULT_MAX_WORKERS if int(requested) == 0 else int(requested)
+    return max(1, min(limit, cpu_bound, n_items))
+
+
+def share_frame(frame: pd.DataFrame, directory: Path, key: str) -> SharedFrame:
+    """KR: 프레임을 메모리 맵 파일로 저장합니다. / EN: Spill a frame's arrays to memory-mappable files."""
+
+    groups: Dict[np.dtype, list] = {}
+    for col in frame.columns:
+        dtype = frame[col].dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in "biufc":
+            groups.setdefault(dtype, []).append(col)
+    blocks = []
+    for position, (dtype, columns) in enumerate(groups.items()):
+        values_path = directory / f"{key}_values{position}.npy"
+        np.save(values_path, np.ascontiguousarray(frame[columns].to_numpy(dtype=dtype)))
+        blocks.append((str(values_path), tuple(columns)))
+    numeric = {col for columns in groups.values() for col in columns}
+    index_path = None
+    index_tz = None
+    index_unit = "ns"
+    fallback_index = None
+    if isinstance(frame.index, pd.DatetimeIndex):
+        index = frame.index
+        index_tz = str(index.tz) if index.tz is not None else None
+        utc_index = index.tz_convert("UTC").tz_localize(None) if index.tz is not None else index
+        index_path = directory / f"{key}_index.npy"
+        index_unit = utc_index.unit
+        np.save(index_path, utc_index.asi8)
+    else:
+        fallback_index = frame.index
+    return SharedFrame(
+        blocks=tuple(blocks),
+        index_path=str(index_path) if index_path else None,
+        index_tz=index_tz,
+        index_name=frame.index.name,
+        index_unit=index_unit,
+        extra={col: frame[col].to_numpy() for col in frame.columns if col not in numeric},
+        column_order=tuple(frame.columns),
+        fallback_index=fallback_index,
+    )
+
+
+def _init_worker(context: Any) -> None:
+    global _WORKER_CONTEXT
+    _WORKER_CONTEXT = context
+
+
+def _init_pool_worker(context: Any) -> None:
+    global _IN_POOL
+    _IN_POOL = True
+    _init_worker(context)
+
+
+def worker_n_jobs(n_jobs: int | None = -1) -> int | None:
+    """KR: 풀 작업자 안에서는 1을 반환합니다. / EN: ``n_jobs`` for an estimator, or 1 inside a pool worker.
+
+    The pool already spreads locations over the cores; letting sklearn start its own threads in every
+    worker would oversubscribe the machine.
+    """
+
+    return 1 if _IN_POOL else n_jobs
+
+
+def pin_worker_threads(estimator: Any) -> Any:
+    """KR: 풀 작업자 안에서 추정기의 n_jobs 를 1로 고정합니다. / EN: Pin every ``n_jobs`` param to 1 in a pool worker.
+
+    Works for plain estimators and pipelines; workers hold their own unpickled copy, so the change
+    never leaks back to the parent. Outside a pool the estimator is returned unchanged.
+    """
+
+    if not _IN_POOL or not hasattr(estimator, "get_params"):
+        return estimator
+    params = {key: 1 for key in estimator.get_params() if key == "n_jobs" or key.endswith("__n_jobs")}
+    if params:
+        estimator.set_params(**params)
+    return estimator
+
+
+def _run_task(func: LocationTask, location: str, payload: Any) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    if isinstance(payload, SharedFrame):
+        payload = payload.load()
+    result = func(location, payload, _WORKER_CONTEXT)
+    return result, time.perf_counter() - started
+
+
+def run_per_location(
+    func: LocationTask,
+    items: Mapping[str, T],
+    *,
+    context: Any = None,
+    max_workers: int | None = 1,
+) -> ParallelResult:
+    """KR: 위치별 작업을 프로세스 풀에서 실행합니다. / EN: Run ``func(location, item, context)`` per location.
+
+    ``func`` must be a module-level function. ``context`` is shipped once per worker through the pool
+    initializer; DataFrame items are shared via memory-mapped files. Results keep the input order
+    regardless of completion order. ``max_workers`` of 1 (or a single item) runs in-process.
+    """
+
+    locations = [location for location, item in items.items() if item is not None]
+    workers = resolve_workers(max_workers, len(locations))
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    if workers <= 1:
+        _init_worker(context)
+        try:
+            for location in locations:
+                result, elapsed = _run_task(func, location, items[location])
+                results[location] = result
+                timings[location] = round(elapsed, 4)
+        finally:
+            _init_worker(None)
+        return ParallelResult(results=results, timings=timings)
+
+    with tempfile.TemporaryDirectory(prefix="marine_ml_") as workdir:
+        payloads: Dict[str, Any] = {}
+        for position, location in enumerate(locations):
+            item = items[location]
+            payloads[location] = share_frame(item, Path(workdir), f"loc{position}") if isinstance(item, pd.DataFrame) else item
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_pool_worker, initargs=(context,)) as pool:
+            futures = {location: pool.submit(_run_task, func, location, payloads[location]) for location in locations}
+            for location in locations:
+                result, elapsed = futures[location].result()
+                results[location] = result
+                timings[location] = round(elapsed, 4)
+    LOGGER.debug("Ran %s over %d locations with %d workers", getattr(func, "__name__", func), len(locations), workers)
+    return ParallelResult(results=results, timings=timings)
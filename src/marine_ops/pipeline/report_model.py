@@ -0,0 +1,216 @@
+"""Shared intermediate for the 72-hour report writers."""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from zoneinfo import ZoneInfo
+
+from src.marine_ops.pipeline.config import PipelineConfig
+
+PREDICTION_CANDIDATES = ("predicted_eri", "predicted_value", "eri_value", "prediction")
+_PREDICTION_EXCLUDED = {"timestamp", "location", "model_rmse", "hs_value", "wind_value"}
+
+
+def to_python(value: Any) -> Any:
+    """KR: 직렬화 가능한 파이썬 값으로 변환합니다. / EN: Plain-Python value (NaN/NaT -> None, numpy -> builtin)."""
+
+    if value is None:
+        return None
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return None if pd.isna(value) else value.isoformat()
+    if isinstance(value, np.datetime64):
+        return None if np.isnat(value) else pd.Timestamp(value).isoformat()
+    if isinstance(value, (np.floating, float)):
+        return None if math.isnan(value) else float(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, dict):
+        return {key: to_python(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_python(item) for item in value]
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class ColumnTable:
+    """KR: 열 배열 기반의 경량 표입니다. / EN: Lightweight table held as one array per column."""
+
+    columns: Tuple[str, ...]
+    data: Mapping[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.data[self.columns[0]]) if self.columns else 0
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame | None, leading: Mapping[str, Any] | None = None) -> "ColumnTable":
+        if frame is None or frame.empty:
+            return cls((), {})
+        data: Dict[str, np.ndarray] = {}
+        for name, value in (leading or {}).items():
+            data[name] = np.full(len(frame), value, dtype=object)
+        for name in frame.columns:
+            if name not in data:
+                data[str(name)] = frame[name].to_numpy()
+        return cls(tuple(data), data)
+
+    @classmethod
+    def from_records(cls, records: Sequence[Mapping[str, Any]], leading: Sequence[str] = ()) -> "ColumnTable":
+        if not records:
+            return cls((), {})
+        columns: List[str] = list(leading)
+        for record in records:
+            for key in record:
+                if key not in columns:
+                    columns.append(key)
+        data = {name: np.array([record.get(name) for record in records], dtype=object) for name in columns}
+        return cls(tuple(columns), data)
+
+    @classmethod
+    def concat(cls, tables: Iterable["ColumnTable"]) -> "ColumnTable":
+        parts = [table for table in tables if not table.empty]
+        if not parts:
+            return cls((), {})
+        columns: List[str] = []
+        for table in parts:
+            columns.extend(name for name in table.columns if name not in columns)
+        data: Dict[str, np.ndarray] = {}
+        for name in columns:
+            chunks = [
+                table.data[name] if name in table.data else np.full(len(table), None, dtype=object) for table in parts
+            ]
+            dtypes = {chunk.dtype for chunk in chunks}
+            data[name] = np.concatenate(chunks) if len(dtypes) == 1 else np.concatenate([c.astype(object) for c in chunks])
+        return cls(tuple(columns), data)
+
+    def select(self, predicate) -> "ColumnTable":
+        kept = tuple(name for name in self.columns if predicate(name))
+        return ColumnTable(kept, {name: self.data[name] for name in kept})
+
+    def rows(self) -> Iterator[tuple]:
+        return zip(*(self.data[name] for name in self.columns)) if self.columns else iter(())
+
+    def records(self) -> List[Dict[str, Any]]:
+        return [dict(zip(self.columns, (to_python(value) for value in row))) for row in self.rows()]
+
+
+def resolve_prediction_column(table: ColumnTable) -> str | None:
+    """KR: 보고할 예측 열을 고릅니다. / EN: Most relevant prediction value column for reporting output."""
+
+    for candidate in PREDICTION_CANDIDATES:
+        if candidate in table.data:
+            return candidate
+    for name in table.columns:
+        if name not in _PREDICTION_EXCLUDED and np.issubdtype(table.data[name].dtype, np.number):
+            return name
+    return None
+
+
+@dataclass(slots=True)
+class ReportModel:
+    """KR: 모든 출력 형식이 공유하는 보고서 중간 표현입니다. / EN: Report intermediate shared by every writer.
+
+    Inputs are walked once into column tables; HTML, JSON, CSV and TXT writers only read from here.
+    """
+
+    local_ts: datetime
+    timestamp_label: str
+    tz: str
+    location_ids: List[str]
+    forecast_hours: int
+    alerts: List[str]
+    route_windows: List[Dict[str, Any]]
+    decisions: Dict[str, Dict[str, Dict[str, Dict[str, Any]]]]
+    decision_tables: Dict[str, ColumnTable]
+    route_table: ColumnTable
+    long_range_tables: Dict[str, ColumnTable]
+    anomalies: Dict[str, List[Dict[str, Any]]]
+    anomaly_table: ColumnTable
+    api_status: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    ml_metadata: Dict[str, Any] = field(default_factory=dict)
+    backtest_html: str | None = None
+
+    @property
+    def decision_table(self) -> ColumnTable:
+        return ColumnTable.concat(self.decision_tables.values())
+
+    @property
+    def long_range_table(self) -> ColumnTable:
+        return ColumnTable.concat(self.long_range_tables.values())
+
+
+def _decision_records(location: str, decisions: Mapping[str, Mapping[str, Mapping[str, Any]]]) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for day_label, parts in decisions.items():
+        for part_name, payload in parts.items():
+            row = {"location": location, "day": day_label, "daypart": part_name}
+            row.update(payload)
+            rows.append(row)
+    return rows
+
+
+def build_report_model(
+    run_ts: datetime,
+    cfg: PipelineConfig,
+    agi: Dict[str, Dict[str, Dict[str, object]]],
+    das: Dict[str, Dict[str, Dict[str, object]]],
+    route_windows: Iterable[Dict[str, object]],
+    ncm_alerts: Iterable[str],
+    *,
+    api_status: Dict[str, Dict[str, str]] | None = None,
+    long_range: Dict[str, pd.DataFrame] | None = None,
+    anomalies: Dict[str, List[Dict[str, object]]] | pd.DataFrame | None = None,
+    ml_metadata: Dict[str, object] | None = None,
+    backtest_html: str | None = None,
+) -> ReportModel:
+    """KR: 입력을 한 번 순회해 보고서 모델을 만듭니다. / EN: Walk the run outputs once into a ``ReportModel``."""
+
+    local_ts = run_ts.astimezone(ZoneInfo(cfg.tz))
+    windows = list(route_windows or [])
+    decisions = {"AGI": agi or {}, "DAS": das or {}}
+    decision_tables = {
+        location: ColumnTable.from_records(_decision_records(location, parts), leading=("location", "day", "daypart"))
+        for location, parts in decisions.items()
+    }
+    long_range_tables = {
+        location: ColumnTable.from_frame(frame, leading={"location": location})
+        for location, frame in (long_range or {}).items()
+        if isinstance(frame, pd.DataFrame)
+    }
+    if isinstance(anomalies, pd.DataFrame):
+        anomaly_map: Dict[str, List[Dict[str, Any]]] = {}
+        for record in anomalies.to_dict(orient="records"):
+            anomaly_map.setdefault(str(record.get("location", "UNKNOWN")), []).append(record)
+    else:
+        anomaly_map = {location: list(records) for location, records in (anomalies or {}).items()}
+    anomaly_rows = [{"location": location, **record} for location, records in anomaly_map.items() for record in records]
+    return ReportModel(
+        local_ts=local_ts,
+        timestamp_label=local_ts.strftime("%Y%m%d_%H%M"),
+        tz=cfg.tz,
+        location_ids=list(cfg.location_ids()),
+        forecast_hours=int(cfg.forecast_hours),
+        alerts=list(ncm_alerts or []),
+        route_windows=windows,
+        decisions=decisions,
+        decision_tables=decision_tables,
+        route_table=ColumnTable.from_records(windows),
+        long_range_tables=long_range_tables,
+        anomalies=anomaly_map,
+        anomaly_table=ColumnTable.from_records(anomaly_rows, leading=("location",)),
+        api_status=dict(api_status or {}),
+        ml_metadata=dict(ml_metadata or {}),
+        backtest_html=backtest_html,
+    )
@@ -1,71 +1,295 @@
 """Reporting helpers for the 72-hour marine pipeline."""
 from __future__ import annotations
 
+import csv
+import html
 import json
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Iterable, List
+from string import Template
+from typing import Any, Callable, Dict, Iterable, List, TextIO
 
+import numpy as np
 import pandas as pd
-from zoneinfo import ZoneInfo
 
 from src.marine_ops.pipeline.config import PipelineConfig
+from src.marine_ops.pipeline.report_model import (
+    ColumnTable,
+    ReportModel,
+    build_report_model,
+    resolve_prediction_column,
+    to_python,
+)
+
+_HTML_HEAD = Template(
+    """<!DOCTYPE html>
+<html lang='en'>
+<head>
+<meta charset='utf-8'>
+<title>72h Marine Report $label</title>
+<style>
+body { font-family: Arial, sans-serif; margin: 24px; color: #111; }
+h1 { color: #004c97; }
+section { margin-bottom: 32px; }
+.table { border-collapse: collapse; width: 100%; font-size: 13px; }
+.table th, .table td { border: 1px solid #ddd; padding: 6px; text-align: center; }
+.badge { display: inline-block; padding: 4px 8px; margin-right: 6px; border-radius: 4px; background: #eef; color: #004c97; }
+</style>
+</head>
+<body>
+<h1>72h Marine Report — $heading</h1>
+<section>
+  <h2>Executive Summary</h2>
+  <p>Configured locations: $locations. Forecast horizon: $horizon hours.</p>
+  <p>NCM alerts detected: $alerts</p>
+</section>
+"""
+)
+_HTML_SECTION_OPEN = Template("<section>\n  <h2>$title</h2>\n")
+_HTML_SECTION_CLOSE = "</section>\n"
+_HTML_TAIL = "</body>\n</html>\n"
+_NO_DATA = "<p>No data available.</p>\n"
+_EMPTY_TABLE = ColumnTable((), {})
+
+
+def _cell_formatter(values: np.ndarray) -> Callable[[Any], str]:
+    """KR: 열 dtype 별 셀 포맷터를 한 번 선택합니다. / EN: Pick one cell formatter per column dtype."""
+
+    if np.issubdtype(values.dtype, np.floating):
+        return lambda value: "" if value != value else f"{value:.3f}"
+    if np.issubdtype(values.dtype, np.integer):
+        return str
+    # tz-aware columns arrive as object arrays of Timestamps (ColumnTable.from_frame) and use _generic
+    if np.issubdtype(values.dtype, np.datetime64):
+        return lambda value: "" if pd.isna(value) else pd.Timestamp(value).strftime("%Y-%m-%d %H:%M")
+
+    def _generic(value: Any) -> str:
+        if value is None:
+            return ""
+        if isinstance(value, float):
+            return "" if value != value else f"{value:.3f}"
+        if isinstance(value, (pd.Timestamp, datetime)):
+            return value.strftime("%Y-%m-%d %H:%M")
+        return html.escape(str(value))
+
+    return _generic
+
+
+def _write_html_table(handle: TextIO, table: ColumnTable) -> None:
+    """KR: 열 배열에서 행을 바로 스트리밍합니다. / EN: Stream ``<tr>`` rows straight from column arrays."""
+
+    visible = table.select(lambda name: not name.startswith("alerts_"))
+    if visible.empty:
+        handle.write(_NO_DATA)
+        return
+    formatters = [_cell_formatter(visible.data[name]) for name in visible.columns]
+    handle.write("<table class='table'><thead><tr>")
+    handle.write("".join(f"<th>{html.escape(name)}</th>" for name in visible.columns))
+    handle.write("</tr></thead><tbody>\n")
+    for row in visible.rows():
+        handle.write("<tr>")
+        handle.write("".join(f"<td>{fmt(value)}</td>" for fmt, value in zip(formatters, row)))
+        handle.write("</tr>\n")
+    handle.write("</tbody></table>\n")
+
+
+def stream_html(model: ReportModel, handle: TextIO) -> None:
+    """KR: HTML 보고서를 섹션 단위로 스트리밍합니다. / EN: Stream the HTML report section by section."""
+
+    handle.write(
+        _HTML_HEAD.substitute(
+            label=model.timestamp_label,
+            heading=html.escape(model.local_ts.strftime("%Y-%m-%d %H:%M %Z")),
+            locations=html.escape(", ".join(model.location_ids)),
+            horizon=model.forecast_hours,
+            alerts="None" if not model.alerts else html.escape(", ".join(model.alerts)),
+        )
+    )
+    sections = (
+        ("Route Windows (MW4 ↔ AGI)", model.route_table),
+        ("AGI Daypart Decisions", model.decision_tables.get("AGI", _EMPTY_TABLE)),
+        ("DAS Daypart Decisions", model.decision_tables.get("DAS", _EMPTY_TABLE)),
+        ("7-Day Long-Range Forecast", model.long_range_table),
+        ("Sea State Anomaly Alerts", model.anomaly_table),
+    )
+    for title, table in sections:
+        handle.write(_HTML_SECTION_OPEN.substitute(title=title))
+        _write_html_table(handle, table)
+        handle.write(_HTML_SECTION_CLOSE)
+
+    handle.write(_HTML_SECTION_OPEN.substitute(title="ML Model Metadata"))
+    if model.ml_metadata:
+        handle.write("<ul>\n")
+        for key, value in model.ml_metadata.items():
+            handle.write(f"<li><strong>{html.escape(str(key))}</strong>: {html.escape(str(value))}</li>\n")
+        handle.write("</ul>\n")
+    else:
+        handle.write("<p>No ML metadata.</p>\n")
+    handle.write(_HTML_SECTION_CLOSE)
+    if model.backtest_html:
+        handle.write(_HTML_SECTION_OPEN.substitute(title="Backtest Skill (rolling origin)"))
+        handle.write(f"  {model.backtest_html}\n")
+        handle.write(_HTML_SECTION_CLOSE)
+    handle.write(_HTML_TAIL)
+
+
+def _json_payload(model: ReportModel) -> Dict[str, Any]:
+    return {
+        "generated_at": model.local_ts.isoformat(),
+        "tz": model.tz,
+        "alerts": list(model.alerts),
+        "route_windows": to_python(model.route_windows),
+        "decisions": to_python(model.decisions),
+        "api_status": model.api_status,
+        "long_range_forecast": {
+            location: table.select(lambda name: name != "location").records()
+            for location, table in model.long_range_tables.items()
+        },
+        "anomalies": to_python(model.anomalies),
+        "ml_metadata": to_python(model.ml_metadata),
+    }
+
+
+def _write_csv(path: Path, table: ColumnTable) -> None:
+    if table.empty:
+        path.write_text("", encoding="utf-8")
+        return
+    with path.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(table.columns)
+        for row in table.rows():
+            writer.writerow(["" if value is None else value for value in map(to_python, row)])
+
+
+def _number(value: Any) -> float | None:
+    value = to_python(value)
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _format_ts(value: Any) -> str:
+    if isinstance(value, (pd.Timestamp, datetime, np.datetime64)) and not pd.isna(value):
+        return pd.Timestamp(value).strftime("%Y-%m-%d %H:%M")
+    return str(value) if value is not None else "N/A"
+
+
+def _txt_lines(model: ReportModel) -> Iterable[str]:
+    yield f"72h Marine Report ({model.local_ts.strftime('%Y-%m-%d %H:%M %Z')})"
+    yield f"Alerts: {'None' if not model.alerts else ', '.join(model.alerts)}"
+    yield ""
+    yield "Route windows:"
+    if not model.route_windows:
+        yield "  (none)"
+    for item in model.route_windows:
+        hourly = f", hourly {item['hourly_window']}" if item.get("hourly_window") else ""
+        hourly += f", tide {item['tide_window']}" if item.get("tide_window") else ""
+        yield f"  - {item.get('label')}: {item.get('agi_decision')}/{item.get('das_decision')} (start {item.get('start')}{hourly})"
+    yield ""
+
+    for location in ("AGI", "DAS"):
+        table = model.decision_tables.get(location, _EMPTY_TABLE)
+        yield f"{location} dayparts:"
+        if table.empty:
+            yield "  (no data)"
+            continue
+        missing = np.full(len(table), None, dtype=object)
+        names = ("day", "daypart", "decision", "hs_p90", "hs_mean", "wind_p90_kt", "wind_mean_kt")
+        for day, part, decision, hs_p90, hs_mean, wind_p90, wind_mean in zip(*(table.data.get(n, missing) for n in names)):
+            hs_value = _number(hs_p90) if _number(hs_p90) is not None else _number(hs_mean)
+            wind_value = _number(wind_p90) if _number(wind_p90) is not None else _number(wind_mean)
+            decision = decision or "N/A"
+            if hs_value is None:
+                yield f"  - {day} {part}: {decision}"
+            else:
+                wind_str = f"{wind_value:.1f} kt" if wind_value is not None else "N/A"
+                yield f"  - {day} {part}: {decision} (Hs~{hs_value:.2f} m, Wind~{wind_str})"
+        yield ""
+
+    yield "7-day long-range forecast:"
+    if not model.long_range_tables:
+        yield "  (no forecast data)"
+    for location, table in model.long_range_tables.items():
+        if table.empty:
+            yield f"  - {location}: no forecast data"
+            continue
+        predicted_column = resolve_prediction_column(table)
+        if not predicted_column:
+            yield f"  - {location}: forecast value unavailable"
+            continue
+        label = predicted_column.replace("_", " ")
+        missing = np.full(len(table), None, dtype=object)
+        for ts_value, value, hs_value, wind_value in zip(
+            table.data.get("timestamp", missing),
+            table.data[predicted_column],
+            table.data.get("hs_value", missing),
+            table.data.get("wind_value", missing),
+        ):
+            value = _number(value)
+            line = f"  - {location} {_format_ts(ts_value)}: {label} {'N/A' if value is None else f'{value:.2f}'}"
+            extras: List[str] = []
+            if _number(hs_value) is not None:
+                extras.append(f"Hs {_number(hs_value):.2f} m")
+            if _number(wind_value) is not None:
+                extras.append(f"Wind {_number(wind_value):.2f} kt")
+            yield f"{line} ({', '.join(extras)})" if extras else line
+
+    yield ""
+    yield "Anomaly alerts:"
+    if not any(model.anomalies.values()):
+        yield "  (no anomalies)"
+    for location, records in model.anomalies.items():
+        for record in records:
+            parts: List[str] = []
+            for key, label in (
+                ("eri_value", "ERI"),
+                ("observed", "Obs"),
+                ("predicted", "Pred"),
+                ("hs_value", "Hs"),
+                ("wind_value", "Wind"),
+            ):
+                value = _number(record.get(key))
+                if value is None:
+                    continue
+                suffix = " kt" if key == "wind_value" else " m" if key == "hs_value" else ""
+                parts.append(f"{label} {value:.2f}{suffix}")
+            line = f"  - {location} {_format_ts(record.get('timestamp'))}: {', '.join(parts) if parts else 'no metrics'}"
+            message = record.get("message")
+            yield f"{line} ({message})" if message else line
+
+    yield ""
+    if model.ml_metadata:
+        yield "ML metadata:"
+        for key, value in model.ml_metadata.items():
+            yield f"  - {key}: {value}"
+    else:
+        yield "ML metadata: (none)"
+
+
+def write_report(model: ReportModel, out_dir: str = "out", *, include_html: bool = True) -> Dict[str, Path]:
+    """KR: 하나의 모델에서 모든 출력을 씁니다. / EN: Write HTML, JSON, CSV, TXT and ML CSV from one model."""
+
+    output_dir = Path(out_dir)
+    output_dir.mkdir(exist_ok=True)
+    stem = f"summary_3d_{model.timestamp_label}"
+    paths: Dict[str, Path] = {}
+    if include_html:
+        paths["html"] = output_dir / f"{stem}.html"
+        with paths["html"].open("w", encoding="utf-8") as handle:
+            stream_html(model, handle)
+
+    paths["json"] = output_dir / f"{stem}.json"
+    with paths["json"].open("w", encoding="utf-8") as handle:
+        json.dump(_json_payload(model), handle, ensure_ascii=False, indent=2)
+
+    paths["csv"] = output_dir / f"{stem}.csv"
+    _write_csv(paths["csv"], model.decision_table)
 
+    paths["txt"] = output_dir / f"{stem}.txt"
+    with paths["txt"].open("w", encoding="utf-8") as handle:
+        handle.writelines(f"{line}\n" for line in _txt_lines(model))
 
-def _decisions_to_rows(
-    location: str,
-    decisions: Dict[str, Dict[str, Dict[str, object]]],
-) -> List[Dict[str, object]]:
-    rows: List[Dict[str, object]] = []
-    for day_label, parts in decisions.items():
-        for part_name, payload in parts.items():
-            row = {
-                "location": location,
-                "day": day_label,
-                "daypart": part_name,
-            }
-            row.update(payload)
-            rows.append(row)
-    return rows
-
-
-def _safe_json(value):
-    if isinstance(value, float) and (pd.isna(value) or pd.isnull(value)):
-        return None
-    if isinstance(value, (pd.Timestamp, datetime)):
-        return value.isoformat()
-    if isinstance(value, dict):
-        return {k: _safe_json(v) for k, v in value.items()}
-    if isinstance(value, list):
-        return [_safe_json(item) for item in value]
-    return value
-
-
-def _resolve_prediction_column(df: pd.DataFrame) -> str | None:
-    """Identify the most relevant prediction value column for reporting output."""
-    candidates = [
-        "predicted_eri",
-        "predicted_value",
-        "eri_value",
-        "prediction",
-    ]
-    for candidate in candidates:
-        if candidate in df.columns:
-            return candidate
-    numeric_cols = [
-        col
-        for col in df.columns
-        if col
-        not in {
-            "timestamp",
-            "location",
-            "model_rmse",
-            "hs_value",
-            "wind_value",
-        }
-        and pd.api.types.is_numeric_dtype(df[col])
-    ]
-    return numeric_cols[0] if numeric_cols else None
+    paths["ml_csv"] = output_dir / f"{stem}_ml.csv"
+    _write_csv(paths["ml_csv"], model.long_range_table)
+    return paths
 
 
 def render_html_3d(
@@ -79,105 +303,26 @@ def render_html_3d(
     long_range: Dict[str, pd.DataFrame] | None = None,
     anomalies: Dict[str, List[Dict[str, object]]] | None = None,
     ml_metadata: Dict[str, object] | None = None,
+    backtest_html: str | None = None,
     out_dir: str = "out",
 ) -> Path:
+    model = build_report_model(
+        run_ts,
+        cfg,
+        agi,
+        das,
+        route_windows,
+        ncm_alerts,
+        long_range=long_range,
+        anomalies=anomalies,
+        ml_metadata=ml_metadata,
+        backtest_html=backtest_html,
+    )
     output_dir = Path(out_dir)
     output_dir.mkdir(exist_ok=True)
-
-    local_ts = run_ts.astimezone(ZoneInfo(cfg.tz))
-    timestamp_label = local_ts.strftime("%Y%m%d_%H%M")
-    html_path = output_dir / f"summary_3d_{timestamp_label}.html"
-
-    agi_rows = pd.DataFrame(_decisions_to_rows("AGI", agi))
-    das_rows = pd.DataFrame(_decisions_to_rows("DAS", das))
-    route_rows = pd.DataFrame(list(route_windows)) if route_windows else pd.DataFrame()
-
-    def _render_table(df: pd.DataFrame) -> str:
-        if df.empty:
-            return "<p>No data available.</p>"
-        friendly = df.copy()
-        friendly = friendly.drop(columns=[col for col in friendly.columns if col.startswith("alerts_")], errors="ignore")
-        return friendly.to_html(index=False, classes="table", justify="center", border=0)
-
-    lr_frames: List[pd.DataFrame] = []
-    for location, df in (long_range or {}).items():
-        if df is None or df.empty:
-            continue
-        enriched = df.copy()
-        enriched.insert(0, "location", location)
-        lr_frames.append(enriched)
-    long_range_table = pd.concat(lr_frames, ignore_index=True) if lr_frames else pd.DataFrame()
-
-    anomalies_rows: List[Dict[str, object]] = []
-    if isinstance(anomalies, pd.DataFrame):
-        anomalies_rows = anomalies.to_dict(orient="records")
-    else:
-        for location, records in (anomalies or {}).items():
-            for record in records:
-                payload = {"location": location}
-                payload.update(record)
-                anomalies_rows.append(payload)
-    anomalies_table = pd.DataFrame(anomalies_rows)
-
-    metadata_html = "<p>No ML metadata.</p>"
-    if ml_metadata:
-        metadata_lines = ["<ul>"]
-        for key, value in ml_metadata.items():
-            metadata_lines.append(f"<li><strong>{key}</strong>: {value}</li>")
-        metadata_lines.append("</ul>")
-        metadata_html = "\n".join(metadata_lines)
-
-    html = f"""
-<!DOCTYPE html>
-<html lang='en'>
-<head>
-<meta charset='utf-8'>
-<title>72h Marine Report {timestamp_label}</title>
-<style>
-body {{ font-family: Arial, sans-serif; margin: 24px; color: #111; }}
-h1 {{ color: #004c97; }}
-section {{ margin-bottom: 32px; }}
-.table {{ border-collapse: collapse; width: 100%; font-size: 13px; }}
-.table th, .table td {{ border: 1px solid #ddd; padding: 6px; text-align: center; }}
-.badge {{ display: inline-block; padding: 4px 8px; margin-right: 6px; border-radius: 4px; background: #eef; color: #004c97; }}
-</style>
-</head>
-<body>
-<h1>72h Marine Report — {local_ts.strftime('%Y-%m-%d %H:%M %Z')}</h1>
-<section>
-  <h2>Executive Summary</h2>
-  <p>Configured locations: {', '.join(cfg.location_ids())}. Forecast horizon: {cfg.forecast_hours} hours.</p>
-  <p>NCM alerts detected: {'None' if not ncm_alerts else ', '.join(ncm_alerts)}</p>
-</section>
-<section>
-  <h2>Route Windows (MW4 ↔ AGI)</h2>
-  {_render_table(route_rows)}
-</section>
-<section>
-  <h2>AGI Daypart Decisions</h2>
-  {_render_table(agi_rows)}
-</section>
-<section>
-  <h2>DAS Daypart Decisions</h2>
-  {_render_table(das_rows)}
-</section>
-<section>
-  <h2>7-Day Long-Range Forecast</h2>
-  {_render_table(long_range_table)}
-</section>
-<section>
-  <h2>Sea State Anomaly Alerts</h2>
-  {_render_table(anomalies_table)}
-</section>
-<section>
-  <h2>ML Model Metadata</h2>
-  {metadata_html}
-</section>
-</body>
-</html>
-"""
-
-    html_path.write_text(html, encoding="utf-8")
+    html_path = output_dir / f"summary_3d_{model.timestamp_label}.html"
+    with html_path.open("w", encoding="utf-8") as handle:
+        stream_html(model, handle)
     return html_path
 
 
@@ -195,174 +340,16 @@ def write_side_outputs(
     ml_metadata: Dict[str, object] | None = None,
     out_dir: str = "out",
 ) -> Dict[str, Path]:
-    output_dir = Path(out_dir)
-    output_dir.mkdir(exist_ok=True)
-    local_ts = run_ts.astimezone(ZoneInfo(cfg.tz))
-    timestamp_label = local_ts.strftime("%Y%m%d_%H%M")
-
-    agi_rows = _decisions_to_rows("AGI", agi)
-    das_rows = _decisions_to_rows("DAS", das)
-    combined_rows = agi_rows + das_rows
-
-    json_payload = {
-        "generated_at": local_ts.isoformat(),
-        "tz": cfg.tz,
-        "alerts": list(ncm_alerts),
-        "route_windows": list(route_windows),
-        "decisions": {
-            "AGI": agi,
-            "DAS": das,
-        },
-        "api_status": api_status,
-        "long_range_forecast": {
-            location: df.to_dict(orient="records") if isinstance(df, pd.DataFrame) else []
-            for location, df in (long_range or {}).items()
-        },
-        "anomalies": anomalies or {},
-        "ml_metadata": ml_metadata or {},
-    }
-
-    json_path = output_dir / f"summary_3d_{timestamp_label}.json"
-    json_path.write_text(json.dumps(_safe_json(json_payload), ensure_ascii=False, indent=2), encoding="utf-8")
-
-    csv_path = output_dir / f"summary_3d_{timestamp_label}.csv"
-    if combined_rows:
-        pd.DataFrame(combined_rows).to_csv(csv_path, index=False)
-    else:
-        csv_path.write_text("", encoding="utf-8")
-
-    txt_lines = [
-        f"72h Marine Report ({local_ts.strftime('%Y-%m-%d %H:%M %Z')})",
-        f"Alerts: {'None' if not ncm_alerts else ', '.join(ncm_alerts)}",
-        "",
-        "Route windows:",
-    ]
-    windows = list(route_windows)
-    if not windows:
-        txt_lines.append("  (none)")
-    else:
-        for item in windows:
-            txt_lines.append(
-                f"  - {item.get('label')}: {item.get('agi_decision')}/{item.get('das_decision')} (start {item.get('start')})"
-            )
-
-    txt_lines.append("")
-    for location, rows in (("AGI", agi_rows), ("DAS", das_rows)):
-        txt_lines.append(f"{location} dayparts:")
-        if not rows:
-            txt_lines.append("  (no data)")
-            continue
-        df = pd.DataFrame(rows)
-        for _, row in df.iterrows():
-            hs_value = row.get("hs_p90") if not pd.isna(row.get("hs_p90")) else row.get("hs_mean")
-            wind_value = row.get("wind_p90_kt") if not pd.isna(row.get("wind_p90_kt")) else row.get("wind_mean_kt")
-            if pd.isna(hs_value):
-                summary_line = f"  - {row['day']} {row['daypart']}: {row.get('decision', 'N/A')}"
-            else:
-                hs_str = f"{hs_value:.2f} m" if hs_value is not None else "N/A"
-                wind_str = f"{wind_value:.1f} kt" if wind_value is not None and not pd.isna(wind_value) else "N/A"
-                summary_line = (
-                    f"  - {row['day']} {row['daypart']}: {row.get('decision', 'N/A')} "
-                    f"(Hs~{hs_str}, Wind~{wind_str})"
-                )
-            txt_lines.append(summary_line)
-        txt_lines.append("")
-
-    txt_lines.append("7-day long-range forecast:")
-    if long_range:
-        for location, df in long_range.items():
-            if not isinstance(df, pd.DataFrame) or df.empty:
-                txt_lines.append(f"  - {location}: no forecast data")
-                continue
-            predicted_column = _resolve_prediction_column(df)
-            if not predicted_column:
-                txt_lines.append(f"  - {location}: forecast value unavailable")
-                continue
-            label = predicted_column.replace("_", " ")
-            for _, row in df.iterrows():
-                ts_value = row.get("timestamp")
-                if isinstance(ts_value, (pd.Timestamp, datetime)) and pd.notna(ts_value):
-                    ts_str = ts_value.strftime("%Y-%m-%d %H:%M")
-                else:
-                    ts_str = str(ts_value) if ts_value not in (None, pd.NA) else "N/A"
-                value = row.get(predicted_column)
-                value_str = "N/A"
-                if value is not None and not pd.isna(value):
-                    value_str = f"{float(value):.2f}"
-                line = f"  - {location} {ts_str}: {label} {value_str}"
-                hs_value = row.get("hs_value")
-                wind_value = row.get("wind_value")
-                extras: List[str] = []
-                if hs_value is not None and not pd.isna(hs_value):
-                    extras.append(f"Hs {float(hs_value):.2f} m")
-                if wind_value is not None and not pd.isna(wind_value):
-                    extras.append(f"Wind {float(wind_value):.2f} kt")
-                if extras:
-                    line = f"{line} ({', '.join(extras)})"
-                txt_lines.append(line)
-    else:
-        txt_lines.append("  (no forecast data)")
-
-    txt_lines.append("")
-    txt_lines.append("Anomaly alerts:")
-    if anomalies:
-        for location, records in anomalies.items():
-            if not records:
-                continue
-            for record in records:
-                ts_value = record.get("timestamp")
-                if isinstance(ts_value, (pd.Timestamp, datetime)):
-                    ts_str = ts_value.strftime("%Y-%m-%d %H:%M")
-                else:
-                    ts_str = str(ts_value) if ts_value is not None else "N/A"
-                parts: List[str] = []
-                for key, label in (
-                    ("eri_value", "ERI"),
-                    ("observed", "Obs"),
-                    ("predicted", "Pred"),
-                    ("hs_value", "Hs"),
-                    ("wind_value", "Wind"),
-                ):
-                    value = record.get(key)
-                    if value is None or pd.isna(value):
-                        continue
-                    suffix = " kt" if key == "wind_value" else " m" if key == "hs_value" else ""
-                    parts.append(f"{label} {float(value):.2f}{suffix}")
-                detail = ", ".join(parts) if parts else "no metrics"
-                message = record.get("message")
-                line = f"  - {location} {ts_str}: {detail}"
-                if message:
-                    line = f"{line} ({message})"
-                txt_lines.append(line)
-    else:
-        txt_lines.append("  (no anomalies)")
-
-    txt_lines.append("")
-    if ml_metadata:
-        txt_lines.append("ML metadata:")
-        for key, value in ml_metadata.items():
-            txt_lines.append(f"  - {key}: {value}")
-    else:
-        txt_lines.append("ML metadata: (none)")
-
-    txt_path = output_dir / f"summary_3d_{timestamp_label}.txt"
-    txt_path.write_text("\n".join(txt_lines), encoding="utf-8")
-
-    forecast_csv_path = output_dir / f"summary_3d_{timestamp_label}_ml.csv"
-    if long_range:
-        lr_concat = pd.concat(
-            [
-                df.assign(location=location)
-                for location, df in (long_range or {}).items()
-                if isinstance(df, pd.DataFrame) and not df.empty
-            ],
-            ignore_index=True,
-        )
-        if not lr_concat.empty:
-            lr_concat.to_csv(forecast_csv_path, index=False)
-        else:
-            forecast_csv_path.write_text("", encoding="utf-8")
-    else:
-        forecast_csv_path.write_text("", encoding="utf-8")
-
-    return {"json": json_path, "csv": csv_path, "txt": txt_path, "ml_csv": forecast_csv_path}
+    model = build_report_model(
+        run_ts,
+        cfg,
+        agi,
+        das,
+        route_windows,
+        ncm_alerts,
+        api_status=api_status,
+        long_range=long_range,
+        anomalies=anomalies,
+        ml_metadata=ml_metadata,
+    )
+    return write_report(model, out_dir, include_html=False)
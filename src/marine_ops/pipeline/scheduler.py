@@ -0,0 +1,143 @@
+"""Dependency-aware job graph for the long-lived automation daemon."""
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Mapping, Sequence, Tuple
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+
+class LatencyHistogram:
+    """KR: 고정 버킷 지연 시간 히스토그램입니다. / EN: Fixed-bucket latency histogram in seconds.
+
+    Bucket ``i`` counts samples ``<= LATENCY_BUCKETS[i]``; the last slot is the overflow bucket.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(float(edge) for edge in buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float | None:
+        """KR: 버킷 상한 기준 분위수 추정치입니다. / EN: Upper-bound estimate of the ``q`` quantile."""
+
+        if not self.count:
+            return None
+        target = q * self.count
+        running = 0
+        for edge, count in zip(self.buckets, self.counts):
+            running += count
+            if running >= target:
+                return edge
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_s": round(self.total, 4),
+            "max_s": round(self.max, 4),
+            "p50_s": self.quantile(0.5),
+            "p95_s": self.quantile(0.95),
+            "buckets": {f"le_{edge:g}": count for edge, count in zip(self.buckets, self.counts)}
+            | {"le_inf": self.counts[-1]},
+        }
+
+
+@dataclass(slots=True)
+class JobResult:
+    value: Any
+    finished_at: float
+    duration_s: float
+
+
+@dataclass(slots=True)
+class _Job:
+    name: str
+    func: Callable[[Mapping[str, Any]], Any]
+    depends_on: Tuple[str, ...]
+    max_age_s: float
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    failures: int = 0
+
+
+class JobGraph:
+    """KR: 의존성과 신선도 기반으로 작업을 중복 없이 실행합니다. / EN: Run jobs once per freshness window.
+
+    Each job receives the values of its dependencies. A dependency whose last result is younger than its
+    ``max_age_s`` is reused rather than re-run, and callers that arrive while a job is running wait for that
+    run instead of starting another one.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._jobs: Dict[str, _Job] = {}
+        self._results: Dict[str, JobResult] = {}
+        self._clock = clock
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[Mapping[str, Any]], Any],
+        *,
+        depends_on: Sequence[str] = (),
+        max_age_s: float = 0.0,
+    ) -> None:
+        missing = [dep for dep in depends_on if dep not in self._jobs]
+        if missing:
+            raise ValueError(f"Job '{name}' depends on unknown jobs: {missing}")
+        self._jobs[name] = _Job(name, func, tuple(depends_on), float(max_age_s))
+
+    def result(self, name: str) -> JobResult | None:
+        return self._results.get(name)
+
+    def is_fresh(self, name: str) -> bool:
+        result = self._results.get(name)
+        return result is not None and self._clock() - result.finished_at < self._jobs[name].max_age_s
+
+    def run(self, name: str, *, force: bool = False) -> Any:
+        """KR: 의존 작업을 먼저 해결한 뒤 작업을 실행합니다. / EN: Resolve dependencies, then run ``name``.
+
+        ``force`` re-runs the named job even when fresh; dependencies still follow their freshness window.
+        """
+
+        job = self._jobs[name]
+        inputs = {dep: self.run(dep) for dep in job.depends_on}
+        started_wait = self._clock()
+        with job.lock:
+            latest = self._results.get(name)
+            if latest is not None and (
+                (not force and self.is_fresh(name)) or (force and latest.finished_at >= started_wait)
+            ):
+                return latest.value
+            started = self._clock()
+            try:
+                value = job.func(inputs)
+            except Exception:
+                job.failures += 1
+                job.histogram.record(self._clock() - started)
+                raise
+            finished = self._clock()
+            job.histogram.record(finished - started)
+            self._results[name] = JobResult(value, finished, finished - started)
+            return value
+
+    def invalidate(self, name: str) -> None:
+        self._results.pop(name, None)
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {**job.histogram.snapshot(), "failures": job.failures, "fresh": self.is_fresh(name)}
+            for name, job in self._jobs.items()
+        }
+
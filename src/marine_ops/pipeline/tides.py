@@ -0,0 +1,274 @@
+"""Tide-height arrays: hourly alignment, high/low waters, threshold crossings and tide windows."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping
+
+import numpy as np
+import pandas as pd
+
+from src.marine_ops.core.schema import MarineTimeseries
+from src.marine_ops.pipeline.windows import format_span, from_epoch_seconds, to_epoch_seconds
+
+HIGH, LOW = 1, -1
+RISING, FALLING = 1, -1
+EVENT_LABELS = {HIGH: "HW", LOW: "LW"}
+DEFAULT_MAX_GAP_S = 2 * 3600
+
+
+@dataclass(frozen=True)
+class TideSeries:
+    """KR: 시간 순 조석 높이 배열입니다. / EN: Time-sorted tide heights (m) at their native resolution.
+
+    WorldTides returns 30-minute heights; they are kept as arrays and only interpolated when aligned to
+    another grid.
+    """
+
+    site: str
+    epoch_s: np.ndarray
+    height_m: np.ndarray
+
+    @classmethod
+    def build(cls, site: str, epoch_s: Any, height_m: Any) -> "TideSeries":
+        epoch = np.asarray(epoch_s, dtype=np.int64)
+        height = np.asarray(height_m, dtype=np.float64)
+        valid = ~np.isnan(height)
+        epoch, height = epoch[valid], height[valid]
+        order = np.argsort(epoch, kind="stable")
+        epoch, height = epoch[order], height[order]
+        unique = np.concatenate(([True], np.diff(epoch) > 0)) if len(epoch) else np.array([], dtype=bool)
+        return cls(site, epoch[unique], height[unique])
+
+    @classmethod
+    def from_timeseries(cls, series: MarineTimeseries) -> "TideSeries":
+        """KR: ``sea_level`` 필드에서 만듭니다. / EN: Build from the ``sea_level`` of connector points."""
+
+        points = [point for point in series.data_points if point.sea_level is not None]
+        if not points:
+            return cls.build(series.location, [], [])
+        epoch = to_epoch_seconds([point.timestamp for point in points])
+        return cls.build(series.location, epoch, [point.sea_level for point in points])
+
+    def __len__(self) -> int:
+        return len(self.epoch_s)
+
+    def at(self, epoch_s: Any, max_gap_s: int = DEFAULT_MAX_GAP_S) -> np.ndarray:
+        """KR: 임의 시각의 선형 보간 높이입니다. / EN: Linearly interpolated heights at ``epoch_s``.
+
+        Times outside the series, or inside a gap longer than ``max_gap_s``, are NaN.
+        """
+
+        target = np.asarray(epoch_s, dtype=np.int64)
+        if len(self) < 2:
+            return np.full(target.shape, np.nan)
+        values = np.interp(target, self.epoch_s, self.height_m)
+        right = np.clip(np.searchsorted(self.epoch_s, target, side="left"), 1, len(self) - 1)
+        gap = self.epoch_s[right] - self.epoch_s[right - 1]
+        outside = (target < self.epoch_s[0]) | (target > self.epoch_s[-1]) | (gap > max_gap_s)
+        values[outside] = np.nan
+        return values
+
+    def aligned(self, index: pd.DatetimeIndex, max_gap_s: int = DEFAULT_MAX_GAP_S) -> pd.Series:
+        """KR: 다른 프레임의 시간 격자에 맞춘 ``sea_level`` 열입니다. / EN: ``sea_level`` on another frame's grid."""
+
+        return pd.Series(self.at(to_epoch_seconds(index), max_gap_s), index=index, name="sea_level")
+
+    def hourly(self, max_gap_s: int = DEFAULT_MAX_GAP_S) -> pd.Series:
+        """KR: 정시 격자로 재표본화합니다. / EN: Heights resampled onto the whole-hour UTC grid it spans."""
+
+        if len(self) < 2:
+            return pd.Series([], index=pd.DatetimeIndex([], tz="UTC"), name="sea_level", dtype=float)
+        first = -(-int(self.epoch_s[0]) // 3600) * 3600
+        grid = np.arange(first, int(self.epoch_s[-1]) + 1, 3600, dtype=np.int64)
+        return self.aligned(from_epoch_seconds(grid, "UTC"), max_gap_s)
+
+
+@dataclass(frozen=True)
+class TideEvents:
+    """KR: 고조/저조 또는 임계값 통과 시각입니다. / EN: High/low waters or threshold crossings as arrays.
+
+    ``kind`` is ``HIGH``/``LOW`` for extrema and ``RISING``/``FALLING`` for crossings.
+    """
+
+    epoch_s: np.ndarray
+    height_m: np.ndarray
+    kind: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.epoch_s)
+
+    def take(self, mask: np.ndarray) -> "TideEvents":
+        return TideEvents(self.epoch_s[mask], self.height_m[mask], self.kind[mask])
+
+    def within(self, start_s: int, end_s: int) -> "TideEvents":
+        return self.take((self.epoch_s >= start_s) & (self.epoch_s < end_s))
+
+    def records(self, tz: str | int, labels: Mapping[int, str] = EVENT_LABELS) -> List[Dict[str, Any]]:
+        return [
+            {"time": stamp.to_pydatetime(), "height_m": round(float(height), 3), "kind": labels.get(int(code), str(code))}
+            for stamp, height, code in zip(from_epoch_seconds(self.epoch_s, tz), self.height_m, self.kind)
+        ]
+
+
+def find_extrema(tide: TideSeries) -> TideEvents:
+    """KR: 기울기 부호 변화로 고조/저조를 찾습니다. / EN: High and low waters from slope sign changes.
+
+    Flat steps inherit the previous slope sign so a plateau yields one turning point. Each turning
+    sample is refined with a parabola through its neighbours, which recovers the time and height of
+    the true extremum between 30-minute samples.
+    """
+
+    if len(tide) < 3:
+        return _empty_events()
+    slope = np.sign(np.diff(tide.height_m))
+    filled = pd.Series(np.where(slope == 0, np.nan, slope)).ffill().bfill().to_numpy()
+    turn = np.flatnonzero(filled[:-1] != filled[1:]) + 1
+    if not len(turn):
+        return _empty_events()
+    kind = np.where(filled[turn - 1] > 0, HIGH, LOW).astype(np.int8)
+    y0, y1, y2 = tide.height_m[turn - 1], tide.height_m[turn], tide.height_m[turn + 1]
+    t0, t1, t2 = tide.epoch_s[turn - 1], tide.epoch_s[turn], tide.epoch_s[turn + 1]
+    curvature = y0 - 2.0 * y1 + y2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shift = np.where(curvature != 0, 0.5 * (y0 - y2) / curvature, 0.0)
+    shift = np.clip(shift, -0.5, 0.5)
+    step = np.where(shift < 0, t1 - t0, t2 - t1)
+    epoch = t1 + np.rint(shift * step).astype(np.int64)
+    height = y1 - 0.25 * (y0 - y2) * shift
+    return TideEvents(epoch, height, kind)
+
+
+def find_crossings(tide: TideSeries, level_m: float) -> TideEvents:
+    """KR: 임계 높이를 지나는 시각입니다. / EN: Times the tide crosses ``level_m``, linearly interpolated."""
+
+    if len(tide) < 2:
+        return _empty_events()
+    above = tide.height_m >= level_m
+    idx = np.flatnonzero(above[:-1] != above[1:])
+    h0, h1 = tide.height_m[idx], tide.height_m[idx + 1]
+    t0, t1 = tide.epoch_s[idx], tide.epoch_s[idx + 1]
+    epoch = t0 + np.rint((level_m - h0) / (h1 - h0) * (t1 - t0)).astype(np.int64)
+    kind = np.where(h1 > h0, RISING, FALLING).astype(np.int8)
+    return TideEvents(epoch, np.full(len(idx), float(level_m)), kind)
+
+
+@dataclass(frozen=True)
+class TideWindows:
+    """KR: 조석 조건을 만족하는 구간입니다. / EN: Sorted, non-overlapping intervals meeting a tide band."""
+
+    start_s: np.ndarray
+    end_s: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start_s)
+
+    @property
+    def duration_hours(self) -> np.ndarray:
+        return (self.end_s - self.start_s) / 3600.0
+
+    def within(self, start_s: int, end_s: int) -> "TideWindows":
+        """KR: [start, end) 로 잘라낸 구간입니다. / EN: Windows clipped to ``[start_s, end_s)``."""
+
+        start = np.maximum(self.start_s, start_s)
+        end = np.minimum(self.end_s, end_s)
+        keep = end > start
+        return TideWindows(start[keep], end[keep])
+
+    def joint(self, other: "TideWindows") -> "TideWindows":
+        """KR: 두 지점 모두 만족하는 구간입니다. / EN: Pairwise intersection with another site's windows."""
+
+        start = np.maximum.outer(self.start_s, other.start_s).ravel()
+        end = np.minimum.outer(self.end_s, other.end_s).ravel()
+        keep = end > start
+        order = np.argsort(start[keep], kind="stable")
+        return TideWindows(start[keep][order], end[keep][order])
+
+    def covers(self, epoch_s: Any) -> np.ndarray:
+        """KR: 각 시각이 구간 안인지 여부입니다. / EN: Whether each time falls inside a window."""
+
+        target = np.asarray(epoch_s, dtype=np.int64)
+        slot = np.searchsorted(self.start_s, target, side="right") - 1
+        inside = slot >= 0
+        inside[inside] = target[inside] <= self.end_s[slot[inside]]
+        return inside
+
+    def longest(self) -> int | None:
+        if not len(self):
+            return None
+        return int(np.argmax(self.duration_hours))
+
+    def records(self, tz: str | int) -> List[Dict[str, Any]]:
+        starts, ends = from_epoch_seconds(self.start_s, tz), from_epoch_seconds(self.end_s, tz)
+        return [
+            {"start": start.to_pydatetime(), "end": end.to_pydatetime(), "duration_hours": float(hours)}
+            for start, end, hours in zip(starts, ends, self.duration_hours)
+        ]
+
+
+def tide_windows(tide: TideSeries, min_m: float | None = None, max_m: float | None = None) -> TideWindows:
+    """KR: 높이가 [min_m, max_m] 인 구간입니다. / EN: Intervals where the height stays within the band.
+
+    Window edges are interpolated to the exact crossing of the violated bound rather than snapped to
+    the nearest sample.
+    """
+
+    if len(tide) < 2 or (min_m is None and max_m is None):
+        return _empty_windows()
+    low = -np.inf if min_m is None else float(min_m)
+    high = np.inf if max_m is None else float(max_m)
+    height, epoch = tide.height_m, tide.epoch_s
+    inside = (height >= low) & (height <= high)
+    edges = np.diff(inside.astype(np.int8))
+    opens = np.flatnonzero(edges == 1) + 1
+    closes = np.flatnonzero(edges == -1)
+    start = np.concatenate(([epoch[0]] if inside[0] else [], _edge_times(tide, opens - 1, opens, low, high)))
+    end = np.concatenate((_edge_times(tide, closes, closes + 1, low, high), [epoch[-1]] if inside[-1] else []))
+    return TideWindows(start.astype(np.int64), end.astype(np.int64))
+
+
+def _edge_times(tide: TideSeries, before: np.ndarray, after: np.ndarray, low: float, high: float) -> np.ndarray:
+    h0, h1 = tide.height_m[before], tide.height_m[after]
+    t0, t1 = tide.epoch_s[before], tide.epoch_s[after]
+    outside = np.where((h0 < low) | (h0 > high), h0, h1)
+    level = np.where(outside < low, low, high)
+    return t0 + np.rint((level - h0) / (h1 - h0) * (t1 - t0)).astype(np.int64)
+
+
+def site_tide_windows(
+    tides: Mapping[str, TideSeries],
+    gate_thresholds: Mapping[str, Mapping[str, float]],
+) -> Dict[str, TideWindows]:
+    """KR: 설정된 조석 게이트로 지점별 윈도우를 만듭니다. / EN: Per-site windows for the ``gate.tide`` band.
+
+    Returns an empty mapping when no ``tide`` gate (``min_m``/``max_m``) is configured.
+    """
+
+    band = gate_thresholds.get("tide") or {}
+    if "min_m" not in band and "max_m" not in band:
+        return {}
+    return {site: tide_windows(tide, band.get("min_m"), band.get("max_m")) for site, tide in tides.items() if len(tide)}
+
+
+def best_joint_span(windows: Mapping[str, TideWindows], sites: List[str], start: object, end: object, tz: str) -> str | None:
+    """KR: 슬롯 안에서 모든 지점이 만족하는 가장 긴 조석 구간입니다. / EN: Longest all-site tide span in a slot."""
+
+    if not start or not end or any(site not in windows for site in sites):
+        return None
+    bounds = to_epoch_seconds([start, end])
+    joint = windows[sites[0]]
+    for site in sites[1:]:
+        joint = joint.joint(windows[site])
+    slot = joint.within(int(bounds[0]), int(bounds[1]))
+    best = slot.longest()
+    if best is None:
+        return None
+    return format_span(int(slot.start_s[best]), int(slot.end_s[best]), tz)
+
+
+def _empty_events() -> TideEvents:
+    return TideEvents(np.array([], dtype=np.int64), np.array([], dtype=np.float64), np.array([], dtype=np.int8))
+
+
+def _empty_windows() -> TideWindows:
+    empty = np.array([], dtype=np.int64)
+    return TideWindows(empty, empty)
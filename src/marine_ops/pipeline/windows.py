@@ -0,0 +1,213 @@
+"""Vectorised GO/CONDITIONAL window detection over an hourly horizon."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta, timezone, tzinfo
+from typing import Any, Dict, Iterable, List, Mapping
+
+import numpy as np
+import pandas as pd
+from zoneinfo import ZoneInfo
+
+NO_GO, CONDITIONAL, GO = 0, 1, 2
+STATUS_LABELS = ("NO_GO", "CONDITIONAL", "GO")
+_SECONDS_PER_DAY = 86_400
+
+
+def to_epoch_seconds(values: Any) -> np.ndarray:
+    """KR: 타임스탬프를 한 번에 int64 epoch 초로 변환합니다. / EN: Parse timestamps once into int64 epoch seconds."""
+
+    if isinstance(values, pd.DatetimeIndex):
+        index = values if values.tz is not None else values.tz_localize("UTC")
+    else:
+        index = pd.DatetimeIndex(pd.to_datetime(list(values), utc=True, format="ISO8601"))
+    return index.as_unit("s").asi8.astype(np.int64, copy=False)
+
+
+def _tzinfo(tz: str | int) -> tzinfo:
+    if isinstance(tz, (int, np.integer)):
+        return timezone(timedelta(seconds=int(tz)))
+    return ZoneInfo(tz)
+
+
+def from_epoch_seconds(epoch_s: Any, tz: str | int = "UTC") -> pd.DatetimeIndex:
+    """KR: epoch 초를 현지 시각 인덱스로 변환합니다. / EN: Epoch seconds to a tz-aware index (inverse of ``to_epoch_seconds``).
+
+    ``tz`` is either a zone name or a fixed UTC offset in seconds.
+    """
+
+    return pd.DatetimeIndex(np.asarray(epoch_s).astype("datetime64[s]")).tz_localize("UTC").tz_convert(_tzinfo(tz))
+
+
+def local_day_numbers(epoch_s: np.ndarray, tz: str | int) -> np.ndarray:
+    """KR: 현지 날짜 번호(epoch 이후 일수)입니다. / EN: Local calendar day number for each epoch second.
+
+    ``tz`` is either a zone name or a fixed UTC offset in seconds.
+    """
+
+    if isinstance(tz, (int, np.integer)):
+        return (epoch_s + int(tz)) // _SECONDS_PER_DAY
+    return from_epoch_seconds(epoch_s, tz).tz_localize(None).as_unit("s").asi8 // _SECONDS_PER_DAY
+
+
+def classify_gates(
+    hs_m: np.ndarray,
+    wind_kt: np.ndarray,
+    go_gate: Mapping[str, float],
+    cond_gate: Mapping[str, float],
+) -> np.ndarray:
+    """KR: 모든 포인트를 GO/CONDITIONAL/NO_GO 코드로 분류합니다. / EN: Gate codes for every point at once.
+
+    NaN inputs fail both gates and classify as NO_GO.
+    """
+
+    hs = np.asarray(hs_m, dtype=np.float64)
+    wind = np.asarray(wind_kt, dtype=np.float64)
+    go = (hs <= go_gate.get("hs_m", 1.0)) & (wind <= go_gate.get("wind_kt", 20.0))
+    cond = (hs <= cond_gate.get("hs_m", 1.2)) & (wind <= cond_gate.get("wind_kt", 22.0))
+    return np.where(go, GO, np.where(cond, CONDITIONAL, NO_GO)).astype(np.int8)
+
+
+@dataclass(frozen=True)
+class GateSeries:
+    """KR: 시간 순으로 정렬된 게이트 코드 열입니다. / EN: Time-sorted epoch seconds with gate codes."""
+
+    epoch_s: np.ndarray
+    status: np.ndarray
+
+    @classmethod
+    def build(cls, epoch_s: np.ndarray, status: np.ndarray) -> "GateSeries":
+        order = np.argsort(epoch_s, kind="stable")
+        return cls(np.asarray(epoch_s, dtype=np.int64)[order], np.asarray(status, dtype=np.int8)[order])
+
+    def __len__(self) -> int:
+        return len(self.epoch_s)
+
+    def joint(self, other: "GateSeries") -> "GateSeries":
+        """KR: 두 지점 공통 시각의 보수적 코드입니다. / EN: Worst code of both series on their shared hours."""
+
+        common, left, right = np.intersect1d(self.epoch_s, other.epoch_s, assume_unique=True, return_indices=True)
+        return GateSeries(common, np.minimum(self.status[left], other.status[right]))
+
+
+@dataclass(frozen=True)
+class WindowRuns:
+    """KR: 탐지된 윈도우들의 열 배열입니다. / EN: Detected windows held as parallel arrays."""
+
+    start_s: np.ndarray
+    end_s: np.ndarray
+    status: np.ndarray
+    points: np.ndarray
+    day: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start_s)
+
+    @property
+    def duration_hours(self) -> np.ndarray:
+        return (self.end_s - self.start_s) / 3600.0
+
+    def take(self, mask: np.ndarray) -> "WindowRuns":
+        return WindowRuns(self.start_s[mask], self.end_s[mask], self.status[mask], self.points[mask], self.day[mask])
+
+    def for_day(self, day_number: int) -> "WindowRuns":
+        return self.take(self.day == day_number)
+
+    def within(self, start_s: int, end_s: int) -> "WindowRuns":
+        """KR: [start, end) 구간에 시작하는 윈도우만 남깁니다. / EN: Windows starting inside ``[start_s, end_s)``."""
+
+        return self.take((self.start_s >= start_s) & (self.start_s < end_s))
+
+    def best(self) -> int | None:
+        """KR: GO 우선, 그다음 길이 기준 최적 윈도우 위치입니다. / EN: Index of the best window (GO first, then longest)."""
+
+        if not len(self):
+            return None
+        order = np.lexsort((-np.arange(len(self)), self.duration_hours, self.status == GO))
+        return int(order[-1])
+
+    def records(self, tz: str | int) -> List[Dict[str, Any]]:
+        starts, ends = from_epoch_seconds(self.start_s, tz), from_epoch_seconds(self.end_s, tz)
+        return [
+            {
+                "start": start.to_pydatetime(),
+                "end": end.to_pydatetime(),
+                "status": STATUS_LABELS[code],
+                "duration_hours": float(hours),
+            }
+            for start, end, code, hours in zip(starts, ends, self.status, self.duration_hours)
+        ]
+
+
+def find_windows(
+    series: GateSeries,
+    tz: str | int,
+    *,
+    min_points: int = 2,
+    allowed: Iterable[int] = (GO, CONDITIONAL),
+) -> WindowRuns:
+    """KR: 전체 기간에서 한 번에 연속 구간을 찾습니다. / EN: Run-length encode the whole horizon in one pass.
+
+    A run is a stretch of equal gate codes inside one local day. Runs with an allowed code and at least
+    ``min_points`` points are kept.
+    """
+
+    days = local_day_numbers(series.epoch_s, tz)
+    if not len(series):
+        empty = np.array([], dtype=np.int64)
+        return WindowRuns(empty, empty, np.array([], dtype=np.int8), empty, empty)
+    breaks = np.flatnonzero((np.diff(series.status) != 0) | (np.diff(days) != 0)) + 1
+    starts = np.concatenate(([0], breaks))
+    ends = np.concatenate((breaks - 1, [len(series) - 1]))
+    status = series.status[starts]
+    points = ends - starts + 1
+    keep = np.isin(status, np.fromiter(allowed, dtype=np.int8)) & (points >= min_points)
+    return WindowRuns(
+        series.epoch_s[starts][keep],
+        series.epoch_s[ends][keep],
+        status[keep],
+        points[keep],
+        days[starts][keep],
+    )
+
+
+def frame_gate_series(
+    frame: pd.DataFrame,
+    go_gate: Mapping[str, float],
+    cond_gate: Mapping[str, float],
+    tide_gate: Mapping[str, float] | None = None,
+) -> GateSeries:
+    """KR: 융합 프레임을 게이트 코드 열로 바꿉니다. / EN: Gate codes for a fused hourly frame.
+
+    Uses ``wave_height`` and ``wind_gusts_kt`` (falling back to ``wind_speed_kt``), matching the daypart gates.
+    With a ``tide_gate`` (``min_m``/``max_m``), hours whose ``sea_level`` is outside the band are NO_GO;
+    hours without a tide height are left to the sea-state gates.
+    """
+
+    if frame is None or frame.empty:
+        return GateSeries(np.array([], dtype=np.int64), np.array([], dtype=np.int8))
+    wind_column = "wind_gusts_kt" if "wind_gusts_kt" in frame else "wind_speed_kt"
+    missing = np.full(len(frame), np.nan)
+    hs = frame["wave_height"].to_numpy(dtype=np.float64) if "wave_height" in frame else missing
+    wind = frame[wind_column].to_numpy(dtype=np.float64) if wind_column in frame else missing
+    status = classify_gates(hs, wind, go_gate, cond_gate)
+    if tide_gate and "sea_level" in frame:
+        tide = frame["sea_level"].to_numpy(dtype=np.float64)
+        outside = (tide < tide_gate.get("min_m", -np.inf)) | (tide > tide_gate.get("max_m", np.inf))
+        status = np.where(outside, NO_GO, status).astype(np.int8)
+    return GateSeries.build(to_epoch_seconds(frame.index), status)
+
+
+def hourly_gate_series(
+    frames: Mapping[str, pd.DataFrame],
+    gate_thresholds: Mapping[str, Mapping[str, float]],
+) -> Dict[str, GateSeries]:
+    go_gate = gate_thresholds.get("go", {"hs_m": 1.0, "wind_kt": 20.0})
+    cond_gate = gate_thresholds.get("conditional", {"hs_m": 1.2, "wind_kt": 22.0})
+    tide_gate = gate_thresholds.get("tide")
+    return {location: frame_gate_series(frame, go_gate, cond_gate, tide_gate) for location, frame in frames.items()}
+
+
+def format_span(start_s: int, end_s: int, tz: str | int) -> str:
+    local = from_epoch_seconds(np.array([start_s, end_s], dtype=np.int64), tz)
+    return f"{local[0].strftime('%H:%M')}–{local[1].strftime('%H:%M')}"
@@ -0,0 +1,43 @@
+"""Tests for the thread-local SQLite connection manager."""
+from __future__ import annotations
+
+import threading
+
+from src.marine_ops.core.connection import ConnectionManager
+from src.marine_ops.core.forecast_store import ForecastStore
+from src.marine_ops.core.observation_store import ObservationStore
+
+
+def test_connection_is_reused_per_thread_with_pragmas(tmp_path) -> None:
+    manager = ConnectionManager(tmp_path / "vec.db")
+    conn = manager.connection()
+
+    assert manager.connection() is conn
+    assert manager.pragma("journal_mode") == "wal"
+    assert manager.pragma("synchronous") == 1  # NORMAL
+    assert manager.pragma("cache_size") == -65536
+
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(manager.connection()))
+    worker.start()
+    worker.join()
+    assert seen[0] is not conn
+
+    manager.close()
+    assert manager.connection() is not conn
+    manager.close()
+
+
+def test_stores_share_one_connection_and_commit_through_it(tmp_path) -> None:
+    manager = ConnectionManager(tmp_path / "vec.db")
+    observations = ObservationStore(str(tmp_path / "vec.db"), connections=manager)
+    forecasts = ForecastStore(str(tmp_path / "vec.db"), connections=manager)
+
+    assert observations._connect() is forecasts._connect()
+    with observations._connect() as conn:
+        conn.execute("INSERT INTO marine_obs (location, ts, source) VALUES ('AGI', 0, 'ncm')")
+
+    # A separate manager (another process in practice) sees the committed row through WAL.
+    with ConnectionManager(tmp_path / "vec.db") as other:
+        assert ObservationStore(str(tmp_path / "vec.db"), connections=other).count() == 1
+    manager.close()
@@ -0,0 +1,73 @@
+"""Tests for the run-versioned forecast store."""
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from src.marine_ops.core.forecast_store import FORECAST_TABLE, SERIES_TABLE, ForecastStore
+from src.marine_ops.core.schema import MarineDataPoint, MarineTimeseries
+
+
+def _run(issue: str, wave: float, source: str = "open_meteo") -> MarineTimeseries:
+    valid = pd.date_range(issue, periods=12, freq="h", tz="UTC")
+    points = [
+        MarineDataPoint(timestamp=ts.isoformat(), wind_speed=7.25, wind_direction=180.0, wave_height=wave)
+        for ts in valid
+    ]
+    return MarineTimeseries(source=source, location="AGI", data_points=points, ingested_at=issue)
+
+
+def test_runs_are_versioned_by_issue_time(tmp_path) -> None:
+    store = ForecastStore(str(tmp_path / "fc.db"))
+    store.write_timeseries(_run("2024-05-01T00:00:00+00:00", 1.00))
+    store.write_timeseries(_run("2024-05-01T06:00:00+00:00", 1.50))
+    store.write_timeseries(_run("2024-05-01T06:00:00+00:00", 1.50))
+
+    at_t = store.valid_at("2024-05-01T08:00:00Z")
+    assert at_t["lead_hours"].tolist() == [8, 2]
+    assert at_t["lead_hours"].dtype == np.int16
+    assert at_t["wave_height"].dtype == np.float32
+    np.testing.assert_allclose(at_t["wave_height"], [1.0, 1.5])
+    np.testing.assert_allclose(at_t["wind_speed"], [7.25, 7.25], atol=0.0501)
+
+    latest = store.latest_issue(location="AGI", variables=["wave_height"])
+    assert len(latest) == 18
+    assert latest.set_index("valid_time").loc["2024-05-01T08:00:00+00:00", "lead_hours"] == 2
+
+
+def test_error_by_lead_pairs_forecasts_with_observations(tmp_path) -> None:
+    store = ForecastStore(str(tmp_path / "fc.db"))
+    store.write_timeseries(_run("2024-05-01T00:00:00+00:00", 1.00))
+    store.write_timeseries(_run("2024-05-01T06:00:00+00:00", 1.50))
+    observed = pd.DataFrame(
+        {
+            "location": "AGI",
+            "timestamp": pd.date_range("2024-05-01T06:00", periods=6, freq="h", tz="UTC"),
+            "wave_height": 1.4,
+        }
+    )
+
+    errors = store.error_by_lead(observed, "wave_height").set_index("lead_hours")
+
+    assert errors.loc[0, "n"] == 1
+    assert np.isclose(errors.loc[6, "bias"], -0.4, atol=1e-5)
+    assert np.isclose(errors.loc[0, "bias"], 0.1, atol=1e-5)
+    assert (errors["rmse"] >= errors["mae"] - 1e-9).all()
+
+
+def test_lead_time_filter_uses_the_series_lead_index(tmp_path) -> None:
+    store = ForecastStore(str(tmp_path / "fc.db"))
+    store.write_timeseries(_run("2024-05-01T00:00:00+00:00", 1.00))
+    where, params = store._filters(location="AGI", max_lead=6)
+
+    with closing(sqlite3.connect(tmp_path / "fc.db")) as conn:
+        plan = conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT f.lead_h FROM {FORECAST_TABLE} f JOIN {SERIES_TABLE} s USING (series_id){where}",
+            params,
+        ).fetchall()
+
+    assert any(f"idx_{FORECAST_TABLE}_series_lead" in row[-1] and "lead_h<" in row[-1] for row in plan)
+    assert store.forecasts(location="AGI", max_lead=6)["lead_hours"].max() == 6
@@ -0,0 +1,77 @@
+"""Tests for the typed columnar observation store."""
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import numpy as np
+
+from src.marine_ops.core.observation_store import NUMERIC_FIELDS, ObservationStore
+from src.marine_ops.core.schema import MarineDataPoint, MarineTimeseries
+
+
+def _series(source: str, wave: float, hours: int = 6) -> MarineTimeseries:
+    points = [
+        MarineDataPoint(
+            timestamp=f"2024-05-01T{hour:02d}:00:00+04:00",
+            wind_speed=8.0 + hour,
+            wind_direction=270.0,
+            wave_height=wave,
+            sea_state="slight",
+        )
+        for hour in range(hours)
+    ]
+    return MarineTimeseries(source=source, location="AGI", data_points=points, ingested_at="2024-05-01T00:00:00")
+
+
+def test_upsert_and_range_scan_return_typed_columns(tmp_path) -> None:
+    store = ObservationStore(str(tmp_path / "obs.db"))
+    assert store.upsert_timeseries(_series("open_meteo", 1.0)) == 6
+    store.upsert_timeseries(_series("open_meteo", 1.4))
+    store.upsert_timeseries(_series("stormglass", 0.9))
+
+    arrays = store.scan_arrays(
+        location="AGI",
+        start="2024-04-30T21:00:00Z",
+        end="2024-04-30T23:00:00Z",
+        columns=["wind_speed", "wave_height"],
+    )
+    assert arrays["timestamp"].dtype == np.dtype("datetime64[s]")
+    assert arrays["wave_height"].dtype == np.float64
+    assert list(arrays["source"]) == ["open_meteo", "stormglass", "open_meteo", "stormglass"]
+    np.testing.assert_allclose(arrays["wave_height"], [1.4, 0.9, 1.4, 0.9])
+
+    frame = store.scan(location="AGI", source="open_meteo")
+    assert len(frame) == 6
+    assert str(frame["timestamp"].dt.tz) == "UTC"
+    assert set(NUMERIC_FIELDS) <= set(frame.columns)
+    assert frame["swell_wave_height"].isna().all()
+
+
+def test_backfill_from_json_blobs(tmp_path) -> None:
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            "CREATE TABLE marine_raw (id INTEGER PRIMARY KEY, source TEXT, location TEXT, timestamp TEXT,"
+            " data_json TEXT, ingested_at TEXT)"
+        )
+        for point in _series("open_meteo", 1.2).data_points:
+            conn.execute(
+                "INSERT INTO marine_raw (source, location, timestamp, data_json, ingested_at) VALUES (?, ?, ?, ?, ?)",
+                ("open_meteo", "AGI", point.timestamp, json.dumps(point.__dict__), "2024-05-01T00:00:00"),
+            )
+
+    store = ObservationStore(str(db_path))
+    assert store.backfill_from_raw() == 6
+    assert store.backfill_from_raw() == 0
+    assert store.scan(columns=["wave_height"])["wave_height"].tolist() == [1.2] * 6
+
+
+def test_scan_returns_text_columns_alongside_numbers(tmp_path) -> None:
+    store = ObservationStore(str(tmp_path / "obs.db"))
+    store.upsert_timeseries(_series("open_meteo", 1.0, hours=2))
+
+    arrays = store.scan_arrays(columns=["wave_height", "sea_state", "ingested_at"])
+    assert arrays["wave_height"].dtype == np.float64
+    assert list(arrays["sea_state"]) == ["slight", "slight"]
+    assert list(arrays["ingested_at"]) == ["2024-05-01T00:00:00", "2024-05-01T00:00:00"]
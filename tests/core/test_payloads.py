@@ -0,0 +1,63 @@
+"""Tests for the array-based connector payload decoder."""
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from src.marine_ops.connectors.payloads import loads, open_meteo_frame, regular_time_index, stormglass_columns
+
+
+def test_regular_hourly_times_match_string_parsing() -> None:
+    times = pd.date_range("2025-10-07T00:00", periods=384, freq="h").strftime("%Y-%m-%dT%H:%M").tolist()
+
+    index = regular_time_index(times)
+
+    assert index.equals(pd.DatetimeIndex(pd.to_datetime(times)))
+
+
+def test_irregular_times_fall_back_to_parsing() -> None:
+    times = ["2025-10-07T00:00", "2025-10-07T01:00", "2025-10-07T03:00", "2025-10-07T04:00"]
+
+    index = regular_time_index(times)
+
+    assert list(index) == list(pd.to_datetime(times))
+
+
+def test_interior_gap_or_duplicate_is_not_regularised() -> None:
+    times = pd.date_range("2025-10-07T00:00", periods=9, freq="h").strftime("%Y-%m-%dT%H:%M").tolist()
+    gap = times[:3] + times[4:] + ["2025-10-07T09:00"]
+    duplicate = times[:6] + [times[5]] + times[7:]
+
+    for irregular in (gap, duplicate):
+        index = regular_time_index(irregular)
+        assert list(index) == list(pd.to_datetime(irregular))
+        assert index.freq is None
+    assert regular_time_index(times).freq == pd.Timedelta(hours=1)
+    assert regular_time_index(times, step=pd.Timedelta(minutes=30)).freq is None
+
+
+def test_open_meteo_frame_fills_nulls_and_missing_variables() -> None:
+    raw = json.dumps(
+        {"hourly": {"time": ["2025-10-07T00:00", "2025-10-07T01:00", "2025-10-07T02:00"], "wave_height": [0.4, None, 0.6]}}
+    ).encode("utf-8")
+
+    frame = open_meteo_frame(loads(raw), ["wave_height", "wind_speed_10m"], dtype=np.float32)
+
+    assert frame["wave_height"].dtype == np.float32
+    assert np.allclose(frame["wave_height"], [0.4, np.nan, 0.6], equal_nan=True)
+    assert frame["wind_speed_10m"].isna().all()
+
+
+def test_stormglass_columns_unwrap_source_values() -> None:
+    hours = [
+        {"time": "2025-10-07T00:00:00+00:00", "waveHeight": {"noaa": 1.2}},
+        {"time": "2025-10-07T01:00:00+00:00", "waveHeight": {"sg": 1.0}, "windSpeed": {"noaa": 7.0}},
+    ]
+
+    times, columns = stormglass_columns(hours, ["waveHeight", "windSpeed"])
+
+    assert times == ["2025-10-07T00:00:00+00:00", "2025-10-07T01:00:00+00:00"]
+    assert np.allclose(columns["waveHeight"], [1.2, np.nan], equal_nan=True)
+    assert np.allclose(columns["windSpeed"], [np.nan, 7.0], equal_nan=True)
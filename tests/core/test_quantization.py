@@ -0,0 +1,80 @@
+"""Tests for int8 embedding storage, scoring on codes and recall@k."""
+from __future__ import annotations
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src.marine_ops.core.quantization import (
+    decode_int8,
+    encode_embedding,
+    quantize_int8,
+    quantize_table,
+    recall_at_k,
+    rerank_exact,
+    score_embeddings,
+)
+from src.marine_ops.core.vector_search import rank_embeddings
+
+DIM = 32
+
+
+def _unit_vectors(rows: int, seed: int = 0) -> np.ndarray:
+    matrix = np.random.default_rng(seed).normal(size=(rows, DIM)).astype(np.float32)
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+
+def test_int8_blob_is_a_quarter_size_and_round_trips() -> None:
+    vector = _unit_vectors(1)[0]
+    blob = encode_embedding(vector, "int8")
+    codes, scales = decode_int8([blob], DIM)
+
+    assert len(blob) == DIM + 4 and len(encode_embedding(vector)) == 4 * DIM
+    assert np.abs(codes[0] * scales[0] - vector).max() <= scales[0] / 2 + 1e-7
+    with pytest.raises(ValueError):
+        encode_embedding(vector, "pq")
+
+
+def test_scores_on_codes_track_exact_scores_with_mixed_rows() -> None:
+    matrix = _unit_vectors(200)
+    query = matrix[7]
+    blobs = [encode_embedding(row, "int8" if i % 2 else "float32") for i, row in enumerate(matrix)]
+    scores = score_embeddings(query, blobs)
+
+    exact = matrix @ query
+    assert np.allclose(scores[::2], exact[::2], atol=1e-6)
+    assert np.abs(scores - exact).max() < 0.02
+    with pytest.raises(ValueError):
+        score_embeddings(query, [b"\x00" * 10])
+
+
+def test_recall_against_exact_search_and_float_rerank() -> None:
+    matrix = _unit_vectors(2000, seed=1)
+    queries = _unit_vectors(20, seed=2)
+    dense = [row.tobytes() for row in matrix]
+    codes = [encode_embedding(row, "int8") for row in matrix]
+
+    exact = [rank_embeddings(query, dense, 10)[0] for query in queries]
+    approx = [rank_embeddings(query, codes, 10)[0] for query in queries]
+    reranked = []
+    for query in queries:
+        order, _ = rank_embeddings(query, codes, 40)
+        reranked.append(rerank_exact(query, order, matrix[order], 10)[0])
+
+    assert recall_at_k(exact, approx, 10) >= 0.9
+    assert recall_at_k(exact, reranked, 10) == 1.0
+    assert recall_at_k([[1, 2]], [[2, 3]], 2) == 0.5
+
+
+def test_quantize_table_converts_float_rows_once(tmp_path) -> None:
+    matrix = _unit_vectors(5)
+    conn = sqlite3.connect(tmp_path / "vec.db")
+    conn.execute("CREATE TABLE marine_vec (id INTEGER PRIMARY KEY, embedding BLOB)")
+    conn.executemany("INSERT INTO marine_vec (embedding) VALUES (?)", [(row.tobytes(),) for row in matrix])
+
+    assert quantize_table(conn, "marine_vec", DIM, batch_size=2) == 5
+    assert quantize_table(conn, "marine_vec", DIM) == 0
+    blobs = [row[0] for row in conn.execute("SELECT embedding FROM marine_vec ORDER BY id")]
+    codes, scales = quantize_int8(matrix)
+    assert blobs[3] == scales[3].tobytes() + codes[3].tobytes()
@@ -0,0 +1,98 @@
+"""Tests for connector recording and the local stand-in replay server."""
+from __future__ import annotations
+
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+import requests
+
+from ncm_web.ncm_api_ingestor import NCMApiIngestor, NCMEndpoints
+from src.marine_ops.connectors.endpoints import RECORD_ENV, STANDIN_ENV, save_exchange
+from src.marine_ops.connectors.open_meteo import fetch_open_meteo_marine
+from src.marine_ops.connectors.standin import StandInServer, import_ncm_dumps
+from src.marine_ops.connectors.stormglass import StormglassConnector
+from src.marine_ops.connectors.worldtides import fetch_worldtides_heights
+from src.marine_ops.pipeline.ingest import fetch_ncm_alerts
+
+RAW_DIR = Path(__file__).resolve().parents[2] / "raw"
+NCM_URL = "https://albahar.ncm.gov.ae/api"
+
+
+def _cassettes(root: Path) -> Path:
+    times = [f"2025-10-07T{hour:02d}:00" for hour in range(6)]
+    save_exchange(
+        root,
+        "open_meteo_marine",
+        "GET",
+        "/v1/marine",
+        {"latitude": "25.2111", "longitude": "54.1578"},
+        200,
+        json.dumps({"hourly": {"time": times, "wave_height": [0.5, 0.6, 0.7, 0.8, 0.9, 1.0]}}),
+    )
+    hours = [{"time": f"2025-10-07T0{hour}:00:00+00:00", "windSpeed": {"noaa": 6.0 + hour}} for hour in range(3)]
+    save_exchange(root, "stormglass", "GET", "/v2/weather/point", {}, 200, json.dumps({"hours": hours}))
+    save_exchange(root, "worldtides", "GET", "/api/v3", {"heights": ""}, 200, json.dumps({"heights": []}))
+    page = "<html><body><p>Sea state: rough at times offshore.</p></body></html>"
+    save_exchange(root, "ncm", "GET", "/marine-observations", {"lang": "en"}, 200, page, "text/html")
+    return root
+
+
+def test_connectors_replay_through_standin_and_record(tmp_path, monkeypatch) -> None:
+    cassettes = _cassettes(tmp_path / "cassettes")
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    for name in ("AGI_1759861678_1759861697388.json", "AGI_1759861678_1759861698041.json"):
+        shutil.copy(RAW_DIR / name, raw / name)
+    index = [
+        {"file": "AGI_1759861678_1759861697388.json", "url": f"{NCM_URL}/stations"},
+        {"file": "AGI_1759861678_1759861698041.json", "url": f"{NCM_URL}/station/26"},
+        {"file": "AGI_1759861678_1759861698041.json", "url": f"{NCM_URL}/station/51"},
+        {"file": "AGI_1759861678_1759861698041.json", "url": f"{NCM_URL}/station/126"},
+    ]
+    (raw / "_endpoints.jsonl").write_text("\n".join(json.dumps(row) for row in index), encoding="utf-8")
+    assert import_ncm_dumps(raw, cassettes) == 4
+
+    with StandInServer(cassettes, seed=1) as server:
+        monkeypatch.setenv(STANDIN_ENV, server.url)
+        monkeypatch.setenv(RECORD_ENV, str(tmp_path / "recorded"))
+
+        marine = fetch_open_meteo_marine(25.2111, 54.1578, hours=6, hourly=["wave_height"])
+        storm = StormglassConnector(api_key="test").get_marine_weather(
+            25.2111, 54.1578, datetime(2025, 10, 7), datetime(2025, 10, 8)
+        )
+        tides = fetch_worldtides_heights(25.2111, 54.1578, key="secret", hours=6)
+        endpoints = NCMEndpoints(stations=f"{NCM_URL}/stations", station=f"{NCM_URL}/station/{{id}}")
+        ncm = NCMApiIngestor(endpoints=endpoints, browser_fallback=lambda *_: None).create_marine_timeseries("AGI")
+        alerts = fetch_ncm_alerts(timeout=5)
+
+        assert list(marine.dataframe["wave_height"]) == [0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+        assert [point.wind_speed for point in storm.data_points] == [6.0, 7.0, 8.0]
+        assert tides == {"heights": []}
+        assert len(ncm.data_points) == 98
+        assert alerts["status"] == "ok" and alerts["alerts"] == ["rough at times"]
+        assert server.stats["served"] >= 5 and server.stats["errors"] == 0
+
+    recorded = [json.loads(path.read_text(encoding="utf-8")) for path in (tmp_path / "recorded").glob("*/*.json")]
+    by_service = {record["service"]: record for record in recorded}
+    assert by_service["open_meteo_marine"]["path"] == "/v1/marine"
+    assert "key" not in by_service["worldtides"]["query"]
+    assert any(record["service"] == "ncm" and record["path"] == "/marine-observations" for record in recorded)
+
+
+def test_fault_injection_and_rate_limit(tmp_path) -> None:
+    cassettes = _cassettes(tmp_path / "cassettes")
+
+    with StandInServer(cassettes, error_rate=1.0, seed=3) as failing:
+        response = requests.get(f"{failing.url}/stormglass/v2/weather/point", timeout=5)
+        assert response.status_code == 503
+
+    with StandInServer(cassettes, rate_limit=0.5) as limited:
+        statuses = [requests.get(f"{limited.url}/stormglass/v2/weather/point", timeout=5).status_code for _ in range(3)]
+        stats = requests.get(f"{limited.url}/__stats", timeout=5).json()
+        missing = requests.get(f"{limited.url}/stormglass/v2/unknown", timeout=5)
+
+    assert statuses == [200, 429, 429]
+    assert stats["throttled"] == 2 and stats["served"] == 1
+    assert missing.status_code in (404, 429)
@@ -0,0 +1,96 @@
+"""Tests for columnar unit conversion and the connectors that use it."""
+from __future__ import annotations
+
+import json
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.marine_ops.connectors.open_meteo import OpenMeteoConnector
+from src.marine_ops.connectors.stormglass import StormglassConnector
+from src.marine_ops.core.units import convert_array, kt_to_ms, normalize_columns, unit_conversion
+
+
+class _Response:
+    def __init__(self, payload) -> None:
+        self._payload = payload
+        self.content = json.dumps(payload).encode("utf-8")
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self):
+        return self._payload
+
+
+class _Session:
+    def __init__(self, payload) -> None:
+        self.payload = payload
+        self.headers: dict = {}
+
+    def get(self, url, params=None, timeout=None):
+        return _Response(self.payload)
+
+
+def test_columnar_conversion_matches_scalar_helpers() -> None:
+    knots = np.array([0.0, 10.0, 25.5])
+    assert np.allclose(convert_array(knots, "kn", "m/s"), [kt_to_ms(value) for value in knots])
+    assert np.allclose(convert_array([36.0], "km/h", "kt"), [10.0 / 0.514444])
+    assert np.allclose(convert_array([5000.0], "m", "km"), [5.0])
+    assert np.allclose(convert_array([212.0], "°F", "°C"), [100.0])
+    with pytest.raises(ValueError):
+        unit_conversion("m", "m/s")
+
+
+def test_normalize_columns_pads_missing_values_with_nan() -> None:
+    columns = normalize_columns(
+        {"wind_speed": [36, None, "18"], "visibility": [24000.0], "wind_direction": None},
+        {"wind_speed": "km/h", "visibility": "m"},
+        length=3,
+    )
+
+    assert np.allclose(columns["wind_speed"], [10.0, np.nan, 5.0], equal_nan=True)
+    assert np.allclose(columns["visibility"], [24.0, np.nan, np.nan], equal_nan=True)
+    assert np.isnan(columns["wind_direction"]).all()
+
+
+def test_open_meteo_uses_hourly_units_descriptor() -> None:
+    connector = OpenMeteoConnector()
+    connector.session = _Session(
+        {
+            "hourly_units": {"wind_speed_10m": "km/h", "wind_gusts_10m": "km/h", "visibility": "m"},
+            "hourly": {
+                "time": ["2025-10-07T00:00", "2025-10-07T01:00"],
+                "wind_speed_10m": [36.0, 18.0],
+                "wind_direction_10m": [270, None],
+                "wind_gusts_10m": [None, 54.0],
+                "visibility": [24140.0, 10000.0],
+            },
+        }
+    )
+
+    series = connector.get_marine_weather(25.2, 54.1, datetime(2025, 10, 7), datetime(2025, 10, 8))
+
+    first, second = series.data_points
+    assert first.wind_speed == pytest.approx(10.0) and first.wind_gust is None
+    assert second.wind_direction == 0.0 and second.wind_gust == pytest.approx(15.0)
+    assert first.visibility == pytest.approx(24.14)
+
+
+def test_stormglass_columns_keep_missing_optionals_as_none() -> None:
+    connector = StormglassConnector(api_key="test")
+    connector.session = _Session(
+        {
+            "hours": [
+                {"time": "2025-10-07T00:00:00+00:00", "windSpeed": {"noaa": 7.5}, "waveHeight": {"noaa": 1.2}},
+                {"time": "2025-10-07T01:00:00+00:00", "windSpeed": {"noaa": 8.0}, "wavePeriod": {"noaa": 6.0}},
+            ]
+        }
+    )
+
+    series = connector.get_marine_weather(25.2, 54.1, datetime(2025, 10, 7), datetime(2025, 10, 8))
+
+    first, second = series.data_points
+    assert (first.wind_speed, first.wave_height, first.wave_period) == (7.5, 1.2, None)
+    assert (second.wave_height, second.wave_period, second.visibility) == (0.0, 6.0, None)
@@ -0,0 +1,101 @@
+"""Tests for predicate pushdown and ranking in vector search."""
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src.marine_ops.core.observation_store import ObservationStore
+from src.marine_ops.core.schema import MarineDataPoint, MarineTimeseries
+from src.marine_ops.core.vector_search import (
+    SearchFilter,
+    candidate_embeddings,
+    ensure_meta_ts,
+    fetch_hits,
+    parse_condition,
+    rank_embeddings,
+)
+
+LEGACY_SCHEMA = """
+CREATE TABLE marine_raw (id INTEGER PRIMARY KEY, source TEXT, location TEXT, timestamp TEXT, data_json TEXT, ingested_at TEXT);
+CREATE TABLE marine_vec (id INTEGER PRIMARY KEY, embedding BLOB);
+CREATE TABLE marine_vec_meta (
+    id INTEGER PRIMARY KEY, raw_id INTEGER, text_content TEXT, source TEXT, location TEXT,
+    timestamp TEXT, embedding_id INTEGER, created_at TEXT
+);
+"""
+
+
+def _database(tmp_path) -> sqlite3.Connection:
+    path = tmp_path / "vec.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    rng = np.random.default_rng(0)
+    points = []
+    for i in range(12):
+        location = "AGI" if i % 2 == 0 else "DAS"
+        stamp = f"2024-05-01T{i:02d}:00:00+04:00"
+        wave = 0.5 + 0.2 * i
+        embedding = rng.normal(size=8).astype(np.float32)
+        embedding /= np.linalg.norm(embedding)
+        conn.execute(
+            "INSERT INTO marine_raw VALUES (?, 'open_meteo', ?, ?, ?, 'x')",
+            (i + 1, location, stamp, json.dumps({"wave_height": wave})),
+        )
+        conn.execute("INSERT INTO marine_vec VALUES (?, ?)", (i + 1, embedding.tobytes()))
+        conn.execute(
+            "INSERT INTO marine_vec_meta VALUES (?, ?, ?, 'open_meteo', ?, ?, ?, 'x')",
+            (i + 1, i + 1, f"row {i}", location, stamp, i + 1),
+        )
+        if location == "AGI":
+            points.append(MarineDataPoint(timestamp=stamp, wind_speed=5.0, wind_direction=0.0, wave_height=wave))
+    conn.commit()
+    ObservationStore(str(path)).upsert_timeseries(
+        MarineTimeseries(source="open_meteo", location="AGI", data_points=points, ingested_at="x")
+    )
+    return conn
+
+
+def test_legacy_meta_rows_get_epoch_ts_once(tmp_path) -> None:
+    conn = _database(tmp_path)
+
+    assert ensure_meta_ts(conn) == 12
+    assert ensure_meta_ts(conn) == 0
+    # 04:00 +04:00 is midnight UTC.
+    assert conn.execute("SELECT ts FROM marine_vec_meta WHERE id = 5").fetchone()[0] == 1714521600
+
+
+def test_filters_are_applied_before_scoring(tmp_path) -> None:
+    conn = _database(tmp_path)
+    ensure_meta_ts(conn)
+
+    window = SearchFilter(location="AGI", start="2024-05-01T00:00:00Z", end="2024-05-01T04:00:00Z")
+    ids, blobs = candidate_embeddings(conn, window)
+    # AGI rows at 04:00..08:00 local, end inclusive.
+    assert sorted(ids.tolist()) == [5, 7, 9]
+
+    rough = SearchFilter(location="AGI", conditions=(parse_condition("wave_height>1.5"),))
+    ids, _ = candidate_embeddings(conn, rough)
+    assert sorted(ids.tolist()) == [7, 9, 11]
+
+    with pytest.raises(ValueError):
+        SearchFilter(conditions=(("data_json", ">", 1.0),))
+
+
+def test_rank_and_fetch_hits_in_one_join(tmp_path) -> None:
+    conn = _database(tmp_path)
+    ensure_meta_ts(conn)
+    ids, blobs = candidate_embeddings(conn)
+    query = np.frombuffer(blobs[3], dtype=np.float32)
+
+    order, scores = rank_embeddings(query, blobs, top_k=3)
+    assert ids[order[0]] == ids[3] and scores[0] == pytest.approx(1.0)
+    assert np.all(np.diff(scores) <= 0)
+    full_order, _ = rank_embeddings(query, blobs, top_k=None)
+    assert full_order[:3].tolist() == order.tolist() and len(full_order) == 12
+
+    hits = fetch_hits(conn, ids[order].tolist())
+    raw_id, text, source, location, timestamp, created_at, data_json, ts = hits[int(ids[order[0]])]
+    assert text == "row 3" and json.loads(data_json)["wave_height"] == pytest.approx(1.1)
@@ -0,0 +1,59 @@
+"""Tests for the shared NCM browser pool."""
+from __future__ import annotations
+
+from ncm_web.browser_pool import BrowserPool, cached_driver_path
+
+TABLE = "<table><tr><th>Time</th><th>Wind Speed</th></tr><tr><td>06:00</td><td>12 kt</td></tr></table>"
+
+
+class _Driver:
+    def __init__(self) -> None:
+        self.gets: list[str] = []
+        self.quit_calls = 0
+        self.current_url = "about:blank"
+
+    def get(self, url: str) -> None:
+        self.gets.append(url)
+
+    def execute_script(self, script: str, selector: str) -> dict:
+        return {"tables": [TABLE], "texts": ["Wind 12 kt", ""]}
+
+    def quit(self) -> None:
+        self.quit_calls += 1
+
+
+def test_one_page_load_per_cycle_for_all_sites() -> None:
+    drivers: list[_Driver] = []
+
+    def factory(headless: bool) -> _Driver:
+        drivers.append(_Driver())
+        return drivers[-1]
+
+    pool = BrowserPool(driver_factory=factory, wait_for_page=lambda driver: None, snapshot_ttl_s=60)
+    first = pool.snapshot("https://example.test/marine")
+    second = pool.snapshot("https://example.test/marine")
+
+    assert first is second and pool.page_loads == 1 and len(drivers) == 1
+    assert first.frames() is second.frames()
+    assert list(first.frames()[0].columns) == ["time", "wind_speed"]
+    assert first.container_texts == ["Wind 12 kt"]
+
+    pool.snapshot("https://example.test/marine", max_age_s=0)
+    assert pool.page_loads == 2 and len(drivers) == 1
+    pool.close()
+    assert drivers[0].quit_calls == 1
+
+
+def test_driver_path_is_cached_on_disk(tmp_path) -> None:
+    binary = tmp_path / "chromedriver"
+    binary.write_text("")
+    calls: list[int] = []
+
+    def install() -> str:
+        calls.append(1)
+        return str(binary)
+
+    cache_file = tmp_path / "driver.json"
+    assert cached_driver_path(install, cache_file) == str(binary)
+    assert cached_driver_path(install, cache_file) == str(binary)
+    assert len(calls) == 1
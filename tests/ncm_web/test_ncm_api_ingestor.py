@@ -0,0 +1,151 @@
+"""Replay tests for the browserless NCM connector over saved XHR payloads."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ncm_web.ncm_api_ingestor import NCMApiIngestor, NCMEndpoints, replay_payloads
+
+RAW_DIR = Path(__file__).resolve().parents[2] / "raw"
+STATIONS_FILE = RAW_DIR / "AGI_1759861678_1759861697388.json"
+STATION_FILE = RAW_DIR / "AGI_1759861678_1759861698041.json"
+
+
+class _Response:
+    def __init__(self, payload) -> None:
+        self._payload = payload
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self):
+        return self._payload
+
+
+class _ReplaySession:
+    """Serves saved payloads by URL, standing in for requests.Session."""
+
+    def __init__(self, routes: dict) -> None:
+        self.routes = routes
+        self.headers: dict = {}
+        self.calls: list[str] = []
+
+    def get(self, url: str, timeout: float):
+        self.calls.append(url)
+        return _Response(self.routes[url])
+
+
+@pytest.mark.skipif(not STATION_FILE.exists(), reason="saved NCM payloads not present")
+def test_replay_over_saved_payloads() -> None:
+    summary = replay_payloads(RAW_DIR)
+
+    assert summary["stations"] == 37
+    assert summary["station_files"][STATION_FILE.name] == 98
+
+
+@pytest.mark.skipif(not STATION_FILE.exists(), reason="saved NCM payloads not present")
+def test_json_fast_path_shares_station_fetches_across_sites(tmp_path) -> None:
+    (tmp_path / "stations.json").write_text(STATIONS_FILE.read_text(encoding="utf-8"), encoding="utf-8")
+    (tmp_path / "station.json").write_text(STATION_FILE.read_text(encoding="utf-8"), encoding="utf-8")
+    index = [
+        {"file": "stations.json", "url": "https://ncm.test/api/stations"},
+        {"file": "station.json", "url": "https://ncm.test/api/station/26?lang=en"},
+    ]
+    (tmp_path / "_endpoints.jsonl").write_text("\n".join(json.dumps(row) for row in index), encoding="utf-8")
+    endpoints = NCMEndpoints.discover(tmp_path)
+    assert endpoints.station == "https://ncm.test/api/station/{id}?lang=en"
+
+    station_payload = json.loads(STATION_FILE.read_text(encoding="utf-8"))
+    routes = {"https://ncm.test/api/stations": json.loads(STATIONS_FILE.read_text(encoding="utf-8"))}
+    for station_id in ("46", "26", "45", "126", "27", "44", "51", "47", "43", "112", "108"):
+        routes[f"https://ncm.test/api/station/{station_id}?lang=en"] = station_payload
+    session = _ReplaySession(routes)
+
+    def browser(location: str, hours: int):
+        raise AssertionError("browser fallback must not run when the JSON path works")
+
+    ingestor = NCMApiIngestor(endpoints=endpoints, session=session, browser_fallback=browser)
+    agi = ingestor.create_marine_timeseries("AGI")
+    das = ingestor.create_marine_timeseries("DAS")
+
+    assert ingestor.last_path == "json"
+    assert agi.source == "ncm_api" and len(agi.data_points) == 98
+    first = agi.data_points[0]
+    assert first.timestamp == "2025-10-06T18:00:00+00:00"
+    assert np.isclose(first.wind_speed, 17.64 / 3.6)
+    assert first.humidity == pytest.approx(0.77)
+    assert len(das.data_points) == 98
+    assert session.calls.count("https://ncm.test/api/stations") == 1
+    assert len(session.calls) == len(set(session.calls))
+
+
+def test_browser_fallback_when_fast_paths_fail() -> None:
+    class _Down:
+        headers: dict = {}
+
+        def get(self, url: str, timeout: float):
+            raise ConnectionError("offline")
+
+    calls = []
+    ingestor = NCMApiIngestor(
+        endpoints=NCMEndpoints(),
+        session=_Down(),
+        browser_fallback=lambda location, hours: calls.append(location) or "browser-series",
+    )
+
+    assert ingestor.create_marine_timeseries("AGI") == "browser-series"
+    assert calls == ["AGI"] and ingestor.last_path == "browser"
+
+
+class _HtmlSession:
+    headers: dict = {}
+
+    def __init__(self, html: str) -> None:
+        self.html = html
+
+    def get(self, url: str, timeout: float):
+        response = _Response(None)
+        response.text = self.html
+        return response
+
+
+def _html_table(rows: list) -> str:
+    header = "<tr><th>Station</th><th>Type</th><th>Latitude</th><th>Longitude</th><th>Time</th><th>Wave Height</th><th>Wind Speed</th></tr>"
+    body = "".join("<tr>" + "".join(f"<td>{value}</td>" for value in row) + "</tr>" for row in rows)
+    return f"<html><body><table>{header}{body}</table></body></html>"
+
+
+def test_html_path_keeps_each_sites_nearest_stations() -> None:
+    html = _html_table(
+        [
+            ("Buoy A", "BUOY", 25.20, 54.15, "2025-10-07T00:00:00Z", 0.8, ""),
+            ("AWS A", "AWS", 25.22, 54.16, "2025-10-07T01:00:00Z", "", 18.0),
+            ("Buoy D", "BUOY", 24.87, 53.74, "2025-10-07T00:00:00Z", 1.6, ""),
+        ]
+    )
+    ingestor = NCMApiIngestor(endpoints=NCMEndpoints(), session=_HtmlSession(html), browser_fallback=None)
+
+    agi = ingestor.create_marine_timeseries("AGI")
+    assert ingestor.last_path == "html"
+    das = ingestor.create_marine_timeseries("DAS")
+
+    assert [point.wave_height for point in agi.data_points[:1]] == [0.8]
+    assert np.isnan(agi.data_points[1].wave_height) and agi.data_points[1].sea_state == "Unknown"
+    assert agi.data_points[1].wind_speed == pytest.approx(5.0)
+    assert das.data_points[0].wave_height == 1.6
+
+
+def test_html_without_station_column_falls_through_to_browser() -> None:
+    html = "<table><tr><th>Time</th><th>Wave Height</th></tr><tr><td>2025-10-07T00:00:00Z</td><td>0.8</td></tr></table>"
+    calls = []
+    ingestor = NCMApiIngestor(
+        endpoints=NCMEndpoints(),
+        session=_HtmlSession(html),
+        browser_fallback=lambda location, hours: calls.append(location) or "browser-series",
+    )
+
+    assert ingestor.create_marine_timeseries("DAS") == "browser-series"
+    assert calls == ["DAS"] and ingestor.last_path == "browser"
@@ -0,0 +1,98 @@
+"""Tests for the numeric state-vector analog index."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.marine_ops.core.observation_store import ObservationStore
+from src.marine_ops.core.schema import MarineDataPoint, MarineTimeseries
+from src.marine_ops.pipeline.analogs import AnalogIndex, AnalogSearch, state_frame, summarize_outcomes
+
+HOURS = 24 * 60
+
+
+def _history(hours: int = HOURS, seed: int = 1) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    stamps = pd.date_range("2024-01-01", periods=hours, freq="h", tz="UTC")
+    wave = 1.0 + 0.6 * np.sin(np.arange(hours) / 30.0) + rng.normal(0, 0.05, hours)
+    wind = 8.0 + 5.0 * np.sin(np.arange(hours) / 45.0) + rng.normal(0, 0.5, hours)
+    return pd.DataFrame(
+        {
+            "timestamp": stamps,
+            "source": "open_meteo",
+            "wave_height": wave,
+            "wave_period": 6.0 + wave,
+            "wind_speed": wind,
+            "wind_gust": wind * 1.3,
+            "wind_direction": (300.0 + 40.0 * np.sin(np.arange(hours) / 20.0)) % 360.0,
+            "visibility": np.where(np.arange(hours) % 97 == 0, np.nan, 10.0),
+        }
+    )
+
+
+def test_state_frame_averages_sources_and_directions_circularly() -> None:
+    stamps = pd.to_datetime(["2024-01-01T00:10Z", "2024-01-01T00:40Z"])
+    frame = pd.DataFrame({"timestamp": stamps, "wave_height": [1.0, 2.0], "wind_direction": [350.0, 10.0], "visibility": [np.nan, np.nan]})
+    state = state_frame(frame)
+
+    assert len(state) == 1 and "visibility" not in state
+    assert state["wave_height"].iloc[0] == pytest.approx(1.5)
+    assert np.degrees(np.arctan2(state["wind_direction_sin"].iloc[0], state["wind_direction_cos"].iloc[0])) == pytest.approx(0.0, abs=1e-9)
+
+
+def test_kdtree_and_brute_force_return_the_same_analogs() -> None:
+    history = _history()
+    brute = AnalogIndex.build("AGI", history, backend="brute")
+    tree = AnalogIndex.build("AGI", history, backend="kdtree")
+    when = history["timestamp"].iloc[-100]
+
+    expected = brute.query_at(when, k=8)
+    actual = tree.query_at(when, k=8)
+
+    assert [match.timestamp for match in actual] == [match.timestamp for match in expected]
+    assert np.allclose([m.distance for m in actual], [m.distance for m in expected], atol=1e-4)
+
+
+def test_query_excludes_neighbouring_hours_and_reports_what_followed() -> None:
+    history = _history()
+    index = AnalogIndex.build("AGI", history)
+    when = history["timestamp"].iloc[HOURS // 2]
+    matches = index.query_at(when, k=5, exclude_hours=48, horizon_hours=12)
+
+    assert len(matches) == 5
+    assert all(abs((match.timestamp - when).total_seconds()) > 48 * 3600 for match in matches)
+    first = matches[0]
+    following = history[(history["timestamp"] > first.timestamp) & (history["timestamp"] <= first.timestamp + pd.Timedelta(hours=12))]
+    assert first.outcome["points"] == 12
+    assert first.outcome["wave_height_max"] == pytest.approx(following["wave_height"].max(), abs=1e-3)
+    assert summarize_outcomes(matches)["wave_height_max_median"] is not None
+
+
+def test_encoded_conditions_find_matching_states() -> None:
+    history = _history()
+    index = AnalogIndex.build("AGI", history)
+    matches = index.query(index.encode({"wave_height": 1.6, "wind_speed": 13.0, "wind_direction": 300.0}), k=3)
+
+    assert all(abs(m.state["wave_height"] - 1.6) < 0.3 for m in matches)
+    assert all(abs(m.state["wind_speed"] - 13.0) < 2.0 for m in matches)
+
+
+def test_search_builds_per_location_index_from_the_observation_store(tmp_path) -> None:
+    history = _history(hours=24 * 10)
+    points = [
+        MarineDataPoint(
+            timestamp=stamp.isoformat(), wind_speed=float(wind), wind_direction=float(direction), wave_height=float(wave)
+        )
+        for stamp, wind, direction, wave in zip(history["timestamp"], history["wind_speed"], history["wind_direction"], history["wave_height"])
+    ]
+    store = ObservationStore(str(tmp_path / "obs.db"))
+    store.upsert_timeseries(MarineTimeseries(source="open_meteo", location="AGI", data_points=points, ingested_at="x"))
+    search = AnalogSearch(store)
+
+    hourly = search.similar("AGI", k=4, horizon_hours=6)
+    daily = search.similar("AGI", k=2, resolution="D", horizon_hours=24)
+
+    assert len(hourly) == 4 and len(search.index("AGI")) == 24 * 10
+    assert len(search.index("AGI", "D")) == 10 and len(daily) == 2
+    assert search.similar("DAS", k=4) == []
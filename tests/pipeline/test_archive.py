@@ -0,0 +1,87 @@
+"""Tests for the run archive feeding the ML history table."""
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.marine_ops.core.schema import ERIPoint
+from src.marine_ops.pipeline.archive import ARCHIVE_TABLE, RunArchive
+from src.marine_ops.pipeline.history import HistoryQuery, load_history
+
+
+def _frame(start: str, wave: float, hours: int = 12) -> pd.DataFrame:
+    index = pd.date_range(start, periods=hours, freq="h", tz="UTC")
+    return pd.DataFrame(
+        {"wave_height": np.full(hours, wave), "wind_speed_10m": np.full(hours, 5.0)},
+        index=index,
+    )
+
+
+def _eri(frame: pd.DataFrame, value: float) -> list:
+    return [ERIPoint(ts.isoformat(), value, 0.0, 0.0, 0.0, 0.0) for ts in frame.index]
+
+
+def _count(archive: RunArchive) -> int:
+    with closing(sqlite3.connect(archive.path)) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {ARCHIVE_TABLE}").fetchone()[0]
+
+
+def test_write_run_is_idempotent_and_latest_issue_wins(tmp_path) -> None:
+    archive = RunArchive(tmp_path / "history.sqlite")
+    first_run = datetime(2024, 5, 1, 0, tzinfo=timezone.utc)
+    second_run = datetime(2024, 5, 1, 6, tzinfo=timezone.utc)
+    first = _frame("2024-05-01T00:00", 1.0)
+    second = _frame("2024-05-01T06:00", 1.5)
+    decisions = {"d1": {"morning": {"start": "2024-05-01T06:00:00+00:00", "end": "2024-05-01T12:00:00+00:00", "decision": "GO"}}}
+
+    assert archive.write_run(first_run, {"AGI": first}, eri={"AGI": _eri(first, 20.0)}) == 12
+    archive.write_run(first_run, {"AGI": first}, eri={"AGI": _eri(first, 20.0)})
+    archive.write_run(second_run, {"AGI": second}, eri={"AGI": _eri(second, 30.0)}, decisions={"AGI": decisions})
+    assert _count(archive) == 24
+
+    latest = archive.latest(["AGI"])
+    assert len(latest) == 18
+    overlap = latest.set_index("timestamp").loc["2024-05-01T08:00:00+00:00"]
+    assert overlap["wave_height"] == 1.5 and overlap["eri"] == 30.0 and overlap["decision"] == "GO"
+    assert overlap["lead_hours"] == 2
+    assert np.isclose(overlap["wind_speed_kt"], 5.0 * 1.9438444924406)
+
+    history = load_history([archive.path], HistoryQuery(locations=("AGI",)))
+    assert len(history) == 18
+    assert history["wave_height"].iloc[-1] == 1.5
+
+
+def test_compact_drops_superseded_runs(tmp_path) -> None:
+    archive = RunArchive(tmp_path / "history.sqlite")
+    archive.write_run(datetime(2024, 5, 1, 0, tzinfo=timezone.utc), {"AGI": _frame("2024-05-01T00:00", 1.0)})
+    archive.write_run(datetime(2024, 5, 1, 6, tzinfo=timezone.utc), {"AGI": _frame("2024-05-01T06:00", 1.5)})
+
+    result = archive.compact(now=datetime(2024, 5, 10, tzinfo=timezone.utc), superseded_after_hours=72)
+
+    assert result == {"superseded": 6, "expired": 0}
+    assert _count(archive) == 18
+    assert len(archive.latest()) == 18
+
+
+def test_archive_connections_are_closed(tmp_path, monkeypatch) -> None:
+    opened = []
+    connect = sqlite3.connect
+
+    def tracking_connect(*args, **kwargs):
+        opened.append(connect(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(sqlite3, "connect", tracking_connect)
+    archive = RunArchive(tmp_path / "history.sqlite")
+    frame = _frame("2024-05-01T00:00", 1.0)
+    archive.write_run(datetime(2024, 5, 1, tzinfo=timezone.utc), {"AGI": frame}, eri={"AGI": _eri(frame, 20.0)})
+
+    assert opened
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
@@ -0,0 +1,68 @@
+"""Tests for the rolling-origin backtest engine."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.marine_ops.pipeline.backtest import (
+    load_metrics_table,
+    rolling_origin_folds,
+    run_backtest,
+    write_metrics_table,
+)
+
+
+def _history(hours: int = 24 * 40) -> pd.DataFrame:
+    timestamps = pd.date_range("2024-01-01", periods=hours, freq="h", tz="UTC")
+    phase = np.arange(hours) / 24.0
+    rng = np.random.default_rng(3)
+    frames = []
+    for location, offset in (("AGI", 0.0), ("DAS", 0.3)):
+        frames.append(
+            pd.DataFrame(
+                {
+                    "timestamp": timestamps,
+                    "location": location,
+                    "wave_height": 1.0 + offset + 0.4 * np.sin(2 * np.pi * phase) + rng.normal(0, 0.05, hours),
+                    "wind_speed": 12.0 + 4.0 * np.cos(2 * np.pi * phase),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_folds_walk_forward_without_overlap() -> None:
+    history = _history()
+    folds = rolling_origin_folds(history["timestamp"], n_folds=3, test_hours=48, min_train_hours=24 * 10)
+
+    assert [fold.index for fold in folds] == [0, 1, 2]
+    assert all(later.train_end == earlier.test_end for earlier, later in zip(folds, folds[1:]))
+    assert folds[-1].test_end == history["timestamp"].max()
+
+
+def test_backtest_metrics_and_fold_cache_reuse(tmp_path) -> None:
+    history = _history()
+    kwargs = dict(
+        lead_hours=(24, 48),
+        n_folds=3,
+        test_hours=48,
+        min_train_hours=24 * 10,
+        cache_dir=tmp_path / "folds",
+    )
+    report = run_backtest(history, backend="ridge", **kwargs)
+    cached = sorted((tmp_path / "folds").glob("*.npz"))
+
+    assert set(report.metrics["location"]) == {"AGI", "DAS"}
+    assert set(report.metrics["lead_hours"]) == {24, 48}
+    assert (report.metrics["rmse"] >= report.metrics["mae"]).all()
+    assert report.metrics["rmse"].max() < 0.5
+    assert report.brier_go is not None and 0.0 <= report.brier_go <= 1.0
+    assert len(cached) == 3
+
+    other = run_backtest(history, backend="gradient_boosting", **kwargs)
+    assert sorted((tmp_path / "folds").glob("*.npz")) == cached
+    assert len(other.predictions) == len(report.predictions)
+
+    paths = write_metrics_table(report, tmp_path / "out")
+    assert "<table" in paths["html"].read_text(encoding="utf-8")
+    assert len(load_metrics_table(tmp_path / "out")) == len(report.metrics)
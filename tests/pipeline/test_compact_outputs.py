@@ -0,0 +1,71 @@
+"""Tests for the compact Parquet side outputs."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.marine_ops.pipeline.compact_outputs import (
+    headline_digest,
+    latest_index,
+    load_index,
+    read_compact_table,
+    write_compact_outputs,
+)
+from src.marine_ops.pipeline.config import load_pipeline_config
+from src.marine_ops.pipeline.report_model import build_report_model
+
+
+def _model(eri_value=71.0):
+    cfg = load_pipeline_config("config/locations.yaml")
+    part = {"hs_mean": 0.8, "hs_p90": float("nan"), "wind_p90_kt": 14.0, "decision": "GO"}
+    agi = {"D0": {"morning": part, "evening": {**part, "decision": "NO-GO"}}}
+    long_range = pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-05-02", periods=3, freq="D", tz="UTC"),
+            "predicted_eri": [30.0, np.nan, 45.5],
+        }
+    )
+    return build_report_model(
+        datetime(2024, 5, 1, 2, tzinfo=timezone.utc),
+        cfg,
+        agi,
+        {},
+        [{"label": "D0 morning", "agi_decision": "GO", "das_decision": "GO"}],
+        [],
+        long_range={"AGI": long_range},
+        anomalies={"AGI": [{"timestamp": "2024-05-01T06:00:00+00:00", "eri_value": eri_value, "message": "spike"}]},
+    )
+
+
+def test_compact_tables_and_headline_index(tmp_path) -> None:
+    pytest.importorskip("pyarrow")
+    paths = write_compact_outputs(_model(), tmp_path)
+
+    assert {"decisions", "long_range", "anomalies", "index"} <= set(paths)
+    assert latest_index(tmp_path) == paths["index"]
+    headline = load_index(paths["index"])["headline"]
+    assert headline["decision_counts"]["AGI"] == {"GO": 1, "NO-GO": 1}
+    assert headline["go_windows"] == ["D0 morning"]
+    assert headline["anomaly_peak_eri"]["AGI"] == 71.0
+
+    decisions = read_compact_table(paths["index"], "decisions", columns=["location", "decision"])
+    assert list(decisions.columns) == ["location", "decision"]
+    assert decisions["decision"].tolist() == ["GO", "NO-GO"]
+
+    long_range = read_compact_table(paths["index"], "long_range")
+    assert long_range["predicted_eri"].dtype == np.float32
+    assert long_range["predicted_eri"].isna().tolist() == [False, True, False]
+
+
+def test_integer_peak_eri_and_digest_read_from_index(tmp_path) -> None:
+    pytest.importorskip("pyarrow")
+    paths = write_compact_outputs(_model(eri_value=np.int64(72)), tmp_path)
+
+    assert load_index(paths["index"])["headline"]["anomaly_peak_eri"]["AGI"] == 72.0
+    digest = headline_digest(paths["index"])
+    assert "GO windows: D0 morning" in digest
+    assert "NO-GO: AGI D0 evening" in digest
+    assert "Anomaly peak ERI AGI: 72.0" in digest
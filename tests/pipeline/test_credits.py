@@ -0,0 +1,107 @@
+"""Tests for the metered-API credit ledger and request planner."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from src.marine_ops.core.schema import MarineDataPoint, MarineTimeseries
+from src.marine_ops.pipeline.config import LocationSpec
+from src.marine_ops.pipeline.credits import CreditLedger, ProviderPolicy, RequestPlanner
+from src.marine_ops.pipeline.ingest import _metered_series, _offline_metered, reachable_metered_providers
+
+AGI = LocationSpec(id="AGI", name="AGI", lat=25.2, lon=54.1)
+DAS = LocationSpec(id="DAS", name="DAS", lat=24.9, lon=53.7)
+
+
+class _Clock:
+    def __init__(self, stamp: str) -> None:
+        self.now = datetime.fromisoformat(stamp).replace(tzinfo=timezone.utc)
+
+    def __call__(self) -> datetime:
+        return self.now
+
+
+def _series(site: str, start: pd.Timestamp, end: pd.Timestamp) -> MarineTimeseries:
+    stamps = pd.date_range(start, end, freq="h")
+    points = [
+        MarineDataPoint(timestamp=stamp.isoformat(), wind_speed=5.0, wind_direction=0.0, wave_height=0.8)
+        for stamp in stamps
+    ]
+    return MarineTimeseries(source="worldtides", location=site, data_points=points, ingested_at=stamps[0].isoformat())
+
+
+def _planner(tmp_path, clock, quota: int) -> RequestPlanner:
+    policy = ProviderPolicy(daily_quota=quota, cost_hours=7 * 24, refresh_hours=24, horizon_hours=7 * 24)
+    return RequestPlanner(
+        CreditLedger(tmp_path / "ledger.json", clock=clock),
+        {"worldtides": policy},
+        cache_dir=tmp_path / "series",
+        site_priority=["DAS", "AGI"],
+    )
+
+
+def test_one_multi_day_tide_call_per_site_then_cache(tmp_path) -> None:
+    clock = _Clock("2025-10-07T00:30:00")
+    planner = _planner(tmp_path, clock, quota=4)
+    calls = []
+
+    def fetch(start, end):
+        calls.append((start, end))
+        return _series("AGI", start, end)
+
+    planner.plan_cycle(["AGI", "DAS"], 72)
+    assert [call.site for call in planner.plan["worldtides"].values()] == ["DAS", "AGI"]
+    series, status = _metered_series(planner, None, "worldtides", AGI, 72, fetch, confidence=0.8)
+
+    assert len(calls) == 1 and calls[0][1] - calls[0][0] == pd.Timedelta(hours=7 * 24)
+    assert len(series.data_points) == 72 and "charged 1 credit" in status
+
+    clock.now = clock.now.replace(hour=9)
+    planner.plan_cycle(["AGI", "DAS"], 72)
+    series, status = _metered_series(planner, None, "worldtides", AGI, 72, fetch, confidence=0.8)
+
+    assert len(calls) == 1 and status.startswith("ok (cached")
+    assert series.data_points[0].timestamp.startswith("2025-10-07T09:00")
+    assert planner.ledger.spent("worldtides") == 1
+    assert planner.status()["worldtides"].startswith("1/4 credits used today")
+
+
+def test_budget_and_credit_exhaustion_fall_back_to_real_cached_data(tmp_path) -> None:
+    clock = _Clock("2025-10-07T00:00:00")
+    planner = _planner(tmp_path, clock, quota=2)
+    planner.plan_cycle(["AGI"], 72)
+    _metered_series(planner, None, "worldtides", AGI, 72, lambda s, e: _series("AGI", s, e), confidence=0.8)
+
+    clock.now = datetime(2025, 10, 8, 3, tzinfo=timezone.utc)
+    plan = planner.plan_cycle(["AGI", "DAS"], 72)["worldtides"]
+    assert plan["DAS"].action == "call"  # no cached data at all: funded first
+    assert plan["AGI"].action == "cache" and "reserved" in plan["AGI"].reason
+
+    def out_of_credits(start, end):
+        raise RuntimeError("WorldTides API 크레딧 부족: Not enough credits")
+
+    series, status = _metered_series(planner, None, "worldtides", DAS, 72, out_of_credits, confidence=0.8)
+    assert series is None and status.startswith("skipped (call failed")
+    assert planner.ledger.remaining("worldtides", planner.policies["worldtides"]) == 0
+
+    series, status = _metered_series(planner, None, "worldtides", AGI, 72, out_of_credits, confidence=0.8)
+    assert status.startswith("ok (cached") and len(series.data_points) == 72
+
+
+def test_plan_covers_only_reachable_providers(tmp_path, monkeypatch) -> None:
+    monkeypatch.delenv("STORMGLASS_API_KEY", raising=False)
+    monkeypatch.setenv("WORLDTIDES_API_KEY", "secret")
+    assert reachable_metered_providers("auto") == ["worldtides"]
+    assert reachable_metered_providers("offline") == []
+
+    clock = _Clock("2025-10-07T00:00:00")
+    planner = _planner(tmp_path, clock, quota=4)
+    planner.plan_cycle(["AGI"], 72)
+    _metered_series(planner, None, "worldtides", AGI, 72, lambda s, e: _series("AGI", s, e), confidence=0.8)
+
+    assert planner.plan_cycle(["AGI"], 72, providers=[]) == {}
+    assert planner.status()["worldtides"].endswith("plan: none")
+    series, status = _offline_metered(planner, "worldtides", AGI, 72)
+    assert status == "ok (cached: offline mode)" and len(series.data_points) == 72
+    assert _offline_metered(None, "worldtides", AGI, 72) == (None, "skipped (offline mode)")
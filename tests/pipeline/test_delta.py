@@ -0,0 +1,76 @@
+"""Tests for overlap-aware incremental ingestion."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.marine_ops.pipeline.config import LocationSpec
+from src.marine_ops.pipeline.delta import DeltaIngestor, SourcePolicy, upsert_frame
+from src.marine_ops.pipeline.ingest import _open_meteo_with_delta
+from src.marine_ops.connectors.open_meteo import OpenMeteoResult
+
+LOC = LocationSpec(id="AGI", name="AGI", lat=25.2, lon=54.1)
+
+
+class _Clock:
+    def __init__(self, start: str) -> None:
+        self.now = pd.Timestamp(start, tz="UTC")
+
+    def __call__(self) -> pd.Timestamp:
+        return self.now
+
+
+def _hourly(start: pd.Timestamp, end: pd.Timestamp, value: float) -> pd.DataFrame:
+    index = pd.date_range(start, end, freq="h").tz_convert("Asia/Dubai")
+    return pd.DataFrame({"wave_height": np.full(len(index), value)}, index=index)
+
+
+def test_upsert_reports_replaced_and_added_rows() -> None:
+    existing = _hourly(pd.Timestamp("2025-10-07T00:00Z"), pd.Timestamp("2025-10-07T05:00Z"), 1.0)
+    incoming = _hourly(pd.Timestamp("2025-10-07T04:00Z"), pd.Timestamp("2025-10-07T07:00Z"), 2.0)
+
+    result = upsert_frame(existing, incoming, keep_after=pd.Timestamp("2025-10-07T01:00Z"))
+
+    assert [stamp.hour for stamp in result.replaced.tz_convert("UTC")] == [4, 5]
+    assert len(result.added) == 2 and result.expired == 1
+    assert result.frame["wave_height"].tolist() == [1.0, 1.0, 1.0, 2.0, 2.0, 2.0, 2.0]
+
+
+def test_open_meteo_requests_only_new_hours_within_a_cycle(tmp_path) -> None:
+    clock = _Clock("2025-10-07T07:10")
+    delta = DeltaIngestor(
+        state_dir=tmp_path,
+        policies={"open_meteo_marine": SourcePolicy(cycle_hours=6, publish_lag_hours=0)},
+        clock=clock,
+    )
+    calls = []
+
+    def fetch(window):
+        calls.append(window)
+        if window is None:
+            start = clock.now.floor("h")
+            return OpenMeteoResult(_hourly(start, start + pd.Timedelta(hours=11), 1.0), {})
+        return OpenMeteoResult(_hourly(window[0], window[1], 2.0), {})
+
+    first = _open_meteo_with_delta(delta, "open_meteo_marine", LOC, 12, "Asia/Dubai", fetch)
+    clock.now = pd.Timestamp("2025-10-07T10:20", tz="UTC")
+    second = _open_meteo_with_delta(delta, "open_meteo_marine", LOC, 12, "Asia/Dubai", fetch)
+    clock.now = pd.Timestamp("2025-10-07T10:40", tz="UTC")
+    third = _open_meteo_with_delta(delta, "open_meteo_marine", LOC, 12, "Asia/Dubai", fetch)
+
+    assert calls[0] is None
+    assert calls[1] == (pd.Timestamp("2025-10-07T19:00", tz="UTC"), pd.Timestamp("2025-10-07T21:00", tz="UTC"))
+    assert len(calls) == 2  # the third run is inside the same cycle with no new hours
+    assert len(first.dataframe) == 12 and len(second.dataframe) == 12
+    assert second.dataframe["wave_height"].tolist() == [1.0] * 9 + [2.0] * 3
+    assert third.metadata["delta"]["mode"] == "skip"
+
+    clock.now = pd.Timestamp("2025-10-07T12:05", tz="UTC")
+    _open_meteo_with_delta(delta, "open_meteo_marine", LOC, 12, "Asia/Dubai", fetch)
+    summary = delta.summary()
+    assert calls[-1] is None and summary["entries"][-1]["mode"] == "full"
+    assert len(summary["entries"][-1]["replaced"]) == 10
+    assert summary["requested_hours"] == 12 + 3 + 0 + 12 and summary["full_hours"] == 48
+
+    reloaded = DeltaIngestor(state_dir=tmp_path, policies=delta.policies, clock=clock)
+    assert reloaded.plan("open_meteo_marine", "AGI", 12).mode == "skip"
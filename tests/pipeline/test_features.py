@@ -0,0 +1,50 @@
+"""Tests for the shared feature engineering engine."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.marine_ops.pipeline.features import build_features, latest_features, resolve_schema
+
+
+def _frame() -> pd.DataFrame:
+    index = pd.date_range("2024-01-01", periods=48, freq="h", tz="UTC")
+    return pd.DataFrame(
+        {
+            "wave_height": np.arange(48, dtype=float),
+            "wind_speed_10m": np.full(48, 10.0),
+            "wind_direction_10m": np.full(48, 90.0),
+            "eri": np.linspace(0.1, 0.5, 48),
+        },
+        index=index,
+    )
+
+
+def test_schema_resolves_aliases_once() -> None:
+    schema = resolve_schema(["wave_height", "wind_speed_10m", "eri"])
+
+    assert schema.column_for("hs_value") == "wave_height"
+    assert schema.column_for("wind_value") == "wind_speed_10m"
+    assert "hs_value" in schema.leakage_columns("wave_height")
+
+
+def test_build_features_groups_by_location() -> None:
+    agi = _frame().assign(location="AGI")
+    das = _frame().assign(location="DAS", wave_height=100.0)
+    features = build_features(pd.concat([agi, das]))
+
+    agi_rows = features[features["location"] == "AGI"]
+    assert agi_rows["hs_value_lag_1h"].iloc[1] == 0.0
+    assert agi_rows["hs_value_max_24h"].max() == 47.0
+    assert np.isclose(features["wind_value"].iloc[0], 10.0 * 1.9438444924406)
+    assert np.isclose(features["wind_dir_sin"].iloc[0], 1.0)
+
+
+def test_latest_features_matches_training_row() -> None:
+    frame = _frame()
+    full = build_features(frame)
+    latest = latest_features(frame)
+
+    assert latest["hs_value"] == 47.0
+    assert np.isclose(latest["eri_rolling_24h"], full["eri_rolling_24h"].iloc[-1])
+    assert np.isclose(latest["hs_value_mean_6h"], full["hs_value_mean_6h"].iloc[-1])
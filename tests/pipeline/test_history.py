@@ -0,0 +1,118 @@
+"""Tests for the chunked historical loader."""
+from __future__ import annotations
+
+import os
+import sqlite3
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.marine_ops.pipeline.history import (
+    HistoryQuery,
+    convert_to_columnar,
+    iter_history_chunks,
+    load_history,
+    sqlite_select,
+)
+
+
+def _history_frame() -> pd.DataFrame:
+    index = pd.date_range("2024-01-01", periods=96, freq="h", tz="UTC")
+    return pd.DataFrame(
+        {
+            "timestamp": np.tile(index, 2),
+            "location": ["AGI"] * len(index) + ["DAS"] * len(index),
+            "wave_height": np.linspace(0.5, 2.0, len(index) * 2),
+            "wind_speed_kt": np.linspace(8.0, 20.0, len(index) * 2),
+            "unused": 1.0,
+        }
+    )
+
+
+def test_csv_chunks_filter_and_downcast(tmp_path: Path) -> None:
+    source = tmp_path / "history.csv"
+    _history_frame().to_csv(source, index=False)
+    query = HistoryQuery(
+        start=pd.Timestamp("2024-01-03", tz="UTC"),
+        locations=("DAS",),
+        columns=("wave_height",),
+        chunk_rows=25,
+    )
+
+    chunks = list(iter_history_chunks(source, query))
+
+    assert len(chunks) > 1
+    merged = pd.concat(chunks)
+    assert set(merged.columns) == {"timestamp", "location", "wave_height"}
+    assert merged["location"].eq("DAS").all()
+    assert merged["timestamp"].min() >= pd.Timestamp("2024-01-03", tz="UTC")
+    assert merged["wave_height"].dtype == np.float32
+
+
+def test_sqlite_pushdown_matches_csv(tmp_path: Path) -> None:
+    frame = _history_frame()
+    db_path = tmp_path / "history.sqlite"
+    with sqlite3.connect(db_path) as conn:
+        frame.assign(timestamp=frame["timestamp"].map(pd.Timestamp.isoformat)).to_sql(
+            "marine_ml_history", conn, index=False
+        )
+    query = HistoryQuery(start=pd.Timestamp("2024-01-04", tz="UTC"), locations=("AGI",))
+
+    loaded = load_history([db_path], query)
+
+    assert len(loaded) == 24
+    assert loaded["location"].eq("AGI").all()
+
+
+def test_sqlite_time_filter_uses_the_timestamp_index(tmp_path: Path) -> None:
+    frame = _history_frame()
+    stamps = frame["timestamp"].dt.strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    # One legacy row written with a space separator and a local offset (2024-01-04T00:30Z).
+    stamps.iloc[0] = "2024-01-04 04:30:00+04:00"
+    db_path = tmp_path / "history.sqlite"
+    with sqlite3.connect(db_path) as conn:
+        frame.assign(timestamp=stamps).to_sql("marine_ml_history", conn, index=False)
+        conn.execute("CREATE INDEX idx_history_ts ON marine_ml_history(timestamp)")
+        query = HistoryQuery(start=pd.Timestamp("2024-01-04", tz="UTC"), end=pd.Timestamp("2024-01-04T05:00", tz="UTC"))
+        sql, params = sqlite_select(["timestamp", "location", "wave_height"], "marine_ml_history", query)
+        plan = " ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+    loaded = load_history([db_path], query)
+
+    assert "idx_history_ts" in plan and "julianday" not in sql
+    assert len(loaded) == 13
+    assert loaded["timestamp"].min() == pd.Timestamp("2024-01-04T00:00", tz="UTC")
+
+
+def test_columnar_cache_round_trip(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    source = tmp_path / "history.csv"
+    _history_frame().to_csv(source, index=False)
+
+    cached = convert_to_columnar(source, tmp_path / "cache")
+    loaded = load_history([source], HistoryQuery(columns=("wind_speed_kt",)), cache_dir=tmp_path / "cache")
+
+    assert cached is not None and cached.exists()
+    assert len(loaded) == 192
+    assert "unused" not in loaded.columns
+
+
+def test_columnar_cache_declares_schema_and_tracks_source_size(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    source = tmp_path / "history.csv"
+    frame = _history_frame().assign(visibility_km=np.nan, decision=None)
+    frame.loc[100:, "visibility_km"] = 9.5
+    frame.loc[100:, "decision"] = "GO"
+    frame.to_csv(source, index=False)
+
+    convert_to_columnar(source, tmp_path / "cache", chunk_rows=50)
+    loaded = load_history([source], cache_dir=tmp_path / "cache")
+    assert loaded["visibility_km"].notna().sum() == 92
+    assert set(loaded["decision"].dropna()) == {"GO"}
+
+    stat = source.stat()
+    frame.iloc[:10].to_csv(source, index=False)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert len(load_history([source], cache_dir=tmp_path / "cache")) == 10
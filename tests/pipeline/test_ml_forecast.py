@@ -6,8 +6,12 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from sklearn.dummy import DummyRegressor
+from sklearn.pipeline import Pipeline
+
 from src.marine_ops.pipeline.ml_forecast import (
     MODEL_FILENAME,
+    _chronological_holdout_residuals,
     detect_anomalies,
     predict_long_range,
     train_model,
@@ -38,6 +42,7 @@ def test_train_model_and_predict(tmp_path: Path) -> None:
     agi_forecast = forecasts["AGI"]
     assert isinstance(agi_forecast, pd.DataFrame)
     assert len(agi_forecast) == 7
+    assert artifacts.metrics["rows_holdout"] > 0
     assert {"timestamp", "predicted_eri", "hs_value", "wind_value"}.issubset(agi_forecast.columns)
 
 
@@ -52,3 +57,67 @@ def test_detect_anomalies_returns_mapping(tmp_path: Path) -> None:
     assert "DAS" in anomalies
     for record in anomalies["DAS"]:
         assert "timestamp" in record
+
+
+def test_persistent_anomaly_model_is_reused(tmp_path: Path) -> None:
+    from src.marine_ops.pipeline.anomaly import AnomalyModelStore
+
+    index = pd.date_range("2024-01-01", periods=24 * 20, freq="h", tz="UTC")
+    rng = np.random.default_rng(0)
+    history = pd.DataFrame(
+        {
+            "hs_mean": 1.0 + rng.normal(0, 0.1, len(index)),
+            "wind_speed_kt": 12.0 + rng.normal(0, 1.0, len(index)),
+            "eri": 0.3 + rng.normal(0, 0.02, len(index)),
+        },
+        index=index,
+    )
+    store = AnomalyModelStore(tmp_path / "anomaly")
+    spiked = _synth_frame()
+    spiked.iloc[-1, spiked.columns.get_loc("hs_mean")] = 6.0
+
+    first = detect_anomalies({"AGI": spiked}, store=store, history={"AGI": history})
+    reloaded = AnomalyModelStore(tmp_path / "anomaly")
+    assert reloaded.stale_locations(["AGI"]) == []
+    second = detect_anomalies({"AGI": spiked}, store=reloaded)
+
+    assert first == second
+    assert first["AGI"][-1]["timestamp"] == spiked.index[-1].isoformat()
+    assert max(first["AGI"][-1]["contributions"], key=first["AGI"][-1]["contributions"].get) == "hs_value"
+
+
+def test_streaming_detector_persists_state(tmp_path: Path) -> None:
+    from src.marine_ops.pipeline.anomaly import StreamingAnomalyDetector
+
+    state_path = tmp_path / "state.json"
+    frame = _synth_frame()
+    detector = StreamingAnomalyDetector(state_path, warmup=12)
+    detect_anomalies({"AGI": frame.iloc[:48]}, streaming=detector)
+    detector.save()
+
+    spiked = frame.copy()
+    spiked.iloc[-1, spiked.columns.get_loc("wind_speed_kt")] = 60.0
+    resumed = StreamingAnomalyDetector(state_path, warmup=12)
+    anomalies = detect_anomalies({"AGI": spiked}, streaming=resumed)
+
+    assert resumed.state["AGI"]["count"] == 72
+    assert [record["timestamp"] for record in anomalies["AGI"]] == [spiked.index[-1].isoformat()]
+
+
+def test_holdout_is_the_latest_period_across_locations() -> None:
+    stamps = pd.date_range("2024-01-01", periods=100, freq="h", tz="UTC")
+    # Grouped by location, as the prepared training frame is; only the last 20 hours are "recent".
+    frame = pd.DataFrame(
+        {
+            "timestamp": np.concatenate([stamps, stamps]),
+            "location": ["AGI"] * 100 + ["DAS"] * 100,
+            "x": 0.0,
+            "target": np.tile((np.arange(100) >= 80).astype(float), 2),
+        }
+    )
+    residuals = _chronological_holdout_residuals(
+        Pipeline([("model", DummyRegressor())]), frame, frame[["x"]], frame["target"]
+    )
+
+    assert len(residuals) == 40
+    assert np.allclose(residuals, 1.0)
@@ -0,0 +1,179 @@
+"""Tests for the notification dispatcher against local SMTP and HTTP stubs."""
+from __future__ import annotations
+
+import email
+import json
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from src.marine_ops.pipeline.notify import (
+    TELEGRAM_MAX_CHARS,
+    Notification,
+    NotificationDispatcher,
+    SmtpSender,
+    TelegramSender,
+    split_message,
+)
+
+
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        self.server.sessions += 1
+        self._reply("220 stub")
+        while True:
+            line = self.rfile.readline().decode().strip()
+            if not line:
+                return
+            verb = line.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self._reply("250-stub")
+                self._reply("250 AUTH PLAIN")
+            elif verb == "AUTH":
+                self.server.logins += 1
+                self._reply("235 ok")
+            elif verb == "DATA":
+                self._reply("354 go")
+                body = []
+                while (data := self.rfile.readline().decode()) != ".\r\n":
+                    body.append(data)
+                self.server.messages.append("".join(body))
+                self._reply("250 queued")
+            elif verb == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                if verb == "RCPT":
+                    self.server.recipients.append(line)
+                self._reply("250 ok")
+
+
+class _SmtpStub(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _SmtpHandler)
+        self.sessions = self.logins = 0
+        self.messages: list[str] = []
+        self.recipients: list[str] = []
+
+
+class _TelegramHandler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:  # noqa: N802
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.posts.append((self.path, payload))
+        failing = self.server.failures > 0
+        self.server.failures -= 1
+        body = json.dumps({"ok": not failing}).encode()
+        self.send_response(500 if failing else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        return
+
+
+def _serve(server) -> threading.Thread:
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def _dispatcher(tmp_path, smtp: _SmtpStub, http: HTTPServer, **kwargs) -> NotificationDispatcher:
+    senders = [
+        TelegramSender("TOKEN", "42", api_base=f"http://127.0.0.1:{http.server_port}"),
+        SmtpSender("127.0.0.1", smtp.server_address[1], "bot@example.com", ["a@example.com", "b@example.com"],
+                   username="bot", password="pw", starttls=False),
+    ]
+    return NotificationDispatcher(senders, outbox_path=tmp_path / "outbox.jsonl", sleep=lambda _: None, **kwargs)
+
+
+def test_batch_is_coalesced_and_sent_over_one_smtp_session(tmp_path) -> None:
+    smtp, http = _SmtpStub(), HTTPServer(("127.0.0.1", 0), _TelegramHandler)
+    http.posts, http.failures = [], 1
+    _serve(smtp), _serve(http)
+    try:
+        dispatcher = _dispatcher(tmp_path, smtp, http, coalesce_window_s=0.2).start()
+        dispatcher.submit(Notification("Wind", "strong wind", "warning"))
+        dispatcher.submit(Notification("Wave", "high wave", "error", channels=("email",)))
+        results = dispatcher.flush()
+        dispatcher.close()
+    finally:
+        smtp.shutdown(), http.shutdown()
+
+    assert results == {"telegram": True, "email": True}
+    assert smtp.sessions == 1 and smtp.logins == 1
+    assert len(smtp.messages) == 1 and len(smtp.recipients) == 2
+    digest = email.message_from_string(smtp.messages[0]).get_payload(decode=True).decode()
+    assert "[WARNING] Wind" in digest and "[ERROR] Wave" in digest
+    # First Telegram attempt fails and is retried; only the Telegram-addressed item is sent there.
+    assert len(http.posts) == 2
+    assert http.posts[-1][0] == "/botTOKEN/sendMessage"
+    assert http.posts[-1][1]["text"].startswith("Wind")
+
+
+def test_undelivered_items_go_to_outbox_and_can_be_retried(tmp_path) -> None:
+    smtp, http = _SmtpStub(), HTTPServer(("127.0.0.1", 0), _TelegramHandler)
+    http.posts, http.failures = [], 3
+    _serve(smtp), _serve(http)
+    try:
+        dispatcher = _dispatcher(tmp_path, smtp, http, max_attempts=2)
+        dispatcher.submit(Notification("Fog", "visibility low", channels=("telegram",)))
+        assert dispatcher.flush() == {"telegram": False}
+        outbox = [json.loads(line) for line in (tmp_path / "outbox.jsonl").read_text().splitlines()]
+        assert outbox[0]["channel"] == "telegram"
+
+        assert dispatcher.retry_outbox() == 1
+        assert dispatcher.flush() == {"telegram": True}
+        assert not (tmp_path / "outbox.jsonl").exists()
+        dispatcher.close()
+    finally:
+        smtp.shutdown(), http.shutdown()
+    assert len(http.posts) == 4
+
+
+def test_outbox_survives_a_failed_retry(tmp_path) -> None:
+    smtp, http = _SmtpStub(), HTTPServer(("127.0.0.1", 0), _TelegramHandler)
+    http.posts, http.failures = [], 4
+    _serve(smtp), _serve(http)
+    outbox = tmp_path / "outbox.jsonl"
+    try:
+        dispatcher = _dispatcher(tmp_path, smtp, http, max_attempts=2)
+        dispatcher.submit(Notification("Fog", "visibility low", channels=("telegram",)))
+        assert dispatcher.flush() == {"telegram": False}
+
+        assert dispatcher.retry_outbox() == 1
+        assert dispatcher.retry_outbox() == 0
+        assert dispatcher.flush() == {"telegram": False}
+        assert len(outbox.read_text().splitlines()) == 1
+
+        assert dispatcher.retry_outbox() == 1
+        assert dispatcher.flush() == {"telegram": True}
+        assert not outbox.exists()
+        dispatcher.close()
+    finally:
+        smtp.shutdown(), http.shutdown()
+
+
+def test_long_telegram_digest_is_split_not_truncated(tmp_path) -> None:
+    smtp, http = _SmtpStub(), HTTPServer(("127.0.0.1", 0), _TelegramHandler)
+    http.posts, http.failures = [], 0
+    _serve(smtp), _serve(http)
+    body = "\n".join(f"line {i:04d} " + "x" * 40 for i in range(200))
+    try:
+        dispatcher = _dispatcher(tmp_path, smtp, http)
+        dispatcher.submit(Notification("Digest", body, channels=("telegram",)))
+        assert dispatcher.flush() == {"telegram": True}
+        dispatcher.close()
+    finally:
+        smtp.shutdown(), http.shutdown()
+
+    texts = [payload["text"] for _, payload in http.posts]
+    assert len(texts) == 3 and all(len(text) <= TELEGRAM_MAX_CHARS for text in texts)
+    assert "\n".join(texts) == f"Digest\n\n{body}"
+    assert split_message("a" * 10, 4) == ["aaaa", "aaaa", "aa"]
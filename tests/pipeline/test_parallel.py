@@ -0,0 +1,71 @@
+"""Tests for the per-location process-pool executor."""
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from sklearn.ensemble import IsolationForest
+
+from src.marine_ops.pipeline.parallel import (
+    pin_worker_threads,
+    resolve_workers,
+    run_per_location,
+    share_frame,
+    worker_n_jobs,
+)
+
+
+def _sum_task(location: str, frame: pd.DataFrame, offset: float) -> tuple:
+    return location, float(frame["wave_height"].sum()) + offset, str(frame.index.tz)
+
+
+def _n_jobs_task(location: str, frame: pd.DataFrame, estimator: IsolationForest) -> tuple:
+    return worker_n_jobs(-1), pin_worker_threads(estimator).n_jobs
+
+
+def _frames() -> dict:
+    index = pd.date_range("2024-01-01", periods=24, freq="h", tz="Asia/Dubai")
+    return {
+        name: pd.DataFrame({"wave_height": np.full(24, scale), "label": "x"}, index=index)
+        for name, scale in (("DAS", 2.0), ("AGI", 1.0), ("MW4", 3.0))
+    }
+
+
+def test_parallel_matches_serial_in_input_order() -> None:
+    frames = _frames()
+    serial = run_per_location(_sum_task, frames, context=1.0, max_workers=1)
+    pooled = run_per_location(_sum_task, frames, context=1.0, max_workers=2)
+
+    assert list(pooled.results) == ["DAS", "AGI", "MW4"]
+    assert pooled.results == serial.results
+    assert pooled.results["AGI"] == ("AGI", 25.0, "Asia/Dubai")
+    assert set(pooled.timings) == set(frames)
+
+
+def test_estimators_run_single_threaded_inside_pool_workers(monkeypatch) -> None:
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    estimator = IsolationForest(n_jobs=-1)
+    serial = run_per_location(_n_jobs_task, _frames(), context=estimator, max_workers=1)
+    pooled = run_per_location(_n_jobs_task, _frames(), context=estimator, max_workers=2)
+
+    assert set(serial.results.values()) == {(-1, -1)}
+    assert set(pooled.results.values()) == {(1, 1)}
+    assert estimator.n_jobs == -1
+
+
+def test_unconfigured_workers_run_serially() -> None:
+    assert resolve_workers(None, 5) == 1
+    assert resolve_workers(2, 5) == min(2, os.cpu_count() or 1)
+
+
+def test_shared_frame_keeps_column_dtypes(tmp_path) -> None:
+    index = pd.date_range("2024-01-01", periods=4, freq="h", tz="UTC")
+    frame = pd.DataFrame(
+        {"hs": [1.0, 2.0, np.nan, 0.5], "flag": [True, False, True, True], "count": np.arange(4), "label": list("abcd")},
+        index=index,
+    )
+    loaded = share_frame(frame, tmp_path, "loc0").load()
+
+    pd.testing.assert_frame_equal(loaded, frame, check_freq=False)
@@ -0,0 +1,81 @@
+"""Tests for the shared report model and streaming writers."""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from src.marine_ops.pipeline.config import load_pipeline_config
+from src.marine_ops.pipeline.report_model import ColumnTable, build_report_model
+from src.marine_ops.pipeline.reporting import _cell_formatter, write_report
+
+
+def _decisions() -> dict:
+    entry = {
+        "start": "2024-05-01T06:00:00+04:00",
+        "end": "2024-05-01T12:00:00+04:00",
+        "hs_mean": 0.8,
+        "hs_p90": float("nan"),
+        "wind_mean_kt": 12.0,
+        "wind_p90_kt": 14.0,
+        "decision": "GO",
+        "alerts_matched": ["fog"],
+    }
+    return {"D0": {"morning": entry}}
+
+
+def test_all_outputs_come_from_one_model(tmp_path) -> None:
+    cfg = load_pipeline_config("config/locations.yaml")
+    long_range = pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2024-05-02", periods=3, freq="D", tz="UTC"),
+            "predicted_eri": [30.0, np.nan, 45.5],
+            "hs_value": [1.0, 1.1, 1.2],
+        }
+    )
+    model = build_report_model(
+        datetime(2024, 5, 1, 2, tzinfo=timezone.utc),
+        cfg,
+        _decisions(),
+        {},
+        [{"label": "D0 morning", "agi_decision": "GO", "das_decision": "GO", "start": "06:00"}],
+        ["fog <advisory>"],
+        long_range={"AGI": long_range},
+        anomalies={"AGI": [{"timestamp": "2024-05-01T06:00:00+00:00", "eri_value": 71.0, "message": "spike"}]},
+        ml_metadata={"mode": "test"},
+        backtest_html="<table class='table'></table>",
+    )
+
+    paths = write_report(model, str(tmp_path))
+
+    html = paths["html"].read_text(encoding="utf-8")
+    assert html.count("<section>") == 8
+    assert "fog &lt;advisory&gt;" in html
+    assert "alerts_matched" not in html
+    assert "<td>45.500</td>" in html
+
+    payload = json.loads(paths["json"].read_text(encoding="utf-8"))
+    assert payload["decisions"]["AGI"]["D0"]["morning"]["hs_p90"] is None
+    assert payload["long_range_forecast"]["AGI"][1]["predicted_eri"] is None
+    assert "location" not in payload["long_range_forecast"]["AGI"][0]
+
+    txt = paths["txt"].read_text(encoding="utf-8")
+    assert "  - D0 morning: GO (Hs~0.80 m, Wind~14.0 kt)" in txt
+    assert "predicted eri N/A (Hs 1.10 m)" in txt
+    assert "ERI 71.00 (spike)" in txt
+
+    ml_csv = pd.read_csv(paths["ml_csv"])
+    assert list(ml_csv["location"]) == ["AGI"] * 3
+    assert pd.read_csv(paths["csv"])["decision"].tolist() == ["GO"]
+
+
+def test_timestamp_cells_format_alike_for_naive_and_aware_columns() -> None:
+    stamps = pd.date_range("2024-05-02T06:30", periods=2, freq="h")
+    table = ColumnTable.from_frame(pd.DataFrame({"naive": stamps, "aware": stamps.tz_localize("UTC")}))
+
+    assert table.data["naive"].dtype.kind == "M" and table.data["aware"].dtype == object
+    for name in ("naive", "aware"):
+        fmt = _cell_formatter(table.data[name])
+        assert [fmt(value) for value in table.data[name]] == ["2024-05-02 06:30", "2024-05-02 07:30"]
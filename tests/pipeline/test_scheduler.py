@@ -0,0 +1,78 @@
+"""Tests for the automation job graph."""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.marine_ops.pipeline.scheduler import JobGraph, LatencyHistogram
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_dependencies_are_reused_within_freshness_window() -> None:
+    clock = _Clock()
+    calls = {"collect": 0, "summary": 0}
+
+    def collect(_):
+        calls["collect"] += 1
+        return {"frames": calls["collect"]}
+
+    def summary(deps):
+        calls["summary"] += 1
+        return deps["collect"]["frames"]
+
+    graph = JobGraph(clock=clock)
+    graph.add("collect", collect, max_age_s=600)
+    graph.add("summary", summary, depends_on=("collect",))
+
+    assert graph.run("collect") == {"frames": 1}
+    assert graph.run("summary") == 1
+    assert graph.run("summary") == 1
+    assert calls == {"collect": 1, "summary": 2}
+
+    clock.now = 601
+    assert graph.run("summary") == 2
+    assert graph.metrics()["collect"]["count"] == 2
+
+    with pytest.raises(ValueError):
+        graph.add("orphan", summary, depends_on=("missing",))
+
+
+def test_concurrent_callers_share_one_run() -> None:
+    calls = []
+
+    def slow(_):
+        calls.append(1)
+        time.sleep(0.05)
+        return len(calls)
+
+    graph = JobGraph()
+    graph.add("collect", slow, max_age_s=60)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(graph.run("collect"))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [1, 1, 1, 1]
+    assert len(calls) == 1
+
+
+def test_histogram_quantiles_use_bucket_edges() -> None:
+    histogram = LatencyHistogram(buckets=(1.0, 5.0))
+    for seconds in (0.2, 0.4, 3.0, 9.0):
+        histogram.record(seconds)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"le_1": 2, "le_5": 1, "le_inf": 1}
+    assert snapshot["p50_s"] == 1.0
+    assert snapshot["p95_s"] == 9.0
@@ -0,0 +1,99 @@
+"""Tests for tide-height alignment, extrema, crossings and tide windows."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.marine_ops.connectors import worldtides
+from src.marine_ops.connectors.payloads import worldtides_heights
+from src.marine_ops.core.schema import MarineDataPoint, MarineTimeseries
+from src.marine_ops.pipeline.daypart import route_window
+from src.marine_ops.pipeline.ingest import _tide_frame
+from src.marine_ops.pipeline.tides import (
+    FALLING,
+    HIGH,
+    LOW,
+    RISING,
+    TideSeries,
+    find_crossings,
+    find_extrema,
+    tide_windows,
+)
+from src.marine_ops.pipeline.windows import hourly_gate_series
+
+START = int(pd.Timestamp("2025-10-07T00:00Z").timestamp())
+PERIOD_S = int(12.42 * 3600)
+
+
+def _semidiurnal(site: str = "AGI", hours: int = 48, phase_s: int = 0) -> TideSeries:
+    epoch = START + np.arange(0, hours * 3600 + 1, 1800)
+    height = 1.5 + np.cos(2 * np.pi * (epoch - START - phase_s) / PERIOD_S)
+    return TideSeries.build(site, epoch, height)
+
+
+def test_worldtides_payload_decodes_to_sorted_arrays() -> None:
+    payload = {"heights": [{"dt": START + 1800, "height": 1.2}, {"dt": START, "height": 1.0}, {"dt": START + 3600, "height": None}]}
+    epoch, height = worldtides_heights(payload)
+    tide = TideSeries.build("AGI", epoch, height)
+
+    assert tide.epoch_s.tolist() == [START, START + 1800]
+    assert np.allclose(tide.at([START + 900, START + 7200]), [1.1, np.nan], equal_nan=True)
+
+
+def test_empty_worldtides_heights_fall_back_or_raise(monkeypatch) -> None:
+    monkeypatch.setattr(worldtides, "fetch_worldtides_heights", lambda *args, **kwargs: {"heights": [{"dt": START, "height": None}]})
+
+    series = worldtides.create_marine_timeseries_from_worldtides(24.8, 53.6, "key", forecast_hours=6)
+    assert series.source == "worldtides_fallback"
+    assert all(isinstance(point, MarineDataPoint) for point in series.data_points)
+    with pytest.raises(ValueError):
+        worldtides.create_marine_timeseries_from_worldtides(24.8, 53.6, "key", forecast_hours=6, fallback=False)
+
+
+def test_extrema_are_refined_between_half_hour_samples() -> None:
+    events = find_extrema(_semidiurnal())
+
+    highs = events.take(events.kind == HIGH)
+    lows = events.take(events.kind == LOW)
+    # True high waters at n * 12.42h, low waters half a period later.
+    assert np.all(np.abs(highs.epoch_s - (START + PERIOD_S * np.arange(1, len(highs) + 1))) < 120)
+    assert np.all(np.abs(lows.epoch_s - (START + PERIOD_S // 2 + PERIOD_S * np.arange(len(lows)))) < 120)
+    assert np.allclose(highs.height_m, 2.5, atol=0.01) and np.allclose(lows.height_m, 0.5, atol=0.01)
+
+
+def test_crossings_and_band_windows_share_interpolated_edges() -> None:
+    tide = _semidiurnal(hours=24)
+    crossings = find_crossings(tide, 1.5)
+    windows = tide_windows(tide, min_m=1.5)
+
+    assert crossings.kind[:2].tolist() == [FALLING, RISING]
+    assert abs(crossings.epoch_s[0] - (START + PERIOD_S // 4)) < 120
+    assert windows.start_s[0] == START and windows.end_s[0] == crossings.epoch_s[0]
+    assert windows.start_s[1] == crossings.epoch_s[1]
+    assert windows.covers([START + 3600, START + 6 * 3600]).tolist() == [True, False]
+
+
+def test_tide_column_joins_fused_grid_gates_and_route_windows() -> None:
+    tide = _semidiurnal(hours=24)
+    stamps = pd.to_datetime(tide.epoch_s, unit="s", utc=True).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    points = [
+        MarineDataPoint(timestamp=stamp, wind_speed=0.0, wind_direction=0.0, wave_height=0.0, sea_level=float(h))
+        for stamp, h in zip(stamps, tide.height_m)
+    ]
+    series = MarineTimeseries(source="worldtides", location="AGI", data_points=points, ingested_at=stamps[0])
+    index = pd.date_range("2025-10-07T04:00", periods=12, freq="h", tz="Asia/Dubai")
+
+    frame = _tide_frame(series, index)
+    assert frame.index.equals(index) and not frame["sea_level"].isna().any()
+    assert _tide_frame(MarineTimeseries("worldtides_fallback", "AGI", points, stamps[0]), index) is None
+
+    fused = frame.assign(wave_height=0.5, wind_speed_kt=10.0)
+    gates = hourly_gate_series({"AGI": fused, "DAS": fused}, {"tide": {"min_m": 1.5}})
+    assert gates["AGI"].status.tolist()[:5] == [2, 2, 2, 2, 0]
+
+    das = _semidiurnal("DAS", hours=24, phase_s=3600)
+    band = {"AGI": tide_windows(TideSeries.from_timeseries(series), min_m=1.5), "DAS": tide_windows(das, min_m=1.5)}
+    entry = {"start": "2025-10-07T04:00:00+04:00", "end": "2025-10-07T12:00:00+04:00", "decision": "GO"}
+    windows = route_window({"D+0": {"morning": entry}}, {"D+0": {"morning": entry}}, tides=band, tz="Asia/Dubai")
+    assert windows[0]["tide_window"] == "04:00–07:06"
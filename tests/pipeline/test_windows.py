@@ -0,0 +1,69 @@
+"""Tests for vectorised window detection."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from src.marine_ops.pipeline.daypart import route_window
+from src.marine_ops.pipeline.windows import (
+    CONDITIONAL,
+    GO,
+    GateSeries,
+    classify_gates,
+    find_windows,
+    from_epoch_seconds,
+    hourly_gate_series,
+    to_epoch_seconds,
+)
+
+GATES = {"go": {"hs_m": 1.0, "wind_kt": 20.0}, "conditional": {"hs_m": 1.2, "wind_kt": 22.0}}
+
+
+def test_runs_split_on_status_and_local_day() -> None:
+    stamps = pd.date_range("2024-05-01T16:00", periods=10, freq="h", tz="UTC")
+    hs = np.array([1.1, 1.1, 0.5, 0.5, 0.5, 0.5, 3.0, 0.5, 0.5, np.nan])
+    status = classify_gates(hs, np.full(10, 10.0), GATES["go"], GATES["conditional"])
+    runs = find_windows(GateSeries.build(to_epoch_seconds(stamps), status), "Asia/Dubai")
+
+    # 20:00 UTC is local midnight (UTC+4), so the first GO stretch splits in two.
+    assert runs.status.tolist() == [CONDITIONAL, GO, GO, GO]
+    assert runs.points.tolist() == [2, 2, 2, 2]
+    assert runs.day[1] + 1 == runs.day[2]
+    records = runs.records("Asia/Dubai")
+    assert records[0]["start"].hour == 20 and records[0]["duration_hours"] == 1.0
+    assert runs.best() == 1
+    assert from_epoch_seconds(to_epoch_seconds(stamps), "Asia/Dubai").equals(stamps.tz_convert("Asia/Dubai"))
+
+
+def test_route_window_adds_best_joint_hourly_span() -> None:
+    index = pd.date_range("2024-05-01T02:00", periods=6, freq="h", tz="UTC")
+    agi = pd.DataFrame({"wave_height": [0.5] * 6, "wind_speed_kt": [10.0] * 6}, index=index)
+    das = pd.DataFrame({"wave_height": [2.0, 0.5, 0.5, 0.5, 1.1, 1.1], "wind_speed_kt": [10.0] * 6}, index=index)
+    entry = {"start": "2024-05-01T06:00:00+04:00", "end": "2024-05-01T12:00:00+04:00", "decision": "GO"}
+    decisions = {"D+0": {"morning": entry}}
+
+    windows = route_window(decisions, decisions, hourly=hourly_gate_series({"AGI": agi, "DAS": das}, GATES), tz="Asia/Dubai")
+
+    assert windows[0]["hourly_window"] == "07:00–09:00"
+    assert "hourly_window" not in route_window(decisions, decisions)[0]
+
+
+def test_formatter_treats_missing_wave_height_as_no_go() -> None:
+    from scripts.three_day_formatter import GST_OFFSET_SECONDS, ThreeDayFormatter
+
+    formatter = ThreeDayFormatter()
+    midnight_utc = formatter._gst_day_number() * 86_400 - GST_OFFSET_SECONDS
+    stamps = pd.to_datetime(midnight_utc + 3600 * np.arange(7), unit="s", utc=True)
+    hs = [1.0, 1.0, 1.0, None, 1.0, 1.0, 1.0]
+    timeseries = [
+        {"timestamp": stamp.isoformat(), "wave_height_m": wave, "wind_speed_ms": 5.0}
+        for stamp, wave in zip(stamps, hs)
+    ]
+
+    windows = formatter.detect_windows(timeseries, day_offset=0)
+    assert [window["status"] for window in windows] == ["GO", "GO"]
+    assert [window["duration_hours"] for window in windows] == [2.0, 2.0]
+
+    # Same list mutated in place (same length) must be re-evaluated.
+    timeseries[3]["wave_height_m"] = 1.0
+    assert [window["duration_hours"] for window in formatter.detect_windows(timeseries, day_offset=0)] == [6.0]